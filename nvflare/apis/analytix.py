@@ -15,6 +15,8 @@
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 from nvflare.apis.dxo import DXO, DataKind
 
 _DATA_TYPE_KEY = "analytics_data_type"
@@ -24,6 +26,7 @@ _KWARGS_KEY = "analytics_kwargs"
 class AnalyticsDataType(Enum):
     SCALARS = "SCALARS"
     SCALAR = "SCALAR"
+    SCALAR_BATCH = "SCALAR_BATCH"
     IMAGE = "IMAGE"
     TEXT = "TEXT"
 
@@ -82,3 +85,41 @@ class AnalyticsData:
         kwargs = dxo.get_meta_prop(_KWARGS_KEY)
 
         return cls(tag, value, data_type, kwargs)
+
+
+def get_analytics_data_type(dxo: DXO) -> Optional[AnalyticsDataType]:
+    """Gets the AnalyticsDataType of the analytic data in the DXO object."""
+    return dxo.get_meta_prop(_DATA_TYPE_KEY)
+
+
+def scalar_batch_to_dxo(scalars: dict, kwargs: Optional[dict] = None) -> DXO:
+    """Converts a batch of scalars to one DXO object.
+
+    Args:
+        scalars (dict): tag => numpy array of shape (n, 2). Each row is (global step, value).
+            The global step is NaN when it is not given.
+        kwargs (optional, dict): additional arguments to be passed.
+    """
+    if not isinstance(scalars, dict):
+        raise TypeError(f"expect scalars to be an instance of dict, but got {type(scalars)}.")
+    for tag, series in scalars.items():
+        if not isinstance(series, np.ndarray) or series.ndim != 2 or series.shape[1] != 2:
+            raise ValueError(f"expect scalars of tag {tag} to be a numpy array of shape (n, 2).")
+    dxo = DXO(data_kind=DataKind.ANALYTIC, data=scalars)
+    dxo.set_meta_prop(_DATA_TYPE_KEY, AnalyticsDataType.SCALAR_BATCH)
+    dxo.set_meta_prop(_KWARGS_KEY, kwargs)
+    return dxo
+
+
+def scalar_batch_from_dxo(dxo: DXO) -> dict:
+    """Gets the scalars from a DXO object made by scalar_batch_to_dxo.
+
+    Returns:
+        A dict of tag => list of (global step, value). The global step is None when it was not given.
+    """
+    if get_analytics_data_type(dxo) != AnalyticsDataType.SCALAR_BATCH:
+        raise ValueError("dxo does not have the correct format for a scalar batch.")
+    result = {}
+    for tag, series in dxo.data.items():
+        result[tag] = [(None if np.isnan(step) else int(step), float(value)) for step, value in series]
+    return result
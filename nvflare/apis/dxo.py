@@ -13,10 +13,10 @@
 # limitations under the License.
 
 import copy
-import pickle
 from typing import List
 
 from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.fuel.utils import tensor_frame
 
 
 class DataKind(object):
@@ -100,7 +100,7 @@ class DXO(object):
             object serialized in bytes.
 
         """
-        return pickle.dumps(self)
+        return tensor_frame.dumps(self)
 
     def validate(self) -> str:
         if self.data is None:
@@ -140,13 +140,13 @@ def from_bytes(data: bytes) -> DXO:
     """method to convert the object bytes into Model object.
 
     Args:
-        data: a bytes object
+        data: a bytes-like object
 
     Returns:
-        an object loaded by pickle from data
+        an object loaded from data
 
     """
-    x = pickle.loads(data)
+    x = tensor_frame.loads(data)
     if isinstance(x, DXO):
         return x
     else:
@@ -14,6 +14,7 @@
 
 import logging
 import traceback
+from typing import List, Optional
 
 from nvflare.apis.utils.fl_context_utils import generate_log_message
 
@@ -111,6 +112,17 @@ class FLComponent(object):
         """
         pass
 
+    def get_subscribed_event_types(self) -> Optional[List[str]]:
+        """Gets the event types that handle_event handles.
+
+        The engine only invokes handle_event for these event types. A subclass that overrides handle_event
+        must override this method too, otherwise it gets all events.
+
+        Returns:
+            List of event types, or None (default) to get all events.
+        """
+        return None
+
     def log_info(self, fl_ctx: FLContext, msg: str, fire_event=False):
         """Logs a message with logger.info.
 
@@ -14,6 +14,9 @@
 
 from enum import Enum
 
+# time in seconds the server may hold a task request until it has a task for the client
+DEFAULT_TASK_WAIT_TIME = 30
+
 
 class ReturnCode(object):
 
@@ -152,6 +155,8 @@ class FedEventHeader(object):
     DIRECTION = "_direction"
     ORIGIN = "_origin"
     TARGETS = "_targets"
+    SEQ = "_seq"
+    SENDER = "_sender"
 
 
 class EventScope(object):
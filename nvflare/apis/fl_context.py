@@ -14,16 +14,26 @@
 
 import logging
 import threading
+from types import MappingProxyType
 
 from .fl_constant import ReservedKey
 
-_update_lock = threading.Lock()
-
 
 class FLContext(object):
+    """Props of a context, with their private/sticky attributes.
+
+    The values and the attribute masks are kept in two dicts. There is no lock: every method is a few atomic dict
+    operations, so a context can be read by several threads. Threads that set or remove the same key of one context
+    concurrently must synchronize themselves, as the result is one of the orders of their operations.
+    """
+
+    __slots__ = ("model", "_values", "_masks")
+
     MASK_STICKY = 1 << 0
     MASK_PRIVATE = 1 << 1
 
+    logger = logging.getLogger("FLContext")
+
     @classmethod
     def _is_sticky(cls, mask) -> bool:
         return mask & cls.MASK_STICKY > 0
@@ -48,53 +58,65 @@ class FLContext(object):
         else:
             return result + "non-sticky"
 
+    @classmethod
+    def _to_mask(cls, private, sticky) -> int:
+        mask = 0
+        if private:
+            mask += cls.MASK_PRIVATE
+        if sticky:
+            mask += cls.MASK_STICKY
+        return mask
+
     def __init__(self):
         self.model = None
-        self.props = {}
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self._values = {}
+        self._masks = {}
+
+    @property
+    def props(self):
+        """Read-only snapshot of the props as {key: {"value": value, "mask": mask}}.
+
+        Use set_prop, remove_prop or update_props to change the props.
+        """
+        values = self._values
+        return MappingProxyType(
+            {k: {"value": values[k], "mask": mask} for k, mask in list(self._masks.items()) if k in values}
+        )
 
     def public_key_exists(self, key):
-        return key in self.props and not self._is_private(self.props[key]["mask"])
+        mask = self._masks.get(key)
+        return mask is not None and not self._is_private(mask)
 
     def get_all_public_props(self):
-        return {k: v["value"] for k, v in self.props.items() if not self._is_private(v["mask"])}
+        values = self._values
+        return {
+            k: values[k] for k, mask in list(self._masks.items()) if not mask & FLContext.MASK_PRIVATE and k in values
+        }
 
     def set_prop(self, key: str, value, private=True, sticky=True):
         if not isinstance(key, str):
             raise ValueError("prop key must be str")
 
-        with _update_lock:
-            mask = 0
-            if private:
-                mask += FLContext.MASK_PRIVATE
-            if sticky:
-                mask += FLContext.MASK_STICKY
-            if key not in self.props or key in self.props and self.props[key]["mask"] == mask:
-                self.props[key] = {"value": value, "mask": mask}
-            else:
-                existing_mask = self.props[key]["mask"]
-                self.logger.warning(
-                    f"property {key} already exists with attributes "
-                    f"{self._to_string(existing_mask)}, cannot change to {self._to_string(mask)}"
-                )
-                return False
+        mask = self._to_mask(private, sticky)
+        # the first writer of a key sets its attributes
+        existing_mask = self._masks.setdefault(key, mask)
+        if existing_mask != mask:
+            self.logger.warning(
+                f"property {key} already exists with attributes "
+                f"{self._to_string(existing_mask)}, cannot change to {self._to_string(mask)}"
+            )
+            return False
+        self._values[key] = value
         return True
 
     def get_prop(self, key, default=None):
-        with _update_lock:
-            if key in self.props:
-                return self.props.get(key)["value"]
-            else:
-                return default
+        return self._values.get(key, default)
 
     def get_prop_detail(self, key):
-        with _update_lock:
-            if key in self.props:
-                prop = self.props.get(key)
-                mask = prop["mask"]
-                return {"value": prop["value"], "private": self._is_private(mask), "sticky": self._is_sticky(mask)}
-            else:
-                return None
+        mask = self._masks.get(key)
+        if mask is None or key not in self._values:
+            return None
+        return {"value": self._values[key], "private": self._is_private(mask), "sticky": self._is_sticky(mask)}
 
     def remove_prop(self, key: str):
         if not isinstance(key, str):
@@ -104,11 +126,52 @@ class FLContext(object):
             # do not allow removal of reserved props!
             return
 
-        with _update_lock:
-            self.props.pop(key, None)
+        self._values.pop(key, None)
+        self._masks.pop(key, None)
+
+    def update_props(self, ctx, keys=None):
+        """Copies props of another context with their attributes, replacing the props of this context with the same keys.
+
+        Args:
+            ctx: the FLContext to copy from
+            keys: the keys to copy. None to copy all props.
+
+        """
+        if keys is None:
+            masks = dict(ctx._masks)
+            values = {k: v for k, v in list(ctx._values.items()) if k in masks}
+        else:
+            values = {k: ctx._values[k] for k in keys if k in ctx._values and k in ctx._masks}
+        self._masks.update({k: ctx._masks[k] for k in values})
+        self._values.update(values)
+
+    def _set_props(self, values: dict, mask: int):
+        """Sets many props with the same attributes. Keys that exist with other attributes are kept, like set_prop."""
+        masks = self._masks
+        conflicts = [k for k in values if masks.get(k, mask) != mask]
+        if conflicts:
+            for k in conflicts:
+                self.logger.warning(
+                    f"property {k} already exists with attributes "
+                    f"{self._to_string(masks[k])}, cannot change to {self._to_string(mask)}"
+                )
+            values = {k: v for k, v in values.items() if k not in conflicts}
+        masks.update(dict.fromkeys(values, mask))
+        self._values.update(values)
+
+    def __getstate__(self):
+        # contexts are pickled to peers and child processes that could run an older version:
+        # keep the state of the contexts that had a "props" dict (and a logger) instead of slots
+        return {"model": self.model, "props": dict(self.props), "logger": self.logger}
+
+    def __setstate__(self, state):
+        self.model = state.get("model")
+        props = state.get("props", {})
+        self._values = {k: v["value"] for k, v in props.items()}
+        self._masks = {k: v["mask"] for k, v in props.items()}
 
     def __str__(self):
-        raw_list = [f'{k}: {type(v["value"])}' for k, v in self.props.items()]
+        raw_list = [f"{k}: {type(v)}" for k, v in list(self._values.items())]
         return " ".join(raw_list)
 
     # some convenience methods
@@ -135,16 +198,19 @@ class FLContext(object):
 
     def set_public_props(self, metadata: dict):
         # remove all public props
-        self.props = {k: v for k, v in self.props.items() if self._is_private(v["mask"] or self._is_sticky(v["mask"]))}
+        for k, mask in list(self._masks.items()):
+            if not self._is_private(mask):
+                self._values.pop(k, None)
+                self._masks.pop(k, None)
 
-        for key, value in metadata.items():
-            self.set_prop(key, value, private=False, sticky=True)
+        self._set_props(metadata, FLContext.MASK_STICKY)
 
     def clone_sticky(self):
         new_fl_ctx = FLContext()
-        for k, v in self.props.items():
-            if self._is_sticky(v["mask"]):
-                new_fl_ctx.props[k] = {"value": v["value"], "mask": v["mask"]}
+        values = self._values
+        masks = {k: mask for k, mask in list(self._masks.items()) if mask & FLContext.MASK_STICKY and k in values}
+        new_fl_ctx._masks = masks
+        new_fl_ctx._values = {k: values[k] for k in masks}
         return new_fl_ctx
 
     def sync_sticky(self):
@@ -167,7 +233,6 @@ class FLContext(object):
 
 
 class FLContextManager(object):
-
     """
     NOTE: The engine may create a new FLContextManager object for each RUN!
 
@@ -182,6 +247,9 @@ class FLContextManager(object):
         self.public_stickers = {}
         self.private_stickers = {}
 
+        # the props of a new context, built again when the stickers change
+        self._template = None
+
         if public_stickers and isinstance(public_stickers, dict):
             self.public_stickers.update(public_stickers)
 
@@ -196,6 +264,15 @@ class FLContextManager(object):
         Returns: a FLContext object
 
         """
+        ctx = FLContext()
+        with self._update_lock:
+            if self._template is None:
+                self._template = self._build_template()
+            ctx._values = self._template._values.copy()
+            ctx._masks = self._template._masks.copy()
+        return ctx
+
+    def _build_template(self) -> FLContext:
         ctx = FLContext()
         ctx.set_prop(key=ReservedKey.MANAGER, value=self, private=True, sticky=False)
 
@@ -206,13 +283,8 @@ class FLContextManager(object):
         if self.identity_name:
             ctx.set_prop(key=ReservedKey.IDENTITY_NAME, value=self.identity_name, private=False)
 
-        with self._update_lock:
-            for k, v in self.public_stickers.items():
-                ctx.set_prop(key=k, value=v, sticky=True, private=False)
-
-            for k, v in self.private_stickers.items():
-                ctx.set_prop(key=k, value=v, sticky=True, private=True)
-
+        ctx._set_props(self.public_stickers, FLContext.MASK_STICKY)
+        ctx._set_props(self.private_stickers, FLContext.MASK_STICKY | FLContext.MASK_PRIVATE)
         return ctx
 
     def finalize_context(self, ctx: FLContext):
@@ -224,10 +296,12 @@ class FLContextManager(object):
         Returns:
 
         """
+        values = ctx._values
         with self._update_lock:
-            for k, v in ctx.props.items():
-                if ctx._is_sticky(v["mask"]):
-                    if ctx._is_private(v["mask"]):
-                        self.private_stickers[k] = v["value"]
-                    else:
-                        self.public_stickers[k] = v["value"]
+            for k, mask in list(ctx._masks.items()):
+                if ctx._is_sticky(mask) and k in values:
+                    stickers = self.private_stickers if ctx._is_private(mask) else self.public_stickers
+                    value = values[k]
+                    if k not in stickers or stickers[k] is not value:
+                        stickers[k] = value
+                        self._template = None
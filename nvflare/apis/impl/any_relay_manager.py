@@ -92,8 +92,12 @@ class AnyRelayTaskManager(TaskManager):
                 if pending_client_name == client_name:
                     raise RuntimeError("Logic Error: must not be here for client {}".format(client_name))
 
-                # should this client timeout?
-                if task_result_timeout and time.time() - pending_task.task_sent_time > task_result_timeout:
+                # should this client timeout? (no task_sent_time yet: the task is still being sent)
+                if (
+                    task_result_timeout
+                    and pending_task.task_sent_time is not None
+                    and time.time() - pending_task.task_sent_time > task_result_timeout
+                ):
                     # timeout!
                     # give up on the pending task and move to the next target
                     finished_targets[pending_client_name] -= 1
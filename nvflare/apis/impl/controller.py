@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
+import itertools
 import threading
 import time
 from abc import ABC
@@ -23,7 +25,7 @@ from nvflare.apis.controller_spec import ClientTask, ControllerSpec, SendOrder,
 from nvflare.apis.fl_constant import FLContextKey, ReservedTopic
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.fl_exception import WorkflowError
-from nvflare.apis.responder import Responder
+from nvflare.apis.responder import Responder, TaskNotifier
 from nvflare.apis.server_engine_spec import ServerEngineSpec
 from nvflare.apis.shareable import Shareable
 from nvflare.apis.signal import Signal
@@ -38,6 +40,8 @@ from .task_manager import TaskCheckStatus, TaskManager
 _TASK_KEY_ENGINE = "___engine"
 _TASK_KEY_MANAGER = "___mgr"
 _TASK_KEY_DONE = "___done"
+_TASK_KEY_SEQ = "___seq"
+_TASK_KEY_INDEX_TARGETS = "___index_targets"
 
 
 def _check_positive_int(name, value):
@@ -67,14 +71,24 @@ class Controller(Responder, ControllerSpec, ABC):
         """Manage life cycles of tasks and their destinations
 
         Args:
-            task_check_period (float, optional): interval for checking status of tasks. Defaults to 0.5.
+            task_check_period (float, optional): max interval for checking status of tasks. Submissions,
+              cancellations and task timeouts are handled as they happen. Defaults to 0.5.
         """
         Responder.__init__(self)
         self._engine = None
         self._tasks = []  # list of standing tasks
+        # index of the standing tasks for task requests, in schedule order:
+        # the tasks any client could get, and client name => tasks that have the client as a fixed target
+        self._any_client_tasks = []
+        self._client_tasks_index = {}
+        self._task_seq = itertools.count()
         self._client_task_map = {}  # client_task_id => client_task
+        self._task_deadlines = []  # heap of (timeout time, seq, task)
+        self._deadline_seq = itertools.count()
         self._all_done = False
         self._task_lock = Lock()
+        # notified when the state of a task changed: the monitor and the waiters check the tasks again
+        self._task_changes = TaskNotifier()
         self._task_monitor = threading.Thread(target=self._monitor_tasks, args=())
         self._task_check_period = task_check_period
 
@@ -111,6 +125,9 @@ class Controller(Responder, ControllerSpec, ABC):
                 },
             )
 
+    def get_subscribed_event_types(self):
+        return [InfoCollector.EVENT_TYPE_GET_STATS]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         """Called when events are fired
 
@@ -145,8 +162,8 @@ class Controller(Responder, ControllerSpec, ABC):
 
         client_task_to_send = None
         with self._task_lock:
-            self.logger.debug("self._tasks: {}".format(self._tasks))
-            for task in self._tasks:
+            self.logger.debug("self._tasks: %s", self._tasks)
+            for task in self._get_candidate_tasks(client.name):
                 if task.completion_status is not None:
                     # this task is finished (and waiting for the monitor to exit it)
                     continue
@@ -155,7 +172,7 @@ class Controller(Responder, ControllerSpec, ABC):
                 # note: the task could be sent to a client multiple times (e.g. in relay)
                 # we only check the last ClientTask sent to the client
                 client_task_to_check = task.last_client_task_map.get(client.name, None)
-                self.logger.debug("client_task_to_check: {}".format(client_task_to_check))
+                self.logger.debug("client_task_to_check: %s", client_task_to_check)
                 resend_task = False
 
                 if client_task_to_check is not None:
@@ -180,11 +197,11 @@ class Controller(Responder, ControllerSpec, ABC):
                         client_task_to_check = ClientTask(task=task, client=client)
                     check_status = manager.check_task_send(client_task_to_check, fl_ctx)
                     self.logger.debug(
-                        "Checking client task: {}, task.client.name: {}".format(
-                            client_task_to_check, client_task_to_check.client.name
-                        )
+                        "Checking client task: %s, task.client.name: %s",
+                        client_task_to_check,
+                        client_task_to_check.client.name,
                     )
-                    self.logger.debug("Check task send get check_status: {}".format(check_status))
+                    self.logger.debug("Check task send get check_status: %s", check_status)
                     if check_status == TaskCheckStatus.BLOCK:
                         # do not send this task, and do not check other tasks
                         return self._try_again()
@@ -202,7 +219,7 @@ class Controller(Responder, ControllerSpec, ABC):
         # NOTE: move task sending process outside the lock
         # This is to minimize the locking time and to avoid potential deadlock:
         # the CB could schedule another task, which requires lock
-        self.logger.debug("Determining based on client_task_to_send: {}".format(client_task_to_send))
+        self.logger.debug("Determining based on client_task_to_send: %s", client_task_to_send)
         if client_task_to_send is None:
             # no task available for this client
             return self._try_again()
@@ -232,7 +249,7 @@ class Controller(Responder, ControllerSpec, ABC):
                     task.completion_status = TaskCompletionStatus.ERROR
                     task.exception = ex
 
-            self.logger.debug("before_task_sent_cb done on client_task_to_send: {}".format(client_task_to_send))
+            self.logger.debug("before_task_sent_cb done on client_task_to_send: %s", client_task_to_send)
 
             if task.completion_status is not None:
                 can_send_task = False
@@ -265,9 +282,10 @@ class Controller(Responder, ControllerSpec, ABC):
                 can_send_task = False
 
             if not can_send_task:
+                self._task_changes.notify()
                 return self._try_again()
 
-            self.logger.debug("after_task_sent_cb done on client_task_to_send: {}".format(client_task_to_send))
+            self.logger.debug("after_task_sent_cb done on client_task_to_send: %s", client_task_to_send)
 
             client_task_to_send.task_sent_time = time.time()
             client_task_to_send.task_send_count += 1
@@ -283,7 +301,7 @@ class Controller(Responder, ControllerSpec, ABC):
         with self._task_lock:
             # task_id is the uuid associated with the client_task
             client_task = self._client_task_map.get(task_id, None)
-            self.logger.debug("Handle exception on client_task {} with id {}".format(client_task, task_id))
+            self.logger.debug("Handle exception on client_task %s with id %s", client_task, task_id)
 
         if client_task is None:
             # cannot find a standing task on the exception
@@ -321,7 +339,7 @@ class Controller(Responder, ControllerSpec, ABC):
         with self._task_lock:
             # task_id is the uuid associated with the client_task
             client_task = self._client_task_map.get(task_id, None)
-            self.logger.debug("Get submission={} from client task={} id={}".format(result, client_task, task_id))
+            self.logger.debug("Get submission=%s from client task=%s id=%s", result, client_task, task_id)
 
         if client_task is None:
             # cannot find a standing task for the submission
@@ -347,6 +365,9 @@ class Controller(Responder, ControllerSpec, ABC):
             manager = task.props[_TASK_KEY_MANAGER]
             manager.check_task_result(result, client_task, fl_ctx)
 
+            # e.g. the next client of a relay can get the task now
+            self.task_notifier.notify()
+
             if task.result_received_cb is not None:
                 try:
                     self.log_info(fl_ctx, "invoking result_received_cb ...")
@@ -359,6 +380,7 @@ class Controller(Responder, ControllerSpec, ABC):
                     )
                     task.completion_status = TaskCompletionStatus.ERROR
                     task.exception = ex
+                    self._task_changes.notify()
                     return
                 except BaseException as ex:
                     # this task cannot proceed anymore
@@ -368,10 +390,14 @@ class Controller(Responder, ControllerSpec, ABC):
                     )
                     task.completion_status = TaskCompletionStatus.ERROR
                     task.exception = ex
+                    self._task_changes.notify()
                     return
             else:
                 self.log_info(fl_ctx, "no result_received_cb")
 
+            # the task may be done now: let the monitor check it after the CB, which could also end the task
+            self._task_changes.notify()
+
     def _schedule_task(
         self,
         task: Task,
@@ -379,11 +405,12 @@ class Controller(Responder, ControllerSpec, ABC):
         manager: TaskManager,
         targets: Union[List[Client], List[str], None],
         allow_dup_targets: bool = False,
+        dynamic_targets: bool = False,
     ):
         if task.schedule_time is not None:
             # this task was scheduled before
             # we do not allow a task object to be reused
-            self.logger.debug("task.schedule_time: {}".format(task.schedule_time))
+            self.logger.debug("task.schedule_time: %s", task.schedule_time)
             raise ValueError("Task was already used. Please create a new task object.")
 
         task.targets = targets
@@ -409,9 +436,51 @@ class Controller(Responder, ControllerSpec, ABC):
         task.schedule_time = time.time()
 
         with self._task_lock:
+            task.props[_TASK_KEY_SEQ] = next(self._task_seq)
             self._tasks.append(task)
+            self._add_task_to_index(task, dynamic_targets)
+            if task.timeout:
+                heapq.heappush(
+                    self._task_deadlines, (task.schedule_time + task.timeout, next(self._deadline_seq), task)
+                )
             self.log_info(fl_ctx, "scheduled task {}".format(task.name))
 
+        # wake up the clients waiting for a task
+        self.task_notifier.notify()
+        self._task_changes.notify()
+
+    def _add_task_to_index(self, task: Task, dynamic_targets: bool):
+        # clients that are not targets of a task are not sent the task (the task managers return NO_BLOCK for them),
+        # so a request only needs to check the tasks it could get. Dynamic targets can be joined by any client.
+        if task.targets is None or dynamic_targets:
+            index_targets = None
+            self._any_client_tasks.append(task)
+        else:
+            index_targets = list(dict.fromkeys(task.targets))
+            for name in index_targets:
+                self._client_tasks_index.setdefault(name, []).append(task)
+        task.props[_TASK_KEY_INDEX_TARGETS] = index_targets
+
+    def _remove_task_from_index(self, task: Task):
+        index_targets = task.props[_TASK_KEY_INDEX_TARGETS]
+        if index_targets is None:
+            self._any_client_tasks.remove(task)
+            return
+        for name in index_targets:
+            tasks = self._client_tasks_index[name]
+            tasks.remove(task)
+            if not tasks:
+                self._client_tasks_index.pop(name)
+
+    def _get_candidate_tasks(self, client_name: str):
+        # the standing tasks the client could get, in schedule order
+        client_tasks = self._client_tasks_index.get(client_name)
+        if not client_tasks:
+            return self._any_client_tasks
+        if not self._any_client_tasks:
+            return client_tasks
+        return heapq.merge(self._any_client_tasks, client_tasks, key=lambda t: t.props[_TASK_KEY_SEQ])
+
     def broadcast(
         self,
         task: Task,
@@ -595,6 +664,7 @@ class Controller(Responder, ControllerSpec, ABC):
             fl_ctx (Optional[FLContext], optional): FLContext associated with this cancellation. Defaults to None.
         """
         task.completion_status = completion_status
+        self._task_changes.notify()
 
     def cancel_all_tasks(self, completion_status=TaskCompletionStatus.CANCELLED, fl_ctx: Optional[FLContext] = None):
         """Cancel all standing tasks in this controller.
@@ -606,6 +676,7 @@ class Controller(Responder, ControllerSpec, ABC):
         with self._task_lock:
             for t in self._tasks:
                 t.completion_status = completion_status
+        self._task_changes.notify()
 
     def abort_task(self, task, fl_ctx: FLContext):
         """Ask all clients to abort the execution of the specified task.
@@ -644,6 +715,7 @@ class Controller(Responder, ControllerSpec, ABC):
         """
         self.cancel_all_tasks()  # unconditionally cancel all tasks
         self._all_done = True
+        self._task_changes.notify()
         try:
             if self._task_monitor.is_alive():
                 self._task_monitor.join()
@@ -651,6 +723,9 @@ class Controller(Responder, ControllerSpec, ABC):
             self.log_debug(fl_ctx, "unable to join monitor thread (not started?)")
         self.stop_controller(fl_ctx)
 
+        # the clients waiting for a task of this controller must ask again
+        self.task_notifier.notify()
+
     def relay(
         self,
         task: Task,
@@ -719,6 +794,7 @@ class Controller(Responder, ControllerSpec, ABC):
             manager=manager,
             targets=targets,
             allow_dup_targets=True,
+            dynamic_targets=dynamic_targets,
         )
 
     def relay_and_wait(
@@ -760,11 +836,26 @@ class Controller(Responder, ControllerSpec, ABC):
 
     def _monitor_tasks(self):
         while not self._all_done:
+            seq = self._task_changes.get_seq()
             self._check_tasks()
-            time.sleep(self._task_check_period)
+            self._task_changes.wait(seq, self._get_check_wait_time())
+
+    def _get_check_wait_time(self) -> Optional[float]:
+        # The monitor is woken up when the state of a task changed. It also needs to check again when the next
+        # task times out, and periodically for the time-based exit conditions of the task managers.
+        with self._task_lock:
+            while self._task_deadlines and not self._task_deadlines[0][2].is_standing:
+                heapq.heappop(self._task_deadlines)
+            if not self._tasks:
+                return None
+            wait_time = self._task_check_period
+            if self._task_deadlines:
+                wait_time = min(wait_time, max(self._task_deadlines[0][0] - time.time(), 0.0))
+            return wait_time
 
     def _check_tasks(self):
         exit_tasks = []
+        now = time.time()
         with self._task_lock:
             for task in self._tasks:
                 if task.completion_status is not None:
@@ -777,26 +868,26 @@ class Controller(Responder, ControllerSpec, ABC):
                     if not isinstance(manager, TaskManager):
                         raise TypeError("manager in task must be an instance of TaskManager.")
                     should_exit, exit_status = manager.check_task_exit(task)
-                    self.logger.debug("should_exit: {}, exit_status: {}".format(should_exit, exit_status))
+                    self.logger.debug("should_exit: %s, exit_status: %s", should_exit, exit_status)
                     if should_exit:
                         task.completion_status = exit_status
                         exit_tasks.append(task)
                         continue
 
-                # check if task timeout
-                if task.timeout and time.time() - task.schedule_time >= task.timeout:
+            # check the tasks that timed out
+            while self._task_deadlines and self._task_deadlines[0][0] <= now:
+                _, _, task = heapq.heappop(self._task_deadlines)
+                if task.is_standing and task.completion_status is None:
                     task.completion_status = TaskCompletionStatus.TIMEOUT
                     exit_tasks.append(task)
-                    continue
 
             for exit_task in exit_tasks:
                 exit_task.is_standing = False
-                self.logger.debug(
-                    "Removing task={}, completion_status={}".format(exit_task, exit_task.completion_status)
-                )
+                self.logger.debug("Removing task=%s, completion_status=%s", exit_task, exit_task.completion_status)
                 self._tasks.remove(exit_task)
+                self._remove_task_from_index(exit_task)
                 for client_task in exit_task.client_tasks:
-                    self.logger.debug("Removing client_task with id={}".format(client_task.id))
+                    self.logger.debug("Removing client_task with id=%s", client_task.id)
                     self._client_task_map.pop(client_task.id)
 
         # do the task exit processing outside the lock to minimize the locking time
@@ -804,6 +895,9 @@ class Controller(Responder, ControllerSpec, ABC):
         if len(exit_tasks) <= 0:
             return
 
+        self.task_notifier.notify()
+        self._task_changes.notify()
+
         with self._engine.new_context() as fl_ctx:
             for exit_task in exit_tasks:
                 with exit_task.cb_lock:
@@ -829,12 +923,12 @@ class Controller(Responder, ControllerSpec, ABC):
                             exit_task.completion_status = TaskCompletionStatus.ERROR
                             exit_task.exception = ex
 
-    @staticmethod
-    def _process_finished_task(task, func):
+    def _process_finished_task(self, task, func):
         def wrap(*args, **kwargs):
             if func:
                 func(*args, **kwargs)
             task.props[_TASK_KEY_DONE] = True
+            self._task_changes.notify()
 
         return wrap
 
@@ -842,6 +936,8 @@ class Controller(Responder, ControllerSpec, ABC):
         task.props[_TASK_KEY_DONE] = False
         task.task_done_cb = self._process_finished_task(task=task, func=task.task_done_cb)
         while True:
+            # take the seq before checking, so that a change during the check is not missed
+            seq = self._task_changes.get_seq()
             if task.completion_status is not None:
                 break
 
@@ -852,4 +948,23 @@ class Controller(Responder, ControllerSpec, ABC):
             task_done = task.props[_TASK_KEY_DONE]
             if task_done:
                 break
-            time.sleep(self._task_check_period)
+
+            # the abort signal cannot notify, so it is still checked every task_check_period
+            self._task_changes.wait(seq, self._task_check_period)
+
+    def _wait_for_standing_tasks(self, abort_signal: Signal) -> bool:
+        """Wait until there are no standing tasks.
+
+        Args:
+            abort_signal (Signal): abort signal of the control flow
+
+        Returns:
+            bool: False if aborted
+        """
+        while True:
+            seq = self._task_changes.get_seq()
+            if not self.get_num_standing_tasks():
+                return True
+            if abort_signal and abort_signal.triggered:
+                return False
+            self._task_changes.wait(seq, self._task_check_period)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 from abc import ABC, abstractmethod
 from typing import Tuple
 
@@ -23,9 +24,45 @@ from .fl_context import FLContext
 from .shareable import Shareable
 
 
+class TaskNotifier(object):
+    """Lets task requests wait until tasks may have become available, instead of polling.
+
+    Every change of the tasks increments a sequence number. A waiter gets the sequence number before it
+    looks for a task, and waits for it to change if there was none, so no change can be missed.
+    """
+
+    def __init__(self):
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def get_seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def notify(self):
+        with self._cond:
+            self._seq += 1
+            self._cond.notify_all()
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """Wait until the tasks changed after the sequence number was taken.
+
+        Args:
+            seq: sequence number from get_seq
+            timeout: max time to wait in seconds
+
+        Returns: whether the tasks changed
+
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._seq != seq, timeout)
+
+
 class Responder(FLComponent, ABC):
     def __init__(self):
         FLComponent.__init__(self)
+        # notified when tasks may have become available to clients
+        self.task_notifier = TaskNotifier()
 
     @abstractmethod
     def process_task_request(self, client: Client, fl_ctx: FLContext) -> Tuple[str, str, Shareable]:
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pickle
+from nvflare.fuel.utils import tensor_frame
 
 from .fl_constant import ReservedKey, ReturnCode
 
@@ -110,24 +110,30 @@ class Shareable(dict):
     def to_bytes(self) -> bytes:
         """method to serialize the Model object into bytes.
 
+        The headers are pickled separately from the tensor buffers, which are written as raw
+        aligned segments. See nvflare.fuel.utils.tensor_frame for the layout.
+
         Returns:
             object serialized in bytes.
 
         """
-        return pickle.dumps(self)
+        return tensor_frame.dumps(self)
 
     @classmethod
     def from_bytes(cls, data: bytes):
         """method to convert the object bytes into Model object.
 
+        Tensors are reconstructed as views on data without copying if data is writable
+        (e.g. a bytearray). Plain pickled bytes are also accepted.
+
         Args:
-            data: a bytes object
+            data: a bytes-like object
 
         Returns:
-            an object loaded by pickle from data
+            an object loaded from data
 
         """
-        return pickle.loads(data)
+        return tensor_frame.loads(data)
 
 
 # some convenience functions
@@ -0,0 +1,73 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABC, abstractmethod
+
+from nvflare.apis.fl_component import FLComponent
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+
+
+class UpstreamClientSpec(FLComponent, ABC):
+    """Connection of a server to an upstream server, on which it acts as a client (e.g. a relay)."""
+
+    @abstractmethod
+    def register(self, fl_ctx: FLContext) -> bool:
+        """Register to the upstream server.
+
+        Args:
+            fl_ctx: FLContext of the local server
+
+        Returns: whether the registration succeeded
+
+        """
+        pass
+
+    @abstractmethod
+    def get_task(self, fl_ctx: FLContext):
+        """Get the next task from the upstream server.
+
+        Waits before returning when the upstream server has no task yet.
+
+        Args:
+            fl_ctx: FLContext of the local server
+
+        Returns: (task_name, task_data), or (None, None) if there is no task
+
+        """
+        pass
+
+    @abstractmethod
+    def is_run_ended(self) -> bool:
+        """Whether the upstream server asked to end the run."""
+        pass
+
+    @abstractmethod
+    def submit_result(self, task_name: str, result: Shareable, fl_ctx: FLContext) -> bool:
+        """Send the result of a task to the upstream server.
+
+        Args:
+            task_name: name of the task
+            result: result of the task
+            fl_ctx: FLContext of the local server
+
+        Returns: whether the result was sent
+
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Close the connection to the upstream server."""
+        pass
@@ -23,13 +23,15 @@ from nvflare.apis.shareable import Shareable
 def get_serializable_data(fl_ctx: FLContext):
     logger = logging.getLogger("fl_context_utils")
     new_fl_ctx = FLContext()
+    keys = []
     for k, v in fl_ctx.props.items():
         if k not in NonSerializableKeys.KEYS:
             try:
-                pickle.dumps(v)
-                new_fl_ctx.props[k] = v
+                pickle.dumps(v["value"])
+                keys.append(k)
             except:
                 logger.warning(generate_log_message(fl_ctx, f"Object is not serializable (discarded): {k} - {v}"))
+    new_fl_ctx.update_props(fl_ctx, keys=keys)
     return new_fl_ctx
 
 
@@ -14,5 +14,10 @@
 
 from .accumulate_model_aggregator import AccumulateWeightedAggregator
 from .intime_accumulate_model_aggregator import InTimeAccumulateWeightedAggregator
+from .sparse_accumulate_model_aggregator import SparseInTimeAccumulateWeightedAggregator
 
-__all__ = ["AccumulateWeightedAggregator", "InTimeAccumulateWeightedAggregator"]
+__all__ = [
+    "AccumulateWeightedAggregator",
+    "InTimeAccumulateWeightedAggregator",
+    "SparseInTimeAccumulateWeightedAggregator",
+]
@@ -14,6 +14,8 @@
 
 import re
 
+import numpy as np
+
 from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
 from nvflare.apis.fl_constant import ReservedKey, ReturnCode
 from nvflare.apis.fl_context import FLContext
@@ -22,8 +24,58 @@ from nvflare.app_common.abstract.aggregator import Aggregator
 from nvflare.app_common.app_constant import AppConstants
 
 
+class _FlatLayout(object):
+    def __init__(self, data: dict):
+        """Offsets of the floating point arrays of a model in one contiguous buffer.
+
+        Args:
+            data: the model as a dict of variable name to value
+        """
+        self.items = []  # (name, offset, size, shape)
+        self.dtypes = {}
+        offset = 0
+        for k, v in data.items():
+            if _is_float_array(v):
+                self.items.append((k, offset, v.size, v.shape))
+                self.dtypes[k] = v.dtype
+                offset += v.size
+        self.size = offset
+        self.max_item_size = max([size for _, _, size, _ in self.items], default=0)
+        self.dtype = np.result_type(*self.dtypes.values()) if self.dtypes else None
+
+    def matches(self, data: dict) -> bool:
+        if sum(1 for v in data.values() if _is_float_array(v)) != len(self.items):
+            return False
+        for k, _, _, shape in self.items:
+            v = data.get(k)
+            if not _is_float_array(v) or v.shape != shape or v.dtype != self.dtypes[k]:
+                return False
+        return True
+
+    def unpack(self, buffer: np.ndarray) -> dict:
+        # arrays of a smaller dtype than the buffer (in mixed precision models) are copied back to their dtype
+        return {
+            k: buffer[offset : offset + size].reshape(shape).astype(self.dtypes[k], copy=False)
+            for k, offset, size, shape in self.items
+        }
+
+
+def _is_float_array(v) -> bool:
+    return isinstance(v, np.ndarray) and np.issubdtype(v.dtype, np.floating)
+
+
 class InTimeAccumulateWeightedAggregator(Aggregator):
-    def __init__(self, exclude_vars=None, aggregation_weights=None, expected_data_kind=DataKind.WEIGHT_DIFF):
+
+    # values of MetaKey.PROCESSED_ALGORITHM of the contributions that can be accumulated
+    accepted_algorithms = (None,)
+
+    def __init__(
+        self,
+        exclude_vars=None,
+        aggregation_weights=None,
+        expected_data_kind=DataKind.WEIGHT_DIFF,
+        use_flat_buffer=False,
+    ):
         """Perform accumulated weighted aggregation
         It computes
         weighted_sum = sum(shareable*n_iteration*aggregation_weights) and
@@ -36,6 +88,8 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
         Args:
             exclude_vars ([type], optional): regex to match excluded vars during aggregation. Defaults to None.
             aggregation_weights ([type], optional): dictionary to map client name to its aggregation weights. Defaults to None.
+            use_flat_buffer (bool, optional): accumulate the floating point arrays in place in one contiguous
+                buffer, instead of allocating new arrays for every variable of every contribution. Defaults to False.
         """
         super().__init__()
         self.exclude_vars = re.compile(exclude_vars) if exclude_vars else None
@@ -51,10 +105,21 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
         self.counts = dict()
         self.history = list()
 
+        self.use_flat_buffer = use_flat_buffer
+        # the layout is kept across rounds, since the model usually doesn't change
+        self._layout = None
+        self._scratch = None
+        self._flat_total = None
+        self._flat_count = 0
+        self._flat_round = True
+
     def reset_stats(self):
         self.total = {}
         self.counts = {}
         self.history = []
+        self._flat_total = None
+        self._flat_count = 0
+        self._flat_round = True
 
     def accept(self, shareable: Shareable, fl_ctx: FLContext) -> bool:
         """Store shareable and update aggregator's internal state
@@ -83,7 +148,7 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
             return False
 
         processed_algorithm = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM)
-        if processed_algorithm is not None:
+        if processed_algorithm not in self.accepted_algorithms:
             self.log_error(fl_ctx, f"unable to accept shareable processed by {processed_algorithm}")
             return False
 
@@ -147,6 +212,32 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
                     self.warning_count[client_name] = 0
             aggregation_weight = 1.0
 
+        self._accumulate(dxo, aggregation_weight, float_n_iter, n_iter, fl_ctx)
+        self.history.append(
+            {
+                "client_name": client_name,
+                "round": contribution_round,
+                "aggregation_weight": aggregation_weight,
+                "n_iter": n_iter,
+            }
+        )
+        self.log_debug(fl_ctx, "End accept")
+        return True
+
+    def _accumulate(self, dxo: DXO, aggregation_weight: float, float_n_iter: float, n_iter, fl_ctx: FLContext):
+        """Add the weighted data of an accepted contribution to the totals.
+
+        Args:
+            dxo: the contribution
+            aggregation_weight: aggregation weight of the client
+            float_n_iter: number of iterations as float
+            n_iter: number of iterations
+            fl_ctx: context provided by workflow
+        """
+        data = dxo.data
+        if self.use_flat_buffer:
+            data = self._accumulate_flat(data, aggregation_weight * float_n_iter, n_iter, fl_ctx)
+
         for k, v in data.items():
             if self.exclude_vars is not None and self.exclude_vars.search(k):
                 continue
@@ -158,16 +249,6 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
             else:
                 self.total[k] = current_total + weighted_value
                 self.counts[k] = self.counts[k] + n_iter
-        self.history.append(
-            {
-                "client_name": client_name,
-                "round": contribution_round,
-                "aggregation_weight": aggregation_weight,
-                "n_iter": n_iter,
-            }
-        )
-        self.log_debug(fl_ctx, "End accept")
-        return True
 
     def aggregate(self, fl_ctx: FLContext) -> Shareable:
         """Called when workflow determines to generate shareable to send back to clients
@@ -184,8 +265,69 @@ class InTimeAccumulateWeightedAggregator(Aggregator):
         self.log_info(fl_ctx, f"aggregating {len(self.history)} update(s) at round {current_round}")
         self.log_debug(fl_ctx, f"complete history {self.history}")
         aggregated_dict = {k: v / self.counts[k] for k, v in self.total.items()}
+        if self._flat_total is not None:
+            # divide in place: the aggregated arrays are views of the buffer, which is not reused
+            self._flat_total /= self._flat_count
+            aggregated_dict.update(self._layout.unpack(self._flat_total))
+        # the summed weight lets a relay forward the result as one contribution to the next tier,
+        # whose weighted mean then equals the mean over all the clients below it
+        num_steps = sum(item["n_iter"] for item in self.history)
         self.reset_stats()
         self.log_debug(fl_ctx, "End aggregation")
 
-        dxo = DXO(data_kind=self.expected_data_kind, data=aggregated_dict)
+        dxo = DXO(
+            data_kind=self.expected_data_kind,
+            data=aggregated_dict,
+            meta={MetaKey.NUM_STEPS_CURRENT_ROUND: num_steps},
+        )
         return dxo.to_shareable()
+
+    def _accumulate_flat(self, data: dict, weight: float, n_iter, fl_ctx: FLContext) -> dict:
+        """Accumulate the floating point arrays of the contribution into the flat buffer.
+
+        Args:
+            data: the contribution
+            weight: aggregation weight times number of iterations
+            n_iter: number of iterations
+            fl_ctx: context provided by workflow
+
+        Returns:
+            the variables that are not accumulated in the flat buffer
+
+        """
+        if not self._flat_round:
+            return data
+
+        if self.exclude_vars is not None:
+            data = {k: v for k, v in data.items() if not self.exclude_vars.search(k)}
+
+        if self._flat_total is None:
+            # first contribution of the round
+            if self._layout is None or not self._layout.matches(data):
+                self._layout = _FlatLayout(data)
+                self._scratch = None
+            if self._layout.size == 0:
+                self._flat_round = False
+                return data
+            self._flat_total = np.empty(self._layout.size, dtype=self._layout.dtype)
+            for k, offset, size, _ in self._layout.items:
+                np.multiply(data[k].reshape(-1), weight, out=self._flat_total[offset : offset + size])
+        elif self._layout.matches(data):
+            if self._scratch is None:
+                self._scratch = np.empty(self._layout.max_item_size, dtype=self._layout.dtype)
+            for k, offset, size, _ in self._layout.items:
+                # fused multiply-add without temporary arrays
+                weighted_value = np.multiply(data[k].reshape(-1), weight, out=self._scratch[:size])
+                total = self._flat_total[offset : offset + size]
+                np.add(total, weighted_value, out=total)
+        else:
+            self.log_warning(fl_ctx, "model layout changed within the round - aggregating per variable")
+            for k, v in self._layout.unpack(self._flat_total).items():
+                self.total[k] = v
+                self.counts[k] = self._flat_count
+            self._flat_total = None
+            self._flat_round = False
+            return data
+
+        self._flat_count += n_iter
+        return {k: v for k, v in data.items() if k not in self._layout.dtypes}
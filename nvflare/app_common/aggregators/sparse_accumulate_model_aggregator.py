@@ -0,0 +1,73 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey
+from nvflare.apis.fl_context import FLContext
+from nvflare.app_common.filters.top_k_sparsifier import SPARSIFICATION_TOP_K
+
+from .intime_accumulate_model_aggregator import InTimeAccumulateWeightedAggregator
+
+
+class SparseInTimeAccumulateWeightedAggregator(InTimeAccumulateWeightedAggregator):
+
+    accepted_algorithms = (None, SPARSIFICATION_TOP_K)
+
+    def __init__(self, exclude_vars=None, aggregation_weights=None):
+        """Perform accumulated weighted aggregation of WEIGHT_DIFF, sent dense or sparsified by TopKSparsifier.
+
+        The values of a sparse variable are scatter-added into the dense total of the variable,
+        without making a dense array of each contribution. Dense variables are added in place.
+
+        Args:
+            exclude_vars ([type], optional): regex to match excluded vars during aggregation. Defaults to None.
+            aggregation_weights ([type], optional): dictionary to map client name to its aggregation weights. Defaults to None.
+        """
+        super().__init__(
+            exclude_vars=exclude_vars,
+            aggregation_weights=aggregation_weights,
+            expected_data_kind=DataKind.WEIGHT_DIFF,
+        )
+
+    def _accumulate(self, dxo: DXO, aggregation_weight: float, float_n_iter: float, n_iter, fl_ctx: FLContext):
+        sparse_keys = {}
+        if dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) == SPARSIFICATION_TOP_K:
+            sparse_keys = dxo.get_meta_prop(MetaKey.PROCESSED_KEYS) or {}
+
+        weight = aggregation_weight * float_n_iter
+        for k, v in dxo.data.items():
+            if self.exclude_vars is not None and self.exclude_vars.search(k):
+                continue
+            record = sparse_keys.get(k)
+            total = self.total.get(k, None)
+            if total is None:
+                # the totals are C-contiguous, so that their flat views can be scattered into
+                if record is None:
+                    total = np.multiply(v, weight, order="C")
+                    # make the total of scalars an array, so that it can be added in place
+                    self.total[k] = total if isinstance(total, np.ndarray) else np.array(total)
+                    self.counts[k] = n_iter
+                    continue
+                total = np.zeros(record["shape"], dtype=np.result_type(v.dtype, np.float32))
+                self.total[k] = total
+                self.counts[k] = 0
+
+            if record is None:
+                total += np.multiply(v, weight)
+            else:
+                flat_total = total.reshape(-1)
+                # the indices of a variable are unique, so a fancy-indexed add is a scatter-add
+                flat_total[record["indices"]] += v * weight
+            self.counts[k] = self.counts[k] + n_iter
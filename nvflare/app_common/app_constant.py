@@ -51,6 +51,7 @@ class AppConstants(object):
     META_COOKIE = "cookie"
     META_DATA = "meta_data"
     GLOBAL_MODEL = "global_model"
+    GLOBAL_MODEL_VERSION = "global_model_version"
 
     IS_BEST = "is_best"
     FAILURE = "failure"
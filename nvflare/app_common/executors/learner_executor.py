@@ -38,6 +38,9 @@ class LearnerExecutor(Executor):
         self.submit_model_task = submit_model_task
         self.validate_task = validate_task
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.ABORT_TASK, EventType.END_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.initialize(fl_ctx)
@@ -33,6 +33,7 @@ from nvflare.apis.utils.fl_context_utils import get_serializable_data
 from nvflare.fuel.common.multi_process_executor_constants import CommunicateData, CommunicationMetaData
 from nvflare.fuel.utils.class_utils import ModuleScanner
 from nvflare.fuel.utils.component_builder import ComponentBuilder
+from nvflare.fuel.utils.shm_transport import put_shared, release_shared
 
 
 def _get_open_ports(number):
@@ -60,11 +61,14 @@ class WorkerComponentBuilder(ComponentBuilder):
 
 
 class MultiProcessExecutor(Executor):
-    def __init__(self, executor_id=None, num_of_processes=1, components=None):
+    def __init__(self, executor_id=None, num_of_processes=1, components=None, use_shared_memory=False):
         """
         Arguments:
             executor_id: executor component ID
             num_of_processes: number of processes to create
+            use_shared_memory: send the tensors of the task data to the rank processes in one shared memory
+                segment, which they map read-only, instead of pickling a copy for each of them.
+                /dev/shm must be large enough to hold the task data.
         """
         super().__init__()
         self.executor_id = executor_id
@@ -78,6 +82,7 @@ class MultiProcessExecutor(Executor):
         if num_of_processes < 1:
             raise ValueError(f"{num_of_processes} must >= 1.")
         self.num_of_processes = num_of_processes
+        self.use_shared_memory = use_shared_memory
         self.executor = None
 
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -135,7 +140,7 @@ class MultiProcessExecutor(Executor):
 
                     return_data = self.conn_clients[0][CommunicationMetaData.HANDLE_CONN].recv()
                     # update the fl_ctx from the child process return data.
-                    fl_ctx.props.update(return_data[CommunicationMetaData.FL_CTX].props)
+                    fl_ctx.update_props(return_data[CommunicationMetaData.FL_CTX])
                 except BaseException as e:
                     # Warning: Have to set fire_event=False, otherwise it will cause dead loop on the event handling!!!
                     self.log_warning(
@@ -231,7 +236,7 @@ class MultiProcessExecutor(Executor):
                     rank_number = data[CommunicationMetaData.RANK_NUMBER]
 
                     with self.relay_lock:
-                        fl_ctx.props.update(data[CommunicationMetaData.FL_CTX].props)
+                        fl_ctx.update_props(data[CommunicationMetaData.FL_CTX])
 
                         fl_ctx.set_prop(FLContextKey.FROM_RANK_NUMBER, rank_number, private=True, sticky=False)
                         fl_ctx.set_prop(
@@ -275,18 +280,32 @@ class MultiProcessExecutor(Executor):
             self.finalize(fl_ctx)
             return make_reply(ReturnCode.OK)
 
+        shm = None
         try:
             data = {
                 CommunicationMetaData.COMMAND: CommunicateData.EXECUTE,
                 CommunicationMetaData.TASK_NAME: task_name,
-                CommunicationMetaData.SHAREABLE: shareable,
                 CommunicationMetaData.FL_CTX: get_serializable_data(fl_ctx),
             }
+            if self.use_shared_memory:
+                # only the descriptor of the shared tensors is sent on the sockets
+                descriptor, shm = put_shared(shareable)
+                data[CommunicationMetaData.SHARED_SHAREABLE] = descriptor
+            else:
+                data[CommunicationMetaData.SHAREABLE] = shareable
 
             # send the execute command to all the child processes
             for conn_client in self.conn_clients:
                 conn_client[CommunicationMetaData.EXE_CONN].send(data)
 
+            if shm is not None:
+                if not self._wait_for_attach(abort_signal):
+                    self.finalize(fl_ctx)
+                    return make_reply(ReturnCode.OK)
+                # the segment stays mapped in the rank processes until they close it
+                release_shared(shm, unlink=True)
+                shm = None
+
             while True:
                 if abort_signal.triggered:
                     self.finalize(fl_ctx)
@@ -296,11 +315,25 @@ class MultiProcessExecutor(Executor):
                     # Only need to receive the Shareable and FLContext update from rank 0 process.
                     return_data = self.conn_clients[0][CommunicationMetaData.EXE_CONN].recv()
                     shareable = return_data[CommunicationMetaData.SHAREABLE]
-                    fl_ctx.props.update(return_data[CommunicationMetaData.FL_CTX].props)
+                    fl_ctx.update_props(return_data[CommunicationMetaData.FL_CTX])
                     return shareable
         except BaseException as e:
             self.log_error(fl_ctx, "Multi-Process Execution error.")
             return make_reply(ReturnCode.EXECUTION_RESULT_ERROR)
+        finally:
+            release_shared(shm, unlink=True)
+
+    def _wait_for_attach(self, abort_signal: Signal) -> bool:
+        """Wait until all the rank processes mapped the shared task data."""
+        attached = [False] * len(self.conn_clients)
+        while not all(attached):
+            if abort_signal.triggered:
+                return False
+            for i, conn_client in enumerate(self.conn_clients):
+                if not attached[i] and conn_client[CommunicationMetaData.EXE_CONN].poll(0.1):
+                    conn_client[CommunicationMetaData.EXE_CONN].recv()
+                    attached[i] = True
+        return True
 
     def finalize(self, fl_ctx: FLContext):
         """This is called when exiting/aborting the executor."""
@@ -12,8 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .dequantizer import Dequantizer
 from .exclude_vars import ExcludeVars
+from .global_model_delta_decoder import GlobalModelDeltaDecoder
+from .global_model_delta_encoder import GlobalModelDeltaEncoder
 from .percentile_privacy import PercentilePrivacy
+from .quantizer import Quantizer
 from .svt_privacy import SVTPrivacy
+from .top_k_sparsifier import TopKSparsifier
 
-__all__ = ["PercentilePrivacy", "SVTPrivacy", "ExcludeVars"]
+__all__ = [
+    "PercentilePrivacy",
+    "SVTPrivacy",
+    "ExcludeVars",
+    "Quantizer",
+    "Dequantizer",
+    "TopKSparsifier",
+    "GlobalModelDeltaEncoder",
+    "GlobalModelDeltaDecoder",
+]
@@ -0,0 +1,71 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvflare.apis.dxo import MetaKey, from_shareable
+from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+
+from .quantization import dequantize, get_quantization_type
+
+
+class Dequantizer(Filter):
+    def __init__(self):
+        """Restore the float arrays quantized by the Quantizer filter.
+
+        Data that is not quantized is passed through, so this filter can be configured for all tasks.
+        """
+        Filter.__init__(self)
+
+    def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
+        """Called by runners to dequantize the weights.
+
+        When the return code of shareable is not ReturnCode.OK, this
+        function will not perform any process and returns the shareable back.
+
+        Args:
+            shareable (Shareable): shareable must conform to DXO format.
+            fl_ctx (FLContext): only used for logging.
+
+        Returns:
+            Shareable: a shareable with the restored weights
+        """
+        rc = shareable.get_return_code()
+        if rc != ReturnCode.OK:
+            # don't process if RC not OK
+            return shareable
+
+        try:
+            dxo = from_shareable(shareable)
+        except ValueError:
+            self.log_error(fl_ctx, "invalid shareable: no DXO")
+            return shareable
+
+        quantization_type = get_quantization_type(dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM, None))
+        if quantization_type is None:
+            return shareable
+
+        quantized_keys = dxo.get_meta_prop(MetaKey.PROCESSED_KEYS, None)
+        if not isinstance(quantized_keys, dict):
+            self.log_error(fl_ctx, "quantized data does not contain PROCESSED_KEYS")
+            return shareable
+
+        for k, meta in quantized_keys.items():
+            if k in dxo.data:
+                dxo.data[k] = dequantize(dxo.data[k], quantization_type, meta)
+
+        self.log_debug(fl_ctx, f"dequantized {len(quantized_keys)} variables from {quantization_type}")
+        dxo.remove_meta_props([MetaKey.PROCESSED_ALGORITHM, MetaKey.PROCESSED_KEYS])
+        return dxo.update_shareable(shareable)
@@ -0,0 +1,148 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encoding of a global model against an older version of it held by a client.
+
+Only what changed is sent. For each variable of the new model, the record in PROCESSED_KEYS is:
+
+- UNCHANGED: the variable is equal to the one of the base model, and is not in the data.
+- FULL: the data has the whole value.
+- an index array: the data has the values at these flat indices, the rest is equal to the base.
+- a dict (quantized encoding only): the data has the quantized difference to the base, and the
+  record has the quantization type and meta needed to restore it.
+
+The exact encoding sends the new values instead of their difference to the base, so the client
+restores the model exactly. It only saves bytes when few values change (frozen layers, sparse
+aggregates): after a dense FedAvg round nearly every float changes and most variables are FULL.
+
+The quantized encoding sends the difference of the float variables to the base, quantized. The
+restored model differs from the new model by the quantization error of that difference only,
+provided the base is the model the client restored (not the exact global model), so the errors
+of earlier rounds do not add up.
+"""
+
+import numpy as np
+
+from .quantization import DEFAULT_BLOCK_SIZE, dequantize, is_quantizable, quantize
+
+GLOBAL_MODEL_DELTA = "global_model_delta"
+META_KEY_BASE_VERSION = "global_model_base_version"
+
+UNCHANGED = "unchanged"
+FULL = "full"
+
+
+def _is_comparable(b, v) -> bool:
+    return isinstance(v, np.ndarray) and isinstance(b, np.ndarray) and b.shape == v.shape and b.dtype == v.dtype
+
+
+def _encode_exact(b, v):
+    if _is_comparable(b, v):
+        changed = np.flatnonzero(b != v)
+        if changed.size == 0:
+            return None, UNCHANGED
+
+        index_dtype = np.int32 if v.size <= np.iinfo(np.int32).max else np.int64
+        if changed.size * (v.itemsize + np.dtype(index_dtype).itemsize) < v.nbytes:
+            return v.reshape(-1)[changed], changed.astype(index_dtype)
+    return v, FULL
+
+
+def encode_delta(base: dict, weights: dict) -> (dict, dict):
+    """Encodes the weights against the base weights.
+
+    Args:
+        base: variable name => value of the base model
+        weights: variable name => value of the new model
+
+    Returns: tuple of (data, records)
+
+    """
+    data = {}
+    records = {}
+    for k, v in weights.items():
+        value, records[k] = _encode_exact(base.get(k), v)
+        if value is not None:
+            data[k] = value
+    return data, records
+
+
+def encode_quantized_delta(
+    base: dict, weights: dict, quantization_type: str, block_size: int = DEFAULT_BLOCK_SIZE
+) -> (dict, dict, dict):
+    """Encodes the weights as the quantized difference to the base weights.
+
+    Variables that cannot be quantized are encoded exactly, like in encode_delta.
+
+    Args:
+        base: variable name => value of the base model
+        weights: variable name => value of the new model
+        quantization_type: one of the quantization types of the Quantizer
+        block_size: number of values per scale of blockwise8
+
+    Returns: tuple of (data, records, restored weights). The restored weights are what decode_delta returns
+        for this encoding.
+
+    """
+    data = {}
+    records = {}
+    restored = {}
+    for k, v in weights.items():
+        b = base.get(k)
+        if _is_comparable(b, v) and is_quantizable(v):
+            diff = v - b
+            if not diff.any():
+                records[k] = UNCHANGED
+                restored[k] = b.copy()
+                continue
+            data[k], meta = quantize(diff, quantization_type, block_size)
+            records[k] = dict(meta, type=quantization_type)
+            restored[k] = _add_quantized(b, data[k], records[k])
+            continue
+
+        value, records[k] = _encode_exact(b, v)
+        if value is not None:
+            data[k] = value
+        restored[k] = v.copy() if isinstance(v, np.ndarray) else v
+    return data, records, restored
+
+
+def _add_quantized(base_value: np.ndarray, value: np.ndarray, record: dict) -> np.ndarray:
+    return base_value + dequantize(value, record["type"], record)
+
+
+def decode_delta(base: dict, data: dict, records: dict) -> dict:
+    """Restores the weights encoded by encode_delta.
+
+    Args:
+        base: variable name => value of the base model. It is not changed.
+        data: the data of the encoded model
+        records: the records of the encoded model
+
+    Returns: variable name => value of the new model
+
+    """
+    weights = {}
+    for k, record in records.items():
+        if isinstance(record, str) and record == FULL:
+            weights[k] = data[k]
+        elif isinstance(record, str) and record == UNCHANGED:
+            weights[k] = base[k].copy()
+        elif isinstance(record, dict):
+            weights[k] = _add_quantized(base[k], data[k], record)
+        else:
+            value = base[k].copy()
+            value.reshape(-1)[record] = data[k]
+            weights[k] = value
+    return weights
@@ -0,0 +1,99 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+import numpy as np
+
+from nvflare.apis.dxo import DataKind, MetaKey, from_shareable
+from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+from nvflare.app_common.app_constant import AppConstants
+
+from .global_model_delta import GLOBAL_MODEL_DELTA, META_KEY_BASE_VERSION, decode_delta
+
+
+class GlobalModelDeltaDecoder(Filter):
+    def __init__(self):
+        """Restore the global model sent by the GlobalModelDeltaEncoder on the server.
+
+        This is a task data filter on the client. It keeps a copy of the last global model received, and
+        reports its version to the server in the client context (AppConstants.GLOBAL_MODEL_VERSION), so that
+        the server can send only what changed since that version.
+        """
+        Filter.__init__(self)
+        self.held_version = None
+        self.held_weights = None
+
+    def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
+        """Called by runners to restore the global model.
+
+        When the return code of shareable is not ReturnCode.OK, this
+        function will not perform any process and returns the shareable back.
+
+        Args:
+            shareable (Shareable): shareable must conform to DXO format.
+            fl_ctx (FLContext): the version of the restored model is set in it as public sticky prop.
+
+        Returns:
+            Shareable: a shareable with the full global model
+
+        Raises:
+            ValueError: when the model is encoded against a version that is not held
+        """
+        rc = shareable.get_return_code()
+        if rc != ReturnCode.OK:
+            # don't process if RC not OK
+            return shareable
+
+        version = shareable.get_header(AppConstants.GLOBAL_MODEL_VERSION, None)
+        if version is None:
+            return shareable
+
+        try:
+            dxo = from_shareable(shareable)
+        except ValueError:
+            return shareable
+
+        if dxo.data_kind != DataKind.WEIGHTS:
+            return shareable
+
+        processed_algo = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM, None)
+        if processed_algo == GLOBAL_MODEL_DELTA:
+            base_version = dxo.get_meta_prop(META_KEY_BASE_VERSION)
+            if base_version != self.held_version or self.held_weights is None:
+                # the server sends the full model once it knows the client does not hold the base
+                self._set_held(None, None, fl_ctx)
+                raise ValueError(f"global model encoded against version {base_version} but {self.held_version} is held")
+
+            dxo.data = decode_delta(self.held_weights, dxo.data, dxo.get_meta_prop(MetaKey.PROCESSED_KEYS))
+            dxo.remove_meta_props([MetaKey.PROCESSED_ALGORITHM, MetaKey.PROCESSED_KEYS, META_KEY_BASE_VERSION])
+            shareable = dxo.update_shareable(shareable)
+        elif processed_algo:
+            return shareable
+
+        # the learner could change the weights in place, so a copy is held
+        self._set_held(
+            version,
+            {k: v.copy() if isinstance(v, np.ndarray) else copy.deepcopy(v) for k, v in dxo.data.items()},
+            fl_ctx,
+        )
+        return shareable
+
+    def _set_held(self, version, weights, fl_ctx: FLContext):
+        self.held_version = version
+        self.held_weights = weights
+        fl_ctx.set_prop(AppConstants.GLOBAL_MODEL_VERSION, version, private=False, sticky=True)
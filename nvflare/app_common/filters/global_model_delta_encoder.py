@@ -0,0 +1,182 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.app_common.app_constant import AppConstants
+
+from .global_model_delta import (
+    FULL,
+    GLOBAL_MODEL_DELTA,
+    META_KEY_BASE_VERSION,
+    encode_delta,
+    encode_quantized_delta,
+)
+from .quantization import DEFAULT_BLOCK_SIZE, QUANTIZATION_TYPES
+
+
+class GlobalModelDeltaEncoder(Filter):
+    def __init__(self, num_versions: int = 3, quantization_type: str = None, block_size: int = DEFAULT_BLOCK_SIZE):
+        """Send clients only the part of the global model that changed since the version they hold.
+
+        This is a task data filter on the server. Every new WEIGHTS task data is a new version of the
+        global model. Clients with the GlobalModelDeltaDecoder task data filter report the version they hold in
+        their context (AppConstants.GLOBAL_MODEL_VERSION). A client that holds a kept version gets the model
+        encoded against it, other clients get the full model. The encoded model is made once per held version, so
+        it is still serialized once for all the clients that hold the same version.
+
+        Without quantization_type, the changed values are sent exactly. This only pays off when few values
+        change between rounds (frozen layers, sparse aggregates from TopKSparsifier): after a dense FedAvg round
+        every float variable is sent whole. When an encoding saved nothing, the older versions are dropped and
+        the clients get the full model, so the encoder keeps at most two model copies instead of num_versions.
+
+        With quantization_type, the difference of the float variables to the held version is sent quantized
+        (see the Quantizer), and the client restores the model up to the quantization error of that difference.
+        The server keeps the model each client restored as the version the client holds, so the errors do not
+        add up over the rounds.
+
+        Args:
+            num_versions (int): number of held versions to keep
+            quantization_type (str): quantization of the difference to the held version: float16, bfloat16 or
+                blockwise8. None to send the changed values exactly.
+            block_size (int): number of values per scale of blockwise8
+
+        Raises:
+            ValueError: when num_versions is not positive or quantization_type is invalid
+        """
+        Filter.__init__(self)
+        if not isinstance(num_versions, int) or num_versions <= 0:
+            raise ValueError("invalid num_versions {}: must be a positive int".format(num_versions))
+        if quantization_type is not None and quantization_type not in QUANTIZATION_TYPES:
+            raise ValueError(
+                "invalid quantization_type {}: must be None or in {}".format(quantization_type, QUANTIZATION_TYPES)
+            )
+        self.num_versions = num_versions
+        self.quantization_type = quantization_type
+        self.block_size = block_size
+        self._versions = OrderedDict()  # version => copy of the weights held by the clients of this version
+        self._next_version = 0
+        self._source = None  # weak reference to the task data of the current version
+        self._source_data_id = None
+        self._current_version = None
+        self._encoded = {}  # held version => (encoded task data of the current version, version it restores)
+        self._last_encoding_saved = True
+        self._lock = threading.Lock()
+
+    def _add_version(self, weights: dict) -> int:
+        version = self._next_version
+        self._next_version += 1
+        self._versions[version] = weights
+        while len(self._versions) > self.num_versions:
+            self._versions.popitem(last=False)
+        return version
+
+    def _update_version(self, shareable: Shareable, dxo: DXO):
+        if self._source is not None and self._source() is shareable and self._source_data_id == id(dxo.data):
+            return
+
+        if not self._last_encoding_saved:
+            # the older versions would not save anything either. The next version is kept to try again.
+            self._versions.clear()
+            self._last_encoding_saved = True
+
+        # the weights can be changed in place once the round is done, so a copy is kept
+        weights = {k: v.copy() if isinstance(v, np.ndarray) else copy.deepcopy(v) for k, v in dxo.data.items()}
+        self._current_version = self._add_version(weights)
+        self._source = weakref.ref(shareable)
+        self._source_data_id = id(dxo.data)
+        self._encoded = {}
+
+    def _encode(self, held_version, dxo: DXO):
+        base = self._versions[held_version]
+        if self.quantization_type:
+            data, records, restored = encode_quantized_delta(base, dxo.data, self.quantization_type, self.block_size)
+            # the clients of this encoding hold the restored model, which is not the current version
+            version = self._add_version(restored)
+        else:
+            data, records = encode_delta(base, dxo.data)
+            version = self._current_version
+            self._last_encoding_saved = not all(isinstance(r, str) and r == FULL for r in records.values())
+
+        meta = dict(dxo.get_meta_props())
+        meta[MetaKey.PROCESSED_ALGORITHM] = GLOBAL_MODEL_DELTA
+        meta[MetaKey.PROCESSED_KEYS] = records
+        meta[META_KEY_BASE_VERSION] = held_version
+        return DXO(data_kind=DataKind.WEIGHTS, data=data, meta=meta).to_shareable(), version
+
+    def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
+        """Called by runners to encode the global model against the version held by the client.
+
+        When the return code of shareable is not ReturnCode.OK, this
+        function will not perform any process and returns the shareable back.
+
+        Args:
+            shareable (Shareable): shareable must conform to DXO format.
+            fl_ctx (FLContext): this context must include the peer context of the client.
+
+        Returns:
+            Shareable: the full or the encoded global model
+        """
+        rc = shareable.get_return_code()
+        if rc != ReturnCode.OK:
+            # don't process if RC not OK
+            return shareable
+
+        try:
+            dxo = from_shareable(shareable)
+        except ValueError:
+            return shareable
+
+        if dxo.data_kind != DataKind.WEIGHTS or not dxo.data:
+            return shareable
+
+        processed_algo = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM, None)
+        if processed_algo:
+            self.log_info(fl_ctx, "cannot encode data already processed by {}".format(processed_algo))
+            return shareable
+
+        peer_ctx = fl_ctx.get_peer_context()
+        held_version = peer_ctx.get_prop(AppConstants.GLOBAL_MODEL_VERSION) if peer_ctx else None
+
+        with self._lock:
+            self._update_version(shareable, dxo)
+            if held_version == self._current_version or held_version not in self._versions:
+                shareable.set_header(AppConstants.GLOBAL_MODEL_VERSION, self._current_version)
+                return shareable
+
+            encoded = self._encoded.get(held_version)
+            if encoded is None:
+                encoded = self._encode(held_version, dxo)
+                self._encoded[held_version] = encoded
+                self.log_debug(
+                    fl_ctx,
+                    f"encoded global model version {self._current_version} against version {held_version}"
+                    f" as version {encoded[1]}",
+                )
+            encoded, version = encoded
+
+        # like the task data, the encoded task data is shared by the clients and only its headers are per client
+        encoded[ReservedHeaderKey.HEADERS] = copy.deepcopy(shareable.get(ReservedHeaderKey.HEADERS, {}))
+        encoded.set_header(AppConstants.GLOBAL_MODEL_VERSION, version)
+        return encoded
@@ -0,0 +1,104 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Quantization of float arrays for the Quantizer and Dequantizer filters.
+
+- float16: the values cast to float16.
+- bfloat16: the upper 16 bits of the float32 values (rounded to nearest even), kept as uint16
+  since numpy has no bfloat16 type. Same range as float32 with 8 bits of mantissa.
+- blockwise8: the flattened values split in blocks of block_size. Each block is scaled by its max
+  absolute value to int8. The scales (one float32 per block) are kept with the meta of the layer.
+"""
+
+import numpy as np
+
+QUANTIZATION_FLOAT16 = "float16"
+QUANTIZATION_BFLOAT16 = "bfloat16"
+QUANTIZATION_BLOCKWISE8 = "blockwise8"
+QUANTIZATION_TYPES = (QUANTIZATION_FLOAT16, QUANTIZATION_BFLOAT16, QUANTIZATION_BLOCKWISE8)
+
+# value of MetaKey.PROCESSED_ALGORITHM is the prefix + quantization type
+QUANTIZATION_ALGORITHM_PREFIX = "quantize_"
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def get_quantization_algorithm(quantization_type: str) -> str:
+    return QUANTIZATION_ALGORITHM_PREFIX + quantization_type
+
+
+def get_quantization_type(processed_algorithm) -> str:
+    """Gets the quantization type from the processed algorithm of a DXO, or None if it is not quantized."""
+    if not isinstance(processed_algorithm, str) or not processed_algorithm.startswith(QUANTIZATION_ALGORITHM_PREFIX):
+        return None
+    quantization_type = processed_algorithm[len(QUANTIZATION_ALGORITHM_PREFIX) :]
+    return quantization_type if quantization_type in QUANTIZATION_TYPES else None
+
+
+def is_quantizable(value) -> bool:
+    return isinstance(value, np.ndarray) and value.dtype in (np.float32, np.float64) and value.size > 0
+
+
+def quantize(value: np.ndarray, quantization_type: str, block_size: int = DEFAULT_BLOCK_SIZE):
+    """Quantizes a float array.
+
+    Args:
+        value: float32 or float64 array
+        quantization_type: one of QUANTIZATION_TYPES
+        block_size: number of values per scale of blockwise8
+
+    Returns: tuple of (quantized array, layer meta). The meta is needed by dequantize.
+
+    """
+    meta = {"dtype": value.dtype.str, "shape": value.shape}
+    if quantization_type == QUANTIZATION_FLOAT16:
+        return value.astype(np.float16), meta
+
+    if quantization_type == QUANTIZATION_BFLOAT16:
+        bits = np.ascontiguousarray(value, dtype=np.float32).view(np.uint32)
+        # round to nearest even on the dropped 16 bits
+        rounding = ((bits >> 16) & 1) + 0x7FFF
+        return ((bits + rounding) >> 16).astype(np.uint16), meta
+
+    if quantization_type == QUANTIZATION_BLOCKWISE8:
+        flat = value.reshape(-1).astype(np.float32)
+        num_blocks = -(-flat.size // block_size)
+        padded = np.zeros(num_blocks * block_size, dtype=np.float32)
+        padded[: flat.size] = flat
+        blocks = padded.reshape(num_blocks, block_size)
+        scales = np.abs(blocks).max(axis=1) / 127.0
+        scales[scales == 0.0] = 1.0
+        quantized = np.rint(blocks / scales[:, None]).astype(np.int8).reshape(-1)[: flat.size]
+        meta["scales"] = scales.astype(np.float32)
+        meta["block_size"] = block_size
+        return quantized, meta
+
+    raise ValueError("invalid quantization type {}: must be in {}".format(quantization_type, QUANTIZATION_TYPES))
+
+
+def dequantize(value: np.ndarray, quantization_type: str, meta: dict) -> np.ndarray:
+    """Restores the float array from the result of quantize."""
+    dtype = np.dtype(meta["dtype"])
+    if quantization_type == QUANTIZATION_FLOAT16:
+        return value.astype(dtype)
+
+    if quantization_type == QUANTIZATION_BFLOAT16:
+        return (value.astype(np.uint32) << 16).view(np.float32).astype(dtype, copy=False).reshape(meta["shape"])
+
+    if quantization_type == QUANTIZATION_BLOCKWISE8:
+        block_size = meta["block_size"]
+        scales = np.repeat(meta["scales"], block_size)[: value.size]
+        return (value.astype(np.float32) * scales).astype(dtype, copy=False).reshape(meta["shape"])
+
+    raise ValueError("invalid quantization type {}: must be in {}".format(quantization_type, QUANTIZATION_TYPES))
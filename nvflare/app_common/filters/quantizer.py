@@ -0,0 +1,110 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvflare.apis.dxo import DataKind, MetaKey, from_shareable
+from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+
+from .quantization import (
+    DEFAULT_BLOCK_SIZE,
+    QUANTIZATION_TYPES,
+    get_quantization_algorithm,
+    is_quantizable,
+    quantize,
+)
+
+
+class Quantizer(Filter):
+    def __init__(self, quantization_type: str = "float16", block_size: int = DEFAULT_BLOCK_SIZE):
+        """Quantize the float arrays of WEIGHTS or WEIGHT_DIFF to reduce the size of the data to send.
+
+        The quantized data must be restored by the Dequantizer filter on the receiving side, e.g. as task result
+        filter on the server when this filter is a task result filter on the clients.
+
+        Args:
+            quantization_type (str): float16, bfloat16 or blockwise8
+            block_size (int): number of values that share one scale with blockwise8
+
+        Raises:
+            ValueError: when the quantization type is not supported
+        """
+        Filter.__init__(self)
+        if quantization_type not in QUANTIZATION_TYPES:
+            raise ValueError(
+                "invalid quantization type {}: must be in {}".format(quantization_type, QUANTIZATION_TYPES)
+            )
+        if not isinstance(block_size, int) or block_size <= 0:
+            raise ValueError("invalid block size {}: must be a positive int".format(block_size))
+        self.quantization_type = quantization_type
+        self.block_size = block_size
+
+    def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
+        """Called by runners to quantize the weights.
+
+        When the return code of shareable is not ReturnCode.OK, this
+        function will not perform any process and returns the shareable back.
+
+        Args:
+            shareable (Shareable): shareable must conform to DXO format.
+            fl_ctx (FLContext): only used for logging.
+
+        Returns:
+            Shareable: a shareable with quantized weights
+        """
+        rc = shareable.get_return_code()
+        if rc != ReturnCode.OK:
+            # don't process if RC not OK
+            return shareable
+
+        try:
+            dxo = from_shareable(shareable)
+        except ValueError:
+            self.log_error(fl_ctx, "invalid shareable: no DXO")
+            return shareable
+
+        if dxo.data_kind not in (DataKind.WEIGHTS, DataKind.WEIGHT_DIFF):
+            self.log_debug(fl_ctx, "ignored: expect WEIGHTS or WEIGHT_DIFF but got {}".format(dxo.data_kind))
+            return shareable
+
+        processed_algo = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM, None)
+        if processed_algo:
+            self.log_info(fl_ctx, "cannot quantize data already processed by {}".format(processed_algo))
+            return shareable
+
+        if not dxo.data:
+            self.log_debug(fl_ctx, "no data to quantize")
+            return shareable
+
+        n_bytes_before = n_bytes_after = 0
+        quantized_keys = {}
+        for k, v in dxo.data.items():
+            if not is_quantizable(v):
+                continue
+            n_bytes_before += v.nbytes
+            dxo.data[k], quantized_keys[k] = quantize(v, self.quantization_type, self.block_size)
+            n_bytes_after += dxo.data[k].nbytes
+
+        if not quantized_keys:
+            return shareable
+
+        self.log_debug(
+            fl_ctx,
+            f"quantized {len(quantized_keys)} of {len(dxo.data)} variables to {self.quantization_type}: "
+            f"{n_bytes_before} => {n_bytes_after} bytes",
+        )
+        dxo.set_meta_prop(MetaKey.PROCESSED_ALGORITHM, get_quantization_algorithm(self.quantization_type))
+        dxo.set_meta_prop(MetaKey.PROCESSED_KEYS, quantized_keys)
+        return dxo.update_shareable(shareable)
@@ -0,0 +1,146 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+from nvflare.apis.dxo import DataKind, MetaKey, from_shareable
+from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+
+SPARSIFICATION_TOP_K = "top_k_sparsification"
+
+
+def densify(values: np.ndarray, record: dict) -> np.ndarray:
+    """Restores the dense array of a variable sparsified by TopKSparsifier.
+
+    Args:
+        values: the kept values of the variable
+        record: PROCESSED_KEYS entry of the variable, with its shape and the flat indices of the values
+
+    Returns: the dense array, with zeros at the dropped entries
+    """
+    dense = np.zeros(int(np.prod(record["shape"])), dtype=values.dtype)
+    dense[record["indices"]] = values
+    return dense.reshape(record["shape"])
+
+
+class TopKSparsifier(Filter):
+    def __init__(self, density: float = 0.01, min_size: int = 1000, error_feedback: bool = True):
+        """Send only the largest entries of each variable of WEIGHT_DIFF.
+
+        For each float variable of at least min_size entries, only the density fraction of the entries
+        with the largest magnitude is sent, as the values in the DXO data and their flat indices in
+        MetaKey.PROCESSED_KEYS. Smaller variables are sent dense.
+
+        With error feedback, the dropped part of the diff is kept and added to the diff of the next round,
+        so that every update is eventually sent.
+
+        The sparse data must be aggregated by SparseInTimeAccumulateWeightedAggregator.
+
+        Args:
+            density (float): fraction of the entries to send, in (0, 1]
+            min_size (int): variables with fewer entries are sent dense
+            error_feedback (bool): whether to carry the dropped entries over to the next round
+
+        Raises:
+            ValueError: when density is not in (0, 1]
+        """
+        Filter.__init__(self)
+        if not 0.0 < density <= 1.0:
+            raise ValueError("invalid density {}: must be in (0, 1]".format(density))
+        self.density = density
+        self.min_size = min_size
+        self.error_feedback = error_feedback
+        self.residuals = {}  # variable name => flat array of the dropped diff
+
+    def _sparsify(self, name: str, value: np.ndarray):
+        flat = value.reshape(-1)
+        if self.error_feedback:
+            residual = self.residuals.get(name)
+            if residual is not None and residual.shape == flat.shape and residual.dtype == flat.dtype:
+                flat = flat + residual
+            else:
+                flat = flat.copy()
+
+        k = max(int(flat.size * self.density), 1)
+        indices = np.argpartition(np.abs(flat), flat.size - k)[flat.size - k :]
+        # sorted indices make the scatter of the aggregator sequential in memory
+        indices.sort()
+        values = flat[indices]
+
+        if self.error_feedback:
+            # what is not sent now is sent with a later round
+            flat[indices] = 0
+            self.residuals[name] = flat
+
+        index_dtype = np.int32 if flat.size <= np.iinfo(np.int32).max else np.int64
+        return values, {"shape": value.shape, "indices": indices.astype(index_dtype)}
+
+    def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
+        """Called by runners to sparsify the weight diff.
+
+        When the return code of shareable is not ReturnCode.OK, this
+        function will not perform any process and returns the shareable back.
+
+        Args:
+            shareable (Shareable): shareable must conform to DXO format.
+            fl_ctx (FLContext): only used for logging.
+
+        Returns:
+            Shareable: a shareable with the sparse weight diff
+        """
+        rc = shareable.get_return_code()
+        if rc != ReturnCode.OK:
+            # don't process if RC not OK
+            return shareable
+
+        try:
+            dxo = from_shareable(shareable)
+        except ValueError:
+            self.log_error(fl_ctx, "invalid shareable: no DXO")
+            return shareable
+
+        if dxo.data_kind != DataKind.WEIGHT_DIFF:
+            self.log_debug(fl_ctx, "ignored: expect WEIGHT_DIFF but got {}".format(dxo.data_kind))
+            return shareable
+
+        processed_algo = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM, None)
+        if processed_algo:
+            self.log_info(fl_ctx, "cannot sparsify data already processed by {}".format(processed_algo))
+            return shareable
+
+        if not dxo.data:
+            self.log_debug(fl_ctx, "no data to sparsify")
+            return shareable
+
+        n_sent = n_total = 0
+        sparse_keys = {}
+        for k, v in dxo.data.items():
+            if not isinstance(v, np.ndarray) or not np.issubdtype(v.dtype, np.floating) or v.size < self.min_size:
+                continue
+            dxo.data[k], sparse_keys[k] = self._sparsify(k, v)
+            n_total += v.size
+            n_sent += dxo.data[k].size
+
+        if not sparse_keys:
+            return shareable
+
+        self.log_debug(
+            fl_ctx, f"sparsified {len(sparse_keys)} of {len(dxo.data)} variables: sent {n_sent} of {n_total}"
+        )
+        dxo.set_meta_prop(MetaKey.PROCESSED_ALGORITHM, SPARSIFICATION_TOP_K)
+        dxo.set_meta_prop(MetaKey.PROCESSED_KEYS, sparse_keys)
+        return dxo.update_shareable(shareable)
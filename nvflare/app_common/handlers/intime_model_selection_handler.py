@@ -43,6 +43,9 @@ class IntimeModelSelectionHandler(FLComponent):
         self.logger.debug(f"model selection weights control: {aggregation_weights}")
         self._reset_stats()
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.BEFORE_PROCESS_SUBMISSION, AppEventType.BEFORE_AGGREGATION]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         """
             perform the handler process based on the event_type.
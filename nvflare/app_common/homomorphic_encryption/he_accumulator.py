@@ -0,0 +1,130 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import numpy as np
+import tenseal as ts
+
+from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import parallel_map
+
+
+class HEAccumulator(object):
+    def __init__(self, num_workers=None):
+        """Running weighted sums of (partly) CKKS encrypted model updates.
+
+        Each serialized ciphertext is deserialized, multiplied by the weight of its contribution and added in place
+        to the running sum as soon as the contribution arrives, so the server holds one sum per variable instead of
+        the contributions. The sums are divided by the counts once, when the result is taken.
+
+        Scaling a CKKS vector uses up a level of the modulus chain. Contributions of weight 1.0 are not multiplied,
+        so unweighted sums only use the level of the division; weighted ones need a context with one more level, as
+        before the sums were kept.
+
+        Peak memory is one sum per variable plus the vectors being deserialized by the workers.
+
+        Args:
+            num_workers: max number of threads reducing vectors in parallel; None for the default, 1 to disable.
+        """
+        self.tenseal_context = None
+        self.num_workers = num_workers
+        self.sums = {}  # var name => running sum
+        self.counts = {}
+        self.num_contributions = 0
+        self.stats = {
+            "contributions": 0,
+            "ciphertexts": 0,
+            "encrypted_bytes": 0,
+            "reduce_time": 0.0,
+            "scale_time": 0.0,
+        }
+
+    def set_context(self, tenseal_context):
+        """Sets the evaluation context. It is kept across rounds, only the sums are reset."""
+        self.tenseal_context = tenseal_context
+
+    def reset(self):
+        self.sums = {}
+        self.counts = {}
+        self.num_contributions = 0
+
+    def add(self, data: dict, encrypted_layers: dict, weight: float, count: float):
+        """Adds a contribution to the running sums.
+
+        Args:
+            data: var name => serialized CKKS vector (encrypted vars) or array
+            encrypted_layers: var name => whether the var is encrypted
+            weight: the weight factor of the contribution
+            count: what the contribution adds to the divisor of the average of each var
+
+        Returns:
+            number of encrypted bytes reduced
+
+        """
+        sums = self.sums
+        context = self.tenseal_context
+
+        def _reduce(name):
+            value = data[name]
+            if encrypted_layers[name]:
+                num_bytes = len(value)
+                value = ts.ckks_vector_from(context, value)
+            else:
+                num_bytes = 0
+                value = np.asarray(value)
+            if weight != 1.0:
+                value = value * weight
+            total = sums.get(name)
+            if total is None:
+                # arrays are copied (in their own dtype), the sum must not be a view of the contribution
+                sums[name] = value if num_bytes or weight != 1.0 else np.array(value)
+            else:
+                # in place for both CKKS vectors and arrays; each var is only reduced by one thread
+                total += value
+                sums[name] = total
+            return num_bytes
+
+        start_time = time.time()
+        num_bytes = sum(parallel_map(_reduce, list(data.keys()), num_workers=self.num_workers))
+        for name in data:
+            self.counts[name] = self.counts.get(name, 0) + count
+        self.num_contributions += 1
+
+        self.stats["contributions"] += 1
+        self.stats["ciphertexts"] += sum(1 for name in data if encrypted_layers[name])
+        self.stats["encrypted_bytes"] += num_bytes
+        self.stats["reduce_time"] += time.time() - start_time
+        return num_bytes
+
+    def get_result(self) -> dict:
+        """Gets the weighted averages of the vars: sum * (1 / count).
+
+        Returns:
+            var name => CKKS vector (encrypted vars) or array
+
+        """
+        start_time = time.time()
+        names = list(self.counts.keys())
+
+        def _scale(name):
+            return self.sums[name] * (1.0 / self.counts[name])
+
+        results = parallel_map(_scale, names, num_workers=self.num_workers)
+        self.stats["scale_time"] += time.time() - start_time
+        return dict(zip(names, results))
+
+    def get_info(self) -> dict:
+        info = dict(self.stats)
+        info["pending_contributions"] = self.num_contributions
+        return info
@@ -13,3 +13,7 @@
 # limitations under the License.
 
 HE_ALGORITHM_CKKS = "CKKS"
+
+# meta prop with the offset index of the layers packed into CKKS slot batches
+HE_PACKING = "he_packing"
+HE_PACK_PREFIX = "__he_pack_"
@@ -15,9 +15,6 @@
 import re
 import time
 
-import numpy as np
-import tenseal as ts
-
 import nvflare.app_common.homomorphic_encryption.he_constant as he
 from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
 from nvflare.apis.event_type import EventType
@@ -26,10 +23,12 @@ from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable
 from nvflare.app_common.abstract.aggregator import Aggregator
 from nvflare.app_common.app_constant import AppConstants
+from nvflare.app_common.homomorphic_encryption.he_accumulator import HEAccumulator
 from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import (
     count_encrypted_layers,
     load_tenseal_context_from_workspace,
 )
+from nvflare.widgets.info_collector import GroupInfoCollector, InfoCollector
 
 
 class HEInTimeAccumulateWeightedAggregator(Aggregator):
@@ -41,6 +40,7 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
         weigh_by_local_iter=False,
         expected_data_kind="WEIGHT_DIFF",
         expected_algorithm=he.HE_ALGORITHM_CKKS,
+        num_workers=None,
     ):
         """
             In time aggregator for `Shareables` encrypted using homomorphic encryption (HE) with TenSEAL https://github.com/OpenMined/TenSEAL.
@@ -51,6 +51,11 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
                                  defaults to a weight of 1.0 if not specified. Will be ignored if weigh_by_local_iter: False (default for HE)
             weigh_by_local_iter: If true, multiply client weights on first in encryption space
                                  (default: `False` which is recommended for HE, first multiply happens in `HEModelEncryptor`)
+            num_workers: max number of threads adding encrypted packs (or layers) in parallel; None for the default,
+                         1 to disable. Note that exclude_vars matches pack names, not layer names, for packed layers.
+
+        Contributions are reduced into running sums as they arrive (see `HEAccumulator`); the encrypted bytes and the
+        reduce and scale times are reported in the stats.
         """
         super().__init__()
         self.tenseal_context = None
@@ -63,6 +68,7 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
             raise ValueError(f"expected algorithm {self.expected_algorithm} not supported")
         self.exclude_vars = re.compile(exclude_vars) if exclude_vars else None
         self.aggregation_weights = aggregation_weights or {}
+        self.accumulator = HEAccumulator(num_workers=num_workers)
         self.reset_stats()
         self.weigh_by_local_iter = weigh_by_local_iter
         self.logger.info(f"client weights control: {self.aggregation_weights}")
@@ -73,18 +79,28 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
         self.warning_count = dict()
         self.warning_limit = 0
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN, InfoCollector.EVENT_TYPE_GET_STATS]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.tenseal_context = load_tenseal_context_from_workspace(self.tenseal_context_file, fl_ctx)
+            self.accumulator.set_context(self.tenseal_context)
         elif event_type == EventType.END_RUN:
             self.tenseal_context = None
+            self.accumulator.set_context(None)
+        elif event_type == InfoCollector.EVENT_TYPE_GET_STATS:
+            collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR, None)
+            if collector:
+                assert isinstance(collector, GroupInfoCollector)
+                collector.set_info(group_name=self._name, info=self.accumulator.get_info())
 
     def reset_stats(self):
-        self.total = dict()
-        self.counts = dict()
+        self.accumulator.reset()
         self.contribution_count = 0
         self.history = list()
         self.merged_encrypted_layers = dict()  # thread-safety is handled by workflow
+        self.packing = None
 
     def accept(self, shareable: Shareable, fl_ctx: FLContext) -> bool:
         """
@@ -153,7 +169,7 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
                 else:
                     self.warning_count[client_name] = 0
             n_iter = 1.0
-        float_n_iter = np.float(n_iter)
+        float_n_iter = float(n_iter)
 
         aggregation_weight = self.aggregation_weights.get(client_name)
         if aggregation_weight is None:
@@ -167,36 +183,36 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
             self.log_error(fl_ctx, "encrypted_layers is None!")
             return False
 
-        for k, v in aggr_data.items():
-            if self.exclude_vars is not None and self.exclude_vars.search(k):
-                continue
+        # packs only add up if all clients packed the same layers the same way
+        packing = dxo.get_meta_prop(he.HE_PACKING)
+        if self.contribution_count == 0:
+            self.packing = packing
+        elif packing != self.packing:
+            self.log_error(fl_ctx, f"HE packing of {client_name} differs from the other contributions, skipping it.")
+            return False
+
+        if self.weigh_by_local_iter:
+            weight = aggregation_weight * float_n_iter
+        else:
+            weight = 1.0
+        data = {k: v for k, v in aggr_data.items() if self.exclude_vars is None or not self.exclude_vars.search(k)}
+        num_bytes = self.accumulator.add(data, encrypted_layers, weight=weight, count=n_iter)
+        for k in data:
             if encrypted_layers[k]:
-                if self.weigh_by_local_iter:
-                    weighted_value = ts.ckks_vector_from(self.tenseal_context, v) * (aggregation_weight * float_n_iter)
-                else:
-                    weighted_value = ts.ckks_vector_from(self.tenseal_context, v)
                 self.merged_encrypted_layers[k] = True  # any client can set this true
-            else:
-                if self.weigh_by_local_iter:
-                    weighted_value = v * (aggregation_weight * float_n_iter)
-                else:
-                    weighted_value = v
-                if k not in self.merged_encrypted_layers:
-                    self.merged_encrypted_layers[k] = False  # only set False if no other client set it to True
-            current_total = self.total.get(k, None)
-            if current_total is None:
-                self.total[k] = weighted_value
-                self.counts[k] = n_iter
-            else:
-                self.total[k] = current_total + weighted_value
-                self.counts[k] = self.counts[k] + n_iter
+            elif k not in self.merged_encrypted_layers:
+                self.merged_encrypted_layers[k] = False  # only set False if no other client set it to True
 
         self.contribution_count += 1
 
         end_time = time.time()
         n_encrypted, n_total = count_encrypted_layers(self.merged_encrypted_layers)
         self.log_info(fl_ctx, f"{n_encrypted} of {n_total} layers encrypted")
-        self.log_info(fl_ctx, f"Round {current_round} adding {client_name} time is {end_time - start_time} seconds")
+        self.log_info(
+            fl_ctx,
+            f"Round {current_round} adding {client_name} ({num_bytes} encrypted bytes)"
+            f" time is {end_time - start_time} seconds",
+        )
 
         self.history.append(
             {
@@ -212,9 +228,7 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
         start_time = time.time()
         current_round = fl_ctx.get_prop(AppConstants.CURRENT_ROUND)
 
-        aggregated_dict = dict()
-        for k, v in self.total.items():
-            aggregated_dict[k] = v * (1.0 / self.counts[k])
+        aggregated_dict = self.accumulator.get_result()
         end_time = time.time()
         self.log_info(
             fl_ctx,
@@ -224,6 +238,8 @@ class HEInTimeAccumulateWeightedAggregator(Aggregator):
         dxo = DXO(data_kind=self.expected_data_kind, data=aggregated_dict)
         dxo.set_meta_prop(MetaKey.PROCESSED_KEYS, self.merged_encrypted_layers)
         dxo.set_meta_prop(MetaKey.PROCESSED_ALGORITHM, self.expected_algorithm)
+        if self.packing:
+            dxo.set_meta_prop(he.HE_PACKING, self.packing)
         n_encrypted, n_total = count_encrypted_layers(self.merged_encrypted_layers)
         self.log_info(fl_ctx, f"{n_encrypted} of {n_total} layers encrypted")
 
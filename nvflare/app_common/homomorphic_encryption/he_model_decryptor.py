@@ -25,25 +25,32 @@ from nvflare.apis.filter import Filter
 from nvflare.apis.fl_constant import ReturnCode
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable
+from nvflare.app_common.homomorphic_encryption.he_packing import unpack_layers
 from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import (
     count_encrypted_layers,
     load_tenseal_context_from_workspace,
+    parallel_map,
 )
 
 
 class HEModelDecryptor(Filter):
-    def __init__(self, tenseal_context_file="client_context.tenseal"):
+    def __init__(self, tenseal_context_file="client_context.tenseal", num_workers=None):
         """
             filter to decrypt Shareable object using homomorphic encryption (HE) with TenSEAL https://github.com/OpenMined/TenSEAL.
 
         Args:
             tenseal_context_file: tenseal context files containing decryption keys and parameters
+            num_workers: max number of threads decrypting packs (or layers) in parallel; None for the default, 1 to disable.
 
         """
         super().__init__()
         self.logger.info("Using HE model decryptor.")
         self.tenseal_context = None
         self.tenseal_context_file = tenseal_context_file
+        self.num_workers = num_workers
+
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
 
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
@@ -59,26 +66,28 @@ class HEModelDecryptor(Filter):
             raise ValueError("encrypted_layers is None!")
 
         start_time = time.time()
-        n_decrypted, n_total = 0, 0
+        encrypted_names = []
         for i, param_name in enumerate(params.keys()):
-            values = params[param_name]
-            if encrypted_layers[param_name]:
-                _n = values.size()
-                n_total += _n
-                if isinstance(values, CKKSVector):
-                    self.log_info(fl_ctx, f"Decrypting vars {i+1} of {n_params}: {param_name} with {_n} values")
-                    params[param_name] = values.decrypt()
-                    n_decrypted += _n
-                else:
+            if encrypted_layers.get(param_name, False):
+                if not isinstance(params[param_name], CKKSVector):
                     self.log_info(
                         fl_ctx,
                         f"{i} of {n_params}: {param_name} = {np.shape(params[param_name])} already decrypted (RAW)!",
                     )
                     raise ValueError("Should be encrypted at this point!")
-            else:
-                params[param_name] = values
+                encrypted_names.append(param_name)
+
+        decrypted = parallel_map(lambda name: params[name].decrypt(), encrypted_names, num_workers=self.num_workers)
+        n_decrypted = 0
+        for param_name, values in zip(encrypted_names, decrypted):
+            params[param_name] = values
+            n_decrypted += len(values)
         end_time = time.time()
-        self.log_info(fl_ctx, f"Decryption time for {n_decrypted} of {n_total} params {end_time - start_time} seconds.")
+        self.log_info(
+            fl_ctx,
+            f"Decryption time for {n_decrypted} params in {len(encrypted_names)} CKKS vectors"
+            f" {end_time - start_time} seconds.",
+        )
 
         return params
 
@@ -90,17 +99,24 @@ class HEModelDecryptor(Filter):
         result = {}
         n_total = 0
         self.log_info(fl_ctx, f"params {len(params)} {type(params)}")
+        encrypted_names = []
         for v in params:
             ndarray = params[v]
-            if encrypted_layers[v]:
+            if encrypted_layers.get(v, False):
                 if np.size(ndarray) > 1:
                     raise ValueError(f"size of {v} should not be larger 1 but is {np.size(ndarray)}!")
-                result[v] = ts.ckks_vector_from(self.tenseal_context, ndarray)
-                n = result[v].size()
+                encrypted_names.append(v)
             else:
                 result[v] = ndarray
-                n = np.size(ndarray)
-            n_total += n
+                n_total += np.size(ndarray)
+
+        context = self.tenseal_context
+        vectors = parallel_map(
+            lambda name: ts.ckks_vector_from(context, params[name]), encrypted_names, num_workers=self.num_workers
+        )
+        for v, vector in zip(encrypted_names, vectors):
+            result[v] = vector
+            n_total += vector.size()
         end_time = time.time()
         self.log_info(fl_ctx, f"to_ckks_vector time for {n_total} values: {end_time - start_time} seconds.")
         return result
@@ -150,8 +166,14 @@ class HEModelDecryptor(Filter):
             fl_ctx=fl_ctx,
         )
 
+        packing = dxo.get_meta_prop(key=he.HE_PACKING, default=None)
+        if packing:
+            # replace the packs with the layers they hold
+            packs = {name: decrypted_params.pop(name) for name in packing["packs"]}
+            decrypted_params.update(unpack_layers(packs, packing))
+
         dxo.data = decrypted_params
-        dxo.remove_meta_props([MetaKey.PROCESSED_ALGORITHM, MetaKey.PROCESSED_KEYS])
+        dxo.remove_meta_props([MetaKey.PROCESSED_ALGORITHM, MetaKey.PROCESSED_KEYS, he.HE_PACKING])
         dxo.update_shareable(shareable)
 
         return shareable
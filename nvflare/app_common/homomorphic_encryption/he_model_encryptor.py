@@ -26,9 +26,11 @@ from nvflare.apis.filter import Filter
 from nvflare.apis.fl_constant import ReservedKey, ReturnCode
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable
+from nvflare.app_common.homomorphic_encryption.he_packing import pack_layers
 from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import (
     count_encrypted_layers,
     load_tenseal_context_from_workspace,
+    parallel_map,
 )
 
 
@@ -39,6 +41,8 @@ class HEModelEncryptor(Filter):
         encrypt_layers=None,
         aggregation_weights=None,
         weigh_by_local_iter=True,
+        pack_size=0,
+        num_workers=None,
     ):
         """
             filter to encrypt Shareable object using homomorphic encryption (HE) with TenSEAL https://github.com/OpenMined/TenSEAL.
@@ -51,6 +55,12 @@ class HEModelEncryptor(Filter):
             aggregation_weights: dictionary of client aggregation `{"client1": 1.0, "client2": 2.0, "client3": 3.0}`;
                                  defaults to a weight of 1.0 if not specified.
             weigh_by_local_iter: If true, multiply client weights on first before encryption (default: `True` which is recommended for HE)
+            pack_size: number of values per CKKS vector. The encrypted layers are concatenated and split into packs of
+                       this size, so small layers don't each take a ciphertext. Use the number of slots of the context
+                       (poly_modulus_degree / 2, i.e. 4096 for the default 8192). Packing changes the layer names of
+                       the encrypted model and requires HEModelDecryptor and HEModelShareableGenerator of the same
+                       version. Defaults to 0, which encrypts each layer on its own.
+            num_workers: max number of threads encrypting packs (or layers) in parallel; None for the default, 1 to disable.
 
         """
         super().__init__()
@@ -63,6 +73,10 @@ class HEModelEncryptor(Filter):
         self.n_iter = None
         self.client_name = None
         self.aggregation_weight = None
+        if pack_size is None or pack_size < 0:
+            raise ValueError(f"pack_size must be >= 0 but got {pack_size}")
+        self.pack_size = pack_size
+        self.num_workers = num_workers
 
         # choose which layers to encrypt
         if encrypt_layers is not None:
@@ -81,6 +95,9 @@ class HEModelEncryptor(Filter):
             self.encrypt_layers = [True]  # needs to be list for logic in encryption()
             self.logger.info("Encrypting all layers")
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.tenseal_context = load_tenseal_context_from_workspace(self.tenseal_context_file, fl_ctx)
@@ -106,6 +123,7 @@ class HEModelEncryptor(Filter):
         n_encrypted, n_total = 0, 0
         encryption_dict = {}
         vmins, vmaxs = [], []
+        to_encrypt = {}
         for i, param_name in enumerate(params.keys()):
             values = params[param_name].ravel()
             _n = np.size(values)
@@ -113,18 +131,17 @@ class HEModelEncryptor(Filter):
 
             # weigh before encryption
             if self.aggregation_weight:
-                values = values * np.float(self.aggregation_weight)
+                values = values * float(self.aggregation_weight)
             if self.weigh_by_local_iter:
-                values = values * np.float(self.n_iter)
+                values = values * float(self.n_iter)
 
             if param_name in self.encrypt_layers or self.encrypt_layers[0] is True:
-                self.log_info(fl_ctx, f"Encrypting vars {i+1} of {n_params}: {param_name} with {_n} values")
+                self.log_debug(fl_ctx, f"Encrypting vars {i+1} of {n_params}: {param_name} with {_n} values")
                 vmin = np.min(params[param_name])
                 vmax = np.max(params[param_name])
                 vmins.append(vmin)
                 vmaxs.append(vmax)
-                params[param_name] = ts.ckks_vector(self.tenseal_context, values).serialize()
-                encryption_dict[param_name] = True
+                to_encrypt[param_name] = values
                 n_encrypted += _n
             elif isinstance(values, CKKSVector):
                 self.log_error(
@@ -134,18 +151,35 @@ class HEModelEncryptor(Filter):
             else:
                 params[param_name] = values
                 encryption_dict[param_name] = False
-        end_time = time.time()
         if n_encrypted == 0:
             raise ValueError("Nothing has been encrypted! Check provided encrypt_layers list of layer names or regex.")
+
+        packing = None
+        if self.pack_size:
+            # the packs replace the encrypted layers
+            for param_name in to_encrypt:
+                del params[param_name]
+            to_encrypt, packing = pack_layers(to_encrypt, list(to_encrypt.keys()), self.pack_size)
+
+        context = self.tenseal_context
+        encrypted = parallel_map(
+            lambda v: ts.ckks_vector(context, v).serialize(), to_encrypt.values(), num_workers=self.num_workers
+        )
+        for name, value in zip(to_encrypt.keys(), encrypted):
+            params[name] = value
+            encryption_dict[name] = True
+        end_time = time.time()
         self.log_info(
             fl_ctx,
-            f"Encryption time for {n_encrypted} of {n_total} params"
+            f"Encryption time for {n_encrypted} of {n_total} params in {len(encrypted)} CKKS vectors"
             f" (encrypted value range [{np.min(vmins)}, {np.max(vmaxs)}])"
             f" {end_time - start_time} seconds.",
         )
-        # params is a dictionary.  keys are layer names.  values are either weights or serialized ckks_vector of weights.
-        # encryption_dict: keys are layer names.  values are True for serialized ckks_vectors, False elsewhere.
-        return params, encryption_dict
+        # params is a dictionary.  keys are layer (or pack) names.  values are either weights or serialized
+        # ckks_vector of weights.
+        # encryption_dict: keys are layer (or pack) names.  values are True for serialized ckks_vectors, False elsewhere.
+        # packing: offset index of the encrypted layers in the packs, None if the layers are not packed.
+        return params, encryption_dict, packing
 
     def process(self, shareable: Shareable, fl_ctx: FLContext) -> Shareable:
         """
@@ -186,10 +220,12 @@ class HEModelEncryptor(Filter):
 
     def _process(self, dxo: DXO, fl_ctx: FLContext) -> DXO:
         self.log_info(fl_ctx, "Running HE encryption...")
-        encrypted_params, encryption_dict = self.encryption(params=dxo.data, fl_ctx=fl_ctx)
+        encrypted_params, encryption_dict, packing = self.encryption(params=dxo.data, fl_ctx=fl_ctx)
         new_dxo = DXO(data_kind=dxo.data_kind, data=encrypted_params, meta=dxo.meta)
         new_dxo.set_meta_prop(key=MetaKey.PROCESSED_KEYS, value=encryption_dict)
         new_dxo.set_meta_prop(key=MetaKey.PROCESSED_ALGORITHM, value=he.HE_ALGORITHM_CKKS)
+        if packing:
+            new_dxo.set_meta_prop(key=he.HE_PACKING, value=packing)
         n_encrypted, n_total = count_encrypted_layers(encryption_dict)
         self.log_info(fl_ctx, f"{n_encrypted} of {n_total} layers encrypted")
         return new_dxo
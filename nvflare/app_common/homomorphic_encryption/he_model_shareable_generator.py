@@ -24,24 +24,34 @@ from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable
 from nvflare.app_common.abstract.model import ModelLearnable, ModelLearnableKey
 from nvflare.app_common.app_constant import AppConstants
-from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import load_tenseal_context_from_workspace
+from nvflare.app_common.homomorphic_encryption.he_packing import pack_global_weights
+from nvflare.app_common.homomorphic_encryption.homomorphic_encrypt import (
+    load_tenseal_context_from_workspace,
+    parallel_map,
+)
 from nvflare.app_common.shareablegenerators.full_model_shareable_generator import FullModelShareableGenerator
 
 
 class HEModelShareableGenerator(FullModelShareableGenerator):
-    def __init__(self, tenseal_context_file="server_context.tenseal"):
+    def __init__(self, tenseal_context_file="server_context.tenseal", num_workers=None):
         """
             ShareableGenerator converts between Shareable and Learnable objects with homomorphic encryption (HE)
             support using TenSEAL https://github.com/OpenMined/TenSEAL.
 
         Args:
             tenseal_context_file: tenseal context files containing decryption keys and parameters
+            num_workers: max number of threads updating encrypted packs (or layers) in parallel; None for the default,
+                         1 to disable.
 
         """
         super().__init__()
         self.tenseal_context = None
         self.tenseal_context_file = tenseal_context_file
         self.is_encrypted = False
+        self.num_workers = num_workers
+
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
 
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
@@ -78,6 +88,15 @@ class HEModelShareableGenerator(FullModelShareableGenerator):
 
         return updated_vars, n_vars_total
 
+    def _pack_base_weights(self, fl_ctx: FLContext, base_model: ModelLearnable, packing: dict):
+        """Makes the packs of the aggregated diff addable to the global weights (see pack_global_weights)."""
+        base_meta = base_model.get(ModelLearnableKey.META) or {}
+        num_packs = pack_global_weights(base_model[ModelLearnableKey.WEIGHTS], base_meta, packing)
+        if num_packs:
+            self.log_info(
+                fl_ctx, f"packed {len(packing['layers'])} layers of the global model into {num_packs} HE packs"
+            )
+
     def _shareable_to_learnable(self, shareable: Shareable, fl_ctx: FLContext) -> ModelLearnable:
         dxo = from_shareable(shareable)
         enc_algorithm = dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM)
@@ -104,14 +123,22 @@ class HEModelShareableGenerator(FullModelShareableGenerator):
             if not model_diff:
                 raise ValueError(f"{self._name} DXO data is empty!")
 
+            packing = dxo.get_meta_prop(he.HE_PACKING)
+            if packing:
+                self._pack_base_weights(fl_ctx, base_model, packing)
+
             n_vars = len(model_diff.items())
             n_params = 0
-            for v_name, v_value in model_diff.items():
-                self.log_debug(fl_ctx, f"adding {v_name} to global model...")
-                # v_value += model[v_name]
-                updated_vars, n_vars_total = self.add_to_global_weights(
-                    fl_ctx, v_value, base_weights, v_name, encrypt_layers
-                )
+            names = list(model_diff.keys())
+            # each var only reads and writes its own global weights, so the (native) HE work can run in parallel
+            results = parallel_map(
+                lambda v_name: self.add_to_global_weights(
+                    fl_ctx, model_diff[v_name], base_weights, v_name, encrypt_layers
+                ),
+                names,
+                num_workers=self.num_workers,
+            )
+            for v_name, (updated_vars, n_vars_total) in zip(names, results):
                 n_params += n_vars_total
                 base_weights[v_name] = updated_vars
                 self.log_debug(fl_ctx, f"assigned new {v_name}")
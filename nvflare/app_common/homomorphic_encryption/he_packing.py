@@ -0,0 +1,101 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+import nvflare.app_common.homomorphic_encryption.he_constant as he
+
+
+def pack_layers(params: dict, names: list, pack_size: int):
+    """
+    Packs layers into batches of pack_size values, so that many small layers share the slots of one CKKS vector.
+
+    The layers are concatenated in the order of names and the result is split into packs.
+
+    Args:
+        params: dict of layer name to values
+        names: names of the layers to pack
+        pack_size: number of values per pack, usually the number of CKKS slots (poly_modulus_degree / 2)
+
+    Returns:
+        tuple of (packs, packing). packs is a dict of pack name to 1-D array.
+        packing is the offset index needed by unpack_layers.
+
+    """
+    if pack_size <= 0:
+        raise ValueError("pack_size must be positive but got {}".format(pack_size))
+    layers = []
+    offset = 0
+    for name in names:
+        size = int(np.size(params[name]))
+        layers.append([name, offset, size])
+        offset += size
+    flat = np.concatenate([np.ravel(params[name]) for name in names]) if names else np.zeros(0)
+
+    packs = {}
+    for i, start in enumerate(range(0, offset, pack_size)):
+        packs[f"{he.HE_PACK_PREFIX}{i}"] = flat[start : start + pack_size]
+    packing = {"pack_size": pack_size, "packs": list(packs.keys()), "layers": layers}
+    return packs, packing
+
+
+def unpack_layers(packs: dict, packing: dict) -> dict:
+    """
+    Splits packs created by pack_layers back into flat layers.
+
+    Args:
+        packs: dict of pack name to values (e.g. decrypted packs)
+        packing: the offset index returned by pack_layers
+
+    Returns:
+        dict of layer name to 1-D array
+
+    """
+    if not packing["packs"]:
+        return {name: np.zeros(0) for name, _, _ in packing["layers"]}
+    flat = np.concatenate([np.ravel(packs[p]) for p in packing["packs"]])
+    return {name: flat[offset : offset + size] for name, offset, size in packing["layers"]}
+
+
+def pack_global_weights(weights: dict, meta: dict, packing: dict) -> int:
+    """
+    Packs the plaintext layers of a global model the same way as the aggregated diff, so that the packs can be added.
+
+    The packs replace the layers in weights. Once the global model holds the packs, the packing must stay the same.
+
+    Args:
+        weights: dict of layer (or pack) name to values of the global model, changed in place
+        meta: meta props of the global model
+        packing: the offset index of the aggregated diff
+
+    Returns:
+        number of packs created, 0 if the global model is packed already
+
+    """
+    if all(name in weights for name in packing["packs"]):
+        if meta.get(he.HE_PACKING) != packing:
+            raise ValueError("HE packing of the aggregated diff differs from the packing of the global model")
+        return 0
+
+    names = [name for name, _, _ in packing["layers"]]
+    missing = [name for name in names if name not in weights]
+    if missing:
+        raise ValueError(f"packed layers {missing} are not in the global model")
+    packs, base_packing = pack_layers(weights, names, packing["pack_size"])
+    if base_packing != packing:
+        raise ValueError("HE packing of the aggregated diff does not match the layers of the global model")
+    for name in names:
+        del weights[name]
+    weights.update(packs)
+    return len(packs)
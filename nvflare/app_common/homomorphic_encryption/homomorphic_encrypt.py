@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
 
 import tenseal as ts
 
@@ -56,3 +57,23 @@ def count_encrypted_layers(encrypted_layers: dict):
         if encrypted_layers[e]:
             n_encrypted += 1
     return n_encrypted, n_total
+
+
+def parallel_map(func, items, num_workers=None) -> list:
+    """
+    Applies func to the items on a thread pool. TenSEAL does the heavy work in native code.
+
+    Args:
+        func: function of one item
+        items: the items
+        num_workers: max number of threads. None for the ThreadPoolExecutor default, 1 to run in the calling thread.
+
+    Returns:
+        list of results in the order of items
+
+    """
+    items = list(items)
+    if num_workers == 1 or len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(func, items))
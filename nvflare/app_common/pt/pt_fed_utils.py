@@ -15,6 +15,7 @@
 import logging
 from collections import OrderedDict
 
+import numpy as np
 import torch
 import torch.nn as nn
 
@@ -26,6 +27,7 @@ from nvflare.app_common.abstract.model import (
     validate_model_learnable,
 )
 from nvflare.app_common.app_constant import ModelFormat
+from nvflare.fuel.utils.layer_store import LayerStore
 
 
 def feed_vars(model: nn.Module, model_params):
@@ -116,7 +118,7 @@ class PTModelPersistenceFormatManager(object):
                 continue
 
             is_processed = processed_vars.get(k, False)
-            if is_processed:
+            if is_processed or isinstance(v, np.ndarray):
                 weights[k] = v
             else:
                 weights[k] = v.cpu().numpy()
@@ -145,6 +147,35 @@ class PTModelPersistenceFormatManager(object):
                 persistence_dict[k] = v
         return persistence_dict
 
+    def to_layer_store_data(self):
+        """Split the persistence data into the layers and the other props of a LayerStore checkpoint.
+
+        Numpy weights are stored as they are, without converting them to tensors.
+
+        Returns: tuple of (layers, props)
+
+        """
+        processed_vars = self._get_processed_vars()
+        layers = OrderedDict()
+        other_vars = OrderedDict()
+        for k, v in self.var_dict.items():
+            if isinstance(v, torch.Tensor) and not processed_vars.get(k, False) and v.dtype != torch.bfloat16:
+                v = v.detach().cpu().numpy()
+            if isinstance(v, np.ndarray) and not v.dtype.hasobject:
+                layers[k] = v
+            else:
+                # processed (e.g. encrypted) vars and dtypes numpy doesn't have are pickled with the props
+                other_vars[k] = v
+
+        props = OrderedDict()
+        props[self.PERSISTENCE_KEY_MODEL] = other_vars
+        if self.meta:
+            props[self.PERSISTENCE_KEY_META_PROPS] = self.meta
+        if self.train_conf:
+            props[self.PERSISTENCE_KEY_TRAIN_CONF] = self.train_conf
+        props.update(self.other_props)
+        return layers, props
+
     def update(self, ml: ModelLearnable):
         """
         Update the persistence data with the learned values
@@ -169,3 +200,22 @@ class PTModelPersistenceFormatManager(object):
 
     def get_persist_model_format(self):
         return ModelFormat.PT_CHECKPOINT
+
+
+def load_layer_store(path: str) -> dict:
+    """Load a checkpoint saved in a LayerStore as persistence data.
+
+    The weights are read-only memory maps of the layer files, so nothing is read until they are used.
+
+    Args:
+        path: the directory of the LayerStore
+
+    Returns: persistence data for PTModelPersistenceFormatManager
+
+    """
+    store = LayerStore(path)
+    data = store.load_props()
+    weights = store.load()
+    weights.update(data.get(PTModelPersistenceFormatManager.PERSISTENCE_KEY_MODEL, {}))
+    data[PTModelPersistenceFormatManager.PERSISTENCE_KEY_MODEL] = weights
+    return data
@@ -89,6 +89,9 @@ class PTFedOptModelShareableGenerator(FullModelShareableGenerator):
         else:
             return None
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             # Initialize the optimizer with current global model params
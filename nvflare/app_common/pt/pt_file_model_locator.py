@@ -34,6 +34,9 @@ class PTFileModelLocator(ModelLocator):
 
         self.model_inventory = {}
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.initialize(fl_ctx)
@@ -27,7 +27,8 @@ from nvflare.app_common.abstract.model_persistor import ModelPersistor
 from nvflare.app_common.app_constant import AppConstants, DefaultCheckpointFileName, EnvironmentKey
 from nvflare.app_common.app_event_type import AppEventType
 from nvflare.app_common.model_desc import ModelDescriptor
-from nvflare.app_common.pt.pt_fed_utils import PTModelPersistenceFormatManager
+from nvflare.app_common.pt.pt_fed_utils import PTModelPersistenceFormatManager, load_layer_store
+from nvflare.fuel.utils.layer_store import LAYER_STORE_SUFFIX, LayerStore, is_layer_store
 
 
 class PTFileModelPersistor(ModelPersistor):
@@ -69,6 +70,12 @@ class PTFileModelPersistor(ModelPersistor):
     If checkpoint folder name is specified, then global model and best global model will be saved to it;
     Otherwise they will be saved directly in the app folder.
 
+    If use_layer_store is set, the models are saved as LayerStore directories instead of torch files:
+    each layer is kept in its own file, only the layers that changed are rewritten on save, and the
+    layers are memory-mapped on load. The directory is named after the model file with a ".layers"
+    suffix, so torch files of earlier runs are left in place. Source checkpoints in this format are
+    loaded too.
+
     """
 
     def __init__(
@@ -78,6 +85,7 @@ class PTFileModelPersistor(ModelPersistor):
         global_model_file_name=DefaultCheckpointFileName.GLOBAL_MODEL,
         best_global_model_file_name=DefaultCheckpointFileName.BEST_GLOBAL_MODEL,
         source_ckpt_file_full_name=None,
+        use_layer_store=False,
     ):
         """
 
@@ -87,6 +95,7 @@ class PTFileModelPersistor(ModelPersistor):
             global_model_file_name: file name for saving global model
             best_global_model_file_name: file name for saving best global model
             source_ckpt_file_full_name: full file name for source model checkpoint file
+            use_layer_store: save the models as incremental, memory-mappable LayerStore directories
 
         """
         super().__init__()
@@ -100,6 +109,8 @@ class PTFileModelPersistor(ModelPersistor):
         self.global_model_file_name = global_model_file_name
         self.best_global_model_file_name = best_global_model_file_name
         self.source_ckpt_file_full_name = source_ckpt_file_full_name
+        self.use_layer_store = use_layer_store
+        self._layer_stores = {}
 
         self.default_train_conf = None
 
@@ -188,8 +199,11 @@ class PTFileModelPersistor(ModelPersistor):
 
         if src_file_name:
             try:
-                device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
-                data = torch.load(src_file_name, map_location=device)
+                if is_layer_store(src_file_name):
+                    data = load_layer_store(src_file_name)
+                else:
+                    device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+                    data = torch.load(src_file_name, map_location=device)
                 # "checkpoint may contain 'model', 'optimizer', 'lr_scheduler', etc. or only contain model dict directly."
             except:
                 self.log_exception(fl_ctx, "error loading checkpoint from {}".format(src_file_name))
@@ -211,6 +225,9 @@ class PTFileModelPersistor(ModelPersistor):
         self.persistence_manager = PTModelPersistenceFormatManager(data, default_train_conf=self.default_train_conf)
         return self.persistence_manager.to_model_learnable(self.exclude_vars)
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, AppEventType.GLOBAL_BEST_MODEL_AVAILABLE]
+
     def handle_event(self, event: str, fl_ctx: FLContext):
         if event == EventType.START_RUN:
             self._initialize(fl_ctx)
@@ -218,8 +235,24 @@ class PTFileModelPersistor(ModelPersistor):
             # save the current model as the best model!
             self.save_model_file(self._best_ckpt_save_path)
 
+    def _get_model_location(self, file_name: str) -> str:
+        location = os.path.join(self.log_dir, file_name)
+        if self.use_layer_store and (is_layer_store(location + LAYER_STORE_SUFFIX) or not os.path.exists(location)):
+            return location + LAYER_STORE_SUFFIX
+        return location
+
     def save_model_file(self, save_path: str):
         assert isinstance(self.persistence_manager, PTModelPersistenceFormatManager)
+        if self.use_layer_store:
+            save_path += LAYER_STORE_SUFFIX
+            store = self._layer_stores.get(save_path)
+            if store is None:
+                store = LayerStore(save_path)
+                self._layer_stores[save_path] = store
+            layers, props = self.persistence_manager.to_layer_store_data()
+            store.save(layers, props)
+            return
+
         save_dict = self.persistence_manager.to_persistence_dict()
         torch.save(save_dict, save_path)
 
@@ -233,8 +266,11 @@ class PTFileModelPersistor(ModelPersistor):
             # device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
             # Use the "cpu" to load the global model weights, avoid GPU out of memory
             device = "cpu"
-            location = os.path.join(self.log_dir, model_file)
-            data = torch.load(location, map_location=device)
+            location = self._get_model_location(model_file)
+            if is_layer_store(location):
+                data = load_layer_store(location)
+            else:
+                data = torch.load(location, map_location=device)
             persistence_manager = PTModelPersistenceFormatManager(data, default_train_conf=self.default_train_conf)
             return persistence_manager.to_model_learnable(self.exclude_vars)
         except BaseException as e:
@@ -243,7 +279,7 @@ class PTFileModelPersistor(ModelPersistor):
 
     def get_model_inventory(self, fl_ctx: FLContext) -> {str: ModelDescriptor}:
         model_inventory = {}
-        location = os.path.join(self.log_dir, self.global_model_file_name)
+        location = self._get_model_location(self.global_model_file_name)
         if os.path.exists(location):
             model_inventory[self.global_model_file_name] = ModelDescriptor(
                 name=self.global_model_file_name,
@@ -252,7 +288,7 @@ class PTFileModelPersistor(ModelPersistor):
                 props={},
             )
 
-        location = os.path.join(self.log_dir, self.best_global_model_file_name)
+        location = self._get_model_location(self.best_global_model_file_name)
         if os.path.exists(location):
             model_inventory[self.best_global_model_file_name] = ModelDescriptor(
                 name=self.best_global_model_file_name,
@@ -17,7 +17,7 @@ from typing import List, Optional
 
 from torch.utils.tensorboard import SummaryWriter
 
-from nvflare.apis.analytix import AnalyticsData, AnalyticsDataType
+from nvflare.apis.analytix import AnalyticsData, AnalyticsDataType, get_analytics_data_type, scalar_batch_from_dxo
 from nvflare.apis.dxo import from_shareable
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable
@@ -32,12 +32,22 @@ FUNCTION_MAPPING = {
 
 
 class TBAnalyticsReceiver(AnalyticsReceiver):
-    def __init__(self, tb_folder="tb_events", events: Optional[List[str]] = None):
+    def __init__(
+        self,
+        tb_folder="tb_events",
+        events: Optional[List[str]] = None,
+        async_save: bool = True,
+        max_queue_size: int = 1000,
+        flush_interval: float = 10.0,
+    ):
         """Receives analytic data and saved as TensorBoard.
 
         Args:
             tb_folder (str): the folder to store tensorboard files.
             events (optional, List[str]): A list of events to be handled by this receiver.
+            async_save (bool): whether to write the TensorBoard files in one writer thread per peer.
+            max_queue_size (int): max number of queued records per peer when async_save is set.
+            flush_interval (float): seconds between two flushes of the TensorBoard files when async_save is set.
 
         Note:
             Folder structure:
@@ -54,7 +64,9 @@ class TBAnalyticsReceiver(AnalyticsReceiver):
                           - peer_name_1:
                           - peer_name_2:
         """
-        super().__init__(events=events)
+        super().__init__(
+            events=events, async_save=async_save, max_queue_size=max_queue_size, flush_interval=flush_interval
+        )
         self.writers_table = {}
         self.tb_folder = tb_folder
         self.root_log_dir = None
@@ -68,7 +80,6 @@ class TBAnalyticsReceiver(AnalyticsReceiver):
 
     def save(self, fl_ctx: FLContext, shareable: Shareable, record_origin):
         dxo = from_shareable(shareable)
-        analytic_data = AnalyticsData.from_dxo(dxo)
 
         writer = self.writers_table.get(record_origin)
         if writer is None:
@@ -76,6 +87,14 @@ class TBAnalyticsReceiver(AnalyticsReceiver):
             writer = SummaryWriter(log_dir=peer_log_dir)
             self.writers_table[record_origin] = writer
 
+        if get_analytics_data_type(dxo) == AnalyticsDataType.SCALAR_BATCH:
+            for tag_name, series in scalar_batch_from_dxo(dxo).items():
+                for global_step, value in series:
+                    writer.add_scalar(tag_name, value, global_step=global_step)
+            return
+
+        analytic_data = AnalyticsData.from_dxo(dxo)
+
         # depend on the type in dxo do different things
         for k, v in dxo.data.items():
             tag_name = f"{k}"
@@ -95,6 +114,11 @@ class TBAnalyticsReceiver(AnalyticsReceiver):
             else:
                 func(tag_name, v)
 
+    def flush(self, fl_ctx: FLContext, record_origin: str):
+        writer = self.writers_table.get(record_origin)
+        if writer is not None:
+            writer.flush()
+
     def finalize(self, fl_ctx: FLContext):
         for writer in self.writers_table.values():
             writer.flush()
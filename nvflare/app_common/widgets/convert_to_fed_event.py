@@ -34,6 +34,9 @@ class ConvertToFedEvent(Widget):
         self.events_to_convert = events_to_convert
         self.fed_event_prefix = fed_event_prefix
 
+    def get_subscribed_event_types(self):
+        return list(self.events_to_convert)
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type in self.events_to_convert:
             event_scope = fl_ctx.get_prop(key=FLContextKey.EVENT_SCOPE, default=EventScope.LOCAL)
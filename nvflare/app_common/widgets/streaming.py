@@ -12,12 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from abc import ABC, abstractmethod
-from threading import Lock
+from array import array
+from collections import deque
+from threading import Condition, Lock, Thread
 from typing import List, Optional
 
-from nvflare.apis.analytix import AnalyticsData, AnalyticsDataType
-from nvflare.apis.dxo import DXO
+import numpy as np
+
+from nvflare.apis.analytix import AnalyticsData, AnalyticsDataType, get_analytics_data_type, scalar_batch_to_dxo
+from nvflare.apis.dxo import DXO, from_shareable
 from nvflare.apis.event_type import EventType
 from nvflare.apis.fl_component import FLComponent
 from nvflare.apis.fl_constant import EventScope, FLContextKey, LogMessageTag, ReservedKey
@@ -113,18 +118,48 @@ def write_text(tag: str, text: str, **kwargs) -> DXO:
 
 
 class AnalyticsSender(Widget):
-    def __init__(self):
+
+    REDUCTIONS = {"min": np.min, "mean": np.mean, "last": lambda values: values[-1]}
+
+    def __init__(self, buffer_size: int = 0, flush_interval: float = 1.0, reduction: Optional[str] = None):
         """Sends analytics data.
 
         This class implements some common methods follows signatures from PyTorch SummaryWriter and Python logger.
         It provides a convenient way for Learner to use.
+
+        By default every call sends its data right away. With buffer_size > 0, the scalars of add_scalar are
+        kept per tag and sent together as one SCALAR_BATCH event when buffer_size scalars are buffered, when
+        flush_interval seconds passed since the last flush (checked when a scalar is added), or when flush is called.
+        Buffered scalars are also flushed at the end of the run.
+
+        Args:
+            buffer_size (int): max number of scalars to buffer. 0 to send each scalar right away.
+            flush_interval (float): max seconds to buffer a scalar, checked when a scalar is added.
+            reduction (optional, str): "min", "mean" or "last" to send one reduced value per tag and flush,
+                with the global step of the last scalar. None to send all scalars.
         """
         super().__init__()
+        if not isinstance(buffer_size, int) or buffer_size < 0:
+            raise ValueError(f"buffer_size must be a non-negative int, but got {buffer_size}")
+        if reduction is not None and reduction not in self.REDUCTIONS:
+            raise ValueError(f"reduction must be one of {list(self.REDUCTIONS)}, but got {reduction}")
         self.engine = None
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.reduction = reduction
+        self._buffer = {}  # tag => (array of global steps, array of values)
+        self._num_buffered = 0
+        self._last_flush_time = time.time()
+        self._buffer_lock = Lock()
+
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
 
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.engine = fl_ctx.get_engine()
+        elif event_type == EventType.END_RUN:
+            self.flush()
 
     def _add(
         self,
@@ -152,7 +187,50 @@ class AnalyticsSender(Widget):
             global_step (optional, int): Global step value.
             **kwargs: Additional arguments to pass to the receiver side.
         """
-        self._add(tag=tag, value=scalar, data_type=AnalyticsDataType.SCALAR, global_step=global_step, kwargs=kwargs)
+        if self.buffer_size > 0 and not kwargs:
+            self._buffer_scalar(tag=tag, scalar=scalar, global_step=global_step)
+        else:
+            self._add(tag=tag, value=scalar, data_type=AnalyticsDataType.SCALAR, global_step=global_step, kwargs=kwargs)
+
+    def _buffer_scalar(self, tag: str, scalar: float, global_step: Optional[int] = None):
+        if global_step is not None and not isinstance(global_step, int):
+            raise TypeError(f"Expect global step to be an instance of int, but got {type(global_step)}")
+        if not isinstance(scalar, float):
+            raise TypeError(f"expect value to be an instance of float, but got {type(scalar)}")
+        with self._buffer_lock:
+            steps, values = self._buffer.setdefault(tag, (array("d"), array("d")))
+            steps.append(float("nan") if global_step is None else global_step)
+            values.append(scalar)
+            self._num_buffered += 1
+            if self._num_buffered < self.buffer_size and time.time() - self._last_flush_time < self.flush_interval:
+                return
+            dxo = self._take_buffer()
+        self._send_dxo(dxo)
+
+    def _take_buffer(self) -> Optional[DXO]:
+        buffer = self._buffer
+        self._buffer = {}
+        self._num_buffered = 0
+        self._last_flush_time = time.time()
+        if not buffer:
+            return None
+
+        scalars = {}
+        reduce = self.REDUCTIONS.get(self.reduction)
+        for tag, (steps, values) in buffer.items():
+            steps = np.frombuffer(steps, dtype=np.float64)
+            values = np.frombuffer(values, dtype=np.float64)
+            if reduce:
+                scalars[tag] = np.array([[steps[-1], reduce(values)]])
+            else:
+                scalars[tag] = np.stack([steps, values], axis=1)
+        return scalar_batch_to_dxo(scalars)
+
+    def _send_dxo(self, dxo: Optional[DXO]):
+        if dxo is None or not self.engine:
+            return
+        with self.engine.new_context() as fl_ctx:
+            send_analytic_dxo(self, dxo=dxo, fl_ctx=fl_ctx)
 
     def add_scalars(self, tag: str, scalars: dict, global_step: Optional[int] = None, **kwargs):
         """Sends scalars.
@@ -227,31 +305,69 @@ class AnalyticsSender(Widget):
         self._log(tag=LogMessageTag.CRITICAL, msg=msg, event_type=_LOG_CRITICAL_EVENT_TYPE, args=args, kwargs=kwargs)
 
     def flush(self):
-        """Flushes out the message.
+        """Flushes out the buffered scalars.
 
-        This is doing nothing, it is defined for mimic the PyTorch SummaryWriter behavior.
+        It mimics the PyTorch SummaryWriter behavior.
         """
-        pass
+        with self._buffer_lock:
+            dxo = self._take_buffer()
+        self._send_dxo(dxo)
 
     def close(self):
         """Close resources."""
+        self.flush()
         if self.engine:
             self.engine = None
 
 
+class _OriginWriter(object):
+    def __init__(self, origin: str):
+        """Queue and writer thread of the records of one origin."""
+        self.origin = origin
+        self.records = deque()  # of [shareable, coalesce key]
+        self.slots = {}  # coalesce key => last queued [shareable, coalesce key]
+        self.cond = Condition()
+        self.asked_to_stop = False
+        self.thread = None
+
+
 class AnalyticsReceiver(Widget, ABC):
-    def __init__(self, events: Optional[List[str]] = None):
+    def __init__(
+        self,
+        events: Optional[List[str]] = None,
+        async_save: bool = False,
+        max_queue_size: int = 1000,
+        flush_interval: float = 10.0,
+    ):
         """Receives analytic data.
 
+        By default, save is called on the thread that fires the event, under a lock shared by all origins.
+        With async_save, the records are queued and saved by one writer thread per origin, so that slow writes
+        do not block the event-firing (e.g. aux message) threads. save is then called concurrently for different
+        origins, but never concurrently for the same origin. When the queue of an origin is full, a new SCALAR or
+        SCALARS record replaces the queued record of the same tag, and other new records are dropped. The writer
+        threads call flush periodically, and save all queued records before finalize is called at END_RUN.
+
         Args:
             events (optional, List[str]): A list of event that this receiver will handle.
+            async_save (bool): whether to save the records in writer threads.
+            max_queue_size (int): max number of queued records per origin when async_save is set.
+            flush_interval (float): seconds between two flush calls of a writer thread.
         """
         super().__init__()
         if events is None:
             events = [_ANALYTIC_EVENT_TYPE, f"fed.{_ANALYTIC_EVENT_TYPE}"]
         self.events = events
+        self.async_save = async_save
+        self.max_queue_size = max_queue_size
+        self.flush_interval = flush_interval
+        self.num_coalesced = 0
+        self.num_dropped = 0
         self._save_lock = Lock()
         self._end = False
+        self._engine = None
+        self._writers = {}  # origin => _OriginWriter
+        self._writers_lock = Lock()
 
     @abstractmethod
     def initialize(self, fl_ctx: FLContext):
@@ -282,8 +398,115 @@ class AnalyticsReceiver(Widget, ABC):
         """
         pass
 
+    def flush(self, fl_ctx: FLContext, record_origin: str):
+        """Flushes the saved records of an origin. Called periodically by the writer threads when async_save is set.
+
+        Args:
+            fl_ctx (FLContext): fl context.
+            record_origin (str): the sender of the records.
+        """
+        pass
+
+    @staticmethod
+    def _get_coalesce_key(data: Shareable):
+        # only the latest value of a scalar tag matters when the writer falls behind
+        try:
+            dxo = from_shareable(data)
+        except ValueError:
+            return None
+        if get_analytics_data_type(dxo) not in (AnalyticsDataType.SCALAR, AnalyticsDataType.SCALARS):
+            return None
+        if not isinstance(dxo.data, dict) or len(dxo.data) != 1:
+            return None
+        return next(iter(dxo.data))
+
+    def _enqueue(self, fl_ctx: FLContext, data: Shareable, record_origin: str):
+        with self._writers_lock:
+            if self._end:
+                # the writers are stopped
+                return
+            writer = self._writers.get(record_origin)
+            if writer is None:
+                writer = _OriginWriter(record_origin)
+                writer.thread = Thread(
+                    target=self._write, args=(writer,), name=f"analytics_writer_{record_origin}", daemon=True
+                )
+                writer.thread.start()
+                self._writers[record_origin] = writer
+
+        coalesce_key = self._get_coalesce_key(data)
+        queued = coalesced = False
+        with writer.cond:
+            if len(writer.records) < self.max_queue_size:
+                slot = [data, coalesce_key]
+                writer.records.append(slot)
+                if coalesce_key is not None:
+                    writer.slots[coalesce_key] = slot
+                writer.cond.notify()
+                queued = True
+            elif coalesce_key in writer.slots:
+                writer.slots[coalesce_key][0] = data
+                coalesced = True
+        if queued:
+            return
+
+        with self._writers_lock:
+            if coalesced:
+                self.num_coalesced += 1
+            else:
+                self.num_dropped += 1
+        if not coalesced:
+            self.log_warning(
+                fl_ctx, f"analytics queue of {record_origin} is full - dropped the record", fire_event=False
+            )
+
+    def _write(self, writer: _OriginWriter):
+        last_flush_time = time.time()
+        while True:
+            with writer.cond:
+                if not writer.records and not writer.asked_to_stop:
+                    writer.cond.wait(max(0.0, last_flush_time + self.flush_interval - time.time()))
+                records = list(writer.records)
+                writer.records.clear()
+                writer.slots.clear()
+                done = writer.asked_to_stop
+
+            flush_due = done or time.time() - last_flush_time >= self.flush_interval
+            if not records and not flush_due:
+                continue
+
+            with self._engine.new_context() as fl_ctx:
+                for data, _ in records:
+                    try:
+                        self.save(shareable=data, fl_ctx=fl_ctx, record_origin=writer.origin)
+                    except BaseException:
+                        self.log_exception(fl_ctx, f"failed to save analytics record of {writer.origin}")
+
+                if flush_due:
+                    try:
+                        self.flush(fl_ctx, writer.origin)
+                    except BaseException:
+                        self.log_exception(fl_ctx, f"failed to flush analytics records of {writer.origin}")
+                    last_flush_time = time.time()
+            if done:
+                return
+
+    def _stop_writers(self):
+        with self._writers_lock:
+            writers = list(self._writers.values())
+        for writer in writers:
+            with writer.cond:
+                writer.asked_to_stop = True
+                writer.cond.notify()
+        for writer in writers:
+            writer.thread.join()
+
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN] + list(self.events)
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
+            self._engine = fl_ctx.get_engine()
             self.initialize(fl_ctx)
         elif event_type in self.events and not self._end:
             data = fl_ctx.get_prop(FLContextKey.EVENT_DATA, None)
@@ -305,8 +528,12 @@ class AnalyticsReceiver(Widget, ABC):
             if record_origin is None:
                 self.log_error(fl_ctx, "record_origin can't be None.", fire_event=False)
                 return
+            if self.async_save:
+                self._enqueue(fl_ctx, data, record_origin)
+                return
             with self._save_lock:
                 self.save(shareable=data, fl_ctx=fl_ctx, record_origin=record_origin)
         elif event_type == EventType.END_RUN:
             self._end = True
+            self._stop_writers()
             self.finalize(fl_ctx)
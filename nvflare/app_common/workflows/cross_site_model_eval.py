@@ -227,12 +227,9 @@ class CrossSiteModelEval(Controller):
             else:
                 self.log_info(fl_ctx, "ModelLocator not present. No server models will be included.")
 
-            while self.get_num_standing_tasks():
-                if abort_signal.triggered:
-                    self.log_info(fl_ctx, "Abort signal triggered. Finishing cross site validation.")
-                    return
-                self.log_debug(fl_ctx, "Checking standing tasks to see if cross site validation finished.")
-                time.sleep(self._task_check_period)
+            if not self._wait_for_standing_tasks(abort_signal):
+                self.log_info(fl_ctx, "Abort signal triggered. Finishing cross site validation.")
+                return
         except BaseException as e:
             error_msg = f"Exception in cross site validator control_flow: {e.__str__()}"
             self.log_exception(fl_ctx, error_msg)
@@ -0,0 +1,192 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+
+from nvflare.apis.client import Client
+from nvflare.apis.fl_constant import ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.impl.controller import ClientTask, Controller, Task
+from nvflare.apis.shareable import Shareable, make_reply
+from nvflare.apis.signal import Signal
+from nvflare.apis.upstream_client_spec import UpstreamClientSpec
+from nvflare.app_common.abstract.aggregator import Aggregator
+from nvflare.app_common.app_constant import AppConstants
+from nvflare.widgets.info_collector import GroupInfoCollector, InfoCollector
+
+
+class RelayController(Controller):
+    def __init__(
+        self,
+        upstream_client_id: str = "upstream_client",
+        aggregator_id=AppConstants.DEFAULT_AGGREGATOR_ID,
+        train_task_name=AppConstants.TASK_TRAIN,
+        min_clients: int = 1,
+        wait_time_after_min_received: int = 10,
+        train_timeout: int = 0,
+    ):
+        """Intermediate aggregation tier between the clients and the server.
+
+        The relay registers to the upstream server as a client, through the upstream client component, and serves
+        its own (downstream) clients as the workflow of its server. Each train task received from upstream is
+        broadcast to the downstream clients, and their results are reduced by the local aggregator. Only
+        the aggregated result, which carries the summed weights of its contributions in the
+        NUM_STEPS_CURRENT_ROUND meta, is sent upstream. The upstream aggregator then weighs it as the
+        contributions of all the clients below the relay, so the global model is the same as with flat
+        aggregation, while the server only receives one submission per relay.
+
+        Tasks other than the train task are answered with TASK_UNKNOWN.
+
+        Args:
+            upstream_client_id: ID of the UpstreamClientSpec component connected to the upstream server.
+                Defaults to "upstream_client".
+            aggregator_id: ID of the aggregator component. Defaults to "aggregator".
+            train_task_name: name of the train task. Defaults to "train".
+            min_clients: min number of downstream results of a task. Defaults to 1.
+            wait_time_after_min_received: time to wait for more results after min_clients results are received.
+            train_timeout: time to wait for the downstream clients to do local training. 0 means no timeout.
+        """
+        Controller.__init__(self)
+        if min_clients <= 0:
+            raise ValueError("min_clients must be greater than 0.")
+
+        self.upstream_client_id = upstream_client_id
+        self.aggregator_id = aggregator_id
+        self.train_task_name = train_task_name
+        self.aggregator = None
+
+        self._min_clients = min_clients
+        self._wait_time_after_min_received = wait_time_after_min_received
+        self._train_timeout = train_timeout
+
+        self.upstream = None
+        self._current_round = None
+        self._num_accepted = 0
+        self._num_forwarded = 0
+
+    def start_controller(self, fl_ctx: FLContext):
+        engine = fl_ctx.get_engine()
+        self.aggregator = engine.get_component(self.aggregator_id)
+        if not isinstance(self.aggregator, Aggregator):
+            self.system_panic(f"aggregator {self.aggregator_id} must be an Aggregator type object.", fl_ctx)
+            return
+
+        self.upstream = engine.get_component(self.upstream_client_id)
+        if not isinstance(self.upstream, UpstreamClientSpec):
+            self.system_panic(
+                f"upstream client {self.upstream_client_id} must be an UpstreamClientSpec type object.", fl_ctx
+            )
+            return
+
+    def control_flow(self, abort_signal: Signal, fl_ctx: FLContext):
+        if not self.upstream.register(fl_ctx):
+            self.system_panic("relay failed to register to the upstream server.", fl_ctx)
+            return
+
+        while not abort_signal.triggered:
+            task_name, task_data = self.upstream.get_task(fl_ctx)
+            if self.upstream.is_run_ended():
+                self.log_info(fl_ctx, "upstream server asked to end the run")
+                break
+
+            if task_name is None:
+                continue
+
+            # the downstream tasks get the cookies of this server, the upstream ones must be sent back
+            cookie_jar = copy.deepcopy(task_data.get_cookie_jar())
+            if task_name == self.train_task_name:
+                result = self._aggregate_downstream(task_name, task_data, abort_signal, fl_ctx)
+            else:
+                self.log_error(fl_ctx, f"relay cannot handle task {task_name}")
+                result = make_reply(ReturnCode.TASK_UNKNOWN)
+
+            if abort_signal.triggered:
+                break
+
+            if cookie_jar:
+                result.set_cookie_jar(cookie_jar)
+            if self.upstream.submit_result(task_name, result, fl_ctx):
+                self._num_forwarded += 1
+            else:
+                self.log_error(fl_ctx, f"failed to send the result of task {task_name} upstream")
+
+    def _aggregate_downstream(self, task_name: str, task_data: Shareable, abort_signal: Signal, fl_ctx: FLContext):
+        self._current_round = task_data.get_header(AppConstants.CURRENT_ROUND)
+        self._num_accepted = 0
+        fl_ctx.set_prop(AppConstants.CURRENT_ROUND, self._current_round, private=True, sticky=False)
+        self.log_info(fl_ctx, f"relaying task {task_name} of round {self._current_round} to downstream clients")
+
+        task = Task(
+            name=task_name,
+            data=task_data,
+            props={},
+            timeout=self._train_timeout,
+            result_received_cb=self._process_train_result,
+        )
+        self.broadcast_and_wait(
+            task=task,
+            min_responses=self._min_clients,
+            wait_time_after_min_received=self._wait_time_after_min_received,
+            fl_ctx=fl_ctx,
+            abort_signal=abort_signal,
+        )
+
+        if self._num_accepted == 0:
+            self.log_error(fl_ctx, f"no result of round {self._current_round} accepted from downstream clients")
+            return make_reply(ReturnCode.EMPTY_RESULT)
+
+        fl_ctx.set_prop(AppConstants.CURRENT_ROUND, self._current_round, private=True, sticky=False)
+        return self.aggregator.aggregate(fl_ctx)
+
+    def _process_train_result(self, client_task: ClientTask, fl_ctx: FLContext):
+        self._accept_train_result(client_task.client.name, client_task.result, fl_ctx)
+        client_task.result = None
+
+    def process_result_of_unknown_task(
+        self, client: Client, task_name: str, client_task_id: str, result: Shareable, fl_ctx: FLContext
+    ):
+        if task_name == self.train_task_name and self._current_round is not None:
+            self._accept_train_result(client.name, result, fl_ctx)
+        else:
+            self.log_error(fl_ctx, "Ignoring result from unknown task.")
+
+    def _accept_train_result(self, client_name: str, result: Shareable, fl_ctx: FLContext) -> bool:
+        # the contribution round comes back as the cookie set by the upstream workflow
+        result.set_header(AppConstants.CONTRIBUTION_ROUND, result.get_cookie(AppConstants.CONTRIBUTION_ROUND))
+        fl_ctx.set_prop(AppConstants.CURRENT_ROUND, self._current_round, private=True, sticky=False)
+        accepted = self.aggregator.accept(result, fl_ctx)
+        if accepted:
+            self._num_accepted += 1
+        self.log_info(fl_ctx, f"Contribution from {client_name} {'ACCEPTED' if accepted else 'REJECTED'}.")
+        return accepted
+
+    def stop_controller(self, fl_ctx: FLContext):
+        self.cancel_all_tasks()
+        if self.upstream:
+            self.upstream.close()
+
+    def handle_event(self, event_type: str, fl_ctx: FLContext):
+        super().handle_event(event_type, fl_ctx)
+        if event_type == InfoCollector.EVENT_TYPE_GET_STATS:
+            collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR, None)
+            if collector:
+                assert isinstance(collector, GroupInfoCollector)
+                collector.add_info(
+                    group_name=self._name,
+                    info={
+                        "upstream_client": self.upstream_client_id,
+                        "current_round": self._current_round,
+                        "forwarded_results": self._num_forwarded,
+                    },
+                )
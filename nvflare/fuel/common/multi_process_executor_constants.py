@@ -25,6 +25,8 @@ class CommunicationMetaData(object):
     LOCAL_EXECUTOR = "local_executor"
     RANK_NUMBER = "rank_number"
     SHAREABLE = "shareable"
+    SHARED_SHAREABLE = "shared_shareable"
+    SHM_ATTACHED = "shm_attached"
     RELAYER = "relayer"
     RANK_PROCESS_STARTED = "rank_process_started"
     PARENT_PASSWORD = "parent process secret password"
@@ -12,11 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
+import hashlib
 import importlib
+import importlib.util
 import inspect
-import pkgutil
+import json
+import os
+import threading
 from typing import List
 
+CLASS_INDEX_VERSION = 1
+CLASS_INDEX_DIR_ENV = "NVFLARE_CLASS_INDEX_DIR"
+
 
 def get_class(class_path):
     module_name, class_name = class_path.rsplit(".", 1)
@@ -75,30 +83,185 @@ def get_config_classname(config_dict: dict):
     return class_name
 
 
+def get_class_index_dir() -> str:
+    return os.environ.get(CLASS_INDEX_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "nvflare")
+
+
+def _collect_class_names(nodes, names: list):
+    for node in nodes:
+        if isinstance(node, ast.ClassDef):
+            names.append(node.name)
+        elif isinstance(node, ast.If):
+            _collect_class_names(node.body, names)
+            _collect_class_names(node.orelse, names)
+        elif isinstance(node, (ast.Try, getattr(ast, "TryStar", ast.Try))):
+            _collect_class_names(node.body, names)
+            for handler in node.handlers:
+                _collect_class_names(handler.body, names)
+            _collect_class_names(node.orelse, names)
+            _collect_class_names(node.finalbody, names)
+
+
+def _find_class_names(source_file: str) -> list:
+    """Finds the classes defined at the top level of a module by parsing its source, without importing it."""
+    try:
+        with open(source_file, "rb") as f:
+            tree = ast.parse(f.read(), filename=source_file)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    names = []
+    _collect_class_names(tree.body, names)
+    return names
+
+
+def _walk_modules(path: str, prefix: str):
+    """Yields (module name, source file) of the modules under path, in the order of pkgutil.walk_packages."""
+    try:
+        entries = sorted(os.listdir(path))
+    except OSError:
+        return
+    for entry in entries:
+        full_path = os.path.join(path, entry)
+        if entry.endswith(".py"):
+            name = entry[:-3]
+            if name != "__init__" and name.isidentifier() and os.path.isfile(full_path):
+                yield prefix + name, full_path
+        elif entry.isidentifier() and os.path.isfile(os.path.join(full_path, "__init__.py")):
+            yield prefix + entry, os.path.join(full_path, "__init__.py")
+            yield from _walk_modules(full_path, prefix + entry + ".")
+
+
+def _read_json(file_name: str):
+    try:
+        with open(file_name) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(file_name: str, data):
+    # write to a temporary file and rename it, so that concurrent readers always see a complete index
+    try:
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        tmp_file = "{}.{}.tmp".format(file_name, os.getpid())
+        with open(tmp_file, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, file_name)
+    except OSError:
+        # the index is only a cache
+        pass
+
+
+def build_class_index(base_pkg: str, index_file: str = None) -> list:
+    """Builds the index of the classes defined in the modules of a package, without importing them.
+
+    The index is cached in a JSON file with the mtime and the size of every module source. Only the modules that
+    changed since the index was written are parsed again.
+
+    Args:
+        base_pkg: name of the package
+        index_file: the cache file. None for a file in the class index dir (NVFLARE_CLASS_INDEX_DIR, or
+            ~/.cache/nvflare), named after the package and its location.
+
+    Returns: list of (module name, list of class names), in the order of pkgutil.walk_packages
+
+    """
+    spec = importlib.util.find_spec(base_pkg)
+    if spec is None:
+        raise ModuleNotFoundError("No module named '{}'".format(base_pkg), name=base_pkg)
+    paths = list(spec.submodule_search_locations or [])
+    if index_file is None:
+        key = hashlib.sha1(json.dumps([base_pkg, paths]).encode()).hexdigest()[:16]
+        index_file = os.path.join(get_class_index_dir(), "class_index_{}_{}.json".format(base_pkg, key))
+
+    old_index = _read_json(index_file)
+    if not isinstance(old_index, dict) or old_index.get("version") != CLASS_INDEX_VERSION:
+        old_index = {"modules": {}}
+    old_modules = old_index["modules"]
+
+    modules = {}
+    result = []
+    changed = False
+    for path in paths:
+        for module_name, source_file in _walk_modules(path, base_pkg + "."):
+            try:
+                st = os.stat(source_file)
+            except OSError:
+                continue
+            entry = old_modules.get(source_file)
+            if (
+                not entry
+                or entry["module"] != module_name
+                or entry["mtime"] != st.st_mtime_ns
+                or entry["size"] != st.st_size
+            ):
+                entry = {
+                    "module": module_name,
+                    "mtime": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "classes": _find_class_names(source_file),
+                }
+                changed = True
+            modules[source_file] = entry
+            result.append((module_name, entry["classes"]))
+
+    if changed or len(modules) != len(old_modules):
+        _write_json(index_file, {"version": CLASS_INDEX_VERSION, "modules": modules})
+    return result
+
+
+_package_indexes = {}
+_package_indexes_lock = threading.Lock()
+
+
+def _get_package_index(base_pkg: str) -> list:
+    # all scanners of the process share the index of a package
+    with _package_indexes_lock:
+        index = _package_indexes.get(base_pkg)
+        if index is None:
+            index = build_class_index(base_pkg)
+            _package_indexes[base_pkg] = index
+        return index
+
+
 class ModuleScanner:
     def __init__(self, base_pkgs: List[str], module_names: List[str], exclude_libs=True):
         self.base_pkgs = base_pkgs
         self.module_names = module_names
         self.exclude_libs = exclude_libs
-        self._class_table = {}
+        self._class_table = {}  # class name => names of the modules that define it, in scan order
+        self._resolved = {}
         self._create_classes_table()
 
     def _create_classes_table(self):
+        # classes are found from the (cached) class index of the packages, and their modules are only imported
+        # when a config uses them
         for base in self.base_pkgs:
-            package = __import__(base)
-
-            for importer, modname, ispkg in pkgutil.walk_packages(path=package.__path__, prefix=package.__name__ + "."):
-
-                if modname.startswith(base):
-                    if not self.exclude_libs or (".libs" not in modname):
-                        if any(name in modname for name in self.module_names):
-                            try:
-                                module = importlib.import_module(modname)
-                                for name, obj in inspect.getmembers(module):
-                                    if inspect.isclass(obj) and obj.__module__ == modname:
-                                        self._class_table[name] = modname
-                            except ModuleNotFoundError as ex:
-                                pass
+            for modname, class_names in _get_package_index(base):
+                if self.exclude_libs and ".libs" in modname:
+                    continue
+                if any(name in modname for name in self.module_names):
+                    for class_name in class_names:
+                        self._class_table.setdefault(class_name, []).append(modname)
 
     def get_module_name(self, class_name):
-        return self._class_table.get(class_name, None)
+        module_names = self._class_table.get(class_name, None)
+        if not module_names:
+            return None
+        if len(module_names) == 1:
+            return module_names[0]
+
+        module_name = self._resolved.get(class_name, None)
+        if module_name is None:
+            # the class is defined in several modules: the last one that can be imported wins
+            module_name = module_names[-1]
+            for candidate in reversed(module_names):
+                try:
+                    module = importlib.import_module(candidate)
+                except ModuleNotFoundError:
+                    continue
+                if inspect.isclass(getattr(module, class_name, None)):
+                    module_name = candidate
+                    break
+            self._resolved[class_name] = module_name
+        return module_name
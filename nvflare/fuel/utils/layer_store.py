@@ -0,0 +1,168 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental checkpoint store that keeps each layer of a model in its own file.
+
+The store is a directory laid out as::
+
+    | index.json | props.pkl | layer_0.npy | layer_1.npy | ...
+
+- index.json: layer name => file, dtype, shape and content digest of the layer
+- props.pkl: the pickled non-array parts of the checkpoint (meta, train config, ...)
+- layer_N.npy: one numpy array in the .npy format
+
+Saving a checkpoint only writes the layers whose digest changed since the last save, so
+frozen or excluded layers cost no disk I/O. A changed layer is written to a new file and the
+index is replaced last (write to a temporary file, then rename), so a reader always sees a
+complete checkpoint. Loading memory-maps the layer files: nothing is read until a layer is used, and
+readers that mapped a layer keep their (old) version when it is rewritten.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+INDEX_FILE = "index.json"
+PROPS_FILE = "props.pkl"
+# suffix of a store that is named after a model file, so that it does not collide with the file
+LAYER_STORE_SUFFIX = ".layers"
+STORE_VERSION = 1
+
+
+def is_layer_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+
+def _digest(value: np.ndarray) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str((value.dtype.str, value.shape)).encode())
+    h.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8))
+    return h.hexdigest()
+
+
+def _is_layer(value) -> bool:
+    return isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+class LayerStore(object):
+    def __init__(self, path: str):
+        """Checkpoint store in the directory path.
+
+        Args:
+            path: the directory of the store. It is created on the first save.
+        """
+        self.path = path
+        self._index = None
+
+    def _get_index(self) -> dict:
+        if self._index is None:
+            index_path = os.path.join(self.path, INDEX_FILE)
+            if os.path.isfile(index_path):
+                with open(index_path) as f:
+                    index = json.load(f)
+                if index.get("version") != STORE_VERSION:
+                    raise ValueError("unsupported layer store version {}".format(index.get("version")))
+                self._index = index
+            else:
+                self._index = {"version": STORE_VERSION, "layers": {}}
+        return self._index
+
+    def _write_file(self, file_name: str, write_func):
+        tmp_path = os.path.join(self.path, file_name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            write_func(f)
+        os.replace(tmp_path, os.path.join(self.path, file_name))
+
+    def save(self, layers: dict, props: dict = None) -> int:
+        """Save a checkpoint, rewriting only the layers that changed.
+
+        Args:
+            layers: dict of layer name to numpy array. Other values must go into props.
+            props: picklable non-array parts of the checkpoint
+
+        Returns: number of layers written
+
+        """
+        if os.path.exists(self.path) and not os.path.isdir(self.path):
+            raise ValueError("cannot save layer store to {}: a file of this name exists".format(self.path))
+        os.makedirs(self.path, exist_ok=True)
+        old_index = self._get_index()
+        old_layers = old_index["layers"]
+        next_id = old_index.get("next_id", 0)
+        new_layers = {}
+        for name, value in layers.items():
+            if not _is_layer(value):
+                raise TypeError("layer {} must be a numpy array but got {}".format(name, type(value)))
+            digest = _digest(value)
+            entry = old_layers.get(name)
+            if entry is not None and entry["digest"] == digest:
+                new_layers[name] = entry
+                continue
+
+            # a changed layer goes to a new file, so that the old index stays valid until it is replaced
+            file_name = "layer_{}.npy".format(next_id)
+            next_id += 1
+            self._write_file(file_name, lambda f: np.save(f, value, allow_pickle=False))
+            new_layers[name] = {"file": file_name, "digest": digest, "dtype": value.dtype.str, "shape": value.shape}
+
+        self._write_file(PROPS_FILE, lambda f: pickle.dump(props or {}, f))
+
+        index = {"version": STORE_VERSION, "next_id": next_id, "layers": new_layers}
+        self._write_file(INDEX_FILE, lambda f: f.write(json.dumps(index, indent=1).encode()))
+        self._index = index
+
+        # files of the layers that changed or are gone
+        kept_files = {entry["file"] for entry in new_layers.values()}
+        for entry in old_layers.values():
+            if entry["file"] not in kept_files:
+                try:
+                    os.remove(os.path.join(self.path, entry["file"]))
+                except FileNotFoundError:
+                    pass
+        return next_id - old_index.get("next_id", 0)
+
+    def get_layer_names(self) -> list:
+        return list(self._get_index()["layers"])
+
+    def load(self, names=None, mmap: bool = True) -> dict:
+        """Load the layers of the checkpoint.
+
+        Args:
+            names: names of the layers to load. None to load all layers.
+            mmap: whether to memory-map the layer files (read-only and zero-copy) instead of reading them
+
+        Returns: dict of layer name to numpy array
+
+        """
+        layers = self._get_index()["layers"]
+        if names is None:
+            names = list(layers)
+        mmap_mode = "r" if mmap else None
+        result = {}
+        for name in names:
+            entry = layers.get(name)
+            if entry is None:
+                raise KeyError("layer {} is not in the store {}".format(name, self.path))
+            result[name] = np.load(os.path.join(self.path, entry["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+        return result
+
+    def load_props(self) -> dict:
+        props_path = os.path.join(self.path, PROPS_FILE)
+        if not os.path.isfile(props_path):
+            return {}
+        with open(props_path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,123 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hand objects that carry large tensors to other local processes through shared memory.
+
+The object is pickled with protocol 5, like in tensor_frame, but the out-of-band buffers (e.g.
+numpy arrays) are copied once into a shared memory segment instead of into the pickle stream.
+Only a small descriptor (segment name, buffer table and the pickle stream of everything else)
+is sent to the other processes. Each of them maps the segment and gets the arrays back as
+read-only views of the shared memory, so N processes share one copy of the tensors.
+
+The creator owns the segment: it unlinks it once every process has attached (attached
+segments stay valid until they are closed), or when it is no longer needed.
+"""
+
+import pickle
+from multiprocessing import resource_tracker, shared_memory
+
+BUFFER_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + BUFFER_ALIGNMENT - 1) // BUFFER_ALIGNMENT * BUFFER_ALIGNMENT
+
+
+def put_shared(obj):
+    """Place an object in a new shared memory segment.
+
+    Args:
+        obj: the object to share. It must be picklable.
+
+    Returns: tuple of (descriptor, segment). The descriptor is a small picklable dict to send to the other
+        processes. The segment is None if the object has no out-of-band buffers.
+
+    """
+    buffers = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+    if not raws:
+        return {"name": None, "header": header, "table": []}, None
+
+    table = []
+    offset = 0
+    for raw in raws:
+        offset = _aligned(offset)
+        table.append((offset, raw.nbytes))
+        offset += raw.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for raw, (start, length) in zip(raws, table):
+            shm.buf[start : start + length] = raw
+    except BaseException:
+        release_shared(shm, unlink=True)
+        raise
+    return {"name": shm.name, "header": header, "table": table}, shm
+
+
+def _attach(name: str):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before python 3.13, attaching registers the segment to the resource tracker of this
+        # process, which would unlink it when this process exits. The creator owns it.
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def get_shared(descriptor: dict):
+    """Get the object placed in shared memory by put_shared.
+
+    The arrays of the object are read-only views of the segment. Keep the segment open as long as they are used.
+
+    Args:
+        descriptor: the descriptor returned by put_shared
+
+    Returns: tuple of (object, segment). The segment is None if the object has no out-of-band buffers.
+
+    """
+    name = descriptor["name"]
+    if name is None:
+        return pickle.loads(descriptor["header"]), None
+
+    shm = _attach(name)
+    view = shm.buf.toreadonly()
+    buffers = [view[start : start + length] for start, length in descriptor["table"]]
+    return pickle.loads(descriptor["header"], buffers=buffers), shm
+
+
+def release_shared(shm, unlink: bool = False) -> bool:
+    """Close (and optionally unlink) a shared memory segment.
+
+    Args:
+        shm: the segment, or None
+        unlink: whether to remove the segment name. Only the creator should unlink.
+
+    Returns: False if the segment could not be closed because views of it are still in use
+
+    """
+    if shm is None:
+        return True
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        shm.close()
+    except BufferError:
+        return False
+    return True
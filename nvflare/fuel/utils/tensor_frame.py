@@ -0,0 +1,150 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Framed wire format for objects that carry large tensors.
+
+The object is pickled with protocol 5 and every contiguous buffer that supports out-of-band
+pickling (e.g. numpy ndarrays) is taken out of the pickle stream. The frame is laid out as::
+
+    | prefix | buffer table | header | pad | buffer 0 | pad | buffer 1 | ...
+
+- prefix: magic, format version, number of buffers and header length
+- buffer table: (offset, length) of each buffer, relative to the start of the frame
+- header: the pickle stream of everything else (meta, cookies, data kind, ...)
+- buffers: raw tensor bytes, each starting at an offset aligned to BUFFER_ALIGNMENT
+
+On decode, the buffers are handed back to pickle as memoryview slices of the frame, so numpy
+reconstructs each array with ``np.frombuffer`` on the frame memory instead of copying it.
+"""
+
+import pickle
+import struct
+
+FRAME_MAGIC = b"NVFT"
+FRAME_VERSION = 1
+BUFFER_ALIGNMENT = 64
+
+_PREFIX = struct.Struct("<4sBxxxIQ")
+_TABLE_ENTRY = struct.Struct("<QQ")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + BUFFER_ALIGNMENT - 1) // BUFFER_ALIGNMENT * BUFFER_ALIGNMENT
+
+
+def is_frame(data) -> bool:
+    """Check whether the data is a tensor frame.
+
+    Args:
+        data: a bytes-like object
+
+    Returns: True if data starts with the frame magic
+
+    """
+    return len(data) >= _PREFIX.size and bytes(memoryview(data)[: len(FRAME_MAGIC)]) == FRAME_MAGIC
+
+
+def encode_frame(obj) -> bytes:
+    """Serialize an object into a tensor frame.
+
+    Tensor bytes are copied exactly once, straight into the output frame.
+
+    Args:
+        obj: the object to serialize. It must be picklable.
+
+    Returns: the frame as bytes
+
+    """
+    buffers = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [b.raw() for b in buffers]
+
+    table_start = _PREFIX.size
+    header_start = table_start + _TABLE_ENTRY.size * len(raws)
+    offset = header_start + len(header)
+
+    table = []
+    parts = [None, None, header]
+    for raw in raws:
+        start = _aligned(offset)
+        if start > offset:
+            parts.append(bytes(start - offset))
+        parts.append(raw)
+        table.append(_TABLE_ENTRY.pack(start, raw.nbytes))
+        offset = start + raw.nbytes
+
+    parts[0] = _PREFIX.pack(FRAME_MAGIC, FRAME_VERSION, len(raws), len(header))
+    parts[1] = b"".join(table)
+    return b"".join(parts)
+
+
+def decode_frame(data, writable: bool = True):
+    """Deserialize an object from a tensor frame.
+
+    Arrays in the returned object are views on the frame memory. If the frame memory is
+    read-only (e.g. a bytes object) and writable arrays are requested, the frame is copied once
+    into a bytearray first; pass a bytearray or a writable memoryview to avoid that copy.
+
+    Args:
+        data: the frame as a bytes-like object
+        writable: whether the reconstructed arrays must be writable
+
+    Returns: the deserialized object
+
+    """
+    view = memoryview(data)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+
+    magic, version, num_buffers, header_len = _PREFIX.unpack_from(view, 0)
+    if magic != FRAME_MAGIC:
+        raise ValueError("data is not a tensor frame")
+    if version != FRAME_VERSION:
+        raise ValueError("unsupported tensor frame version {}".format(version))
+
+    if writable and view.readonly:
+        view = memoryview(bytearray(view))
+
+    header_start = _PREFIX.size + _TABLE_ENTRY.size * num_buffers
+    buffers = []
+    for i in range(num_buffers):
+        offset, length = _TABLE_ENTRY.unpack_from(view, _PREFIX.size + _TABLE_ENTRY.size * i)
+        if offset + length > len(view):
+            raise ValueError("truncated tensor frame")
+        buffers.append(view[offset : offset + length])
+
+    return pickle.loads(view[header_start : header_start + header_len], buffers=buffers)
+
+
+def dumps(obj) -> bytes:
+    """Serialize an object into a tensor frame. Same as encode_frame."""
+    return encode_frame(obj)
+
+
+def loads(data, writable: bool = True):
+    """Deserialize an object from either a tensor frame or a plain pickle.
+
+    Plain pickles are still accepted so that data produced by older peers or saved to disk with
+    pickle can be read.
+
+    Args:
+        data: a bytes-like object
+        writable: whether the reconstructed arrays must be writable
+
+    Returns: the deserialized object
+
+    """
+    if is_frame(data):
+        return decode_frame(data, writable=writable)
+    return pickle.loads(data)
@@ -35,6 +35,9 @@ class AuxRunner(FLComponent):
         }  # topic => handler
         self.reg_lock = Lock()
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.run_num = fl_ctx.get_run_number()
@@ -21,6 +21,8 @@ class SpecialTaskName(object):
 
 class TaskConstant(object):
     WAIT_TIME = "__wait_time__"
+    TASK_WAIT_TIME = "__task_wait_time__"
+    SPLIT_HEADERS = "__split_headers__"
 
 
 class EngineConstant(object):
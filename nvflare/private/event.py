@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import uuid
 
 from nvflare.apis.fl_component import FLComponent
@@ -35,6 +36,9 @@ def fire_event(event: str, handlers: list, ctx: FLContext):
     Returns:
 
     """
+    if not handlers:
+        return
+
     event_id = str(uuid.uuid4())
     event_data = ctx.get_prop(FLContextKey.EVENT_DATA, None)
     event_origin = ctx.get_prop(FLContextKey.EVENT_ORIGIN, None)
@@ -47,18 +51,82 @@ def fire_event(event: str, handlers: list, ctx: FLContext):
 
     ctx.set_prop(key=_KEY_EVENT_DEPTH, value=depth + 1, private=True, sticky=False)
 
-    if handlers:
-        for h in handlers:
-            assert isinstance(h, FLComponent)
-            try:
-                # since events could be recursive (a handler fires another event) on the same fl_ctx,
-                # we need to reset these key values into the fl_ctx
-                ctx.set_prop(key=FLContextKey.EVENT_ID, value=event_id, private=True, sticky=False)
-                ctx.set_prop(key=FLContextKey.EVENT_DATA, value=event_data, private=True, sticky=False)
-                ctx.set_prop(key=FLContextKey.EVENT_ORIGIN, value=event_origin, private=True, sticky=False)
-                ctx.set_prop(key=FLContextKey.EVENT_SCOPE, value=event_scope, private=True, sticky=False)
-                h.handle_event(event, ctx)
-            except:
-                h.log_exception(ctx, 'exception when handling event "{}"'.format(event), fire_event=False)
+    for h in handlers:
+        assert isinstance(h, FLComponent)
+        try:
+            # since events could be recursive (a handler fires another event) on the same fl_ctx,
+            # we need to reset these key values into the fl_ctx
+            ctx.set_prop(key=FLContextKey.EVENT_ID, value=event_id, private=True, sticky=False)
+            ctx.set_prop(key=FLContextKey.EVENT_DATA, value=event_data, private=True, sticky=False)
+            ctx.set_prop(key=FLContextKey.EVENT_ORIGIN, value=event_origin, private=True, sticky=False)
+            ctx.set_prop(key=FLContextKey.EVENT_SCOPE, value=event_scope, private=True, sticky=False)
+            h.handle_event(event, ctx)
+        except:
+            h.log_exception(ctx, 'exception when handling event "{}"'.format(event), fire_event=False)
 
     ctx.set_prop(key=_KEY_EVENT_DEPTH, value=depth, private=True, sticky=False)
+
+
+def _get_defining_class(cls, name: str):
+    for c in cls.__mro__:
+        if name in c.__dict__:
+            return c
+    return None
+
+
+def get_subscribed_event_types(handler):
+    """Gets the event types the handler needs to be invoked for.
+
+    Args:
+        handler: the event handler
+
+    Returns: frozenset of event types, or None for all events
+
+    """
+    if not isinstance(handler, FLComponent) or "handle_event" in handler.__dict__:
+        return None
+
+    handler_class = _get_defining_class(type(handler), "handle_event")
+    if handler_class is FLComponent:
+        # the default handle_event does nothing
+        return frozenset()
+
+    # the subscription is only valid if it is declared with (or after) the handle_event that it describes
+    subscriber_class = _get_defining_class(type(handler), "get_subscribed_event_types")
+    if not issubclass(subscriber_class, handler_class):
+        return None
+
+    event_types = handler.get_subscribed_event_types()
+    return None if event_types is None else frozenset(event_types)
+
+
+class EventDispatcher(object):
+    def __init__(self, handlers: list):
+        """Fires events to the handlers that subscribe to them.
+
+        The handlers of each event type are looked up once, and again after a handler is added.
+
+        Args:
+            handlers: list of handlers, in the order they are invoked. Add handlers with add_handler.
+        """
+        self.handlers = handlers
+        self._subscriptions = [(h, get_subscribed_event_types(h)) for h in handlers]
+        self._event_handlers = {}  # event type => handlers
+        self._lock = threading.Lock()
+
+    def add_handler(self, handler: FLComponent):
+        with self._lock:
+            self.handlers.append(handler)
+            self._subscriptions.append((handler, get_subscribed_event_types(handler)))
+            self._event_handlers = {}
+
+    def get_event_handlers(self, event_type: str) -> list:
+        handlers = self._event_handlers.get(event_type)
+        if handlers is None:
+            with self._lock:
+                handlers = [h for h, types in self._subscriptions if types is None or event_type in types]
+                self._event_handlers[event_type] = handlers
+        return handlers
+
+    def fire_event(self, event_type: str, ctx: FLContext):
+        fire_event(event=event_type, handlers=self.get_event_handlers(event_type), ctx=ctx)
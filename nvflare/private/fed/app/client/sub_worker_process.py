@@ -27,6 +27,7 @@ from nvflare.apis.fl_context import FLContext
 from nvflare.apis.signal import Signal
 from nvflare.apis.utils.fl_context_utils import get_serializable_data
 from nvflare.fuel.common.multi_process_executor_constants import CommunicateData, CommunicationMetaData
+from nvflare.fuel.utils.shm_transport import get_shared, release_shared
 from nvflare.private.fed.client.client_run_manager import ClientRunManager
 
 
@@ -41,7 +42,7 @@ class EventRelayer(FLComponent):
     def relay_event(self, run_manager, data):
         with run_manager.new_context() as fl_ctx:
             event_type = data[CommunicationMetaData.EVENT_TYPE]
-            fl_ctx.props.update(data[CommunicationMetaData.FL_CTX].props)
+            fl_ctx.update_props(data[CommunicationMetaData.FL_CTX])
 
             fl_ctx.set_prop(
                 FLContextKey.EVENT_ORIGIN_SITE, CommunicateData.MULTI_PROCESS_EXECUTOR, private=True, sticky=False
@@ -51,8 +52,7 @@ class EventRelayer(FLComponent):
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         event_site = fl_ctx.get_prop(FLContextKey.EVENT_ORIGIN_SITE)
 
-        new_fl_ctx = FLContext()
-        new_fl_ctx.props.update(copy.deepcopy(get_serializable_data(fl_ctx).props))
+        new_fl_ctx = copy.deepcopy(get_serializable_data(fl_ctx))
         if event_site != CommunicateData.MULTI_PROCESS_EXECUTOR:
             with self.event_lock:
                 try:
@@ -65,7 +65,7 @@ class EventRelayer(FLComponent):
 
                     return_data = self.conn.recv()
                     # update the fl_ctx from the child process return data.
-                    fl_ctx.props.update(return_data[CommunicationMetaData.FL_CTX].props)
+                    fl_ctx.update_props(return_data[CommunicationMetaData.FL_CTX])
                 except BaseException:
                     self.log_warning(
                         fl_ctx, f"Failed to relay the event to parent process. Event: {event_type}", fire_event=False
@@ -149,6 +149,8 @@ def _create_connection(listen_port):
 
 
 def execute(run_manager, local_rank, exe_conn, executor):
+    # shared memory segments of earlier tasks that are still in use by the executor
+    shared_segments = []
     try:
         abort_signal = None
         while True:
@@ -160,8 +162,15 @@ def execute(run_manager, local_rank, exe_conn, executor):
                     abort_signal = Signal()
 
                     task_name = data[CommunicationMetaData.TASK_NAME]
-                    shareable = data[CommunicationMetaData.SHAREABLE]
-                    fl_ctx.props.update(data[CommunicationMetaData.FL_CTX].props)
+                    if CommunicationMetaData.SHARED_SHAREABLE in data:
+                        shareable, shm = get_shared(data[CommunicationMetaData.SHARED_SHAREABLE])
+                        if shm is not None:
+                            # the parent only waits for the ack when it created a segment
+                            exe_conn.send({CommunicationMetaData.SHM_ATTACHED: True})
+                            shared_segments.append(shm)
+                    else:
+                        shareable = data[CommunicationMetaData.SHAREABLE]
+                    fl_ctx.update_props(data[CommunicationMetaData.FL_CTX])
 
                     shareable = executor.execute(
                         task_name=task_name, shareable=shareable, fl_ctx=fl_ctx, abort_signal=abort_signal
@@ -173,6 +182,10 @@ def execute(run_manager, local_rank, exe_conn, executor):
                         }
                         exe_conn.send(return_data)
 
+                # the task data is no longer referenced, unless the executor kept some of its arrays
+                data = shareable = return_data = None
+                shared_segments = [shm for shm in shared_segments if not release_shared(shm)]
+
             elif command == CommunicateData.CLOSE:
                 if abort_signal:
                     abort_signal.trigger(True)
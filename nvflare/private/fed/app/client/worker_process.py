@@ -15,6 +15,8 @@
 """Provides a command line interface for a federated client trainer"""
 
 import argparse
+import importlib
+import json
 import os
 import sys
 import traceback
@@ -23,9 +25,10 @@ from nvflare.apis.fl_constant import FLContextKey
 from nvflare.apis.workspace import Workspace
 from nvflare.fuel.sec.security_content_service import SecurityContentService
 from nvflare.fuel.utils.argument_utils import parse_vars
+from nvflare.fuel.utils.class_utils import ModuleScanner
 from nvflare.private.defs import EngineConstant
 from nvflare.private.fed.app.fl_conf import FLClientStarterConfiger
-from nvflare.private.fed.client.client_json_config import ClientJsonConfigurator
+from nvflare.private.fed.client.client_json_config import FL_MODULES, FL_PACKAGES, ClientJsonConfigurator
 from nvflare.private.fed.client.client_run_manager import ClientRunManager
 from nvflare.private.fed.client.client_runner import ClientRunner
 from nvflare.private.fed.client.client_status import ClientStatus
@@ -44,6 +47,8 @@ def main():
 
     parser.add_argument("--local_rank", type=int, default=0)
 
+    parser.add_argument("--warm", action="store_true", help="warm up, then wait for the run on stdin")
+
     args = parser.parse_args()
     kv_list = parse_vars(args.set)
 
@@ -57,6 +62,14 @@ def main():
     args.config_folder = config_folder
     args.env = os.path.join("config", "environment.json")
 
+    run_info = None
+    if args.warm:
+        warm_up(args.workspace, kv_list.get("warm_worker_imports", "torch"))
+        run_info = wait_for_run()
+        if run_info is None:
+            # the pool was shut down
+            return
+
     try:
         remove_restart_file(args)
     except BaseException:
@@ -76,17 +89,23 @@ def main():
     SecurityContentService.initialize(content_folder=startup)
 
     try:
-        token_file = os.path.join(args.workspace, EngineConstant.CLIENT_TOKEN_FILE)
-        with open(token_file, "r") as f:
-            token = f.readline().strip()
-            run_number = f.readline().strip()
-            client_name = f.readline().strip()
-            listen_port = f.readline().strip()
-            print(
-                "token is: {} run_number is: {} client_name: {} listen_port: {}".format(
-                    token, run_number, client_name, listen_port
-                )
+        if run_info:
+            token = run_info["token"]
+            run_number = run_info["run_number"]
+            client_name = run_info["client_name"]
+            listen_port = run_info["listen_port"]
+            app_custom_folder = run_info.get("app_custom_folder")
+            if app_custom_folder:
+                # a cold worker has the folder on its PYTHONPATH, which comes before the installed packages
+                sys.path.insert(0, app_custom_folder)
+                os.environ["PYTHONPATH"] = os.environ.get("PYTHONPATH", "") + ":" + app_custom_folder
+        else:
+            token, run_number, client_name, listen_port = read_token_file(args.workspace)
+        print(
+            "token is: {} run_number is: {} client_name: {} listen_port: {}".format(
+                token, run_number, client_name, listen_port
             )
+        )
 
         workspace = os.path.join("/tmp/fl", client_name)
         app_root = os.path.join(args.workspace, "run_" + str(run_number), "app_" + client_name)
@@ -173,6 +192,48 @@ def main():
         # conn_client.send('bye')
 
 
+def read_token_file(workspace: str):
+    token_file = os.path.join(workspace, EngineConstant.CLIENT_TOKEN_FILE)
+    with open(token_file, "r") as f:
+        token = f.readline().strip()
+        run_number = f.readline().strip()
+        client_name = f.readline().strip()
+        listen_port = f.readline().strip()
+    return token, run_number, client_name, listen_port
+
+
+def warm_up(workspace: str, imports: str):
+    """Does the start work that doesn't depend on the run, ahead of it.
+
+    Args:
+        workspace: the client workspace
+        imports: comma separated modules to import, e.g. the ML framework. Modules that are not installed are skipped.
+
+    """
+    SecurityContentService.initialize(content_folder=os.path.join(workspace, "startup"))
+    # the class index is shared by all the configurators of the process
+    ModuleScanner(FL_PACKAGES, FL_MODULES, True)
+    for name in str(imports).split(","):
+        name = name.strip()
+        if name:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+
+def wait_for_run():
+    """Waits for the run handed over by the WarmWorkerPool on stdin.
+
+    Returns: dict of the run info, or None if stdin was closed
+
+    """
+    line = sys.stdin.readline()
+    if not line.strip():
+        return None
+    return json.loads(line)
+
+
 def remove_restart_file(args):
     restart_file = os.path.join(args.workspace, "restart.fl")
     if os.path.exists(restart_file):
@@ -50,6 +50,13 @@ class Sender(object):
         """
         pass
 
+    def close(self):
+        """
+        Release the resources (e.g. connections) held by the sender.
+        :return:
+        """
+        pass
+
 
 class RequestProcessor(object):
     """
@@ -184,6 +191,8 @@ class FedAdminAgent(object):
         if self.process_req_thread and self.process_req_thread.is_alive():
             self.process_req_thread.join()
 
+        self.sender.close()
+
 
 def _start_retriever(agent: FedAdminAgent):
     agent._run_retriever()
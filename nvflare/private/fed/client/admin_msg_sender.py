@@ -20,6 +20,7 @@ import grpc
 import nvflare.private.fed.protos.admin_pb2 as admin_msg
 import nvflare.private.fed.protos.admin_pb2_grpc as admin_service
 from nvflare.private.admin_defs import Message
+from nvflare.private.fed.client.channel_pool import CHANNEL_DEFAULT_OPTIONS, ChannelPool, add_channel_options
 from nvflare.private.fed.utils.messageproto import message_to_proto, proto_to_message
 from .admin import Sender
 
@@ -48,6 +49,8 @@ class AdminMessageSender(Sender):
         self.rank = rank
 
         self.pool = ThreadPool(len(self.servers))
+        self.channel_pool = ChannelPool(lambda channel_dict, token: self._set_up_channel(channel_dict))
+        self._ssl_credentials = None
 
     def send_reply(self, message: Message):
         if self.rank == 0:
@@ -56,15 +59,17 @@ class AdminMessageSender(Sender):
                 self.send_client_reply(message, taskname)
 
     def send_client_reply(self, message, taskname):
+        channel_dict = self.servers[taskname]
         try:
-            with self._set_up_channel(self.servers[taskname]) as channel:
-                stub = admin_service.AdminCommunicatingStub(channel)
-
+            with self.channel_pool.stub(channel_dict, admin_service.AdminCommunicatingStub) as stub:
                 reply = admin_msg.Reply()
                 reply.client_name = self.client_name
                 reply.message.CopyFrom(message_to_proto(message))
                 # reply.message = message_to_proto(message)
                 stub.SendReply(reply)
+                self.channel_pool.report_success(channel_dict)
+        except grpc.RpcError as grpc_error:
+            self.channel_pool.report_failure(channel_dict, grpc_error)
         except BaseException:
             pass
 
@@ -95,16 +100,18 @@ class AdminMessageSender(Sender):
         return messages
 
     def retrieve_client_requests(self, taskname):
+        channel_dict = self.servers[taskname]
         try:
             message_list = []
-            with self._set_up_channel(self.servers[taskname]) as channel:
-                stub = admin_service.AdminCommunicatingStub(channel)
-
+            with self.channel_pool.stub(channel_dict, admin_service.AdminCommunicatingStub) as stub:
                 client = admin_msg.Client()
                 client.client_name = self.client_name
                 messages = stub.Retrieve(client)
-                for i in messages.message:
-                    message_list.append(proto_to_message(i))
+                self.channel_pool.report_success(channel_dict)
+            for i in messages.message:
+                message_list.append(proto_to_message(i))
+        except grpc.RpcError as grpc_error:
+            self.channel_pool.report_failure(channel_dict, grpc_error)
         except Exception as e:
             messages = None
         return message_list
@@ -113,18 +120,23 @@ class AdminMessageSender(Sender):
         if self.rank == 0:
             # self.send_client_reply(message)
             for taskname in tuple(self.servers):
+                channel_dict = self.servers[taskname]
                 try:
-                    with self._set_up_channel(self.servers[taskname]) as channel:
-                        stub = admin_service.AdminCommunicatingStub(channel)
-
+                    with self.channel_pool.stub(channel_dict, admin_service.AdminCommunicatingStub) as stub:
                         reply = admin_msg.Reply()
                         reply.client_name = self.client_name
                         reply.message.CopyFrom(message_to_proto(message))
                         # reply.message = message_to_proto(message)
                         stub.SendResult(reply)
+                        self.channel_pool.report_success(channel_dict)
+                except grpc.RpcError as grpc_error:
+                    self.channel_pool.report_failure(channel_dict, grpc_error)
                 except BaseException:
                     pass
 
+    def close(self):
+        self.channel_pool.close()
+
     def _set_up_channel(self, channel_dict):
         """
         Connect client to the server.
@@ -132,23 +144,30 @@ class AdminMessageSender(Sender):
         :param channel_dict: grpc channel parameters
         :return: an initialised grpc channel
         """
+        channel_dict = add_channel_options(channel_dict, CHANNEL_DEFAULT_OPTIONS)
         if self.secure:
-            with open(self.root_cert, "rb") as f:
-                trusted_certs = f.read()
-            with open(self.private_key, "rb") as f:
-                private_key = f.read()
-            with open(self.ssl_cert, "rb") as f:
-                certificate_chain = f.read()
-
             call_credentials = grpc.metadata_call_credentials(
                 lambda context, callback: callback((("x-custom-token", self.client_name),), None)
             )
-            credentials = grpc.ssl_channel_credentials(
-                certificate_chain=certificate_chain, private_key=private_key, root_certificates=trusted_certs
-            )
+            credentials = self._get_ssl_credentials()
 
             composite_credentials = grpc.composite_channel_credentials(credentials, call_credentials)
             channel = grpc.secure_channel(**channel_dict, credentials=composite_credentials)
         else:
             channel = grpc.insecure_channel(**channel_dict)
         return channel
+
+    def _get_ssl_credentials(self):
+        # the certs only need to be read once
+        if self._ssl_credentials is None:
+            with open(self.root_cert, "rb") as f:
+                trusted_certs = f.read()
+            with open(self.private_key, "rb") as f:
+                private_key = f.read()
+            with open(self.ssl_cert, "rb") as f:
+                certificate_chain = f.read()
+
+            self._ssl_credentials = grpc.ssl_channel_credentials(
+                certificate_chain=certificate_chain, private_key=private_key, root_certificates=trusted_certs
+            )
+        return self._ssl_credentials
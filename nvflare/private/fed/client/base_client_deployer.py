@@ -14,8 +14,10 @@
 
 import grpc
 
+from nvflare.apis.fl_constant import DEFAULT_TASK_WAIT_TIME
 from nvflare.apis.fl_context import FLContext
 from nvflare.private.fed.client.fed_client import FederatedClient
+from nvflare.private.fed.utils.fed_utils import DEFAULT_CHUNK_SIZE
 from .client_req_processors import ClientRequestProcessors
 
 
@@ -71,6 +73,9 @@ class BaseClientDeployer:
             executors=self.executors,
             compression=compression,
             enable_byoc=self.enable_byoc,
+            streaming=self.client_config.get("streaming", False),
+            chunk_size=self.client_config.get("chunk_size", DEFAULT_CHUNK_SIZE),
+            task_wait_time=self.client_config.get("task_wait_time", DEFAULT_TASK_WAIT_TIME),
         )
         return self.federated_client
 
@@ -0,0 +1,190 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+from contextlib import contextmanager
+
+import grpc
+
+# Pings keep the connection (and NAT / firewall state on the way) alive during long calls, and detect dead
+# connections. The reconnect backoff is used by the channel itself when the connection is lost.
+CHANNEL_DEFAULT_OPTIONS = [
+    ("grpc.keepalive_time_ms", 60000),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.initial_reconnect_backoff_ms", 1000),
+    ("grpc.max_reconnect_backoff_ms", 30000),
+]
+
+# Errors that mean the connection itself is bad, not the request.
+CONNECTION_ERRORS = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+def add_channel_options(channel_dict: dict, options) -> dict:
+    """Add options to the channel parameters, unless they are already set.
+
+    Args:
+        channel_dict: grpc channel parameters
+        options: list of (name, value) grpc channel options
+
+    Returns: a copy of the channel parameters
+
+    """
+    result = dict(channel_dict)
+    current = list(result.get("options") or [])
+    names = {name for name, _ in current}
+    result["options"] = current + [(name, value) for name, value in options if name not in names]
+    return result
+
+
+class _PooledChannel(object):
+    def __init__(self, channel):
+        self.channel = channel
+        self.stubs = {}
+        self.failures = 0
+        # number of calls in progress, and whether the channel is to be closed when they are done
+        self.users = 0
+        self.closing = False
+
+    def get_stub(self, stub_class):
+        stub = self.stubs.get(stub_class)
+        if stub is None:
+            stub = stub_class(self.channel)
+            self.stubs[stub_class] = stub
+        return stub
+
+    def close(self):
+        self.channel.close()
+
+
+class ChannelPool(object):
+    """Long-lived grpc channels and stubs, one per server target.
+
+    Opening a channel for every call means a new connection (and a TLS handshake in secure mode) for
+    every message. The pool keeps the channel open instead; grpc reconnects it with backoff when the
+    connection is lost. A channel that keeps failing with connection errors is closed and replaced by a
+    new one on the next call.
+    """
+
+    def __init__(self, create_channel, max_failures: int = 3):
+        """
+
+        Args:
+            create_channel: function that creates a channel from (channel_dict, token)
+            max_failures: number of consecutive connection errors after which the channel is replaced
+        """
+        self.create_channel = create_channel
+        self.max_failures = max_failures
+        self._channels = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @contextmanager
+    def stub(self, channel_dict: dict, stub_class, token=None):
+        """Use the stub of the pooled channel to the target, creating the channel if needed.
+
+        The calls must be made within the with block: a channel that is replaced meanwhile is only closed once
+        the calls in progress on it are done.
+
+        Args:
+            channel_dict: grpc channel parameters
+            stub_class: grpc stub class
+            token: client token, used in the call credentials of the channel
+
+        Yields: a stub_class instance
+
+        """
+        target = channel_dict.get("target")
+        with self._lock:
+            entry = self._channels.get(target)
+            if entry is not None and entry[0] != token:
+                # the client got a new token, so the call credentials must change
+                self._close(target)
+                entry = None
+            if entry is None:
+                self.logger.debug(f"Open channel to {target}")
+                entry = (token, _PooledChannel(self.create_channel(channel_dict, token)))
+                self._channels[target] = entry
+            channel = entry[1]
+            channel.users += 1
+            stub = channel.get_stub(stub_class)
+
+        try:
+            yield stub
+        finally:
+            with self._lock:
+                channel.users -= 1
+                if channel.closing and channel.users == 0:
+                    self._close_channel(target, channel)
+
+    def report_success(self, channel_dict: dict):
+        with self._lock:
+            entry = self._channels.get(channel_dict.get("target"))
+            if entry is not None:
+                entry[1].failures = 0
+
+    def report_failure(self, channel_dict: dict, grpc_error):
+        """Record a failed call on the pooled channel to the target.
+
+        Args:
+            channel_dict: grpc channel parameters
+            grpc_error: the grpc.RpcError of the call
+
+        """
+        if isinstance(grpc_error, grpc.Call) and grpc_error.code() not in CONNECTION_ERRORS:
+            # the server got the call, so the connection is fine
+            self.report_success(channel_dict)
+            return
+
+        target = channel_dict.get("target")
+        with self._lock:
+            entry = self._channels.get(target)
+            if entry is None:
+                return
+            entry[1].failures += 1
+            if entry[1].failures >= self.max_failures:
+                self.logger.info(f"Channel to {target} failed {entry[1].failures} times. Replace it.")
+                self._close(target)
+
+    def is_healthy(self, channel_dict: dict) -> bool:
+        """Whether the last call on the pooled channel to the target did not fail with a connection error."""
+        with self._lock:
+            entry = self._channels.get(channel_dict.get("target"))
+            return entry is None or entry[1].failures == 0
+
+    def get_info(self) -> dict:
+        with self._lock:
+            return {
+                target: {"healthy": channel.failures == 0, "failures": channel.failures}
+                for target, (_, channel) in self._channels.items()
+            }
+
+    def close(self):
+        with self._lock:
+            for target in list(self._channels):
+                self._close(target)
+
+    def _close(self, target):
+        _, channel = self._channels.pop(target)
+        if channel.users > 0:
+            # closing the channel would cancel the calls in progress
+            channel.closing = True
+        else:
+            self._close_channel(target, channel)
+
+    def _close_channel(self, target, channel):
+        try:
+            channel.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing channel to {target}: {e}")
@@ -31,6 +31,9 @@ class ClientAuxRunner(AuxRunner):
 
     """
 
+    MAX_BULK_REQUESTS = 1000
+    FNF_SEND_INTERVAL = 0.1
+
     def __init__(self):
         AuxRunner.__init__(self)
         self.abort_signal = None
@@ -40,6 +43,9 @@ class ClientAuxRunner(AuxRunner):
         self.fnf_requests = []
         self.fnf_lock = threading.Lock()
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         AuxRunner.handle_event(self, event_type, fl_ctx)
         if event_type == EventType.START_RUN:
@@ -108,19 +114,30 @@ class ClientAuxRunner(AuxRunner):
                 break
 
             with self.fnf_lock:
-                if len(self.fnf_requests) <= 0:
-                    sleep_time = 1.0
-                    continue
-
-                with self.engine.new_context() as fl_ctx:
-                    bulk = Shareable()
-                    bulk.set_header(ReservedHeaderKey.TOPIC, topic)
-                    bulk.set_peer_props(fl_ctx.get_all_public_props())
-                    bulk[self.DATA_KEY_BULK] = self.fnf_requests
-                    reply = self.engine.aux_send(topic=topic, request=bulk, timeout=1.0, fl_ctx=fl_ctx)
-
-                    rc = reply.get_return_code()
-                    if rc != ReturnCode.COMMUNICATION_ERROR:
-                        # if communication error we'll retry
-                        self.fnf_requests = []
-            sleep_time = 0.5
+                # the requests are sent outside the lock, so new requests are not blocked by the sending
+                requests = self.fnf_requests[: self.MAX_BULK_REQUESTS]
+                self.fnf_requests = self.fnf_requests[len(requests) :]
+                num_pending = len(self.fnf_requests)
+
+            if not requests:
+                sleep_time = 1.0
+                continue
+
+            with self.engine.new_context() as fl_ctx:
+                bulk = Shareable()
+                bulk.set_header(ReservedHeaderKey.TOPIC, topic)
+                bulk.set_peer_props(fl_ctx.get_all_public_props())
+                bulk[self.DATA_KEY_BULK] = requests
+                reply = self.engine.aux_send(topic=topic, request=bulk, timeout=1.0, fl_ctx=fl_ctx)
+
+            rc = reply.get_return_code()
+            if rc == ReturnCode.COMMUNICATION_ERROR:
+                # if communication error we'll retry
+                with self.fnf_lock:
+                    self.fnf_requests = requests + self.fnf_requests
+                sleep_time = 0.5
+            elif num_pending > 0:
+                # keep draining the backlog
+                sleep_time = 0.0
+            else:
+                sleep_time = self.FNF_SEND_INTERVAL
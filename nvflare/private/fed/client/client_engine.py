@@ -24,6 +24,7 @@ from concurrent.futures import ThreadPoolExecutor
 from nvflare.apis.fl_constant import MachineStatus
 from nvflare.apis.shareable import Shareable
 from nvflare.fuel.hci.zip_utils import unzip_all_from_bytes
+from nvflare.fuel.utils.argument_utils import parse_vars
 from nvflare.private.admin_defs import Message
 from nvflare.private.defs import ClientStatusKey
 
@@ -45,7 +46,10 @@ class ClientEngine(ClientEngineInternalSpec):
         self.args = args
         self.rank = rank
         self.client.process = None
-        self.client_executor = ProcessExecutor(client.client_name)
+        # warm worker processes cut the start time of the runs; by default each worker process is started cold
+        warm_workers = parse_vars(args.set).get("warm_workers", 0) if rank == 0 else 0
+        self.client_executor = ProcessExecutor(client.client_name, warm_workers=warm_workers)
+        self.client_executor.start_worker_pool(args)
 
         self.run_number = -1
         self.status = MachineStatus.STOPPED
@@ -136,7 +140,9 @@ class ClientEngine(ClientEngineInternalSpec):
         self._write_token_file(run_number, open_port)
         self.run_number = run_number
 
-        self.client_executor.start_train(self.client, self.args, app_root, app_custom_folder, open_port)
+        self.client_executor.start_train(
+            self.client, self.args, app_root, app_custom_folder, open_port, run_number=run_number
+        )
 
         return "Start the client app..."
 
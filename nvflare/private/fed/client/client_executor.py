@@ -26,6 +26,7 @@ from nvflare.apis.fl_constant import AdminCommandNames, ReturnCode
 from nvflare.apis.shareable import Shareable, make_reply
 from nvflare.fuel.utils.pipe.file_pipe import FilePipe
 from .client_status import ClientStatus, get_status_message
+from .worker_pool import WarmWorkerPool
 
 
 class ClientExecutor(object):
@@ -37,12 +38,13 @@ class ClientExecutor(object):
         self.pipe = FilePipe(root_path=pipe_path, name="training")
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def start_train(self, client, args, app_root, app_custom_folder, listen_port):
+    def start_train(self, client, args, app_root, app_custom_folder, listen_port, run_number=None):
         """
         start_train method to start the FL client training.
         :param client: the FL client object.
         :param args: admin command arguments for starting the FL client training.
         :param app_root: the root folder of the running APP.
+        :param run_number: the run number. The worker reads it from the token file if not given.
         :return:
         """
         pass
@@ -123,7 +125,12 @@ class ProcessExecutor(ClientExecutor):
     Run the Client executor in a child process.
     """
 
-    def __init__(self, uid):
+    def __init__(self, uid, warm_workers: int = 0):
+        """
+        :param uid: the client name
+        :param warm_workers: number of worker processes to start ahead of the runs (see WarmWorkerPool).
+            0 to start the worker process of each run cold.
+        """
         ClientExecutor.__init__(self, uid)
         # self.client = client
 
@@ -134,6 +141,9 @@ class ProcessExecutor(ClientExecutor):
 
         self.lock = threading.Lock()
 
+        self.warm_workers = warm_workers
+        self.worker_pool = None
+
     def get_conn_client(self):
         if not self.conn_client:
             try:
@@ -148,7 +158,27 @@ class ProcessExecutor(ClientExecutor):
 
         return pipe
 
-    def start_train(self, client, args, app_root, app_custom_folder, listen_port):
+    def _get_worker_command(self, args):
+        command_options = ""
+        for t in args.set:
+            command_options += " " + t
+        return (
+            f"{sys.executable} -m nvflare.private.fed.app.client.worker_process -m "
+            + args.workspace
+            + " -s fed_client.json "
+            " --set" + command_options + " print_conf=True"
+        )
+
+    def start_worker_pool(self, args):
+        """Starts the warm workers, so that the next run doesn't wait for a cold worker process."""
+        if self.warm_workers <= 0:
+            return
+        if not self.worker_pool:
+            command = self._get_worker_command(args) + " --warm"
+            self.worker_pool = WarmWorkerPool(shlex.split(command, " "), size=self.warm_workers)
+        self.worker_pool.fill()
+
+    def start_train(self, client, args, app_root, app_custom_folder, listen_port, run_number=None):
         # self.pool = multiprocessing.Pool(processes=1)
         # result = self.pool.apply_async(_start_client, (client, args, app_root))
 
@@ -159,25 +189,35 @@ class ProcessExecutor(ClientExecutor):
 
         self.listen_port = listen_port
 
-        new_env = os.environ.copy()
-        if app_custom_folder != "":
-            new_env["PYTHONPATH"] = new_env["PYTHONPATH"] + ":" + app_custom_folder
-
-        # self.retrieve_cross_validate_setting(client, app_root)
-
-        command_options = ""
-        for t in args.set:
-            command_options += " " + t
-        command = (
-            f"{sys.executable} -m nvflare.private.fed.app.client.worker_process -m "
-            + args.workspace
-            + " -s fed_client.json "
-            " --set" + command_options + " print_conf=True"
-        )
-        # use os.setsid to create new process group ID
-        process = subprocess.Popen(shlex.split(command, " "), preexec_fn=os.setsid, env=new_env)
-
-        print("training child process ID: {}".format(process.pid))
+        process = None
+        if self.worker_pool and run_number is not None:
+            process = self.worker_pool.hand_off(
+                {
+                    "token": client.token,
+                    "run_number": run_number,
+                    "client_name": client.client_name,
+                    "listen_port": listen_port,
+                    "app_custom_folder": app_custom_folder,
+                }
+            )
+
+        if process is None:
+            new_env = os.environ.copy()
+            if app_custom_folder != "":
+                new_env["PYTHONPATH"] = new_env["PYTHONPATH"] + ":" + app_custom_folder
+
+            # self.retrieve_cross_validate_setting(client, app_root)
+
+            command = self._get_worker_command(args)
+            # use os.setsid to create new process group ID
+            process = subprocess.Popen(shlex.split(command, " "), preexec_fn=os.setsid, env=new_env)
+            print("training child process ID: {}".format(process.pid))
+        else:
+            print("training child process ID: {} (warm)".format(process.pid))
+
+        if self.worker_pool:
+            # replace the worker that was handed the run, each run gets a new process
+            self.worker_pool.fill()
 
         client.process = process
         client.multi_gpu = False
@@ -416,6 +456,9 @@ class ProcessExecutor(ClientExecutor):
             data = {"command": AdminCommandNames.SHUTDOWN, "data": {}}
             self.conn_client.send(data)
             self.conn_client = None
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
         self.cleanup()
 
 
@@ -20,7 +20,7 @@ from nvflare.apis.fl_constant import FLContextKey, ReturnCode
 from nvflare.apis.fl_context import FLContext, FLContextManager
 from nvflare.apis.shareable import Shareable, make_reply
 from nvflare.apis.workspace import Workspace
-from nvflare.private.event import fire_event
+from nvflare.private.event import EventDispatcher
 from nvflare.widgets.fed_event import ClientFedEventRunner
 from nvflare.widgets.info_collector import InfoCollector
 from nvflare.widgets.widget import Widget, WidgetID
@@ -58,6 +58,7 @@ class ClientRunManager(ClientEngineExecutorSpec):
 
         self.client = client
         self.handlers = handlers
+        self.event_dispatcher = EventDispatcher(handlers)
         self.workspace = workspace
         self.components = components
         self.aux_runner = ClientAuxRunner()
@@ -72,7 +73,7 @@ class ClientRunManager(ClientEngineExecutorSpec):
 
         self.widgets = {WidgetID.INFO_COLLECTOR: InfoCollector(), WidgetID.FED_EVENT_RUNNER: ClientFedEventRunner()}
         for _, widget in self.widgets.items():
-            self.handlers.append(widget)
+            self.add_handler(widget)
 
     def get_task_assignment(self, fl_ctx: FLContext) -> TaskAssignment:
         pull_success, task_name, remote_tasks = self.client.fetch_task(fl_ctx)
@@ -119,10 +120,10 @@ class ClientRunManager(ClientEngineExecutorSpec):
         return self.widgets.get(widget_id)
 
     def fire_event(self, event_type: str, fl_ctx: FLContext):
-        fire_event(event=event_type, handlers=self.handlers, ctx=fl_ctx)
+        self.event_dispatcher.fire_event(event_type, fl_ctx)
 
     def add_handler(self, handler: FLComponent):
-        self.handlers.append(handler)
+        self.event_dispatcher.add_handler(handler)
 
     def build_component(self, config_dict):
         if not self.conf:
@@ -210,7 +210,8 @@ class ClientRunner(FLComponent):
                     self.log_info(fl_ctx, "run abort signal received")
                     break
 
-                time.sleep(task_fetch_interval)
+                if task_fetch_interval > 0:
+                    time.sleep(task_fetch_interval)
 
                 if self.run_abort_signal.triggered:
                     self.log_info(fl_ctx, "run abort signal received")
@@ -265,6 +266,10 @@ class ClientRunner(FLComponent):
                 self.log_debug(fl_ctx, "firing event EventType.AFTER_SEND_TASK_RESULT")
                 self.fire_event(EventType.AFTER_SEND_TASK_RESULT, fl_ctx)
 
+                # ask for the next task right away: the server holds the request until it has a task,
+                # or asks to try again later
+                task_fetch_interval = 0
+
     def run(self, app_root, args):
         with self.engine.new_context() as fl_ctx:
             fl_ctx.set_prop(FLContextKey.APP_ROOT, app_root, sticky=True)
@@ -339,6 +344,9 @@ class ClientRunner(FLComponent):
         with self.engine.new_context() as fl_ctx:
             self.fire_event(EventType.END_RUN, fl_ctx)
 
+    def get_subscribed_event_types(self):
+        return [InfoCollector.EVENT_TYPE_GET_STATS, EventType.FATAL_TASK_ERROR, EventType.FATAL_SYSTEM_ERROR]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == InfoCollector.EVENT_TYPE_GET_STATS:
             collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR)
@@ -24,10 +24,20 @@ from google.protobuf.struct_pb2 import Struct
 import nvflare.private.fed.protos.federated_pb2 as fed_msg
 import nvflare.private.fed.protos.federated_pb2_grpc as fed_service
 from nvflare.apis.filter import Filter
-from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_constant import DEFAULT_TASK_WAIT_TIME, FLContextKey
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.fl_exception import FLCommunicationError
-from nvflare.private.fed.utils.fed_utils import shareable_to_modeldata, make_context_data, make_shareeable_data
+from nvflare.private.fed.client.channel_pool import CHANNEL_DEFAULT_OPTIONS, ChannelPool, add_channel_options
+from nvflare.private.defs import TaskConstant
+from nvflare.private.fed.utils.fed_utils import (
+    DEFAULT_CHUNK_SIZE,
+    AssembledTask,
+    ChunkAssembler,
+    make_context_data,
+    make_data_chunks,
+    make_shareeable_data,
+    shareable_to_modeldata,
+)
 
 
 class Communicator:
@@ -38,7 +48,23 @@ class Communicator:
         retry_timeout=30,
         client_state_processors: Optional[List[Filter]] = None,
         compression=None,
+        streaming=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        task_wait_time=DEFAULT_TASK_WAIT_TIME,
     ):
+        """
+
+        Args:
+            ssl_args: SSL args
+            secure_train: whether to use secure communication
+            retry_timeout: retry timeout in seconds
+            client_state_processors: client state processors
+            compression: gRPC compression
+            streaming: whether to use the streaming GetTask/SubmitUpdate RPCs, which send the task data in chunks
+            chunk_size: size in bytes of each chunk sent when streaming
+            task_wait_time: time in seconds the server may hold a task request until it has a task for
+                the client, instead of asking the client to try again. 0 to disable.
+        """
         self.ssl_args = ssl_args
         self.secure_train = secure_train
 
@@ -48,6 +74,11 @@ class Communicator:
         self.retry = int(math.ceil(float(retry_timeout) / 5))
         self.client_state_processors = client_state_processors
         self.compression = compression
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.task_wait_time = task_wait_time
+        self.channel_pool = ChannelPool(self.set_up_channel)
+        self._ssl_credentials = None
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -59,17 +90,9 @@ class Communicator:
         :param token: client token
         :return: an initialised grpc channel
         """
+        channel_dict = add_channel_options(channel_dict, CHANNEL_DEFAULT_OPTIONS)
         if self.secure_train:
-            with open(self.ssl_args["ssl_root_cert"], "rb") as f:
-                trusted_certs = f.read()
-            with open(self.ssl_args["ssl_private_key"], "rb") as f:
-                private_key = f.read()
-            with open(self.ssl_args["ssl_cert"], "rb") as f:
-                certificate_chain = f.read()
-
-            credentials = grpc.ssl_channel_credentials(
-                certificate_chain=certificate_chain, private_key=private_key, root_certificates=trusted_certs
-            )
+            credentials = self._get_ssl_credentials()
 
             # make sure that all headers are in lowecase,
             # otherwise grpc throws an exception
@@ -88,6 +111,25 @@ class Communicator:
             channel = grpc.insecure_channel(**channel_dict, compression=self.compression)
         return channel
 
+    def _get_ssl_credentials(self):
+        # the certs only need to be read once
+        if self._ssl_credentials is None:
+            with open(self.ssl_args["ssl_root_cert"], "rb") as f:
+                trusted_certs = f.read()
+            with open(self.ssl_args["ssl_private_key"], "rb") as f:
+                private_key = f.read()
+            with open(self.ssl_args["ssl_cert"], "rb") as f:
+                certificate_chain = f.read()
+
+            self._ssl_credentials = grpc.ssl_channel_credentials(
+                certificate_chain=certificate_chain, private_key=private_key, root_certificates=trusted_certs
+            )
+        return self._ssl_credentials
+
+    def close(self):
+        """Close the pooled channels."""
+        self.channel_pool.close()
+
     def get_client_state(self, project_name, token, fl_ctx: FLContext):
         """
         Client's meta data used to authenticate and communicate.
@@ -141,35 +183,37 @@ class Communicator:
 
         result, retry = None, self.retry
         retry = 1500  # retry register for 2 hours (7500s)
-        with self.set_up_channel(servers[project_name]) as channel:
-            stub = fed_service.FederatedTrainingStub(channel)
-            while retry > 0:
-                try:
-                    start_time = time.time()
+        channel_dict = servers[project_name]
+        while retry > 0:
+            try:
+                start_time = time.time()
+                with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub) as stub:
                     result = stub.Register(login_message)
-                    token = result.token
-                    self.should_stop = False
-                    break
-                except grpc.RpcError as grpc_error:
-                    self.grpc_error_handler(
-                        servers[project_name],
-                        grpc_error,
-                        "client_registration",
-                        start_time,
-                        retry,
-                        verbose=self.verbose,
-                    )
-                    excep = FLCommunicationError(grpc_error)
-                    if isinstance(grpc_error, grpc.Call):
-                        status_code = grpc_error.code()
-                        if grpc.StatusCode.UNAUTHENTICATED == status_code:
-                            raise excep
-                    retry -= 1
-                    time.sleep(5)
-            if self.should_stop:
-                raise excep
-            if result is None:
-                return None
+                    self.channel_pool.report_success(channel_dict)
+                token = result.token
+                self.should_stop = False
+                break
+            except grpc.RpcError as grpc_error:
+                self.channel_pool.report_failure(channel_dict, grpc_error)
+                self.grpc_error_handler(
+                    channel_dict,
+                    grpc_error,
+                    "client_registration",
+                    start_time,
+                    retry,
+                    verbose=self.verbose,
+                )
+                excep = FLCommunicationError(grpc_error)
+                if isinstance(grpc_error, grpc.Call):
+                    status_code = grpc_error.code()
+                    if grpc.StatusCode.UNAUTHENTICATED == status_code:
+                        raise excep
+                retry -= 1
+                time.sleep(5)
+        if self.should_stop:
+            raise excep
+        if result is None:
+            return None
 
         return token
 
@@ -182,39 +226,60 @@ class Communicator:
         :return: a CurrentTask message from server
         """
         global_model, retry = None, self.retry
-        with self.set_up_channel(servers[project_name]) as channel:
-            stub = fed_service.FederatedTrainingStub(channel)
-            while retry > 0:
-                # get the global model
-                try:
-                    start_time = time.time()
-                    global_model = stub.GetTask(self.get_client_state(project_name, token, fl_ctx))
-                    # Clear the stopping flag
-                    # if the connection to server recovered.
+        channel_dict = servers[project_name]
+        while retry > 0:
+            # get the global model
+            try:
+                start_time = time.time()
+                with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
+                    if self.streaming:
+                        task = self._get_task_stream(stub, self._get_task_request(project_name, token, fl_ctx))
+                    else:
+                        global_model = stub.GetTask(self._get_task_request(project_name, token, fl_ctx))
+                    self.channel_pool.report_success(channel_dict)
+
+                if self.streaming:
                     self.should_stop = False
 
                     end_time = time.time()
                     self.logger.info(
                         f"Received from {project_name} server "
-                        f" ({global_model.ByteSize()} Bytes). getTask time: {end_time - start_time} seconds"
+                        f" ({len(task.data.params['data'].ndarray)} Bytes streamed). "
+                        f"getTask time: {end_time - start_time} seconds"
                     )
+                    return task
 
-                    task = fed_msg.CurrentTask()
-                    task.meta.CopyFrom(global_model.meta)
-                    task.meta_data.CopyFrom(global_model.meta_data)
-                    task.data.CopyFrom(global_model.data)
-                    task.task_name = global_model.task_name
+                # Clear the stopping flag
+                # if the connection to server recovered.
+                self.should_stop = False
 
-                    return task
-                except grpc.RpcError as grpc_error:
-                    self.grpc_error_handler(
-                        servers[project_name], grpc_error, "getTask", start_time, retry, verbose=self.verbose
-                    )
-                    excep = FLCommunicationError(grpc_error)
-                    retry -= 1
-                    time.sleep(5)
-            if self.should_stop:
-                raise excep
+                end_time = time.time()
+                self.logger.info(
+                    f"Received from {project_name} server "
+                    f" ({global_model.ByteSize()} Bytes). getTask time: {end_time - start_time} seconds"
+                )
+
+                task = fed_msg.CurrentTask()
+                task.meta.CopyFrom(global_model.meta)
+                task.meta_data.CopyFrom(global_model.meta_data)
+                task.data.CopyFrom(global_model.data)
+                task.task_name = global_model.task_name
+
+                return task
+            except grpc.RpcError as grpc_error:
+                self.channel_pool.report_failure(channel_dict, grpc_error)
+                self.grpc_error_handler(channel_dict, grpc_error, "getTask", start_time, retry, verbose=self.verbose)
+                excep = FLCommunicationError(grpc_error)
+                retry -= 1
+                time.sleep(5)
+            except ValueError as e:
+                # the streamed task data is incomplete or out of order: ask for the task again
+                self.logger.error(f"Action: getTask received bad task data: {e}. retry: {retry}")
+                excep = FLCommunicationError(e)
+                retry -= 1
+                time.sleep(5)
+        if self.should_stop:
+            raise excep
 
         # Failed to get global, return None
         return None
@@ -236,36 +301,45 @@ class Communicator:
         """
         client_state = self.get_client_state(project_name, token, fl_ctx)
         client_state.client_name = client_name
-        contrib = self._get_communication_data(shareable, client_state, fl_ctx, execute_task_name)
+        if self.streaming:
+            contrib = self._get_contribution_header(client_state, fl_ctx, execute_task_name)
+            data = shareable.to_bytes()
+        else:
+            contrib = self._get_communication_data(shareable, client_state, fl_ctx, execute_task_name)
 
         server_msg, retry = None, self.retry
-        with self.set_up_channel(servers[project_name]) as channel:
-            stub = fed_service.FederatedTrainingStub(channel)
-            while retry > 0:
-                try:
-                    start_time = time.time()
+        channel_dict = servers[project_name]
+        while retry > 0:
+            try:
+                start_time = time.time()
+                with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
                     self.logger.info(f"Send submitUpdate to {project_name} server")
-                    server_msg = stub.SubmitUpdate(contrib)
-                    # Clear the stopping flag
-                    # if the connection to server recovered.
-                    self.should_stop = False
+                    if self.streaming:
+                        server_msg = stub.SubmitUpdateStream(self._make_contribution_chunks(contrib, data))
+                    else:
+                        server_msg = stub.SubmitUpdate(contrib)
+                    self.channel_pool.report_success(channel_dict)
+                # Clear the stopping flag
+                # if the connection to server recovered.
+                self.should_stop = False
 
-                    end_time = time.time()
-                    self.logger.info(
-                        f"Received comments: {server_msg.meta.project.name} {server_msg.comment}."
-                        f" SubmitUpdate time: {end_time - start_time} seconds"
-                    )
-                    break
-                except grpc.RpcError as grpc_error:
-                    if isinstance(grpc_error, grpc.Call):
-                        if grpc_error.details().startswith("Contrib"):
-                            self.logger.info(f"submitUpdate failed: {grpc_error.details()}")
-                            break  # outdated contribution, no need to retry
-                    self.grpc_error_handler(
-                        servers[project_name], grpc_error, "submitUpdate", start_time, retry, verbose=self.verbose
-                    )
-                    retry -= 1
-                    time.sleep(5)
+                end_time = time.time()
+                self.logger.info(
+                    f"Received comments: {server_msg.meta.project.name} {server_msg.comment}."
+                    f" SubmitUpdate time: {end_time - start_time} seconds"
+                )
+                break
+            except grpc.RpcError as grpc_error:
+                self.channel_pool.report_failure(channel_dict, grpc_error)
+                if isinstance(grpc_error, grpc.Call):
+                    if grpc_error.details().startswith("Contrib"):
+                        self.logger.info(f"submitUpdate failed: {grpc_error.details()}")
+                        break  # outdated contribution, no need to retry
+                self.grpc_error_handler(
+                    channel_dict, grpc_error, "submitUpdate", start_time, retry, verbose=self.verbose
+                )
+                retry -= 1
+                time.sleep(5)
         return server_msg
 
     def auxCommunicate(self, servers, project_name, token, fl_ctx: FLContext, client_name, shareable, topic, timeout):
@@ -296,24 +370,26 @@ class Communicator:
         aux_message.data["fl_context"].CopyFrom(make_context_data(fl_ctx))
 
         server_msg, retry = None, self.retry
-        with self.set_up_channel(servers[project_name]) as channel:
-            stub = fed_service.FederatedTrainingStub(channel)
-            while retry > 0:
-                try:
-                    start_time = time.time()
+        channel_dict = servers[project_name]
+        while retry > 0:
+            try:
+                start_time = time.time()
+                with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
                     self.logger.info(f"Send AuxMessage to {project_name} server")
                     server_msg = stub.AuxCommunicate(aux_message, timeout=timeout)
-                    # Clear the stopping flag
-                    # if the connection to server recovered.
-                    self.should_stop = False
+                    self.channel_pool.report_success(channel_dict)
+                # Clear the stopping flag
+                # if the connection to server recovered.
+                self.should_stop = False
 
-                    break
-                except grpc.RpcError as grpc_error:
-                    self.grpc_error_handler(
-                        servers[project_name], grpc_error, "AuxCommunicate", start_time, retry, verbose=self.verbose
-                    )
-                    retry -= 1
-                    time.sleep(5)
+                break
+            except grpc.RpcError as grpc_error:
+                self.channel_pool.report_failure(channel_dict, grpc_error)
+                self.grpc_error_handler(
+                    channel_dict, grpc_error, "AuxCommunicate", start_time, retry, verbose=self.verbose
+                )
+                retry -= 1
+                time.sleep(5)
         return server_msg
 
     def quit_remote(self, servers, task_name, token, fl_ctx: FLContext):
@@ -324,26 +400,28 @@ class Communicator:
         :return: server's reply to the last message
         """
         server_message, retry = None, self.retry
-        with self.set_up_channel(servers[task_name]) as channel:
-            stub = fed_service.FederatedTrainingStub(channel)
-            while retry > 0:
-                try:
-                    start_time = time.time()
+        channel_dict = servers[task_name]
+        while retry > 0:
+            try:
+                start_time = time.time()
+                with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
                     self.logger.info(f"Quitting server: {task_name}")
                     server_message = stub.Quit(self.get_client_state(task_name, token, fl_ctx))
-                    # Clear the stopping flag
-                    # if the connection to server recovered.
-                    self.should_stop = False
+                    self.channel_pool.report_success(channel_dict)
+                # Clear the stopping flag
+                # if the connection to server recovered.
+                self.should_stop = False
 
-                    end_time = time.time()
-                    self.logger.info(
-                        f"Received comment from server: {server_message.comment}. Quit time: {end_time - start_time} seconds"
-                    )
-                    break
-                except grpc.RpcError as grpc_error:
-                    self.grpc_error_handler(servers[task_name], grpc_error, "quit_remote", start_time, retry)
-                    retry -= 1
-                    time.sleep(3)
+                end_time = time.time()
+                self.logger.info(
+                    f"Received comment from server: {server_message.comment}. Quit time: {end_time - start_time} seconds"
+                )
+                break
+            except grpc.RpcError as grpc_error:
+                self.channel_pool.report_failure(channel_dict, grpc_error)
+                self.grpc_error_handler(channel_dict, grpc_error, "quit_remote", start_time, retry)
+                retry -= 1
+                time.sleep(3)
         return server_message
 
     def send_heartbeat(self, servers, task_name, token, client_name):
@@ -351,26 +429,37 @@ class Communicator:
         message.token = token
         message.client_name = client_name
 
-        with self.set_up_channel(servers[task_name]) as channel:
-            while not self.heartbeat_done:
-                stub = fed_service.FederatedTrainingStub(channel)
-                # retry the heartbeat call for 10 minutes
-                retry = 120
-                while retry > 0:
-                    try:
+        channel_dict = servers[task_name]
+        while not self.heartbeat_done:
+            # retry the heartbeat call for 10 minutes
+            retry = 120
+            while retry > 0:
+                try:
+                    with self.channel_pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
                         self.logger.debug(f"Send {task_name} heartbeat {token}")
                         stub.Heartbeat(message)
-                        break
-                    except grpc.RpcError as grpc_error:
-                        self.logger.debug(grpc_error)
-                        excep = FLCommunicationError(grpc_error)
-                        retry -= 1
-                        time.sleep(5)
-                        # pass
-                # if retry <= 0:
-                #     raise excep
-
-                time.sleep(60)
+                        self.channel_pool.report_success(channel_dict)
+                    break
+                except grpc.RpcError as grpc_error:
+                    self.channel_pool.report_failure(channel_dict, grpc_error)
+                    self.logger.debug(grpc_error)
+                    excep = FLCommunicationError(grpc_error)
+                    retry -= 1
+                    time.sleep(5)
+                    # pass
+            # if retry <= 0:
+            #     raise excep
+
+            time.sleep(60)
+
+    def _get_task_request(self, project_name, token, fl_ctx: FLContext):
+        client_state = self.get_client_state(project_name, token, fl_ctx)
+        if self.task_wait_time > 0:
+            # let the server hold the request until it has a task for this client
+            client_state.meta_data[TaskConstant.TASK_WAIT_TIME] = self.task_wait_time
+        # the server can send the task headers separately from the task data
+        client_state.meta_data[TaskConstant.SPLIT_HEADERS] = True
+        return client_state
 
     def _get_communication_data(self, shareable, client_state, fl_ctx: FLContext, execute_task_name):
         contrib = fed_msg.Contribution()
@@ -386,6 +475,32 @@ class Communicator:
 
         return contrib
 
+    def _get_contribution_header(self, client_state, fl_ctx: FLContext, execute_task_name):
+        contrib = fed_msg.Contribution()
+        contrib.client.CopyFrom(client_state)
+        contrib.task_name = execute_task_name
+        contrib.data.params["fl_context"].CopyFrom(make_context_data(fl_ctx))
+        contrib.meta_data.CopyFrom(Struct())
+        return contrib
+
+    def _make_contribution_chunks(self, contrib, data):
+        for i, chunk in enumerate(make_data_chunks(data, self.chunk_size)):
+            if i == 0:
+                yield fed_msg.ContributionChunk(contribution=contrib, chunk=chunk)
+            else:
+                yield fed_msg.ContributionChunk(chunk=chunk)
+
+    def _get_task_stream(self, stub, client_state):
+        task = None
+        assembler = ChunkAssembler()
+        for item in stub.GetTaskStream(client_state):
+            if task is None:
+                task = item.task
+            assembler.add(item.chunk)
+
+        data = assembler.get_data()
+        return AssembledTask(task, data)
+
     def grpc_error_handler(self, service, grpc_error, action, start_time, retry, verbose=False):
         """
         Handling grpc exceptions
@@ -19,11 +19,13 @@ from typing import List, Optional
 from nvflare.apis.event_type import EventType
 from nvflare.apis.executor import Executor
 from nvflare.apis.filter import Filter
+from nvflare.apis.fl_constant import DEFAULT_TASK_WAIT_TIME
 from nvflare.apis.fl_component import FLComponent
 from nvflare.apis.fl_context import FLContext
-from nvflare.apis.shareable import Shareable
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
 from nvflare.private.event import fire_event
 from .fed_client_base import FederatedClientBase
+from ..utils.fed_utils import DEFAULT_CHUNK_SIZE
 from ..utils.numproto import proto_to_bytes
 
 
@@ -44,6 +46,9 @@ class FederatedClient(FederatedClientBase):
         executors: Optional[List[Executor]] = None,
         compression=None,
         enable_byoc=False,
+        streaming=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        task_wait_time=DEFAULT_TASK_WAIT_TIME,
     ):
         # We call the base implementation directly.
         super().__init__(
@@ -55,6 +60,9 @@ class FederatedClient(FederatedClientBase):
             client_state_processors=client_state_processors,
             handlers=handlers,
             compression=compression,
+            streaming=streaming,
+            chunk_size=chunk_size,
+            task_wait_time=task_wait_time,
         )
 
         self.executors = executors
@@ -73,6 +81,9 @@ class FederatedClient(FederatedClientBase):
         peer_context = FLContext()
         for item in responses:
             shareable = shareable.from_bytes(proto_to_bytes(item.data.params["data"]))
+            if "headers" in item.data.params:
+                # the headers of a task are sent separately from its body
+                shareable[ReservedHeaderKey.HEADERS] = pickle.loads(proto_to_bytes(item.data.params["headers"]))
             peer_context = pickle.loads(proto_to_bytes(item.data.params["fl_context"]))
 
         fl_ctx.set_peer_context(peer_context)
@@ -22,12 +22,13 @@ from typing import List, Optional
 
 from nvflare.apis.filter import Filter
 from nvflare.apis.fl_component import FLComponent
-from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_constant import DEFAULT_TASK_WAIT_TIME, FLContextKey
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.fl_exception import FLCommunicationError
 from nvflare.apis.shareable import Shareable
 from nvflare.apis.signal import Signal
 from nvflare.private.defs import EngineConstant
+from nvflare.private.fed.utils.fed_utils import DEFAULT_CHUNK_SIZE
 from .client_status import ClientStatus
 from .communicator import Communicator
 
@@ -48,6 +49,9 @@ class FederatedClientBase:
         client_state_processors: Optional[List[Filter]] = None,
         handlers: Optional[List[FLComponent]] = None,
         compression=None,
+        streaming=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        task_wait_time=DEFAULT_TASK_WAIT_TIME,
     ):
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -62,6 +66,9 @@ class FederatedClientBase:
             retry_timeout=retry_timeout,
             client_state_processors=client_state_processors,
             compression=compression,
+            streaming=streaming,
+            chunk_size=chunk_size,
+            task_wait_time=task_wait_time,
         )
 
         self.secure_train = secure_train
@@ -270,6 +277,7 @@ class FederatedClientBase:
         Quit the remote federated server, close the local session.
         """
         self.logger.info("Shutting down client")
+        self.communicator.close()
 
         return 0
 
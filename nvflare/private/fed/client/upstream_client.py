@@ -0,0 +1,120 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from nvflare.apis.fl_constant import DEFAULT_TASK_WAIT_TIME, FLContextKey
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+from nvflare.apis.upstream_client_spec import UpstreamClientSpec
+from nvflare.private.defs import SpecialTaskName, TaskConstant
+from nvflare.private.fed.client.fed_client import FederatedClient
+
+
+class UpstreamClient(UpstreamClientSpec):
+    def __init__(
+        self,
+        target: str,
+        project_name: str,
+        client_name: str,
+        run_number: int = None,
+        secure_train: bool = False,
+        ssl_root_cert: str = None,
+        ssl_cert: str = None,
+        ssl_private_key: str = None,
+        task_wait_time: int = DEFAULT_TASK_WAIT_TIME,
+        retry_interval: float = 5.0,
+    ):
+        """Connection of a relay to the upstream server, on which the relay acts as a client.
+
+        Args:
+            target: host:port of the upstream server
+            project_name: project name of the upstream server
+            client_name: client name of the relay on the upstream server
+            run_number: run number of the upstream server. Defaults to the run number of the relay.
+            secure_train: whether the upstream connection uses SSL
+            ssl_root_cert: root certificate of the upstream project
+            ssl_cert: client certificate of the relay in the upstream project
+            ssl_private_key: private key of the relay certificate
+            task_wait_time: time in seconds the upstream server may hold a task request
+            retry_interval: time in seconds to wait before asking the upstream server again
+        """
+        super().__init__()
+        if secure_train and not (ssl_root_cert and ssl_cert and ssl_private_key):
+            raise ValueError("secure_train requires ssl_root_cert, ssl_cert and ssl_private_key.")
+
+        self.target = target
+        self.project_name = project_name
+        self.client_name = client_name
+        self.run_number = run_number
+        self.secure_train = secure_train
+        self.ssl_args = {"ssl_root_cert": ssl_root_cert, "ssl_cert": ssl_cert, "ssl_private_key": ssl_private_key}
+        self.task_wait_time = task_wait_time
+        self.retry_interval = retry_interval
+        self.client = None  # the FederatedClient, created when registering
+        self.run_ended = False
+
+    def _new_context(self) -> FLContext:
+        fl_ctx = FLContext()
+        fl_ctx.set_run_number(self.run_number)
+        fl_ctx.set_prop(FLContextKey.CURRENT_RUN, self.run_number, private=False)
+        fl_ctx.set_prop(FLContextKey.CLIENT_NAME, self.client_name, private=False)
+        return fl_ctx
+
+    def register(self, fl_ctx: FLContext) -> bool:
+        if self.run_number is None:
+            self.run_number = fl_ctx.get_run_number()
+        if self.client is None:
+            self.client = FederatedClient(
+                client_name=self.client_name,
+                client_args=self.ssl_args,
+                secure_train=self.secure_train,
+                server_args={self.project_name: {"target": self.target}},
+                task_wait_time=self.task_wait_time,
+            )
+        self.client.register()
+        if self.client.token is None:
+            return False
+        self.log_info(fl_ctx, f"{self.client_name} registered to {self.target}")
+        return True
+
+    def get_task(self, fl_ctx: FLContext):
+        pull_success, task_name, remote_tasks = self.client.fetch_task(self._new_context())
+        if not pull_success:
+            self.log_info(fl_ctx, f"no task from {self.target} - will try in {self.retry_interval} secs")
+            time.sleep(self.retry_interval)
+            return None, None
+
+        if task_name == SpecialTaskName.END_RUN:
+            self.run_ended = True
+            return None, None
+
+        task_data = self.client.extract_shareable(remote_tasks, self._new_context())
+        if task_name == SpecialTaskName.TRY_AGAIN:
+            time.sleep(task_data.get(TaskConstant.WAIT_TIME, self.retry_interval))
+            return None, None
+        return task_name, task_data
+
+    def is_run_ended(self) -> bool:
+        return self.run_ended
+
+    def submit_result(self, task_name: str, result: Shareable, fl_ctx: FLContext) -> bool:
+        upstream_ctx = self._new_context()
+        upstream_ctx.set_prop(FLContextKey.TASK_NAME, task_name, private=True, sticky=False)
+        messages = self.client.push_results(result, upstream_ctx)
+        return bool(messages) and all(m is not None for m in messages)
+
+    def close(self):
+        if self.client:
+            self.client.close()
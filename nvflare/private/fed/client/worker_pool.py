@@ -0,0 +1,89 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import subprocess
+import threading
+
+
+class WarmWorkerPool(object):
+    def __init__(self, command: list, size: int = 1):
+        """Pool of worker processes started ahead of the runs.
+
+        A warm worker does the run independent start work (imports, security content, class index) and then waits
+        for a run on its stdin. It is handed one run only and exits when the run ends, so runs don't share a
+        process. The pool starts a new worker for the next run once a worker is handed a run.
+
+        Args:
+            command: the command of the worker process. The worker must read the run (one JSON line) from stdin,
+                and exit if stdin is closed before a run arrives.
+            size: number of warm workers to keep
+        """
+        self.command = command
+        self.size = size
+        self.idle = []
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _start_worker(self):
+        # use os.setsid to create new process group ID, like for the cold started workers
+        process = subprocess.Popen(self.command, preexec_fn=os.setsid, env=os.environ.copy(), stdin=subprocess.PIPE)
+        self.logger.info("started warm worker process {}".format(process.pid))
+        return process
+
+    def fill(self):
+        """Starts workers until the pool has size live idle workers."""
+        with self.lock:
+            self.idle = [p for p in self.idle if p.poll() is None]
+            while len(self.idle) < self.size:
+                self.idle.append(self._start_worker())
+
+    def hand_off(self, run: dict):
+        """Hands a run to an idle worker.
+
+        Args:
+            run: the run info (JSON serializable) sent to the worker
+
+        Returns: the worker process (subprocess.Popen), or None if there is no live idle worker
+
+        """
+        data = (json.dumps(run) + "\n").encode()
+        with self.lock:
+            while self.idle:
+                process = self.idle.pop(0)
+                if process.poll() is not None:
+                    self.logger.warning("warm worker process {} exited with {}".format(process.pid, process.returncode))
+                    continue
+                try:
+                    process.stdin.write(data)
+                    # the worker takes no other run
+                    process.stdin.close()
+                except OSError:
+                    continue
+                return process
+        return None
+
+    def shutdown(self):
+        """Stops the idle workers. The workers that were handed a run are not affected."""
+        with self.lock:
+            idle = self.idle
+            self.idle = []
+        for process in idle:
+            try:
+                # an idle worker exits when its stdin is closed
+                process.stdin.close()
+            except OSError:
+                pass
@@ -36,7 +36,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
     syntax="proto3",
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
-    serialized_pb=b'\n*nvflare/private/fed/protos/federated.proto\x12\x08\x66\x65\x64learn\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto"\xcd\x01\n\x08MetaData\x12+\n\x07project\x18\x01 \x01(\x0b\x32\x1a.fedlearn.MetaData.Project\x12\x15\n\rcurrent_round\x18\x02 \x01(\x03\x12\x12\n\nnum_rounds\x18\x03 \x01(\x03\x12\x12\n\nrun_number\x18\x04 \x01(\x03\x12+\n\x07\x63reated\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x1a(\n\x07Project\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t"~\n\tModelData\x12/\n\x06params\x18\x01 \x03(\x0b\x32\x1f.fedlearn.ModelData.ParamsEntry\x1a@\n\x0bParamsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"\x1a\n\x07NDArray\x12\x0f\n\x07ndarray\x18\x01 \x01(\x0c"\x91\x01\n\x0b\x43urrentTask\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12!\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x13.fedlearn.ModelData\x12*\n\tmeta_data\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x11\n\ttask_name\x18\x04 \x01(\t"T\n\x10\x46\x65\x64\x65ratedSummary\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12\x0f\n\x07\x63omment\x18\x02 \x01(\t\x12\r\n\x05token\x18\x03 \x01(\t"f\n\x0b\x43lientLogin\x12\x13\n\x0b\x63lient_name\x18\x01 \x01(\t\x12\r\n\x05token\x18\x02 \x01(\t\x12\x11\n\tclient_ip\x18\x03 \x01(\t\x12 \n\x04meta\x18\x04 \x01(\x0b\x32\x12.fedlearn.MetaData"\xf7\x01\n\x0b\x43lientState\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12\x13\n\x0b\x63lient_name\x18\x02 \x01(\t\x12\r\n\x05token\x18\x03 \x01(\t\x12*\n\tmeta_data\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x33\n\x07\x63ontext\x18\x05 \x03(\x0b\x32".fedlearn.ClientState.ContextEntry\x1a\x41\n\x0c\x43ontextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"\xb5\x01\n\x0c\x43ontribution\x12%\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x15.fedlearn.ClientState\x12\x0e\n\x06n_iter\x18\x02 \x01(\x03\x12\x0c\n\x04type\x18\x03 \x01(\t\x12!\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x13.fedlearn.ModelData\x12*\n\tmeta_data\x18\x05 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x11\n\ttask_name\x18\x06 \x01(\t"+\n\x05Token\x12\r\n\x05token\x18\x01 \x01(\t\x12\x13\n\x0b\x63lient_name\x18\x02 \x01(\t"\xa1\x01\n\nAuxMessage\x12%\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x15.fedlearn.ClientState\x12,\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x1e.fedlearn.AuxMessage.DataEntry\x1a>\n\tDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"-\n\x08\x41uxReply\x12!\n\x04\x64\x61ta\x18\x01 \x01(\x0b\x32\x13.fedlearn.ModelData2\x8c\x03\n\x11\x46\x65\x64\x65ratedTraining\x12?\n\x08Register\x12\x15.fedlearn.ClientLogin\x1a\x1a.fedlearn.FederatedSummary"\x00\x12;\n\x04Quit\x12\x15.fedlearn.ClientState\x1a\x1a.fedlearn.FederatedSummary"\x00\x12\x39\n\x07GetTask\x12\x15.fedlearn.ClientState\x1a\x15.fedlearn.CurrentTask"\x00\x12\x44\n\x0cSubmitUpdate\x12\x16.fedlearn.Contribution\x1a\x1a.fedlearn.FederatedSummary"\x00\x12:\n\tHeartbeat\x12\x0f.fedlearn.Token\x1a\x1a.fedlearn.FederatedSummary"\x00\x12<\n\x0e\x41uxCommunicate\x12\x14.fedlearn.AuxMessage\x1a\x12.fedlearn.AuxReply"\x00\x62\x06proto3',
+    serialized_pb=b'\n*nvflare/private/fed/protos/federated.proto\x12\x08\x66\x65\x64learn\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto"\xcd\x01\n\x08MetaData\x12+\n\x07project\x18\x01 \x01(\x0b\x32\x1a.fedlearn.MetaData.Project\x12\x15\n\rcurrent_round\x18\x02 \x01(\x03\x12\x12\n\nnum_rounds\x18\x03 \x01(\x03\x12\x12\n\nrun_number\x18\x04 \x01(\x03\x12+\n\x07\x63reated\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x1a(\n\x07Project\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t"~\n\tModelData\x12/\n\x06params\x18\x01 \x03(\x0b\x32\x1f.fedlearn.ModelData.ParamsEntry\x1a@\n\x0bParamsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"\x1a\n\x07NDArray\x12\x0f\n\x07ndarray\x18\x01 \x01(\x0c"=\n\tDataChunk\x12\x12\n\ntotal_size\x18\x01 \x01(\x03\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c"\x91\x01\n\x0b\x43urrentTask\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12!\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x13.fedlearn.ModelData\x12*\n\tmeta_data\x18\x03 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x11\n\ttask_name\x18\x04 \x01(\t"[\n\x10\x43urrentTaskChunk\x12#\n\x04task\x18\x01 \x01(\x0b\x32\x15.fedlearn.CurrentTask\x12"\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x13.fedlearn.DataChunk"T\n\x10\x46\x65\x64\x65ratedSummary\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12\x0f\n\x07\x63omment\x18\x02 \x01(\t\x12\r\n\x05token\x18\x03 \x01(\t"f\n\x0b\x43lientLogin\x12\x13\n\x0b\x63lient_name\x18\x01 \x01(\t\x12\r\n\x05token\x18\x02 \x01(\t\x12\x11\n\tclient_ip\x18\x03 \x01(\t\x12 \n\x04meta\x18\x04 \x01(\x0b\x32\x12.fedlearn.MetaData"\xf7\x01\n\x0b\x43lientState\x12 \n\x04meta\x18\x01 \x01(\x0b\x32\x12.fedlearn.MetaData\x12\x13\n\x0b\x63lient_name\x18\x02 \x01(\t\x12\r\n\x05token\x18\x03 \x01(\t\x12*\n\tmeta_data\x18\x04 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x33\n\x07\x63ontext\x18\x05 \x03(\x0b\x32".fedlearn.ClientState.ContextEntry\x1a\x41\n\x0c\x43ontextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"\xb5\x01\n\x0c\x43ontribution\x12%\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x15.fedlearn.ClientState\x12\x0e\n\x06n_iter\x18\x02 \x01(\x03\x12\x0c\n\x04type\x18\x03 \x01(\t\x12!\n\x04\x64\x61ta\x18\x04 \x01(\x0b\x32\x13.fedlearn.ModelData\x12*\n\tmeta_data\x18\x05 \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x11\n\ttask_name\x18\x06 \x01(\t"e\n\x11\x43ontributionChunk\x12,\n\x0c\x63ontribution\x18\x01 \x01(\x0b\x32\x16.fedlearn.Contribution\x12"\n\x05\x63hunk\x18\x02 \x01(\x0b\x32\x13.fedlearn.DataChunk"+\n\x05Token\x12\r\n\x05token\x18\x01 \x01(\t\x12\x13\n\x0b\x63lient_name\x18\x02 \x01(\t"\xa1\x01\n\nAuxMessage\x12%\n\x06\x63lient\x18\x01 \x01(\x0b\x32\x15.fedlearn.ClientState\x12,\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x1e.fedlearn.AuxMessage.DataEntry\x1a>\n\tDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12 \n\x05value\x18\x02 \x01(\x0b\x32\x11.fedlearn.NDArray:\x02\x38\x01"-\n\x08\x41uxReply\x12!\n\x04\x64\x61ta\x18\x01 \x01(\x0b\x32\x13.fedlearn.ModelData2\xa7\x04\n\x11\x46\x65\x64\x65ratedTraining\x12?\n\x08Register\x12\x15.fedlearn.ClientLogin\x1a\x1a.fedlearn.FederatedSummary"\x00\x12;\n\x04Quit\x12\x15.fedlearn.ClientState\x1a\x1a.fedlearn.FederatedSummary"\x00\x12\x39\n\x07GetTask\x12\x15.fedlearn.ClientState\x1a\x15.fedlearn.CurrentTask"\x00\x12\x44\n\x0cSubmitUpdate\x12\x16.fedlearn.Contribution\x1a\x1a.fedlearn.FederatedSummary"\x00\x12:\n\tHeartbeat\x12\x0f.fedlearn.Token\x1a\x1a.fedlearn.FederatedSummary"\x00\x12<\n\x0e\x41uxCommunicate\x12\x14.fedlearn.AuxMessage\x1a\x12.fedlearn.AuxReply"\x00\x12\x46\n\rGetTaskStream\x12\x15.fedlearn.ClientState\x1a\x1a.fedlearn.CurrentTaskChunk"\x00\x30\x01\x12Q\n\x12SubmitUpdateStream\x12\x1b.fedlearn.ContributionChunk\x1a\x1a.fedlearn.FederatedSummary"\x00(\x01\x62\x06proto3',
     dependencies=[
         google_dot_protobuf_dot_timestamp__pb2.DESCRIPTOR,
         google_dot_protobuf_dot_struct__pb2.DESCRIPTOR,
@@ -365,6 +365,85 @@ _NDARRAY = _descriptor.Descriptor(
 )
 
 
+_DATACHUNK = _descriptor.Descriptor(
+    name="DataChunk",
+    full_name="fedlearn.DataChunk",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    create_key=_descriptor._internal_create_key,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="total_size",
+            full_name="fedlearn.DataChunk.total_size",
+            index=0,
+            number=1,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+        _descriptor.FieldDescriptor(
+            name="offset",
+            full_name="fedlearn.DataChunk.offset",
+            index=1,
+            number=2,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+        _descriptor.FieldDescriptor(
+            name="data",
+            full_name="fedlearn.DataChunk.data",
+            index=2,
+            number=3,
+            type=12,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=b"",
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=483,
+    serialized_end=544,
+)
+
+
 _CURRENTTASK = _descriptor.Descriptor(
     name="CurrentTask",
     full_name="fedlearn.CurrentTask",
@@ -458,8 +537,68 @@ _CURRENTTASK = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=484,
-    serialized_end=629,
+    serialized_start=547,
+    serialized_end=692,
+)
+
+
+_CURRENTTASKCHUNK = _descriptor.Descriptor(
+    name="CurrentTaskChunk",
+    full_name="fedlearn.CurrentTaskChunk",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    create_key=_descriptor._internal_create_key,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="task",
+            full_name="fedlearn.CurrentTaskChunk.task",
+            index=0,
+            number=1,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+        _descriptor.FieldDescriptor(
+            name="chunk",
+            full_name="fedlearn.CurrentTaskChunk.chunk",
+            index=1,
+            number=2,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=694,
+    serialized_end=785,
 )
 
 
@@ -537,8 +676,8 @@ _FEDERATEDSUMMARY = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=631,
-    serialized_end=715,
+    serialized_start=787,
+    serialized_end=871,
 )
 
 
@@ -635,8 +774,8 @@ _CLIENTLOGIN = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=717,
-    serialized_end=819,
+    serialized_start=873,
+    serialized_end=975,
 )
 
 
@@ -695,8 +834,8 @@ _CLIENTSTATE_CONTEXTENTRY = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1004,
-    serialized_end=1069,
+    serialized_start=1160,
+    serialized_end=1225,
 )
 
 _CLIENTSTATE = _descriptor.Descriptor(
@@ -813,8 +952,8 @@ _CLIENTSTATE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=822,
-    serialized_end=1069,
+    serialized_start=978,
+    serialized_end=1225,
 )
 
 
@@ -949,8 +1088,68 @@ _CONTRIBUTION = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1072,
-    serialized_end=1253,
+    serialized_start=1228,
+    serialized_end=1409,
+)
+
+
+_CONTRIBUTIONCHUNK = _descriptor.Descriptor(
+    name="ContributionChunk",
+    full_name="fedlearn.ContributionChunk",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    create_key=_descriptor._internal_create_key,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="contribution",
+            full_name="fedlearn.ContributionChunk.contribution",
+            index=0,
+            number=1,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+        _descriptor.FieldDescriptor(
+            name="chunk",
+            full_name="fedlearn.ContributionChunk.chunk",
+            index=1,
+            number=2,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+            create_key=_descriptor._internal_create_key,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=1411,
+    serialized_end=1512,
 )
 
 
@@ -1009,8 +1208,8 @@ _TOKEN = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1255,
-    serialized_end=1298,
+    serialized_start=1514,
+    serialized_end=1557,
 )
 
 
@@ -1069,8 +1268,8 @@ _AUXMESSAGE_DATAENTRY = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1400,
-    serialized_end=1462,
+    serialized_start=1659,
+    serialized_end=1721,
 )
 
 _AUXMESSAGE = _descriptor.Descriptor(
@@ -1130,8 +1329,8 @@ _AUXMESSAGE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1301,
-    serialized_end=1462,
+    serialized_start=1560,
+    serialized_end=1721,
 )
 
 
@@ -1171,8 +1370,8 @@ _AUXREPLY = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1464,
-    serialized_end=1509,
+    serialized_start=1723,
+    serialized_end=1768,
 )
 
 _METADATA_PROJECT.containing_type = _METADATA
@@ -1184,6 +1383,8 @@ _MODELDATA.fields_by_name["params"].message_type = _MODELDATA_PARAMSENTRY
 _CURRENTTASK.fields_by_name["meta"].message_type = _METADATA
 _CURRENTTASK.fields_by_name["data"].message_type = _MODELDATA
 _CURRENTTASK.fields_by_name["meta_data"].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
+_CURRENTTASKCHUNK.fields_by_name["task"].message_type = _CURRENTTASK
+_CURRENTTASKCHUNK.fields_by_name["chunk"].message_type = _DATACHUNK
 _FEDERATEDSUMMARY.fields_by_name["meta"].message_type = _METADATA
 _CLIENTLOGIN.fields_by_name["meta"].message_type = _METADATA
 _CLIENTSTATE_CONTEXTENTRY.fields_by_name["value"].message_type = _NDARRAY
@@ -1194,6 +1395,8 @@ _CLIENTSTATE.fields_by_name["context"].message_type = _CLIENTSTATE_CONTEXTENTRY
 _CONTRIBUTION.fields_by_name["client"].message_type = _CLIENTSTATE
 _CONTRIBUTION.fields_by_name["data"].message_type = _MODELDATA
 _CONTRIBUTION.fields_by_name["meta_data"].message_type = google_dot_protobuf_dot_struct__pb2._STRUCT
+_CONTRIBUTIONCHUNK.fields_by_name["contribution"].message_type = _CONTRIBUTION
+_CONTRIBUTIONCHUNK.fields_by_name["chunk"].message_type = _DATACHUNK
 _AUXMESSAGE_DATAENTRY.fields_by_name["value"].message_type = _NDARRAY
 _AUXMESSAGE_DATAENTRY.containing_type = _AUXMESSAGE
 _AUXMESSAGE.fields_by_name["client"].message_type = _CLIENTSTATE
@@ -1202,11 +1405,14 @@ _AUXREPLY.fields_by_name["data"].message_type = _MODELDATA
 DESCRIPTOR.message_types_by_name["MetaData"] = _METADATA
 DESCRIPTOR.message_types_by_name["ModelData"] = _MODELDATA
 DESCRIPTOR.message_types_by_name["NDArray"] = _NDARRAY
+DESCRIPTOR.message_types_by_name["DataChunk"] = _DATACHUNK
 DESCRIPTOR.message_types_by_name["CurrentTask"] = _CURRENTTASK
+DESCRIPTOR.message_types_by_name["CurrentTaskChunk"] = _CURRENTTASKCHUNK
 DESCRIPTOR.message_types_by_name["FederatedSummary"] = _FEDERATEDSUMMARY
 DESCRIPTOR.message_types_by_name["ClientLogin"] = _CLIENTLOGIN
 DESCRIPTOR.message_types_by_name["ClientState"] = _CLIENTSTATE
 DESCRIPTOR.message_types_by_name["Contribution"] = _CONTRIBUTION
+DESCRIPTOR.message_types_by_name["ContributionChunk"] = _CONTRIBUTIONCHUNK
 DESCRIPTOR.message_types_by_name["Token"] = _TOKEN
 DESCRIPTOR.message_types_by_name["AuxMessage"] = _AUXMESSAGE
 DESCRIPTOR.message_types_by_name["AuxReply"] = _AUXREPLY
@@ -1265,6 +1471,17 @@ NDArray = _reflection.GeneratedProtocolMessageType(
 )
 _sym_db.RegisterMessage(NDArray)
 
+DataChunk = _reflection.GeneratedProtocolMessageType(
+    "DataChunk",
+    (_message.Message,),
+    {
+        "DESCRIPTOR": _DATACHUNK,
+        "__module__": "nvflare.private.fed.protos.federated_pb2"
+        # @@protoc_insertion_point(class_scope:fedlearn.DataChunk)
+    },
+)
+_sym_db.RegisterMessage(DataChunk)
+
 CurrentTask = _reflection.GeneratedProtocolMessageType(
     "CurrentTask",
     (_message.Message,),
@@ -1276,6 +1493,17 @@ CurrentTask = _reflection.GeneratedProtocolMessageType(
 )
 _sym_db.RegisterMessage(CurrentTask)
 
+CurrentTaskChunk = _reflection.GeneratedProtocolMessageType(
+    "CurrentTaskChunk",
+    (_message.Message,),
+    {
+        "DESCRIPTOR": _CURRENTTASKCHUNK,
+        "__module__": "nvflare.private.fed.protos.federated_pb2"
+        # @@protoc_insertion_point(class_scope:fedlearn.CurrentTaskChunk)
+    },
+)
+_sym_db.RegisterMessage(CurrentTaskChunk)
+
 FederatedSummary = _reflection.GeneratedProtocolMessageType(
     "FederatedSummary",
     (_message.Message,),
@@ -1330,6 +1558,17 @@ Contribution = _reflection.GeneratedProtocolMessageType(
 )
 _sym_db.RegisterMessage(Contribution)
 
+ContributionChunk = _reflection.GeneratedProtocolMessageType(
+    "ContributionChunk",
+    (_message.Message,),
+    {
+        "DESCRIPTOR": _CONTRIBUTIONCHUNK,
+        "__module__": "nvflare.private.fed.protos.federated_pb2"
+        # @@protoc_insertion_point(class_scope:fedlearn.ContributionChunk)
+    },
+)
+_sym_db.RegisterMessage(ContributionChunk)
+
 Token = _reflection.GeneratedProtocolMessageType(
     "Token",
     (_message.Message,),
@@ -1385,8 +1624,8 @@ _FEDERATEDTRAINING = _descriptor.ServiceDescriptor(
     index=0,
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
-    serialized_start=1512,
-    serialized_end=1908,
+    serialized_start=1771,
+    serialized_end=2322,
     methods=[
         _descriptor.MethodDescriptor(
             name="Register",
@@ -1448,6 +1687,26 @@ _FEDERATEDTRAINING = _descriptor.ServiceDescriptor(
             serialized_options=None,
             create_key=_descriptor._internal_create_key,
         ),
+        _descriptor.MethodDescriptor(
+            name="GetTaskStream",
+            full_name="fedlearn.FederatedTraining.GetTaskStream",
+            index=6,
+            containing_service=None,
+            input_type=_CLIENTSTATE,
+            output_type=_CURRENTTASKCHUNK,
+            serialized_options=None,
+            create_key=_descriptor._internal_create_key,
+        ),
+        _descriptor.MethodDescriptor(
+            name="SubmitUpdateStream",
+            full_name="fedlearn.FederatedTraining.SubmitUpdateStream",
+            index=7,
+            containing_service=None,
+            input_type=_CONTRIBUTIONCHUNK,
+            output_type=_FEDERATEDSUMMARY,
+            serialized_options=None,
+            create_key=_descriptor._internal_create_key,
+        ),
     ],
 )
 _sym_db.RegisterServiceDescriptor(_FEDERATEDTRAINING)
@@ -58,6 +58,16 @@ class FederatedTrainingStub(object):
             request_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.AuxMessage.SerializeToString,
             response_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.AuxReply.FromString,
         )
+        self.GetTaskStream = channel.unary_stream(
+            "/fedlearn.FederatedTraining/GetTaskStream",
+            request_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ClientState.SerializeToString,
+            response_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.CurrentTaskChunk.FromString,
+        )
+        self.SubmitUpdateStream = channel.stream_unary(
+            "/fedlearn.FederatedTraining/SubmitUpdateStream",
+            request_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ContributionChunk.SerializeToString,
+            response_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.FederatedSummary.FromString,
+        )
 
 
 class FederatedTrainingServicer(object):
@@ -99,6 +109,18 @@ class FederatedTrainingServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetTaskStream(self, request, context):
+        """server to client model sharing, with the task data streamed in chunks"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def SubmitUpdateStream(self, request_iterator, context):
+        """client to server contribution submission, with the task data streamed in chunks"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_FederatedTrainingServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -132,6 +154,16 @@ def add_FederatedTrainingServicer_to_server(servicer, server):
             request_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.AuxMessage.FromString,
             response_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.AuxReply.SerializeToString,
         ),
+        "GetTaskStream": grpc.unary_stream_rpc_method_handler(
+            servicer.GetTaskStream,
+            request_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ClientState.FromString,
+            response_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.CurrentTaskChunk.SerializeToString,
+        ),
+        "SubmitUpdateStream": grpc.stream_unary_rpc_method_handler(
+            servicer.SubmitUpdateStream,
+            request_deserializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ContributionChunk.FromString,
+            response_serializer=nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.FederatedSummary.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler("fedlearn.FederatedTraining", rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
@@ -314,3 +346,61 @@ class FederatedTraining(object):
             timeout,
             metadata,
         )
+
+    @staticmethod
+    def GetTaskStream(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/fedlearn.FederatedTraining/GetTaskStream",
+            nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ClientState.SerializeToString,
+            nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.CurrentTaskChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
+
+    @staticmethod
+    def SubmitUpdateStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/fedlearn.FederatedTraining/SubmitUpdateStream",
+            nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.ContributionChunk.SerializeToString,
+            nvflare_dot_private_dot_fed_dot_protos_dot_federated__pb2.FederatedSummary.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
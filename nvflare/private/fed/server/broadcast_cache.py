@@ -0,0 +1,176 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+
+from nvflare.apis.fl_component import FLComponent
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.widgets.info_collector import GroupInfoCollector, InfoCollector
+
+
+def split_headers(shareable: Shareable) -> (Shareable, Shareable):
+    """Split the shareable into its headers and its body.
+
+    Args:
+        shareable: the shareable to split
+
+    Returns: a Shareable that only has a deep copy of the headers, and a shallow copy of the
+        shareable with empty headers
+
+    """
+    headers = Shareable()
+    headers[ReservedHeaderKey.HEADERS] = copy.deepcopy(shareable.get(ReservedHeaderKey.HEADERS, {}))
+    body = copy.copy(shareable)
+    body[ReservedHeaderKey.HEADERS] = {}
+    return headers, body
+
+
+class _Entry(object):
+    def __init__(self, source: Shareable, body: Shareable, on_release):
+        self.source = weakref.ref(source, on_release)
+        self.items = {k: v for k, v in body.items() if k != ReservedHeaderKey.HEADERS}
+        self.data = None
+        self.nbytes = 0
+        self.ready = threading.Event()
+
+    def matches(self, source: Shareable, body: Shareable) -> bool:
+        if self.source() is not source:
+            return False
+        if len(self.items) != len(body) - 1:
+            return False
+        return all(body.get(k) is v for k, v in self.items.items())
+
+
+class BroadcastPayloadCache(object):
+    """Serialize-once cache of task bodies that are sent to many clients.
+
+    A broadcast task hands the same Shareable to every client. Only its headers (task id, cookies)
+    differ from client to client, so the body is serialized once and the small headers are sent
+    separately (see split_headers).
+
+    Entries are keyed by the identity of the source Shareable and are validated against the
+    identity of its top-level items, so a body that was replaced (e.g. by a task data filter) is
+    serialized again. An entry is evicted when its source Shareable is released (i.e. the task is
+    done with it), or when the cache exceeds max_bytes (least recently used first).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # reentrant, since the eviction callback of a released source can run in any thread at any time
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def get_data(self, source: Shareable, body: Shareable) -> bytes:
+        """Get the serialized body.
+
+        Only one thread serializes a body; other threads asking for it at the same time wait for it.
+
+        Args:
+            source: the shareable from which the body was split
+            body: the body to serialize
+
+        Returns: the serialized body
+
+        """
+        if self.max_bytes <= 0:
+            return body.to_bytes()
+
+        key = id(source)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.matches(source, body):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                owner = False
+            else:
+                self._remove(key)
+                entry = _Entry(source, body, lambda _, k=key: self.evict(k))
+                self._entries[key] = entry
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            entry.ready.wait()
+            if entry.data is None:
+                # the owner failed to serialize it
+                return body.to_bytes()
+            return entry.data
+
+        try:
+            entry.data = body.to_bytes()
+        finally:
+            entry.ready.set()
+
+        with self._lock:
+            if self._entries.get(key) is entry:
+                entry.nbytes = len(entry.data)
+                self.total_bytes += entry.nbytes
+                self._evict_over_limit()
+        return entry.data
+
+    def evict(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def get_info(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+
+    def _evict_over_limit(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self.logger.debug("evict broadcast payload {} to stay within {} bytes".format(key, self.max_bytes))
+            self._remove(key)
+
+
+class BroadcastCacheStatsReporter(FLComponent):
+    def __init__(self, cache: BroadcastPayloadCache):
+        """Reports the stats of the broadcast payload cache to the info collector.
+
+        Args:
+            cache: the cache of the server
+        """
+        FLComponent.__init__(self)
+        self.cache = cache
+
+    def handle_event(self, event_type: str, fl_ctx: FLContext):
+        if event_type == InfoCollector.EVENT_TYPE_GET_STATS:
+            collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR, None)
+            if collector:
+                assert isinstance(collector, GroupInfoCollector)
+                collector.set_info(group_name="BroadcastPayloadCache", info=self.cache.get_info())
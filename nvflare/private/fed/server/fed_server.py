@@ -36,22 +36,39 @@ from nvflare.apis.fl_constant import MachineStatus, FLContextKey
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.shareable import Shareable, ReservedHeaderKey
 from nvflare.apis.workspace import Workspace
-from nvflare.private.defs import SpecialTaskName
+from nvflare.private.defs import SpecialTaskName, TaskConstant
 from nvflare.private.fed.server.server_runner import ServerRunner
 from nvflare.private.fed.utils.messageproto import message_to_proto, proto_to_message
-from nvflare.private.fed.utils.numproto import proto_to_bytes
+from nvflare.private.fed.utils.numproto import bytes_to_proto, proto_to_bytes
 from nvflare.widgets.fed_event import ServerFedEventRunner
+from .broadcast_cache import BroadcastCacheStatsReporter, BroadcastPayloadCache, split_headers
 from .client_manager import ClientManager
 from .run_manager import RunManager
 from .server_engine import ServerEngine
 from .server_status import ServerStatus
-from ..utils.fed_utils import shareable_to_modeldata
+from ..utils.fed_utils import (
+    DEFAULT_CHUNK_SIZE,
+    ChunkAssembler,
+    make_context_data,
+    make_data_chunks,
+    shareable_to_modeldata,
+)
 
 GRPC_DEFAULT_OPTIONS = [
     ("grpc.max_send_message_length", 1024 * 1024 * 1024),
     ("grpc.max_receive_message_length", 1024 * 1024 * 1024),
 ]
 
+# allow the keepalive pings of the pooled client channels. added to the configured options unless they are set.
+GRPC_KEEPALIVE_OPTIONS = [
+    ("grpc.http2.min_ping_interval_without_data_ms", 30000),
+]
+
+DEFAULT_BROADCAST_CACHE_MB = 2048
+
+# max time in seconds a task request waits for a task before the client is asked to try again
+DEFAULT_MAX_TASK_WAIT_TIME = 60
+
 
 class BaseServer:
     """
@@ -88,6 +105,14 @@ class BaseServer:
         self.status = ServerStatus.NOT_STARTED
 
         self.abort_signal = None
+        self.chunk_size = DEFAULT_CHUNK_SIZE
+        self.broadcast_cache = BroadcastPayloadCache(max_bytes=DEFAULT_BROADCAST_CACHE_MB * 1024 * 1024)
+
+        # waiting task requests hold a grpc worker thread, so only some of them can wait
+        self.max_task_waiters = 0
+        self.max_task_wait_time = DEFAULT_MAX_TASK_WAIT_TIME
+        self.num_task_waiters = 0
+        self.waiters_lock = Lock()
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
@@ -129,7 +154,13 @@ class BaseServer:
         num_server_workers = grpc_args.get("num_server_workers", 1)
         num_server_workers = max(self.client_manager.get_min_clients(), num_server_workers)
         target = grpc_args["service"].get("target", "0.0.0.0:6007")
-        grpc_options = grpc_args["service"].get("options", GRPC_DEFAULT_OPTIONS)
+        grpc_options = list(grpc_args["service"].get("options", GRPC_DEFAULT_OPTIONS))
+        option_names = {name for name, _ in grpc_options}
+        grpc_options.extend(option for option in GRPC_KEEPALIVE_OPTIONS if option[0] not in option_names)
+        self.chunk_size = grpc_args.get("chunk_size", DEFAULT_CHUNK_SIZE)
+        self.broadcast_cache.max_bytes = grpc_args.get("broadcast_cache_mb", DEFAULT_BROADCAST_CACHE_MB) * 1024 * 1024
+        self.max_task_waiters = grpc_args.get("max_task_waiters", max(num_server_workers // 2, 1))
+        self.max_task_wait_time = grpc_args.get("max_task_wait_time", DEFAULT_MAX_TASK_WAIT_TIME)
 
         compression = grpc.Compression.NoCompression
         if "Deflate" == grpc_args.get("compression"):
@@ -361,6 +392,27 @@ class FederatedServer(BaseServer, fed_service.FederatedTrainingServicer, admin_s
         """
         process client's request of the current global model
         """
+        task, data = self._get_task(request, context)
+        task.data.params["data"].ndarray = data
+        return task
+
+    def GetTaskStream(self, request, context):
+        """
+        process client's request of the current global model, and stream the task data in chunks
+        """
+        task, data = self._get_task(request, context)
+        for i, chunk in enumerate(make_data_chunks(data, self.chunk_size)):
+            if i == 0:
+                yield fed_msg.CurrentTaskChunk(task=task, chunk=chunk)
+            else:
+                yield fed_msg.CurrentTaskChunk(chunk=chunk)
+
+    def _get_task(self, request, context):
+        """
+        get the task for the client.
+
+        :return: the CurrentTask without its "data" param, and the serialized task data
+        """
         # # fl_ctx = self.fl_ctx.clone_sticky()
         # if not self.run_manager:
         #     context.abort(grpc.StatusCode.OUT_OF_RANGE, "Server training stopped")
@@ -383,46 +435,129 @@ class FederatedServer(BaseServer, fed_service.FederatedTrainingServicer, admin_s
             shared_fl_ctx = pickle.loads(proto_to_bytes(request.context["fl_context"]))
             fl_ctx.set_peer_context(shared_fl_ctx)
 
-            with self.lock:
-                # shareable = self.model_manager.get_shareable(self.fl_ctx)
+            wait_time = 0
+            if TaskConstant.TASK_WAIT_TIME in request.meta_data.fields:
+                wait_time = min(request.meta_data[TaskConstant.TASK_WAIT_TIME], self.max_task_wait_time)
+            deadline = time.time() + wait_time
+
+            while True:
+                server_runner = self.server_runner
+                notifier = server_runner.get_task_notifier() if server_runner else None
+                seq = notifier.get_seq() if notifier else None
+
+                # only the task selection is done under the lock.
+                # the task data is serialized outside, so that clients can be served concurrently.
+                with self.lock:
+                    # shareable = self.model_manager.get_shareable(self.fl_ctx)
+
+                    if self.server_runner is None or engine is None or self.engine.run_manager is None:
+                        self.logger.info("server has no current run - asked client to end the run")
+                        taskname = SpecialTaskName.END_RUN
+                        task_id = ""
+                        shareable = None
+                    else:
+                        # taskname, task_id, shareable = self.controller.process_task_request(client, fl_ctx)
+                        taskname, task_id, shareable = self.server_runner.process_task_request(client, fl_ctx)
+
+                    if shareable is None:
+                        shareable = Shareable()
+
+                    # the same task data could be sent to all clients of a broadcast task:
+                    # only the headers are per client, the body is serialized once for all of them.
+                    # the headers are copied under the lock, since other requests could be setting them.
+                    headers, body = split_headers(shareable)
 
-                if self.server_runner is None or engine is None or self.engine.run_manager is None:
-                    self.logger.info("server has no current run - asked client to end the run")
-                    taskname = SpecialTaskName.END_RUN
-                    task_id = ""
-                    shareable = None
-                else:
-                    # taskname, task_id, shareable = self.controller.process_task_request(client, fl_ctx)
-                    taskname, task_id, shareable = self.server_runner.process_task_request(client, fl_ctx)
+                if taskname != SpecialTaskName.TRY_AGAIN or notifier is None:
+                    break
 
-                if shareable is None:
-                    shareable = Shareable()
+                # hold the request until the workflow has a task for the client, instead of having the client poll
+                remaining = deadline - time.time()
+                if remaining <= 0 or not self._wait_for_task(notifier, seq, remaining):
+                    break
 
-                task = fed_msg.CurrentTask(task_name=taskname)
-                task.meta.CopyFrom(self.task_meta_info)
-                meta_data = self.get_current_model_meta_data()
+            if taskname == SpecialTaskName.TRY_AGAIN and wait_time > 0 and time.time() >= deadline:
+                # the request has waited already, the client can ask again right away
+                body[TaskConstant.WAIT_TIME] = 0
 
-                # we need TASK_ID back as a cookie
-                shareable.add_cookie(name=FLContextKey.TASK_ID, data=task_id)
+            task = fed_msg.CurrentTask(task_name=taskname)
+            task.meta.CopyFrom(self.task_meta_info)
+            meta_data = self.get_current_model_meta_data()
 
-                # we also need to make TASK_ID available to the client
-                shareable.set_header(key=FLContextKey.TASK_ID, value=task_id)
+            # we need TASK_ID back as a cookie
+            headers.add_cookie(name=FLContextKey.TASK_ID, data=task_id)
 
-                task.meta_data.CopyFrom(meta_data)
+            # we also need to make TASK_ID available to the client
+            headers.set_header(key=FLContextKey.TASK_ID, value=task_id)
 
-                current_model = shareable_to_modeldata(shareable, fl_ctx)
-                task.data.CopyFrom(current_model)
-                self.logger.info(f"Return task:{taskname} to client:{client.name} --- ({token}) ")
+            task.meta_data.CopyFrom(meta_data)
+
+            if TaskConstant.SPLIT_HEADERS in request.meta_data.fields:
+                data = self.broadcast_cache.get_data(shareable, body)
+                task.data.params["headers"].CopyFrom(bytes_to_proto(pickle.dumps(headers[ReservedHeaderKey.HEADERS])))
+            else:
+                # the client expects the headers in the task data
+                body[ReservedHeaderKey.HEADERS] = headers[ReservedHeaderKey.HEADERS]
+                data = body.to_bytes()
+            task.data.params["fl_context"].CopyFrom(make_context_data(fl_ctx))
+            self.logger.info(f"Return task:{taskname} to client:{client.name} --- ({token}) ")
 
-                # self.fl_ctx.merge_sticky(fl_ctx)
+            # self.fl_ctx.merge_sticky(fl_ctx)
 
-                return task
+            return task, data
+
+    def _wait_for_task(self, notifier, seq, timeout) -> bool:
+        """
+        wait until the tasks changed, unless too many requests are waiting already.
+
+        :return: whether the tasks changed
+        """
+        with self.waiters_lock:
+            if self.num_task_waiters >= self.max_task_waiters:
+                return False
+            self.num_task_waiters += 1
+
+        try:
+            return notifier.wait(seq, timeout)
+        finally:
+            with self.waiters_lock:
+                self.num_task_waiters -= 1
 
     def SubmitUpdate(self, request, context):
         """
         handling client's submission of the federated updates
         running aggregation if there are enough updates
         """
+        return self._submit_update(request, proto_to_bytes(request.data.params["data"]), request.ByteSize(), context)
+
+    def SubmitUpdateStream(self, request_iterator, context):
+        """
+        handling client's submission of the federated updates, with the task data streamed in chunks
+        """
+        contribution = None
+        assembler = ChunkAssembler()
+        for item in request_iterator:
+            if contribution is None:
+                contribution = item.contribution
+            try:
+                assembler.add(item.chunk)
+            except ValueError as e:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        if not assembler.is_complete():
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "incomplete contribution data")
+
+        data = assembler.get_data()
+        return self._submit_update(contribution, data, contribution.ByteSize() + len(data), context)
+
+    def _submit_update(self, request, data, data_size, context):
+        """
+        process the client's contribution.
+
+        :param request: the Contribution message
+        :param data: the serialized task result
+        :param data_size: size of the submission in bytes
+        :return: FederatedSummary
+        """
         # if not self.run_manager:
         #     context.abort(grpc.StatusCode.OUT_OF_RANGE, "Server has stopped")
 
@@ -447,32 +582,33 @@ class FederatedServer(BaseServer, fed_service.FederatedTrainingServicer, admin_s
             else:
                 token = client.get_token()
 
-                with self.lock:
-                    shareable = Shareable()
-                    shareable = shareable.from_bytes(proto_to_bytes(request.data.params["data"]))
-                    shared_fl_context = pickle.loads(proto_to_bytes(request.data.params["fl_context"]))
-
-                    # fl_ctx.set_prop(FLContextKey.PEER_CONTEXT, shared_fl_context)
-                    fl_ctx.set_peer_context(shared_fl_context)
-
-                    shared_fl_context.set_prop(FLContextKey.SHAREABLE, shareable, private=False)
-
-                    contribution_meta = contribution.client.meta
-                    client_contrib_id = "{}_{}_{}".format(
-                        contribution_meta.project.name, client.name, contribution_meta.current_round
-                    )
-                    contribution_task_name = contribution.task_name
-
-                    timenow = Timestamp()
-                    timenow.GetCurrentTime()
-                    time_seconds = timenow.seconds - self.round_started.seconds
-                    self.logger.info(
-                        "received update from %s (%s Bytes, %s seconds)",
-                        client_contrib_id,
-                        contribution.ByteSize(),
-                        time_seconds or "less than 1",
-                    )
+                # deserialize outside the lock, so that submissions can be decoded concurrently
+                shareable = Shareable()
+                shareable = shareable.from_bytes(data)
+                shared_fl_context = pickle.loads(proto_to_bytes(request.data.params["fl_context"]))
+
+                # fl_ctx.set_prop(FLContextKey.PEER_CONTEXT, shared_fl_context)
+                fl_ctx.set_peer_context(shared_fl_context)
 
+                shared_fl_context.set_prop(FLContextKey.SHAREABLE, shareable, private=False)
+
+                contribution_meta = contribution.client.meta
+                client_contrib_id = "{}_{}_{}".format(
+                    contribution_meta.project.name, client.name, contribution_meta.current_round
+                )
+                contribution_task_name = contribution.task_name
+
+                timenow = Timestamp()
+                timenow.GetCurrentTime()
+                time_seconds = timenow.seconds - self.round_started.seconds
+                self.logger.info(
+                    "received update from %s (%s Bytes, %s seconds)",
+                    client_contrib_id,
+                    data_size,
+                    time_seconds or "less than 1",
+                )
+
+                with self.lock:
                     # fire_event(EventType.BEFORE_PROCESS_SUBMISSION, self.handlers, fl_ctx)
 
                     if self.save_contribution(client_contrib_id, contribution):
@@ -487,7 +623,7 @@ class FederatedServer(BaseServer, fed_service.FederatedTrainingServicer, admin_s
 
             response_comment = "Received from {} ({} Bytes, {} seconds)".format(
                 contribution.client.client_name,
-                contribution.ByteSize(),
+                data_size,
                 time_seconds or "less than 1",
             )
             summary_info = fed_msg.FederatedSummary(comment=response_comment)
@@ -616,6 +752,7 @@ class FederatedServer(BaseServer, fed_service.FederatedTrainingServicer, admin_s
 
         fed_event_runner = ServerFedEventRunner()
         self.run_manager.add_handler(fed_event_runner)
+        self.run_manager.add_handler(BroadcastCacheStatsReporter(self.broadcast_cache))
 
         try:
             with self.engine.new_context() as fl_ctx:
@@ -19,7 +19,7 @@ from nvflare.apis.fl_constant import MachineStatus
 from nvflare.apis.fl_context import FLContext, FLContextManager
 from nvflare.apis.server_engine_spec import ServerEngineSpec
 from nvflare.apis.workspace import Workspace
-from nvflare.private.event import fire_event
+from nvflare.private.event import EventDispatcher
 from .client_manager import ClientManager
 from .server_aux_runner import ServerAuxRunner
 
@@ -48,6 +48,7 @@ class RunManager:
 
         self.client_manager = client_manager
         self.handlers = handlers
+        self.event_dispatcher = EventDispatcher(handlers)
         self.aux_runner = ServerAuxRunner()
         self.add_handler(self.aux_runner)
 
@@ -79,7 +80,7 @@ class RunManager:
         return self.components.get(component_id)
 
     def fire_event(self, event_type: str, fl_ctx: FLContext):
-        fire_event(event=event_type, handlers=self.handlers, ctx=fl_ctx)
+        self.event_dispatcher.fire_event(event_type, fl_ctx)
 
     def add_handler(self, handler: FLComponent):
-        self.handlers.append(handler)
+        self.event_dispatcher.add_handler(handler)
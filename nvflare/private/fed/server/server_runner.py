@@ -138,6 +138,9 @@ class ServerRunner(FLComponent):
 
         self.log_info(fl_ctx, "Server runner finished.")
 
+    def get_subscribed_event_types(self):
+        return [InfoCollector.EVENT_TYPE_GET_STATS, EventType.FATAL_SYSTEM_ERROR]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == InfoCollector.EVENT_TYPE_GET_STATS:
             collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR)
@@ -155,6 +158,18 @@ class ServerRunner(FLComponent):
             self.log_error(fl_ctx, "Aborting current RUN due to FATAL_SYSTEM_ERROR received: {}".format(reason))
             self.abort(fl_ctx)
 
+    def get_task_notifier(self):
+        """
+        Get the notifier of the current workflow, which tells when tasks may have become available.
+
+        Returns: the TaskNotifier, or None if there's no current workflow
+
+        """
+        with self.wf_lock:
+            if self.current_wf is None:
+                return None
+            return getattr(self.current_wf.responder, "task_notifier", None)
+
     def _task_try_again(self) -> (str, str, Shareable):
         task = Shareable()
         task[TaskConstant.WAIT_TIME] = self.config.task_request_interval
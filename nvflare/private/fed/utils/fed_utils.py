@@ -15,9 +15,11 @@
 import pickle
 
 from nvflare.apis.fl_context import FLContext
-from nvflare.private.fed.protos.federated_pb2 import ModelData
+from nvflare.private.fed.protos.federated_pb2 import DataChunk, ModelData
 from nvflare.private.fed.utils.numproto import bytes_to_proto
 
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 def shareable_to_modeldata(shareable, fl_ctx):
     # make_init_proto message
@@ -40,3 +42,94 @@ def make_context_data(fl_ctx):
     props = pickle.dumps(shared_fl_ctx)
     context_data = bytes_to_proto(props)
     return context_data
+
+
+def make_data_chunks(data: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Split the serialized data into ordered DataChunks.
+
+    Args:
+        data: the serialized data
+        chunk_size: max number of bytes in each chunk
+
+    Returns: a generator of DataChunk. An empty data still yields one (empty) chunk.
+
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive, but got {}".format(chunk_size))
+
+    view = memoryview(data)
+    total_size = len(view)
+    offset = 0
+    while True:
+        end = min(offset + chunk_size, total_size)
+        yield DataChunk(total_size=total_size, offset=offset, data=bytes(view[offset:end]))
+        offset = end
+        if offset >= total_size:
+            break
+
+
+class ChunkAssembler(object):
+    """Reassemble the DataChunks of a serialized data into one preallocated buffer.
+
+    Each chunk is copied into place as it arrives, so only one copy of the data is held. The
+    assembled buffer is a bytearray, from which Shareable.from_bytes rebuilds the tensors
+    without another copy.
+    """
+
+    def __init__(self):
+        self.buffer = None
+        self.received = 0
+
+    def add(self, chunk: DataChunk):
+        if self.buffer is None:
+            self.buffer = bytearray(chunk.total_size)
+        elif chunk.total_size != len(self.buffer):
+            raise ValueError(
+                "inconsistent chunk total_size: expect {} but got {}".format(len(self.buffer), chunk.total_size)
+            )
+
+        if chunk.offset != self.received:
+            raise ValueError("out of order chunk: expect offset {} but got {}".format(self.received, chunk.offset))
+
+        end = chunk.offset + len(chunk.data)
+        if end > len(self.buffer):
+            raise ValueError("chunk exceeds total_size {}".format(len(self.buffer)))
+        self.buffer[chunk.offset : end] = chunk.data
+        self.received = end
+
+    def is_complete(self) -> bool:
+        return self.buffer is not None and self.received == len(self.buffer)
+
+    def get_data(self) -> bytearray:
+        if not self.is_complete():
+            raise ValueError("incomplete data: received {} bytes".format(self.received))
+        return self.buffer
+
+
+class AssembledNDArray(object):
+    """Stand-in for an NDArray message whose content was reassembled from DataChunks."""
+
+    def __init__(self, data: bytearray):
+        self.ndarray = data
+
+
+class AssembledModelData(object):
+    """Stand-in for a ModelData message whose "data" param was reassembled from DataChunks."""
+
+    def __init__(self, model_data: ModelData, data: bytearray):
+        self.params = dict(model_data.params)
+        self.params["data"] = AssembledNDArray(data)
+
+
+class AssembledTask(object):
+    """A CurrentTask whose "data" param was reassembled from streamed chunks.
+
+    It has the attributes of CurrentTask that the client reads, but keeps the reassembled data
+    as a bytearray instead of copying it into a protobuf message.
+    """
+
+    def __init__(self, task, data: bytearray):
+        self.meta = task.meta
+        self.meta_data = task.meta_data
+        self.task_name = task.task_name
+        self.data = AssembledModelData(task.data, data)
@@ -52,6 +52,9 @@ class ComponentCaller(Widget):
         super().__init__()
         self.engine = None
 
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.engine = fl_ctx.get_engine()
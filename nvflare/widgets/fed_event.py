@@ -12,34 +12,58 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
 import threading
 import time
+import uuid
+from collections import deque
 
 from nvflare.apis.client_engine_spec import ClientEngineSpec
+from nvflare.apis.dxo import DataKind, from_shareable
 from nvflare.apis.event_type import EventType
 from nvflare.apis.fl_constant import EventScope, FedEventHeader, FLContextKey, ReservedKey, ReturnCode
 from nvflare.apis.fl_context import FLContext
 from nvflare.apis.server_engine_spec import ServerEngineSpec
 from nvflare.apis.shareable import Shareable, make_reply
+from nvflare.widgets.info_collector import GroupInfoCollector, InfoCollector
 from nvflare.widgets.widget import Widget
 
 FED_EVENT_TOPIC = "fed.event"
 
 
 class FedEventRunner(Widget):
-    def __init__(self, topic=FED_EVENT_TOPIC):
-        """
+    def __init__(self, topic=FED_EVENT_TOPIC, max_queue_size: int = 10000, post_batch_size: int = 100):
+        """Sends the federated events to peers, and fires the federated events received from peers.
+
+        Received events are queued and fired by the poster thread. When the queue is full, a new analytics event
+        replaces the queued event of the same origin, event type and tag, so that the latest value is kept.
+        Other new events are dropped. The numbers of coalesced and dropped events are reported in the stats.
+
         Args:
-            topic:
+            topic: aux message topic of the fed events
+            max_queue_size: max number of received events waiting to be fired
+            post_batch_size: max number of events the poster takes from the queue at a time
         """
         Widget.__init__(self)
         self.topic = topic
+        self.max_queue_size = max_queue_size
+        self.post_batch_size = post_batch_size
         self.abort_signal = None
         self.asked_to_stop = False
         self.engine = None
-        self.last_timestamps = {}  # client name => last_timestamp
-        self.in_events = []
+        self.last_orders = {}  # (client name, sender id) => seq (or timestamp) of the last event
+        self.in_events = deque()  # of [event, coalesce key]
+        self.in_slots = {}  # coalesce key => last queued [event, coalesce key]
         self.in_lock = threading.Lock()
+        self.in_cond = threading.Condition(self.in_lock)
+        self.out_lock = threading.Lock()
+        self.out_seq = itertools.count()
+        # ranks of a client share its identity name: each runner orders its own events
+        self.sender_id = uuid.uuid4().hex
+        self.num_received = 0
+        self.num_posted = 0
+        self.num_coalesced = 0
+        self.num_dropped = 0
         self.poster = threading.Thread(target=self._post, args=())
 
     def handle_event(self, event_type: str, fl_ctx: FLContext):
@@ -50,9 +74,16 @@ class FedEventRunner(Widget):
             self.asked_to_stop = False
             self.poster.start()
         elif event_type == EventType.END_RUN:
-            self.asked_to_stop = True
+            with self.in_cond:
+                self.asked_to_stop = True
+                self.in_cond.notify_all()
             if self.poster.is_alive():
                 self.poster.join()
+        elif event_type == InfoCollector.EVENT_TYPE_GET_STATS:
+            collector = fl_ctx.get_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR, None)
+            if collector:
+                assert isinstance(collector, GroupInfoCollector)
+                collector.set_info(group_name=self._name, info=self.get_info())
         else:
             # handle outgoing fed events
             event_scope = fl_ctx.get_prop(key=FLContextKey.EVENT_SCOPE, default=EventScope.LOCAL)
@@ -71,14 +102,38 @@ class FedEventRunner(Widget):
 
             event_data.set_header(FedEventHeader.EVENT_TYPE, event_type)
             event_data.set_header(FedEventHeader.ORIGIN, fl_ctx.get_identity_name())
-            event_data.set_header(FedEventHeader.TIMESTAMP, time.time())
-
+            event_data.set_header(FedEventHeader.SENDER, self.sender_id)
             targets = event_data.get_header(FedEventHeader.TARGETS, None)
-            self.fire_and_forget_request(request=event_data, fl_ctx=fl_ctx, targets=targets)
+            with self.out_lock:
+                # the seq is assigned in the order the events are handed to the sender
+                event_data.set_header(FedEventHeader.TIMESTAMP, time.time())
+                event_data.set_header(FedEventHeader.SEQ, next(self.out_seq))
+                self.fire_and_forget_request(request=event_data, fl_ctx=fl_ctx, targets=targets)
 
     def fire_and_forget_request(self, request: Shareable, fl_ctx: FLContext, targets=None):
         pass
 
+    def get_info(self) -> dict:
+        with self.in_lock:
+            return {
+                "queued": len(self.in_events),
+                "received": self.num_received,
+                "posted": self.num_posted,
+                "coalesced": self.num_coalesced,
+                "dropped": self.num_dropped,
+            }
+
+    @staticmethod
+    def _get_coalesce_key(origin: str, event_type: str, event: Shareable):
+        # only analytics events are coalesced: the latest value of a tag replaces the older one
+        try:
+            dxo = from_shareable(event)
+        except ValueError:
+            return None
+        if dxo.data_kind != DataKind.ANALYTIC or not isinstance(dxo.data, dict) or len(dxo.data) != 1:
+            return None
+        return origin, event_type, next(iter(dxo.data))
+
     def _receive(self, topic: str, request: Shareable, fl_ctx: FLContext) -> Shareable:
         peer_name = request.get_peer_prop(ReservedKey.IDENTITY_NAME, None)
         if not peer_name:
@@ -95,48 +150,85 @@ class FedEventRunner(Widget):
             self.log_error(fl_ctx, "missing event_type in incoming fed event")
             return make_reply(ReturnCode.BAD_REQUEST_DATA)
 
-        with self.in_lock:
-            last_timestamp = self.last_timestamps.get(peer_name, None)
-            if last_timestamp is None or timestamp > last_timestamp:
-                # we only keep new items, in case the peer somehow sent old items
+        # events of a sender are ordered by its seq; events of older senders only have a timestamp
+        sender = request.get_header(FedEventHeader.SENDER, None)
+        order = request.get_header(FedEventHeader.SEQ, None) if sender else None
+        if order is None:
+            sender, order = None, timestamp
+        order_key = (peer_name, sender)
+        coalesce_key = self._get_coalesce_key(peer_name, event_type, request)
+        dropped = False
+        with self.in_cond:
+            last_order = self.last_orders.get(order_key, None)
+            if last_order is None or order > last_order:
+                # we only keep new items, in case the peer somehow sent old items (e.g. resent a bulk)
+                self.last_orders[order_key] = order
+                self.num_received += 1
                 request.set_header(FedEventHeader.DIRECTION, "in")
-                self.in_events.append(request)
-                self.last_timestamps[peer_name] = timestamp
+                if len(self.in_events) < self.max_queue_size:
+                    slot = [request, coalesce_key]
+                    self.in_events.append(slot)
+                    if coalesce_key is not None:
+                        self.in_slots[coalesce_key] = slot
+                    self.in_cond.notify()
+                elif coalesce_key in self.in_slots:
+                    self.in_slots[coalesce_key][0] = request
+                    self.num_coalesced += 1
+                else:
+                    self.num_dropped += 1
+                    dropped = self.num_dropped == 1
+
+        if dropped:
+            self.log_warning(fl_ctx, "fed event queue is full - dropping incoming events", fire_event=False)
 
         # NOTE: we do not fire event here since event process could take time.
         # Instead we simply add the package to the queue and return quickly.
         # The posting of events will be handled in the poster thread
         return make_reply(ReturnCode.OK)
 
+    def _should_stop(self):
+        return self.asked_to_stop or self.abort_signal.triggered
+
     def _post(self):
-        sleep_time = 0.1
         while True:
-            time.sleep(sleep_time)
-            if self.asked_to_stop or self.abort_signal.triggered:
-                break
-
-            with self.in_lock:
-                if len(self.in_events) <= 0:
-                    continue
-                event_to_post = self.in_events.pop(0)
+            with self.in_cond:
+                if not self.in_events and not self._should_stop():
+                    # the abort signal cannot notify, so it is checked periodically
+                    self.in_cond.wait(0.1)
+                if self._should_stop():
+                    break
+
+                events_to_post = []
+                while self.in_events and len(events_to_post) < self.post_batch_size:
+                    slot = self.in_events.popleft()
+                    event, coalesce_key = slot
+                    if coalesce_key is not None and self.in_slots.get(coalesce_key) is slot:
+                        self.in_slots.pop(coalesce_key)
+                    events_to_post.append(event)
+
+            for event_to_post in events_to_post:
                 assert isinstance(event_to_post, Shareable)
+                if self._should_stop():
+                    return
 
-            if self.asked_to_stop or self.abort_signal.triggered:
-                break
+                with self.engine.new_context() as fl_ctx:
+                    assert isinstance(fl_ctx, FLContext)
 
-            with self.engine.new_context() as fl_ctx:
-                assert isinstance(fl_ctx, FLContext)
+                    fl_ctx.set_prop(key=FLContextKey.EVENT_DATA, value=event_to_post, private=True, sticky=False)
+                    fl_ctx.set_prop(
+                        key=FLContextKey.EVENT_SCOPE, value=EventScope.FEDERATION, private=True, sticky=False
+                    )
 
-                fl_ctx.set_prop(key=FLContextKey.EVENT_DATA, value=event_to_post, private=True, sticky=False)
-                fl_ctx.set_prop(key=FLContextKey.EVENT_SCOPE, value=EventScope.FEDERATION, private=True, sticky=False)
+                    event_type = event_to_post.get_header(FedEventHeader.EVENT_TYPE)
+                    self.engine.fire_event(event_type=event_type, fl_ctx=fl_ctx)
 
-                event_type = event_to_post.get_header(FedEventHeader.EVENT_TYPE)
-                self.engine.fire_event(event_type=event_type, fl_ctx=fl_ctx)
+            with self.in_lock:
+                self.num_posted += len(events_to_post)
 
 
 class ServerFedEventRunner(FedEventRunner):
-    def __init__(self, topic=FED_EVENT_TOPIC):
-        FedEventRunner.__init__(self, topic)
+    def __init__(self, topic=FED_EVENT_TOPIC, max_queue_size: int = 10000, post_batch_size: int = 100):
+        FedEventRunner.__init__(self, topic, max_queue_size=max_queue_size, post_batch_size=post_batch_size)
 
     def fire_and_forget_request(self, request: Shareable, fl_ctx: FLContext, targets=None):
         assert isinstance(self.engine, ServerEngineSpec)
@@ -149,8 +241,8 @@ class ServerFedEventRunner(FedEventRunner):
 
 
 class ClientFedEventRunner(FedEventRunner):
-    def __init__(self, topic=FED_EVENT_TOPIC):
-        FedEventRunner.__init__(self, topic)
+    def __init__(self, topic=FED_EVENT_TOPIC, max_queue_size: int = 10000, post_batch_size: int = 100):
+        FedEventRunner.__init__(self, topic, max_queue_size=max_queue_size, post_batch_size=post_batch_size)
 
     def fire_and_forget_request(self, request: Shareable, fl_ctx: FLContext, targets=None):
         assert isinstance(self.engine, ClientEngineSpec)
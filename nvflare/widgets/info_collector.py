@@ -64,6 +64,16 @@ class InfoCollector(Widget):
         self.categories = {}
         self.engine = None
 
+    def get_subscribed_event_types(self):
+        return [
+            EventType.START_RUN,
+            EventType.END_RUN,
+            EventType.CRITICAL_LOG_AVAILABLE,
+            EventType.ERROR_LOG_AVAILABLE,
+            EventType.WARNING_LOG_AVAILABLE,
+            EventType.EXCEPTION_LOG_AVAILABLE,
+        ]
+
     def handle_event(self, event_type: str, fl_ctx: FLContext):
         if event_type == EventType.START_RUN:
             self.reset_all()
@@ -0,0 +1,90 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure FLContext creation and prop access, alone and with threads using their own contexts.
+
+python -m test.benchmark.fl_context --num_ops 200000 --num_threads 1 8
+"""
+
+import argparse
+import threading
+import time
+
+from nvflare.apis.fl_context import FLContextManager
+
+
+def _make_manager(num_stickers: int):
+    public_stickers = {"public_{}".format(i): i for i in range(num_stickers)}
+    private_stickers = {"private_{}".format(i): i for i in range(num_stickers)}
+    return FLContextManager(
+        engine=None,
+        identity_name="site-1",
+        run_num=1,
+        public_stickers=public_stickers,
+        private_stickers=private_stickers,
+    )
+
+
+def _new_context(manager, num_ops: int):
+    for _ in range(num_ops):
+        with manager.new_context():
+            pass
+
+
+def _access_props(manager, num_ops: int):
+    fl_ctx = manager.new_context()
+    for i in range(num_ops):
+        fl_ctx.set_prop("key", i, private=True, sticky=False)
+        fl_ctx.get_prop("key")
+        fl_ctx.get_prop("public_0")
+
+
+def _clone(manager, num_ops: int):
+    fl_ctx = manager.new_context()
+    for _ in range(num_ops):
+        fl_ctx.clone_sticky()
+        fl_ctx.get_all_public_props()
+
+
+def run(func, manager, num_ops: int, num_threads: int) -> float:
+    """Returns the ops per second of all threads."""
+    threads = [threading.Thread(target=func, args=(manager, num_ops)) for _ in range(num_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return num_ops * num_threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FLContext creation and prop access")
+    parser.add_argument("--num_ops", type=int, default=200000, help="operations per thread")
+    parser.add_argument("--num_stickers", type=int, default=10, help="public and private sticky props")
+    parser.add_argument("--num_threads", type=int, nargs="+", default=[1, 8], help="thread counts to run")
+    args = parser.parse_args()
+
+    manager = _make_manager(args.num_stickers)
+    print("{:>14} {:>8} {:>14}".format("op", "threads", "ops/s"))
+    for name, func, num_ops in (
+        ("new_context", _new_context, args.num_ops // 10),
+        ("set/get prop", _access_props, args.num_ops),
+        ("clone/public", _clone, args.num_ops // 10),
+    ):
+        for num_threads in args.num_threads:
+            print("{:>14} {:>8} {:>14.0f}".format(name, num_threads, run(func, manager, num_ops, num_threads)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the time of the HE filters and aggregator against the model size.
+
+Each model is encrypted by HEModelEncryptor for every client, the encrypted results are added up
+by HEInTimeAccumulateWeightedAggregator and the (serialized) aggregate is decrypted by
+HEModelDecryptor. Per-layer sequential processing (pack_size 0, one worker) is compared to CKKS
+vectors packed to the slot count and processed on a thread pool. Requires tenseal.
+
+    python -m test.benchmark.he_throughput --model_mb 1 4 16 --num_layers 100 --num_clients 2
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tenseal as ts
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.fl_constant import ReservedKey
+from nvflare.apis.fl_context import FLContext
+from nvflare.app_common.app_constant import AppConstants
+from nvflare.app_common.homomorphic_encryption.he_intime_accumulate_model_aggregator import (
+    HEInTimeAccumulateWeightedAggregator,
+)
+from nvflare.app_common.homomorphic_encryption.he_model_decryptor import HEModelDecryptor
+from nvflare.app_common.homomorphic_encryption.he_model_encryptor import HEModelEncryptor
+
+
+def _make_context(poly_modulus_degree: int):
+    # same parameters as the HEBuilder of the provisioning tool
+    context = ts.context(
+        ts.SCHEME_TYPE.CKKS,
+        poly_modulus_degree=poly_modulus_degree,
+        coeff_mod_bit_sizes=[60, 40, 40],
+        encryption_type=ts.ENCRYPTION_TYPE.SYMMETRIC,
+    )
+    context.generate_relin_keys()
+    context.global_scale = 2**40
+    return context
+
+
+def _make_weights(model_mb: float, num_layers: int):
+    layer_size = max(int(model_mb * 1024 * 1024 / 4 / num_layers), 1)
+    return {"layer_{}".format(i): np.random.randn(layer_size).astype(np.float32) * 1e-3 for i in range(num_layers)}
+
+
+def _to_result(weights, client_name):
+    dxo = DXO(
+        data_kind=DataKind.WEIGHT_DIFF,
+        data={k: v.copy() for k, v in weights.items()},
+        meta={MetaKey.NUM_STEPS_CURRENT_ROUND: 1},
+    )
+    result = dxo.to_shareable()
+    result.set_peer_props({ReservedKey.IDENTITY_NAME: client_name})
+    result.set_header(AppConstants.CONTRIBUTION_ROUND, 0)
+    return result
+
+
+def run(weights, context, num_clients: int, pack_size: int, num_workers):
+    fl_ctx = FLContext()
+    fl_ctx.set_prop(AppConstants.CURRENT_ROUND, 0)
+    encryptor = HEModelEncryptor(pack_size=pack_size, num_workers=num_workers)
+    aggregator = HEInTimeAccumulateWeightedAggregator(num_workers=num_workers)
+    decryptor = HEModelDecryptor(num_workers=num_workers)
+    for component in (encryptor, aggregator, decryptor):
+        component.tenseal_context = context
+    aggregator.accumulator.set_context(context)
+
+    results = [_to_result(weights, "client_{}".format(i)) for i in range(num_clients)]
+    start = time.time()
+    results = [encryptor.process(result, fl_ctx) for result in results]
+    encrypt_time = (time.time() - start) / num_clients
+
+    start = time.time()
+    for result in results:
+        if not aggregator.accept(result, fl_ctx):
+            raise RuntimeError("aggregator did not accept the result")
+    encrypted_bytes = aggregator.accumulator.get_info()["encrypted_bytes"] / num_clients
+    aggregated = from_shareable(aggregator.aggregate(fl_ctx))
+    aggregate_time = time.time() - start
+
+    # the global model reaches the clients serialized
+    encrypted_layers = aggregated.get_meta_prop(MetaKey.PROCESSED_KEYS)
+    aggregated.data = {k: v.serialize() if encrypted_layers[k] else v for k, v in aggregated.data.items()}
+    start = time.time()
+    decrypted = from_shareable(decryptor.process(aggregated.to_shareable(), fl_ctx)).data
+    decrypt_time = time.time() - start
+
+    max_err = max(float(np.abs(np.asarray(decrypted[k]) - v).max()) for k, v in weights.items())
+    return encrypted_bytes, encrypt_time, aggregate_time, decrypt_time, max_err
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HE encryption, aggregation and decryption time")
+    parser.add_argument("--model_mb", type=float, nargs="+", default=[1, 4, 16], help="model sizes in MB")
+    parser.add_argument("--num_layers", type=int, default=100, help="number of layers of the model")
+    parser.add_argument("--num_clients", type=int, default=2, help="number of client results to aggregate")
+    parser.add_argument("--poly_modulus_degree", type=int, default=8192, help="CKKS poly modulus degree")
+    parser.add_argument("--num_workers", type=int, default=None, help="threads of the packed runs")
+    args = parser.parse_args()
+
+    context = _make_context(args.poly_modulus_degree)
+    pack_size = args.poly_modulus_degree // 2
+    print(
+        "{:>9} {:>10} {:>10} {:>12} {:>14} {:>12} {:>10}".format(
+            "model MB", "mode", "enc MB", "encrypt(s)", "aggregate(s)", "decrypt(s)", "max err"
+        )
+    )
+    for model_mb in args.model_mb:
+        weights = _make_weights(model_mb, args.num_layers)
+        for mode, mode_pack_size, num_workers in (("layers", 0, 1), ("packed", pack_size, args.num_workers)):
+            encrypted_bytes, encrypt_time, aggregate_time, decrypt_time, max_err = run(
+                weights, context, args.num_clients, mode_pack_size, num_workers
+            )
+            print(
+                "{:>9} {:>10} {:>10.1f} {:>12.3f} {:>14.3f} {:>12.3f} {:>10.2e}".format(
+                    model_mb, mode, encrypted_bytes / 1024 / 1024, encrypt_time, aggregate_time, decrypt_time, max_err
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
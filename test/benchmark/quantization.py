@@ -0,0 +1,90 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the bytes moved and the reconstruction error of the Quantizer filter.
+
+The bytes are the pickled size of the task result, i.e. what the client uploads. The time is
+the time to quantize on the client and to dequantize on the server.
+
+    python -m test.benchmark.quantization --model_mb 64 --num_layers 100
+"""
+
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from nvflare.apis.dxo import DXO, DataKind, from_shareable
+from nvflare.apis.fl_context import FLContext
+from nvflare.app_common.filters import Dequantizer, Quantizer
+from nvflare.app_common.filters.quantization import QUANTIZATION_TYPES
+
+
+def _make_weights(model_mb: float, num_layers: int):
+    layer_size = max(int(model_mb * 1024 * 1024 / 4 / num_layers), 1)
+    # weight diffs are small values, roughly normal
+    return {"layer_{}".format(i): np.random.randn(layer_size).astype(np.float32) * 1e-3 for i in range(num_layers)}
+
+
+def _to_result(weights):
+    return DXO(data_kind=DataKind.WEIGHT_DIFF, data={k: v.copy() for k, v in weights.items()}).to_shareable()
+
+
+def run(weights, quantization_type, block_size: int):
+    fl_ctx = FLContext()
+    result = _to_result(weights)
+    start = time.time()
+    if quantization_type:
+        result = Quantizer(quantization_type=quantization_type, block_size=block_size).process(result, fl_ctx)
+    num_bytes = len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    if quantization_type:
+        result = Dequantizer().process(result, fl_ctx)
+    duration = time.time() - start
+
+    restored = from_shareable(result).data
+    sq_err = sq_norm = max_err = 0.0
+    for k, v in weights.items():
+        diff = restored[k].astype(np.float64) - v
+        sq_err += float(np.dot(diff, diff))
+        sq_norm += float(np.dot(v.astype(np.float64), v))
+        max_err = max(max_err, float(np.abs(diff).max()))
+    return num_bytes, duration, (sq_err / sq_norm) ** 0.5, max_err
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bytes and the error of the quantization filters")
+    parser.add_argument("--model_mb", type=float, default=64, help="model size in MB")
+    parser.add_argument("--num_layers", type=int, default=100, help="number of layers of the model")
+    parser.add_argument("--block_size", type=int, default=4096, help="block size of blockwise8")
+    args = parser.parse_args()
+
+    weights = _make_weights(args.model_mb, args.num_layers)
+    print("model: {} MB in {} layers".format(args.model_mb, args.num_layers))
+    print(
+        "{:>12} {:>12} {:>8} {:>10} {:>12} {:>12}".format("type", "bytes", "ratio", "time(s)", "rel l2 err", "max err")
+    )
+    base_bytes = None
+    for quantization_type in (None,) + QUANTIZATION_TYPES:
+        num_bytes, duration, rel_err, max_err = run(weights, quantization_type, args.block_size)
+        base_bytes = base_bytes or num_bytes
+        print(
+            "{:>12} {:>12} {:>8.3f} {:>10.3f} {:>12.2e} {:>12.2e}".format(
+                quantization_type or "float32", num_bytes, num_bytes / base_bytes, duration, rel_err, max_err
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the round start fan-out latency of FederatedServer.GetTask against the number of clients.
+
+All clients ask for the same broadcast task at the same time, from a thread pool of the same size
+(like the gRPC worker pool). The latency is the time until the last client got its task.
+
+    python -m test.benchmark.round_start_fanout --clients 1 8 32 64 --model_mb 64
+"""
+
+import argparse
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from nvflare.apis.client import Client
+from nvflare.apis.dxo import DXO, DataKind
+from nvflare.apis.fl_context import FLContext, FLContextManager
+from nvflare.private.fed.protos.federated_pb2 import ClientState
+from nvflare.private.fed.server.fed_server import FederatedServer
+from nvflare.private.fed.utils.numproto import bytes_to_proto
+
+PROJECT_NAME = "benchmark"
+RUN_NUM = 1
+
+
+class _Context(object):
+    def abort(self, code, details):
+        raise RuntimeError("{}: {}".format(code, details))
+
+
+class _RunManager(object):
+    def __init__(self, engine):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=engine, identity_name=PROJECT_NAME, run_num=RUN_NUM, public_stickers={}, private_stickers={}
+        )
+
+    def new_context(self) -> FLContext:
+        return self.fl_ctx_mgr.new_context()
+
+
+class _ServerRunner(object):
+    """Gives every client the same task data, like a broadcast task does."""
+
+    def __init__(self, task_data):
+        self.task_data = task_data
+
+    def get_task_notifier(self):
+        return None
+
+    def process_task_request(self, client, fl_ctx):
+        return "train", "task_{}".format(client.name), self.task_data
+
+
+def _make_weights(model_mb: float, num_layers: int):
+    layer_size = max(int(model_mb * 1024 * 1024 / 4 / num_layers), 1)
+    return {"layer_{}".format(i): np.random.rand(layer_size).astype(np.float32) for i in range(num_layers)}
+
+
+def _make_request(token):
+    fl_ctx = FLContext()
+    fl_ctx.set_run_number(RUN_NUM)
+    request = ClientState(token=token)
+    request.meta.project.name = PROJECT_NAME
+    request.context["fl_context"].CopyFrom(bytes_to_proto(pickle.dumps(fl_ctx)))
+    return request
+
+
+def run_round_start(server, weights, num_clients: int) -> float:
+    # each round broadcasts new task data
+    server.server_runner = _ServerRunner(DXO(data_kind=DataKind.WEIGHTS, data=weights).to_shareable())
+    server.client_manager.clients = {}
+    requests = []
+    for i in range(num_clients):
+        token = "token_{}".format(i)
+        server.client_manager.clients[token] = Client("site-{}".format(i), token)
+        requests.append(_make_request(token))
+
+    with ThreadPoolExecutor(max_workers=num_clients) as pool:
+        start = time.time()
+        futures = [pool.submit(server.GetTask, r, _Context()) for r in requests]
+        for f in futures:
+            f.result()
+        return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the round start fan-out latency of GetTask")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32, 64], help="numbers of clients")
+    parser.add_argument("--model_mb", type=float, default=64, help="model size in MB")
+    parser.add_argument("--num_layers", type=int, default=100, help="number of layers of the model")
+    parser.add_argument("--repeat", type=int, default=3, help="number of rounds for each number of clients")
+    args = parser.parse_args()
+
+    weights = _make_weights(args.model_mb, args.num_layers)
+
+    server = FederatedServer(project_name=PROJECT_NAME, min_num_clients=1, max_num_clients=max(args.clients))
+    server.engine.run_manager = _RunManager(server.engine)
+
+    print("model: {} MB in {} layers".format(args.model_mb, args.num_layers))
+    print("{:>8} {:>12} {:>16}".format("clients", "latency(s)", "per client(ms)"))
+    for n in args.clients:
+        latency = min(run_round_start(server, weights, n) for _ in range(args.repeat))
+        print("{:>8} {:>12.3f} {:>16.1f}".format(n, latency, latency * 1000 / n))
+
+
+if __name__ == "__main__":
+    main()
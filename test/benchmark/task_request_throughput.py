@@ -0,0 +1,90 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the task request throughput of Controller.process_task_request against the number of standing tasks.
+
+Each standing task is sent to one client (like the validation tasks of cross site evaluation). The requests come
+from clients that have no task to get: they are the polling clients of a busy server.
+
+    python -m test.benchmark.task_request_throughput --tasks 1 10 100 1000
+"""
+
+import argparse
+import time
+
+from nvflare.apis.client import Client
+from nvflare.apis.controller_spec import SendOrder, Task
+from nvflare.apis.fl_context import FLContext, FLContextManager
+from nvflare.apis.impl.controller import Controller
+from nvflare.apis.shareable import Shareable
+from nvflare.apis.signal import Signal
+
+
+class _Controller(Controller):
+    def control_flow(self, abort_signal: Signal, fl_ctx: FLContext):
+        pass
+
+    def start_controller(self, fl_ctx: FLContext):
+        pass
+
+    def stop_controller(self, fl_ctx: FLContext):
+        pass
+
+    def process_result_of_unknown_task(
+        self, client: Client, task_name: str, client_task_id: str, result: Shareable, fl_ctx: FLContext
+    ):
+        pass
+
+
+class _Engine(object):
+    def __init__(self):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=self, identity_name="benchmark", run_num=1, public_stickers={}, private_stickers={}
+        )
+
+    def new_context(self):
+        return self.fl_ctx_mgr.new_context()
+
+
+def run_requests(num_tasks: int, num_requests: int) -> float:
+    fl_ctx = _Engine().new_context()
+    # the monitor is not started: the tasks stay standing
+    controller = _Controller()
+    for i in range(num_tasks):
+        task = Task(name="validate", data=Shareable())
+        controller.send(task=task, fl_ctx=fl_ctx, targets=["site-{}".format(i)], send_order=SendOrder.ANY)
+
+    clients = [Client("idle-{}".format(i), "token_{}".format(i)) for i in range(10)]
+    start = time.time()
+    for i in range(num_requests):
+        task_name, _, _ = controller.process_task_request(clients[i % len(clients)], fl_ctx)
+        assert task_name == ""
+    return num_requests / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the task request throughput of Controller")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1, 10, 100, 1000], help="numbers of standing tasks")
+    parser.add_argument("--requests", type=int, default=20000, help="number of task requests")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs for each number of tasks")
+    args = parser.parse_args()
+
+    print("{:>8} {:>14}".format("tasks", "requests/s"))
+    for n in args.tasks:
+        throughput = max(run_requests(n, args.requests) for _ in range(args.repeat))
+        print("{:>8} {:>14.0f}".format(n, throughput))
+
+
+if __name__ == "__main__":
+    main()
@@ -134,6 +134,9 @@ class TestCallback(TestController):
         timeout = 0 if task_complete != "timeout" else 1
         task = create_task("__test_task", data=input_data, task_done_cb=cb, timeout=timeout)
         kwargs = {"targets": clients}
+        if method.startswith("broadcast"):
+            # the task must wait for all results, it could be done after the first one otherwise
+            kwargs["min_responses"] = len(clients)
         launch_thread = threading.Thread(
             target=launch_task,
             kwargs={
@@ -170,9 +173,13 @@ class TestCallback(TestController):
             controller.cancel_task(task)
             assert task.completion_status == TaskCompletionStatus.CANCELLED
         controller._check_tasks()
+        # the monitor thread could be running the callback of the task it removed
+        start = time.time()
+        while task_name not in task.props and time.time() - start < 5.0:
+            time.sleep(0.01)
+        launch_thread.join()
         assert task.props[task_name] == expected
         assert controller.get_num_standing_tasks() == 0
-        launch_thread.join()
         self.stop_controller(controller, fl_ctx)
 
     @pytest.mark.parametrize("method", TestController.ALL_APIS)
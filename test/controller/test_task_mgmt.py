@@ -180,3 +180,35 @@ class TestTaskManagement(TestController):
         assert task.last_client_task_map["__test_client"].result is None
         launch_thread.join()
         self.stop_controller(controller, fl_ctx)
+
+    def test_task_request_order_with_targets(self):
+        controller, fl_ctx = self.start_controller()
+        clients = [create_client(name=f"__test_client{i}") for i in range(3)]
+        tasks = [create_task(name=f"__test_task{i}") for i in range(3)]
+        controller.broadcast(task=tasks[0], fl_ctx=fl_ctx, targets=[clients[0]])
+        controller.broadcast(task=tasks[1], fl_ctx=fl_ctx, min_responses=3)
+        controller.broadcast(task=tasks[2], fl_ctx=fl_ctx, targets=[clients[1]])
+
+        # each client gets the tasks it is a target of, in schedule order
+        expected = {0: ["__test_task0", "__test_task1"], 1: ["__test_task1", "__test_task2"], 2: ["__test_task1"]}
+        for i, task_names in expected.items():
+            for task_name in task_names:
+                task_name_out, client_task_id, _ = controller.process_task_request(clients[i], fl_ctx)
+                assert task_name_out == task_name
+                controller.process_submission(
+                    client=clients[i], task_name=task_name, task_id=client_task_id, fl_ctx=fl_ctx, result=Shareable()
+                )
+            task_name_out, _, _ = controller.process_task_request(clients[i], fl_ctx)
+            assert task_name_out == ""
+
+        controller._check_tasks()
+        assert controller.get_num_standing_tasks() == 0
+        assert not controller._any_client_tasks
+        assert not controller._client_tasks_index
+
+        # any client can join a relay with dynamic targets
+        task = create_task(name="__test_task")
+        controller.relay(task=task, fl_ctx=fl_ctx, targets=[clients[0]])
+        assert controller._any_client_tasks == [task]
+        controller.cancel_task(task)
+        self.stop_controller(controller, fl_ctx)
@@ -0,0 +1,93 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+from nvflare.apis.controller_spec import TaskCompletionStatus
+from nvflare.apis.shareable import Shareable
+
+from .controller_test import DummyController, MockEngine, create_client, create_task, launch_task
+
+# much longer than the waits below: the controller must not depend on its periodic check
+_TASK_CHECK_PERIOD = 5.0
+
+
+class _SlowCheckController(DummyController):
+    def __init__(self):
+        super().__init__()
+        self._task_check_period = _TASK_CHECK_PERIOD
+
+
+def _start(method, task, targets, kwargs=None):
+    controller = _SlowCheckController()
+    fl_ctx = MockEngine().fl_ctx_mgr.new_context()
+    controller.initialize_run(fl_ctx=fl_ctx)
+    kwargs = dict(kwargs or {}, targets=targets)
+    thread = threading.Thread(
+        target=launch_task,
+        kwargs={"controller": controller, "task": task, "method": method, "fl_ctx": fl_ctx, "kwargs": kwargs},
+    )
+    thread.start()
+    while not controller.get_num_standing_tasks():
+        time.sleep(0.01)
+    return controller, fl_ctx, thread
+
+
+class TestTaskWait:
+    @pytest.mark.parametrize("method", ["broadcast_and_wait", "send_and_wait", "relay_and_wait"])
+    def test_return_on_result(self, method):
+        client = create_client(name="__test_client")
+        task = create_task("__test_task")
+        controller, fl_ctx, thread = _start(method, task, [client])
+
+        task_name, task_id, _ = controller.process_task_request(client, fl_ctx)
+        start = time.time()
+        controller.process_submission(client, task_name, task_id, Shareable(), fl_ctx)
+        thread.join(_TASK_CHECK_PERIOD)
+        assert not thread.is_alive()
+        assert time.time() - start < 1.0
+        assert task.completion_status == TaskCompletionStatus.OK
+        assert controller.get_num_standing_tasks() == 0
+        controller.finalize_run(fl_ctx)
+
+    def test_return_on_timeout(self):
+        client = create_client(name="__test_client")
+        task = create_task("__test_task", timeout=1)
+        controller, fl_ctx, thread = _start("broadcast_and_wait", task, [client])
+
+        thread.join(_TASK_CHECK_PERIOD)
+        assert not thread.is_alive()
+        assert time.time() - task.schedule_time < 2.0
+        assert task.completion_status == TaskCompletionStatus.TIMEOUT
+        controller.finalize_run(fl_ctx)
+
+    def test_return_on_cancel(self):
+        client = create_client(name="__test_client")
+        task = create_task("__test_task")
+        controller, fl_ctx, thread = _start("broadcast_and_wait", task, [client])
+
+        start = time.time()
+        controller.cancel_task(task)
+        thread.join(_TASK_CHECK_PERIOD)
+        assert not thread.is_alive()
+        assert time.time() - start < 1.0
+        assert task.completion_status == TaskCompletionStatus.CANCELLED
+
+        # the monitor waits for changes instead of polling, and must still stop at once
+        start = time.time()
+        controller.finalize_run(fl_ctx)
+        assert time.time() - start < 1.0
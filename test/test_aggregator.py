@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import random
+from functools import partial
 
 import numpy as np
 import pytest
@@ -23,13 +24,21 @@ from nvflare.apis.fl_context import FLContext, FLContextManager
 from nvflare.apis.shareable import ReservedHeaderKey, Shareable
 from nvflare.app_common.aggregators.accumulate_model_aggregator import AccumulateWeightedAggregator
 from nvflare.app_common.aggregators.intime_accumulate_model_aggregator import InTimeAccumulateWeightedAggregator
+from nvflare.app_common.aggregators.sparse_accumulate_model_aggregator import SparseInTimeAccumulateWeightedAggregator
 
 # from nvflare.app_common.app_constant import AppConstants, AppShareableKey, AppShareableValue, ShareableContentType
 from nvflare.app_common.app_constant import AppConstants
 
+AGGREGATORS = [
+    AccumulateWeightedAggregator,
+    InTimeAccumulateWeightedAggregator,
+    partial(InTimeAccumulateWeightedAggregator, use_flat_buffer=True),
+    SparseInTimeAccumulateWeightedAggregator,
+]
+
 
 class TestAggregator:
-    @pytest.mark.parametrize("aggregator", [AccumulateWeightedAggregator, InTimeAccumulateWeightedAggregator])
+    @pytest.mark.parametrize("aggregator", AGGREGATORS)
     @pytest.mark.parametrize(
         "received,expected",
         [
@@ -81,7 +90,7 @@ class TestAggregator:
         result = agg.aggregate(fl_ctx)
         np.testing.assert_allclose(result["DXO"]["data"]["var1"], expected["var1"])
 
-    @pytest.mark.parametrize("aggregator", [AccumulateWeightedAggregator, InTimeAccumulateWeightedAggregator])
+    @pytest.mark.parametrize("aggregator", AGGREGATORS)
     @pytest.mark.parametrize("shape", [(4), (6, 6)])
     @pytest.mark.parametrize("n_clients", [10, 50, 100])
     def test_accum_aggregator_random(self, aggregator, shape, n_clients):
@@ -114,7 +123,7 @@ class TestAggregator:
         result_dxo = from_shareable(result)
         np.testing.assert_allclose(result_dxo.data["var1"], weighted_sum / sum_of_weights)
 
-    @pytest.mark.parametrize("aggregator", [AccumulateWeightedAggregator, InTimeAccumulateWeightedAggregator])
+    @pytest.mark.parametrize("aggregator", AGGREGATORS)
     def test_accum_aggregator_accept(self, aggregator):
         aggregation_weights = {f"client_{i}": random.random() for i in range(2)}
         agg = aggregator(aggregation_weights=aggregation_weights)
@@ -155,3 +164,37 @@ class TestAggregator:
         s.set_header(AppConstants.CONTRIBUTION_ROUND, 1)
         fl_ctx.set_prop(AppConstants.CURRENT_ROUND, 2)
         assert (False) == agg.accept(dxo.update_shareable(s), fl_ctx)
+
+    @pytest.mark.parametrize("change_layout", [False, True])
+    def test_flat_buffer(self, change_layout):
+        aggregators = [
+            InTimeAccumulateWeightedAggregator(exclude_vars="excluded"),
+            InTimeAccumulateWeightedAggregator(exclude_vars="excluded", use_flat_buffer=True),
+        ]
+        for current_round in range(2):
+            results = []
+            for agg in aggregators:
+                np.random.seed(current_round)
+                for i in range(4):
+                    data = {
+                        "a": np.random.random((3, 4)).astype(np.float32),
+                        "b": np.random.random(5),
+                        "steps": np.array([i]),
+                        "excluded": np.random.random(2),
+                    }
+                    if change_layout and i == 2:
+                        data["a"] = np.random.random((3, 4))
+                    dxo = DXO(DataKind.WEIGHT_DIFF, data=data, meta={MetaKey.NUM_STEPS_CURRENT_ROUND: i + 1})
+                    fl_ctx = FLContext()
+                    fl_ctx.set_prop(AppConstants.CURRENT_ROUND, current_round)
+                    s = Shareable()
+                    s.set_peer_props({ReservedKey.IDENTITY_NAME: f"client_{i}"})
+                    s.set_header(AppConstants.CONTRIBUTION_ROUND, current_round)
+                    assert agg.accept(dxo.update_shareable(s), fl_ctx)
+                results.append(from_shareable(agg.aggregate(fl_ctx)).data)
+
+            expected, result = results
+            assert result.keys() == expected.keys() == {"a", "b", "steps"}
+            for k, v in expected.items():
+                assert result[k].dtype == v.dtype
+                np.testing.assert_allclose(result[k], v, rtol=1e-6)
@@ -0,0 +1,109 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from nvflare.apis.analytix import AnalyticsData, AnalyticsDataType
+from nvflare.apis.dxo import from_shareable
+from nvflare.apis.event_type import EventType
+from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_context import FLContextManager
+from nvflare.app_common.widgets.streaming import _ANALYTIC_EVENT_TYPE, AnalyticsReceiver
+
+
+class _Engine(object):
+    def __init__(self):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=self, identity_name="server", run_num=1, public_stickers={}, private_stickers={}
+        )
+
+    def new_context(self):
+        return self.fl_ctx_mgr.new_context()
+
+
+class _Receiver(AnalyticsReceiver):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.saved = []
+        self.save_threads = set()
+        self.flushed = []
+        self.finalized = False
+
+    def initialize(self, fl_ctx):
+        pass
+
+    def save(self, fl_ctx, shareable, record_origin):
+        self.gate.wait()
+        data = AnalyticsData.from_dxo(from_shareable(shareable))
+        self.saved.append((record_origin, data.tag, data.value))
+        self.save_threads.add(threading.current_thread())
+
+    def flush(self, fl_ctx, record_origin):
+        self.flushed.append(record_origin)
+
+    def finalize(self, fl_ctx):
+        self.finalized = True
+
+
+def _send(receiver, engine, tag, value, data_type=AnalyticsDataType.SCALAR):
+    with engine.new_context() as fl_ctx:
+        dxo = AnalyticsData(tag=tag, value=value, data_type=data_type).to_dxo()
+        fl_ctx.set_prop(FLContextKey.EVENT_DATA, dxo.to_shareable(), private=True, sticky=False)
+        receiver.handle_event(_ANALYTIC_EVENT_TYPE, fl_ctx)
+
+
+class TestAnalyticsReceiver:
+    def test_sync(self):
+        engine = _Engine()
+        receiver = _Receiver()
+        receiver.handle_event(EventType.START_RUN, engine.new_context())
+        _send(receiver, engine, "loss", 0.5)
+        assert receiver.saved == [("server", "loss", 0.5)]
+        assert receiver.save_threads == {threading.current_thread()}
+
+    def test_async(self):
+        engine = _Engine()
+        receiver = _Receiver(async_save=True, max_queue_size=3)
+        receiver.handle_event(EventType.START_RUN, engine.new_context())
+
+        # a slow writer does not block the event thread
+        receiver.gate.clear()
+        _send(receiver, engine, "loss", 0.1)
+        writer = receiver._writers["server"]
+        while writer.records:
+            time.sleep(0.01)
+
+        _send(receiver, engine, "acc", 0.2)
+        _send(receiver, engine, "loss", 0.3)
+        _send(receiver, engine, "note", "a", data_type=AnalyticsDataType.TEXT)
+        # the queue is full: the latest loss replaces the queued one, the text is dropped
+        _send(receiver, engine, "loss", 0.4)
+        _send(receiver, engine, "note", "b", data_type=AnalyticsDataType.TEXT)
+        assert receiver.num_coalesced == 1
+        assert receiver.num_dropped == 1
+        receiver.gate.set()
+
+        receiver.handle_event(EventType.END_RUN, engine.new_context())
+        assert receiver.finalized
+        assert receiver.flushed == ["server"]
+        assert threading.current_thread() not in receiver.save_threads
+        saved = [(tag, value) for _, tag, value in receiver.saved]
+        assert saved == [("loss", 0.1), ("acc", 0.2), ("loss", 0.4), ("note", "a")]
+
+        # records after END_RUN are ignored
+        _send(receiver, engine, "loss", 0.5)
+        assert len(receiver.saved) == len(saved)
@@ -0,0 +1,98 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nvflare.apis.analytix import AnalyticsDataType, get_analytics_data_type, scalar_batch_from_dxo
+from nvflare.apis.dxo import from_shareable
+from nvflare.apis.event_type import EventType
+from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_context import FLContextManager
+from nvflare.app_common.widgets.streaming import AnalyticsSender
+
+
+class _Engine(object):
+    def __init__(self):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=self, identity_name="site-1", run_num=1, public_stickers={}, private_stickers={}
+        )
+        self.events = []
+
+    def new_context(self):
+        return self.fl_ctx_mgr.new_context()
+
+    def fire_event(self, event_type, fl_ctx):
+        self.events.append((event_type, from_shareable(fl_ctx.get_prop(FLContextKey.EVENT_DATA))))
+
+
+def _make_sender(**kwargs):
+    engine = _Engine()
+    sender = AnalyticsSender(**kwargs)
+    sender.handle_event(EventType.START_RUN, engine.new_context())
+    return sender, engine
+
+
+class TestAnalyticsSender:
+    def test_unbuffered(self):
+        sender, engine = _make_sender()
+        sender.add_scalar("loss", 0.5, global_step=1)
+        sender.add_scalar("loss", 0.25, global_step=2)
+        assert len(engine.events) == 2
+        assert get_analytics_data_type(engine.events[0][1]) == AnalyticsDataType.SCALAR
+
+    def test_size_trigger(self):
+        sender, engine = _make_sender(buffer_size=3, flush_interval=1000.0)
+        sender.add_scalar("loss", 0.5, global_step=1)
+        sender.add_scalar("acc", 0.7)
+        assert not engine.events
+        sender.add_scalar("loss", 0.25, global_step=2)
+        assert len(engine.events) == 1
+        dxo = engine.events[0][1]
+        assert get_analytics_data_type(dxo) == AnalyticsDataType.SCALAR_BATCH
+        assert scalar_batch_from_dxo(dxo) == {"loss": [(1, 0.5), (2, 0.25)], "acc": [(None, 0.7)]}
+
+        # scalars with extra arguments are not buffered
+        sender.add_scalar("loss", 0.1, global_step=3, walltime=1.0)
+        assert len(engine.events) == 2
+
+    def test_time_trigger_and_flush(self):
+        sender, engine = _make_sender(buffer_size=100, flush_interval=0.0)
+        sender.add_scalar("loss", 0.5)
+        assert len(engine.events) == 1
+
+        sender.flush_interval = 1000.0
+        sender.add_scalar("loss", 0.25)
+        sender.flush()
+        assert len(engine.events) == 2
+        # nothing to flush
+        sender.handle_event(EventType.END_RUN, engine.new_context())
+        assert len(engine.events) == 2
+
+    @pytest.mark.parametrize("reduction,expected", [("min", 0.25), ("mean", 0.5), ("last", 0.75)])
+    def test_reduction(self, reduction, expected):
+        sender, engine = _make_sender(buffer_size=100, flush_interval=1000.0, reduction=reduction)
+        for i, value in enumerate([0.5, 0.25, 0.75]):
+            sender.add_scalar("loss", value, global_step=i)
+        sender.handle_event(EventType.END_RUN, engine.new_context())
+        assert scalar_batch_from_dxo(engine.events[0][1]) == {"loss": [(2, expected)]}
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            AnalyticsSender(reduction="max")
+        with pytest.raises(ValueError):
+            AnalyticsSender(buffer_size=-1)
+        sender, _ = _make_sender(buffer_size=10)
+        with pytest.raises(TypeError):
+            sender.add_scalar("loss", np.float32(0.5))
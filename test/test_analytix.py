@@ -12,9 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pytest
 
-from nvflare.apis.analytix import _DATA_TYPE_KEY, _KWARGS_KEY, AnalyticsData, AnalyticsDataType
+from nvflare.apis.analytix import (
+    _DATA_TYPE_KEY,
+    _KWARGS_KEY,
+    AnalyticsData,
+    AnalyticsDataType,
+    get_analytics_data_type,
+    scalar_batch_from_dxo,
+    scalar_batch_to_dxo,
+)
 from nvflare.apis.dxo import DXO, DataKind
 
 FROM_DXO_TEST_CASES = [
@@ -92,3 +101,15 @@ class TestAnalytix:
     def test_from_dxo_invalid(self, dxo, expected_error, expected_msg):
         with pytest.raises(expected_error, match=expected_msg):
             _ = AnalyticsData.from_dxo(dxo)
+
+    def test_scalar_batch(self):
+        scalars = {"loss": np.array([[1.0, 0.5], [np.nan, 0.25]]), "acc": np.array([[3.0, 0.9]])}
+        dxo = scalar_batch_to_dxo(scalars)
+        assert dxo.data_kind == DataKind.ANALYTIC
+        assert get_analytics_data_type(dxo) == AnalyticsDataType.SCALAR_BATCH
+        assert scalar_batch_from_dxo(dxo) == {"loss": [(1, 0.5), (None, 0.25)], "acc": [(3, 0.9)]}
+
+        with pytest.raises(ValueError):
+            scalar_batch_to_dxo({"loss": np.array([1.0, 2.0])})
+        with pytest.raises(ValueError):
+            scalar_batch_from_dxo(AnalyticsData(tag="hello", value=3.0, data_type=AnalyticsDataType.SCALAR).to_dxo())
@@ -0,0 +1,117 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from nvflare.apis.dxo import DXO, DataKind, from_shareable
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.private.fed.server.broadcast_cache import (
+    BroadcastCacheStatsReporter,
+    BroadcastPayloadCache,
+    split_headers,
+)
+from nvflare.widgets.info_collector import GroupInfoCollector, InfoCollector
+
+
+def _make_task_data(size=1000):
+    s = DXO(data_kind=DataKind.WEIGHTS, data={"a": np.random.rand(size)}).to_shareable()
+    s.set_header(ReservedHeaderKey.TASK_ID, "task")
+    return s
+
+
+def _get(cache, shareable, task_id):
+    headers, body = split_headers(shareable)
+    headers.add_cookie("task_id", task_id)
+    data = cache.get_data(shareable, body)
+    return headers, data
+
+
+class TestBroadcastPayloadCache:
+    def test_split_headers(self):
+        s = _make_task_data()
+        headers, body = split_headers(s)
+        headers.set_header("client", "site-1")
+        assert s.get_header("client") is None
+        assert body.get_header(ReservedHeaderKey.TASK_ID) is None
+        assert headers.get_header(ReservedHeaderKey.TASK_ID) == "task"
+        assert body["DXO"] is s["DXO"]
+
+    def test_serialize_once(self):
+        cache = BroadcastPayloadCache(max_bytes=1 << 30)
+        s = _make_task_data()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: _get(cache, s, str(i)), range(16)))
+
+        assert cache.get_info()["misses"] == 1
+        assert cache.get_info()["hits"] == 15
+        for i, (headers, data) in enumerate(results):
+            assert data is results[0][1]
+            assert headers.get_cookie("task_id") == str(i)
+
+        result = Shareable.from_bytes(results[0][1])
+        result[ReservedHeaderKey.HEADERS] = results[3][0][ReservedHeaderKey.HEADERS]
+        assert result.get_cookie("task_id") == "3"
+        np.testing.assert_array_equal(from_shareable(result).data["a"], from_shareable(s).data["a"])
+
+    def test_replaced_body(self):
+        cache = BroadcastPayloadCache(max_bytes=1 << 30)
+        s = _make_task_data()
+        _get(cache, s, "1")
+        DXO(data_kind=DataKind.WEIGHTS, data={"b": np.zeros(3)}).update_shareable(s)
+        headers, data = _get(cache, s, "2")
+        assert cache.get_info()["misses"] == 2
+        result = Shareable.from_bytes(data)
+        result[ReservedHeaderKey.HEADERS] = headers[ReservedHeaderKey.HEADERS]
+        assert "b" in from_shareable(result).data
+
+    def test_evict_on_release(self):
+        cache = BroadcastPayloadCache(max_bytes=1 << 30)
+        s = _make_task_data()
+        _get(cache, s, "1")
+        assert cache.get_info()["entries"] == 1
+        del s
+        gc.collect()
+        assert cache.get_info()["entries"] == 0
+        assert cache.get_info()["bytes"] == 0
+
+    def test_bounded(self):
+        cache = BroadcastPayloadCache(max_bytes=20000)
+        tasks = [_make_task_data(size=1000) for _ in range(5)]
+        for s in tasks:
+            _get(cache, s, "1")
+        info = cache.get_info()
+        assert info["bytes"] <= 20000
+        assert info["entries"] == 2
+
+    def test_disabled(self):
+        cache = BroadcastPayloadCache(max_bytes=0)
+        s = _make_task_data()
+        _get(cache, s, "1")
+        assert cache.get_info()["entries"] == 0
+
+    def test_report_stats(self):
+        cache = BroadcastPayloadCache(max_bytes=1000000)
+        s = _make_task_data()
+        _get(cache, s, "1")
+        _get(cache, s, "2")
+        collector = GroupInfoCollector()
+        fl_ctx = FLContext()
+        fl_ctx.set_prop(InfoCollector.CTX_KEY_STATS_COLLECTOR, collector)
+        BroadcastCacheStatsReporter(cache).handle_event(InfoCollector.EVENT_TYPE_GET_STATS, fl_ctx)
+        assert collector.info["BroadcastPayloadCache"] == cache.get_info()
+        assert collector.info["BroadcastPayloadCache"]["hits"] == 1
@@ -0,0 +1,121 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import grpc
+
+import nvflare.private.fed.protos.federated_pb2_grpc as fed_service
+from nvflare.private.fed.client.channel_pool import CHANNEL_DEFAULT_OPTIONS, ChannelPool, add_channel_options
+from nvflare.private.fed.client.communicator import Communicator
+
+CHANNEL_DICT = {"target": "localhost:1", "options": [("grpc.max_send_message_length", 1024)]}
+
+
+class _Channel(object):
+    def __init__(self, channel):
+        self.channel = channel
+        self.closed = False
+
+    def __getattr__(self, name):
+        return getattr(self.channel, name)
+
+    def close(self):
+        self.closed = True
+        self.channel.close()
+
+
+class _ChannelFactory(object):
+    def __init__(self):
+        self.channels = []
+
+    def __call__(self, channel_dict, token):
+        channel = _Channel(grpc.insecure_channel(**channel_dict))
+        self.channels.append(channel)
+        return channel
+
+
+def _get_stub(pool, channel_dict, token=None):
+    with pool.stub(channel_dict, fed_service.FederatedTrainingStub, token) as stub:
+        return stub
+
+
+class TestChannelPool:
+    def test_add_channel_options(self):
+        result = add_channel_options(CHANNEL_DICT, [("grpc.max_send_message_length", 1), ("grpc.a", 2)])
+        assert result["options"] == [("grpc.max_send_message_length", 1024), ("grpc.a", 2)]
+        assert CHANNEL_DICT["options"] == [("grpc.max_send_message_length", 1024)]
+        assert add_channel_options({"target": "t"}, [("grpc.a", 2)])["options"] == [("grpc.a", 2)]
+
+    def test_reuse_channel(self):
+        factory = _ChannelFactory()
+        pool = ChannelPool(factory)
+        stub = _get_stub(pool, CHANNEL_DICT, "token")
+        for _ in range(10):
+            assert _get_stub(pool, CHANNEL_DICT, "token") is stub
+        assert len(factory.channels) == 1
+
+        _get_stub(pool, dict(CHANNEL_DICT, target="localhost:2"), "token")
+        assert len(factory.channels) == 2
+        assert len(pool.get_info()) == 2
+        pool.close()
+        assert pool.get_info() == {}
+        assert all(channel.closed for channel in factory.channels)
+
+    def test_new_token(self):
+        factory = _ChannelFactory()
+        pool = ChannelPool(factory)
+        stub = _get_stub(pool, CHANNEL_DICT, "token1")
+        assert _get_stub(pool, CHANNEL_DICT, "token2") is not stub
+        assert len(factory.channels) == 2
+        assert len(pool.get_info()) == 1
+        pool.close()
+
+    def test_replace_failed_channel(self):
+        factory = _ChannelFactory()
+        pool = ChannelPool(factory, max_failures=3)
+        _get_stub(pool, CHANNEL_DICT)
+        for _ in range(2):
+            pool.report_failure(CHANNEL_DICT, grpc.RpcError())
+        assert not pool.is_healthy(CHANNEL_DICT)
+        pool.report_success(CHANNEL_DICT)
+        assert pool.is_healthy(CHANNEL_DICT)
+
+        for _ in range(3):
+            pool.report_failure(CHANNEL_DICT, grpc.RpcError())
+        assert pool.get_info() == {}
+        _get_stub(pool, CHANNEL_DICT)
+        assert len(factory.channels) == 2
+        pool.close()
+
+    def test_close_after_calls(self):
+        factory = _ChannelFactory()
+        pool = ChannelPool(factory, max_failures=1)
+        with pool.stub(CHANNEL_DICT, fed_service.FederatedTrainingStub, "token"):
+            # another thread's call failed: the channel is replaced, but not closed during this call
+            pool.report_failure(CHANNEL_DICT, grpc.RpcError())
+            assert pool.get_info() == {}
+            assert not factory.channels[0].closed
+            _get_stub(pool, CHANNEL_DICT, "token")
+            assert len(factory.channels) == 2
+        assert factory.channels[0].closed
+        assert not factory.channels[1].closed
+        pool.close()
+        assert factory.channels[1].closed
+
+    def test_communicator_channel_options(self):
+        communicator = Communicator()
+        channel_dict = add_channel_options(CHANNEL_DICT, CHANNEL_DEFAULT_OPTIONS)
+        assert ("grpc.keepalive_time_ms", 60000) in channel_dict["options"]
+        _get_stub(communicator.channel_pool, CHANNEL_DICT, "token")
+        assert list(communicator.channel_pool.get_info()) == ["localhost:1"]
+        communicator.close()
@@ -0,0 +1,94 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import sys
+
+import pytest
+
+from nvflare.fuel.utils import class_utils
+from nvflare.fuel.utils.class_utils import ModuleScanner, build_class_index
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "src"
+    pkg = root / "idx_pkg"
+    (pkg / "app").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "app" / "__init__.py").write_text("class AppBase:\n    pass\n")
+    (pkg / "app" / "trainer.py").write_text(
+        "import json\n\n\nclass Trainer:\n    pass\n\n\ntry:\n    class Optional:\n        pass\nexcept ImportError:\n    pass\n"
+    )
+    # same class name in a module whose dependency is missing
+    (pkg / "app" / "z_missing.py").write_text("import idx_pkg_missing_dep\n\n\nclass Trainer:\n    pass\n")
+    (pkg / "other.py").write_text("class Other:\n    pass\n")
+    monkeypatch.syspath_prepend(str(root))
+    monkeypatch.setenv(class_utils.CLASS_INDEX_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setattr(class_utils, "_package_indexes", {})
+    yield pkg
+    for name in list(sys.modules):
+        if name.startswith("idx_pkg"):
+            del sys.modules[name]
+
+
+class TestModuleScanner:
+    def test_lazy_scan(self, package):
+        scanner = ModuleScanner(["idx_pkg"], ["app"])
+        # nothing is imported to build the table
+        assert "idx_pkg.app.trainer" not in sys.modules
+        assert scanner.get_module_name("AppBase") == "idx_pkg.app"
+        assert scanner.get_module_name("Optional") == "idx_pkg.app.trainer"
+        assert scanner.get_module_name("Other") is None
+        assert scanner.get_module_name("json") is None
+
+        # like the import-everything scan, modules that can't be imported don't win
+        assert scanner.get_module_name("Trainer") == "idx_pkg.app.trainer"
+
+    def test_cached_index(self, package, tmp_path):
+        index_file = str(tmp_path / "index.json")
+        index = build_class_index("idx_pkg", index_file)
+        assert [m for m, _ in index] == [
+            "idx_pkg.app",
+            "idx_pkg.app.trainer",
+            "idx_pkg.app.z_missing",
+            "idx_pkg.other",
+        ]
+        with open(index_file) as f:
+            cached = json.load(f)
+        assert len(cached["modules"]) == 4
+
+        # unchanged modules are not parsed again
+        trainer_file = str(package / "app" / "trainer.py")
+        cached["modules"][trainer_file]["classes"] = ["FromCache"]
+        with open(index_file, "w") as f:
+            json.dump(cached, f)
+        assert dict(build_class_index("idx_pkg", index_file))["idx_pkg.app.trainer"] == ["FromCache"]
+
+        # stale entries are detected by the mtime
+        (package / "app" / "trainer.py").write_text("class NewTrainer:\n    pass\n")
+        st = os.stat(trainer_file)
+        os.utime(trainer_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        assert dict(build_class_index("idx_pkg", index_file))["idx_pkg.app.trainer"] == ["NewTrainer"]
+
+        # removed modules are dropped
+        os.remove(str(package / "other.py"))
+        assert "idx_pkg.other" not in dict(build_class_index("idx_pkg", index_file))
+        with open(index_file) as f:
+            assert len(json.load(f)["modules"]) == 3
+
+    def test_default_index_file(self, package, tmp_path):
+        ModuleScanner(["idx_pkg"], ["app"])
+        assert [f for f in os.listdir(str(tmp_path / "cache")) if f.startswith("class_index_idx_pkg_")]
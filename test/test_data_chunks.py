@@ -0,0 +1,114 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, from_shareable
+from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+from nvflare.private.fed.client import communicator
+from nvflare.private.fed.client.communicator import Communicator
+from nvflare.private.fed.protos.federated_pb2 import CurrentTask, CurrentTaskChunk, DataChunk
+from nvflare.private.fed.utils.fed_utils import ChunkAssembler, make_data_chunks
+
+TEST_CASES = [
+    (b"", 4, 1),
+    (b"abc", 4, 1),
+    (b"abcd", 4, 1),
+    (b"abcdefghij", 4, 3),
+    (bytes(range(256)) * 10, 1000, 3),
+]
+
+
+class TestDataChunks:
+    @pytest.mark.parametrize("data,chunk_size,num_chunks", TEST_CASES)
+    def test_round_trip(self, data, chunk_size, num_chunks):
+        chunks = list(make_data_chunks(data, chunk_size))
+        assert len(chunks) == num_chunks
+        assembler = ChunkAssembler()
+        for c in chunks:
+            assert not assembler.is_complete() or len(data) == 0
+            assembler.add(DataChunk.FromString(c.SerializeToString()))
+        assert assembler.is_complete()
+        assert assembler.get_data() == data
+
+    def test_shareable(self):
+        weights = {"a": np.random.rand(50, 20).astype(np.float32), "b": np.arange(7)}
+        data = DXO(data_kind=DataKind.WEIGHTS, data=weights).to_shareable().to_bytes()
+        assembler = ChunkAssembler()
+        for c in make_data_chunks(data, 256):
+            assembler.add(c)
+        result = from_shareable(Shareable.from_bytes(assembler.get_data()))
+        for k, v in weights.items():
+            np.testing.assert_array_equal(result.data[k], v)
+            assert result.data[k].flags.writeable
+
+    def test_out_of_order(self):
+        chunks = list(make_data_chunks(b"abcdefgh", 2))
+        assembler = ChunkAssembler()
+        assembler.add(chunks[0])
+        with pytest.raises(ValueError, match="out of order chunk"):
+            assembler.add(chunks[2])
+
+    def test_incomplete(self):
+        chunks = list(make_data_chunks(b"abcdefgh", 2))
+        assembler = ChunkAssembler()
+        assembler.add(chunks[0])
+        with pytest.raises(ValueError, match="incomplete data"):
+            assembler.get_data()
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            list(make_data_chunks(b"abc", 0))
+
+
+class _StreamStub(object):
+    def __init__(self, streams):
+        self.streams = streams
+
+    def GetTaskStream(self, request):
+        return iter(self.streams.pop(0))
+
+
+class TestGetTaskStream:
+    def test_retry_incomplete_stream(self, monkeypatch):
+        monkeypatch.setattr(communicator.time, "sleep", lambda _: None)
+        data = bytes(range(100))
+        chunks = list(make_data_chunks(data, 30))
+        task = CurrentTask(task_name="train")
+        complete = [CurrentTaskChunk(task=task, chunk=chunks[0])] + [CurrentTaskChunk(chunk=c) for c in chunks[1:]]
+        # the first stream ends early: the task is fetched again instead of failing
+        stub = _StreamStub([complete[:2], complete])
+
+        comm = Communicator(streaming=True)
+        monkeypatch.setattr(comm.channel_pool, "stub", _stub_context(stub))
+        fl_ctx = FLContext()
+        fl_ctx.set_prop(FLContextKey.CURRENT_RUN, 1)
+        result = comm.getTask({"server": {"target": "localhost:1"}}, "server", "token", fl_ctx)
+        assert result.task_name == "train"
+        assert bytes(result.data.params["data"].ndarray) == data
+        assert stub.streams == []
+        comm.close()
+
+
+def _stub_context(stub):
+    @contextlib.contextmanager
+    def _stub(channel_dict, stub_class, token=None):
+        yield stub
+
+    return _stub
@@ -0,0 +1,62 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nvflare.apis.event_type import EventType
+from nvflare.apis.fl_component import FLComponent
+from nvflare.apis.fl_context import FLContext
+from nvflare.private.event import EventDispatcher, get_subscribed_event_types
+
+
+class _Legacy(FLComponent):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def handle_event(self, event_type: str, fl_ctx: FLContext):
+        self.events.append(event_type)
+
+
+class _RunOnly(_Legacy):
+    def get_subscribed_event_types(self):
+        return [EventType.START_RUN, EventType.END_RUN]
+
+
+class _RunOnlyOverridden(_RunOnly):
+    def handle_event(self, event_type: str, fl_ctx: FLContext):
+        self.events.append("overridden " + event_type)
+
+
+class TestEventDispatch:
+    def test_subscriptions(self):
+        assert get_subscribed_event_types(FLComponent()) == frozenset()
+        assert get_subscribed_event_types(_Legacy()) is None
+        assert get_subscribed_event_types(_RunOnly()) == {EventType.START_RUN, EventType.END_RUN}
+        # the subscription was declared for the handle_event of the base class
+        assert get_subscribed_event_types(_RunOnlyOverridden()) is None
+
+    def test_dispatch(self):
+        legacy, run_only, overridden = _Legacy(), _RunOnly(), _RunOnlyOverridden()
+        dispatcher = EventDispatcher([legacy, FLComponent(), run_only])
+        dispatcher.fire_event(EventType.START_RUN, FLContext())
+        dispatcher.fire_event(EventType.INFO_LOG_AVAILABLE, FLContext())
+        assert legacy.events == [EventType.START_RUN, EventType.INFO_LOG_AVAILABLE]
+        assert run_only.events == [EventType.START_RUN]
+        assert dispatcher.get_event_handlers(EventType.INFO_LOG_AVAILABLE) == [legacy]
+
+        # an added handler gets the events that were looked up before
+        dispatcher.add_handler(overridden)
+        assert dispatcher.handlers[-1] is overridden
+        dispatcher.fire_event(EventType.INFO_LOG_AVAILABLE, FLContext())
+        assert overridden.events == ["overridden " + EventType.INFO_LOG_AVAILABLE]
+        assert dispatcher.get_event_handlers(EventType.END_RUN) == [legacy, run_only, overridden]
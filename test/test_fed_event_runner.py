@@ -0,0 +1,160 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from nvflare.apis.dxo import DXO, DataKind
+from nvflare.apis.event_type import EventType
+from nvflare.apis.fl_constant import EventScope, FedEventHeader, FLContextKey, ReservedKey, ReturnCode
+from nvflare.apis.fl_context import FLContext, FLContextManager
+from nvflare.apis.shareable import Shareable
+from nvflare.apis.signal import Signal
+from nvflare.widgets.fed_event import ClientFedEventRunner, FedEventRunner, ServerFedEventRunner
+
+
+class _Engine(object):
+    def __init__(self):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=self, identity_name="server", run_num=1, public_stickers={}, private_stickers={}
+        )
+        self.events = []
+
+    def new_context(self):
+        return self.fl_ctx_mgr.new_context()
+
+    def register_aux_message_handler(self, topic, message_handle_func):
+        pass
+
+    def fire_event(self, event_type, fl_ctx):
+        self.events.append((event_type, fl_ctx.get_prop(FLContextKey.EVENT_DATA)))
+
+
+class _SendingRunner(FedEventRunner):
+    def __init__(self):
+        FedEventRunner.__init__(self)
+        self.sent = []
+
+    def fire_and_forget_request(self, request: Shareable, fl_ctx: FLContext, targets=None):
+        self.sent.append(request)
+
+
+def _make_event(timestamp, seq=None, event_type="fed.analytix", tag="loss", value=0.0, peer="site-1", sender="rank-0"):
+    if tag is None:
+        event = Shareable()
+    else:
+        event = DXO(data_kind=DataKind.ANALYTIC, data={tag: value}).to_shareable()
+    event.set_header(FedEventHeader.TIMESTAMP, timestamp)
+    event.set_header(FedEventHeader.EVENT_TYPE, event_type)
+    if seq is not None:
+        event.set_header(FedEventHeader.SEQ, seq)
+        event.set_header(FedEventHeader.SENDER, sender)
+    event.set_peer_props({ReservedKey.IDENTITY_NAME: peer})
+    return event
+
+
+class TestFedEventRunner:
+    def test_dedupe(self):
+        runner = FedEventRunner()
+        fl_ctx = FLContext()
+        # events of a sender are ordered by their seq, not by their timestamp
+        for seq in range(3):
+            assert runner._receive("t", _make_event(1.0, seq=seq), fl_ctx).get_return_code() == ReturnCode.OK
+        runner._receive("t", _make_event(0.5, seq=3), fl_ctx)
+        # resent events are ignored
+        runner._receive("t", _make_event(2.0, seq=1), fl_ctx)
+        # other ranks of the peer and other peers are tracked separately
+        runner._receive("t", _make_event(0.5, seq=0, sender="rank-1"), fl_ctx)
+        runner._receive("t", _make_event(0.5, seq=0, peer="site-2"), fl_ctx)
+        # events without seq are ordered by their timestamp
+        runner._receive("t", _make_event(0.5, peer="site-3"), fl_ctx)
+        runner._receive("t", _make_event(0.5, peer="site-3"), fl_ctx)
+        assert len(runner.in_events) == 7
+        assert runner.get_info()["received"] == 7
+
+        bad = _make_event(2.0)
+        bad.set_peer_props({})
+        assert runner._receive("t", bad, fl_ctx).get_return_code() == ReturnCode.MISSING_PEER_CONTEXT
+
+    def test_backpressure(self):
+        runner = FedEventRunner(max_queue_size=2)
+        fl_ctx = FLContext()
+        runner._receive("t", _make_event(1.0, value=1.0), fl_ctx)
+        runner._receive("t", _make_event(2.0, tag=None), fl_ctx)
+
+        # the queue is full: the latest value of a queued tag replaces the old one, other events are dropped
+        runner._receive("t", _make_event(3.0, value=3.0), fl_ctx)
+        runner._receive("t", _make_event(4.0, tag="acc"), fl_ctx)
+        runner._receive("t", _make_event(5.0, tag=None), fl_ctx)
+
+        info = runner.get_info()
+        assert info["queued"] == 2
+        assert info["coalesced"] == 1
+        assert info["dropped"] == 2
+        first = runner.in_events[0][0]
+        assert first.get_header(FedEventHeader.TIMESTAMP) == 3.0
+        assert first["DXO"]["data"] == {"loss": 3.0}
+
+    def test_post(self):
+        engine = _Engine()
+        fl_ctx = engine.new_context()
+        fl_ctx.set_prop(FLContextKey.RUN_ABORT_SIGNAL, Signal(), private=True, sticky=True)
+
+        runner = FedEventRunner(post_batch_size=10)
+        runner.handle_event(EventType.START_RUN, fl_ctx)
+        try:
+            start = time.time()
+            for i in range(25):
+                runner._receive("t", _make_event(1.0, seq=i, tag="tag{}".format(i)), fl_ctx)
+            while len(engine.events) < 25 and time.time() - start < 5.0:
+                time.sleep(0.01)
+        finally:
+            runner.handle_event(EventType.END_RUN, fl_ctx)
+
+        assert [e[0] for e in engine.events] == ["fed.analytix"] * 25
+        assert [e[1].get_header(FedEventHeader.SEQ) for e in engine.events] == list(range(25))
+        assert all(e[1].get_header(FedEventHeader.DIRECTION) == "in" for e in engine.events)
+        assert runner.get_info()["posted"] == 25
+        assert not runner.poster.is_alive()
+
+    def test_send_order(self):
+        engine = _Engine()
+        sender = _SendingRunner()
+
+        def _fire():
+            for _ in range(200):
+                fl_ctx = engine.new_context()
+                fl_ctx.set_prop(FLContextKey.EVENT_SCOPE, EventScope.FEDERATION, private=True, sticky=False)
+                fl_ctx.set_prop(FLContextKey.EVENT_DATA, Shareable(), private=True, sticky=False)
+                sender.handle_event("fed.analytix", fl_ctx)
+
+        threads = [threading.Thread(target=_fire) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # the events are sent in the order of their seq, so the receiver keeps all of them
+        assert [e.get_header(FedEventHeader.SEQ) for e in sender.sent] == list(range(800))
+        receiver = FedEventRunner(max_queue_size=1000)
+        for e in sender.sent:
+            e.set_peer_props({ReservedKey.IDENTITY_NAME: "site-1"})
+            receiver._receive("t", e, FLContext())
+        assert receiver.get_info()["received"] == 800
+
+    def test_runner_settings(self):
+        for runner_class in (ServerFedEventRunner, ClientFedEventRunner):
+            runner = runner_class(max_queue_size=5, post_batch_size=2)
+            assert runner.max_queue_size == 5
+            assert runner.post_batch_size == 2
@@ -12,7 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from nvflare.apis.fl_context import FLContext
+import pickle
+
+import pytest
+
+from nvflare.apis.fl_constant import ReservedKey
+from nvflare.apis.fl_context import FLContext, FLContextManager
+
+# an FLContext with a public sticky prop "public" = 1 and a private non-sticky prop "private" = "x", pickled by
+# the version that kept the props in one dict
+LEGACY_PICKLE = (
+    b"\x80\x04\x95\xa5\x00\x00\x00\x00\x00\x00\x00\x8c\x17nvflare.apis.fl_context\x94\x8c\tFLContext\x94"
+    b"\x93\x94)\x81\x94}\x94(\x8c\x05model\x94N\x8c\x05props\x94}\x94(\x8c\x06public\x94}\x94(\x8c\x05value"
+    b"\x94K\x01\x8c\x04mask\x94K\x01u\x8c\x07private\x94}\x94(h\n\x8c\x01x\x94h\x0bK\x02uu\x8c\x06logger"
+    b"\x94\x8c\x07logging\x94\x8c\tgetLogger\x94\x93\x94h\x01\x85\x94R\x94ub."
+)
 
 
 class TestFLContext:
@@ -77,3 +91,70 @@ class TestFLContext:
         assert fl_ctx.set_prop("y", 20, private=True)
 
         assert fl_ctx.get_prop("y") == 20
+
+    def test_clone_and_update(self):
+        fl_ctx = FLContext()
+        fl_ctx.set_prop("x", 1, private=False, sticky=True)
+        fl_ctx.set_prop("y", 2, private=True, sticky=False)
+        fl_ctx.set_prop("z", 3, private=True, sticky=True)
+
+        clone = fl_ctx.clone_sticky()
+        assert clone.get_prop("y") is None
+        assert clone.get_prop_detail("z") == {"value": 3, "private": True, "sticky": True}
+        assert clone.get_all_public_props() == {"x": 1}
+
+        other = FLContext()
+        other.set_prop("y", 20, private=False)
+        other.update_props(fl_ctx, keys=["y", "missing"])
+        assert other.get_prop_detail("y") == {"value": 2, "private": True, "sticky": False}
+        assert other.get_prop("missing") is None
+
+        # the props view is read-only
+        assert fl_ctx.props["x"] == {"value": 1, "mask": FLContext.MASK_STICKY}
+        with pytest.raises(TypeError):
+            fl_ctx.props["x"] = {"value": 2, "mask": 0}
+
+    def test_pickle(self):
+        fl_ctx = FLContext()
+        fl_ctx.set_prop("x", 1, private=False)
+        restored = pickle.loads(pickle.dumps(fl_ctx))
+        assert restored.get_prop_detail("x") == fl_ctx.get_prop_detail("x")
+        assert not restored.set_prop("x", 2, private=True)
+
+    def test_legacy_pickle(self):
+        fl_ctx = pickle.loads(LEGACY_PICKLE)
+        assert fl_ctx.model is None
+        assert fl_ctx.get_prop_detail("public") == {"value": 1, "private": False, "sticky": True}
+        assert fl_ctx.get_prop_detail("private") == {"value": "x", "private": True, "sticky": False}
+        assert fl_ctx.get_all_public_props() == {"public": 1}
+
+        # the state is the same as the legacy state, so older versions can load the contexts of this one
+        state = FLContext.__getstate__(fl_ctx)
+        assert sorted(state.keys()) == ["logger", "model", "props"]
+        assert state["props"] == {"public": {"value": 1, "mask": 1}, "private": {"value": "x", "mask": 2}}
+
+    def test_manager(self):
+        mgr = FLContextManager(
+            engine="engine", identity_name="site-1", run_num=3, public_stickers={"p": 1}, private_stickers={"q": 2}
+        )
+        with mgr.new_context() as fl_ctx:
+            assert fl_ctx.get_engine() == "engine"
+            assert fl_ctx.get_run_number() == 3
+            assert fl_ctx.get_all_public_props() == {
+                ReservedKey.RUN_NUM: 3,
+                ReservedKey.IDENTITY_NAME: "site-1",
+                "p": 1,
+            }
+            assert fl_ctx.get_prop_detail("q")["private"]
+            fl_ctx.set_prop("p", 10, private=False)
+            fl_ctx.set_prop("s", 5, private=True)
+            fl_ctx.set_prop("n", 6, private=True, sticky=False)
+
+        # contexts don't share their props, and new ones get the updated stickers
+        fl_ctx.set_prop("t", 7)
+        fl_ctx = mgr.new_context()
+        assert fl_ctx.get_prop("p") == 10
+        assert fl_ctx.get_prop("s") == 5
+        assert fl_ctx.get_prop("n") is None
+        assert fl_ctx.get_prop("t") is None
+        assert fl_ctx.get_prop(ReservedKey.MANAGER) is mgr
@@ -0,0 +1,221 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.fl_context import FLContext, FLContextManager
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.app_common.app_constant import AppConstants
+from nvflare.app_common.filters import GlobalModelDeltaDecoder, GlobalModelDeltaEncoder
+from nvflare.app_common.filters.global_model_delta import (
+    FULL,
+    UNCHANGED,
+    decode_delta,
+    encode_delta,
+    encode_quantized_delta,
+)
+
+
+def _make_model():
+    return {
+        "conv": np.random.randn(8, 3, 3, 3).astype(np.float32),
+        "fc": np.random.randn(100, 10),
+        "frozen": np.random.randn(50),
+        "step": 3,
+    }
+
+
+def _update(model, num_changed=5):
+    new_model = {k: v.copy() if isinstance(v, np.ndarray) else v for k, v in model.items()}
+    new_model["conv"] += 0.1
+    new_model["fc"].reshape(-1)[np.random.choice(1000, num_changed, replace=False)] += 1.0
+    new_model["step"] += 1
+    return new_model
+
+
+def _make_task_data(model, round_num):
+    s = DXO(data_kind=DataKind.WEIGHTS, data=model, meta={"round": round_num}).to_shareable()
+    s.add_cookie(AppConstants.CONTRIBUTION_ROUND, round_num)
+    return s
+
+
+class _Client(object):
+    def __init__(self, name):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=None, identity_name=name, run_num=1, public_stickers={}, private_stickers={}
+        )
+        self.decoder = GlobalModelDeltaDecoder()
+
+    def get_task(self, encoder, task_data):
+        # the server sees the public props of the client context of the task request
+        with self.fl_ctx_mgr.new_context() as client_ctx:
+            peer_ctx = FLContext()
+            peer_ctx.set_public_props(client_ctx.get_all_public_props())
+        server_ctx = FLContext()
+        server_ctx.set_peer_context(peer_ctx)
+        sent = encoder.process(task_data, server_ctx)
+
+        with self.fl_ctx_mgr.new_context() as client_ctx:
+            received = self.decoder.process(Shareable.from_bytes(sent.to_bytes()), client_ctx)
+        return sent, received
+
+
+class TestGlobalModelDelta:
+    def test_encode_decode(self):
+        base = _make_model()
+        model = _update(base)
+        model["new"] = np.ones(3)
+        del base["frozen"]
+        data, records = encode_delta(base, model)
+        assert records["conv"] == FULL
+        assert records["fc"].size == 5
+        assert data["fc"].size == 5
+        assert records["frozen"] == FULL
+        assert records["new"] == FULL
+
+        base_copy = {k: v.copy() if isinstance(v, np.ndarray) else v for k, v in base.items()}
+        restored = decode_delta(base, data, records)
+        assert list(restored) == list(model)
+        for k, v in model.items():
+            np.testing.assert_array_equal(restored[k], v)
+        for k, v in base.items():
+            np.testing.assert_array_equal(base_copy[k], v)
+
+        _, records = encode_delta(model, model)
+        assert records["frozen"] == UNCHANGED
+
+    def test_rounds(self):
+        encoder = GlobalModelDeltaEncoder(num_versions=2)
+        clients = [_Client("site-1"), _Client("site-2")]
+        model = _make_model()
+
+        sent, received = clients[0].get_task(encoder, _make_task_data(model, 0))
+        assert from_shareable(sent).get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+        assert clients[0].decoder.held_version == 0
+
+        for round_num in range(1, 4):
+            model = _update(model)
+            task_data = _make_task_data(model, round_num)
+            for client in clients:
+                sent, received = client.get_task(encoder, task_data)
+                dxo = from_shareable(received)
+                assert dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+                assert dxo.get_meta_prop("round") == round_num
+                assert received.get_cookie(AppConstants.CONTRIBUTION_ROUND) == round_num
+                assert received.get_header(AppConstants.GLOBAL_MODEL_VERSION) == round_num
+                for k, v in model.items():
+                    np.testing.assert_array_equal(dxo.data[k], v)
+                # the learner can change the weights without changing the held model
+                dxo.data["frozen"] += 1.0
+
+            # site-2 held no version in round 1
+            if round_num > 1:
+                sent_dxo = from_shareable(sent)
+                assert sent_dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) == "global_model_delta"
+                assert "frozen" not in sent_dxo.data
+                assert sent_dxo.data["fc"].size == 5
+
+        # the encoded model is shared by the clients that hold the same version
+        task_data = _make_task_data(_update(model), 4)
+        sent = [client.get_task(encoder, task_data)[0] for client in clients]
+        assert sent[0] is sent[1]
+        assert sent[0] is not task_data
+
+    def test_version_out_of_ring(self):
+        encoder = GlobalModelDeltaEncoder(num_versions=1)
+        client = _Client("site-1")
+        model = _make_model()
+        client.get_task(encoder, _make_task_data(model, 0))
+        # another client makes the server move on by two versions
+        for round_num in range(1, 3):
+            model = _update(model)
+            _Client("site-2").get_task(encoder, _make_task_data(model, round_num))
+
+        sent, received = client.get_task(encoder, _make_task_data(model, 2))
+        assert from_shareable(sent).get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+        np.testing.assert_array_equal(from_shareable(received).data["fc"], model["fc"])
+
+    def test_base_not_held(self):
+        encoder = GlobalModelDeltaEncoder()
+        client = _Client("site-1")
+        model = _make_model()
+        client.get_task(encoder, _make_task_data(model, 0))
+        # the client lost its model
+        client.decoder.held_version = 5
+        with pytest.raises(ValueError):
+            client.get_task(encoder, _make_task_data(_update(model), 1))
+        assert client.fl_ctx_mgr.public_stickers[AppConstants.GLOBAL_MODEL_VERSION] is None
+
+        sent, _ = client.get_task(encoder, _make_task_data(model, 1))
+        assert sent.get(ReservedHeaderKey.HEADERS)
+        assert from_shareable(sent).get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+
+    def test_dense_updates(self):
+        # every float changes after a dense round: nothing is saved, so no older version is kept
+        encoder = GlobalModelDeltaEncoder(num_versions=3)
+        client = _Client("site-1")
+        model = {"fc": np.random.randn(100, 10)}
+        for round_num in range(4):
+            model = {"fc": model["fc"] + np.random.randn(100, 10) * 0.01}
+            sent, received = client.get_task(encoder, _make_task_data(model, round_num))
+            np.testing.assert_array_equal(from_shareable(received).data["fc"], model["fc"])
+            records = from_shareable(sent).get_meta_prop(MetaKey.PROCESSED_KEYS)
+            assert records is None or records["fc"] == FULL
+            assert len(encoder._versions) <= 2
+
+    def test_encode_quantized(self):
+        base = _make_model()
+        model = _update(base)
+        model["int"] = np.arange(10)
+        base["int"] = np.arange(10)
+        model["int"][3] = 7
+        data, records, restored = encode_quantized_delta(base, model, "blockwise8")
+        assert data["conv"].dtype == np.int8
+        assert records["conv"]["type"] == "blockwise8"
+        assert records["frozen"] == UNCHANGED
+        assert records["int"].tolist() == [3]
+        assert records["step"] == FULL
+
+        decoded = decode_delta(base, data, records)
+        for k, v in restored.items():
+            np.testing.assert_array_equal(decoded[k], v)
+        np.testing.assert_allclose(decoded["conv"], model["conv"], atol=0.01)
+        np.testing.assert_array_equal(decoded["int"], model["int"])
+
+    @pytest.mark.parametrize("quantization_type", ["float16", "blockwise8"])
+    def test_quantized_rounds(self, quantization_type):
+        encoder = GlobalModelDeltaEncoder(num_versions=3, quantization_type=quantization_type)
+        clients = [_Client("site-1"), _Client("site-2")]
+        model = {"fc": np.random.randn(1000, 10).astype(np.float32)}
+        for round_num in range(10):
+            model = {"fc": model["fc"] + np.random.randn(1000, 10).astype(np.float32) * 0.01}
+            task_data = _make_task_data(model, round_num)
+            sent = []
+            for client in clients:
+                s, received = client.get_task(encoder, task_data)
+                sent.append(s)
+                restored = from_shareable(received).data["fc"]
+                # the error is the one of the last difference: it does not add up over the rounds
+                assert np.abs(restored - model["fc"]).max() < 0.001
+                if round_num > 0:
+                    assert len(s.to_bytes()) < task_data.to_bytes().__len__() * 0.6
+                # the server keeps the model the client restored as the version it holds
+                np.testing.assert_array_equal(encoder._versions[client.decoder.held_version]["fc"], restored)
+            if round_num > 0:
+                assert sent[0] is sent[1]
+
+        with pytest.raises(ValueError):
+            GlobalModelDeltaEncoder(quantization_type="int4")
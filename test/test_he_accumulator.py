@@ -0,0 +1,129 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+ts = pytest.importorskip("tenseal")
+
+from nvflare.app_common.homomorphic_encryption.he_accumulator import HEAccumulator  # noqa: E402
+
+TOLERANCE = 1e-4
+
+
+def _make_context(coeff_mod_bit_sizes):
+    context = ts.context(
+        ts.SCHEME_TYPE.CKKS,
+        poly_modulus_degree=8192,
+        coeff_mod_bit_sizes=coeff_mod_bit_sizes,
+        encryption_type=ts.ENCRYPTION_TYPE.SYMMETRIC,
+    )
+    context.generate_relin_keys()
+    context.global_scale = 2**40
+    return context
+
+
+@pytest.fixture(scope="module")
+def context():
+    # weighted contributions use a level for the weight and one for the division
+    return _make_context([60, 40, 40, 40])
+
+
+ENCRYPTED_LAYERS = {"enc": True, "plain": False}
+
+
+def _make_contribution(context, seed):
+    rng = np.random.default_rng(seed)
+    values = {"enc": rng.standard_normal(20), "plain": rng.standard_normal(5).astype(np.float32)}
+    data = {"enc": ts.ckks_vector(context, values["enc"]).serialize(), "plain": values["plain"]}
+    return values, data
+
+
+def _old_result(contributions):
+    # what the aggregator computed before the accumulator: sum(weight * value) / sum(count) per var
+    totals, counts = {}, {}
+    for values, weight, count in contributions:
+        for name, value in values.items():
+            totals[name] = totals.get(name, 0) + value * weight
+            counts[name] = counts.get(name, 0) + count
+    return {name: totals[name] * (1.0 / counts[name]) for name in totals}
+
+
+class TestHEAccumulator:
+    @pytest.mark.parametrize(
+        "weights,counts",
+        [
+            ([1.0, 1.0, 1.0], [1, 3, 2]),
+            ([1.0, 6.0, 6.0, 2.0], [1, 3, 3, 4]),
+            ([0.5, 2.0, 3.0], [2.0, 1.0, 1.5]),
+        ],
+    )
+    def test_weighted_average(self, context, weights, counts):
+        accumulator = HEAccumulator()
+        accumulator.set_context(context)
+        contributions = []
+        for i, (weight, count) in enumerate(zip(weights, counts)):
+            values, data = _make_contribution(context, i)
+            accumulator.add(data, ENCRYPTED_LAYERS, weight=weight, count=count)
+            contributions.append((values, weight, count))
+
+        result = accumulator.get_result()
+        expected = _old_result(contributions)
+        np.testing.assert_allclose(result["enc"].decrypt(), expected["enc"], atol=TOLERANCE)
+        np.testing.assert_allclose(result["plain"], expected["plain"], atol=TOLERANCE)
+        # plaintext vars keep the dtype of the contributions
+        assert result["plain"].dtype == np.float32
+
+        info = accumulator.get_info()
+        assert info["contributions"] == len(weights)
+        assert info["ciphertexts"] == len(weights)
+        # one running sum per var, whatever the weights
+        assert len(accumulator.sums) == len(ENCRYPTED_LAYERS)
+        assert info["pending_contributions"] == len(weights)
+
+    def test_contributions_not_changed(self, context):
+        accumulator = HEAccumulator()
+        accumulator.set_context(context)
+        values, data = _make_contribution(context, 0)
+        plain = data["plain"].copy()
+        accumulator.add(data, ENCRYPTED_LAYERS, weight=1.0, count=1)
+        accumulator.add(_make_contribution(context, 1)[1], ENCRYPTED_LAYERS, weight=1.0, count=1)
+        np.testing.assert_array_equal(data["plain"], plain)
+
+    def test_reset(self, context):
+        accumulator = HEAccumulator()
+        accumulator.set_context(context)
+        accumulator.add(_make_contribution(context, 0)[1], ENCRYPTED_LAYERS, weight=2.0, count=1)
+        accumulator.reset()
+        values, data = _make_contribution(context, 1)
+        accumulator.add(data, ENCRYPTED_LAYERS, weight=1.0, count=1)
+
+        result = accumulator.get_result()
+        np.testing.assert_allclose(result["enc"].decrypt(), values["enc"], atol=TOLERANCE)
+        np.testing.assert_allclose(result["plain"], values["plain"], atol=TOLERANCE)
+        assert accumulator.get_info()["contributions"] == 2
+
+    def test_unweighted_single_level(self):
+        # the default provisioned context only has the level of the division
+        context = _make_context([60, 40, 40])
+        accumulator = HEAccumulator()
+        accumulator.set_context(context)
+        contributions = []
+        for i, count in enumerate([1, 3, 2]):
+            values, data = _make_contribution(context, i)
+            accumulator.add(data, ENCRYPTED_LAYERS, weight=1.0, count=count)
+            contributions.append((values, 1.0, count))
+
+        result = accumulator.get_result()
+        np.testing.assert_allclose(result["enc"].decrypt(), _old_result(contributions)["enc"], atol=TOLERANCE)
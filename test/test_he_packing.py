@@ -0,0 +1,98 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+import nvflare.app_common.homomorphic_encryption.he_constant as he
+from nvflare.app_common.homomorphic_encryption.he_packing import pack_global_weights, pack_layers, unpack_layers
+
+
+def _make_params():
+    return {
+        "conv.weight": np.arange(12, dtype=np.float32).reshape(3, 4),
+        "conv.bias": np.arange(3, dtype=np.float32),
+        "fc.weight": np.arange(7, dtype=np.float32),
+    }
+
+
+class TestHEPacking:
+    @pytest.mark.parametrize("pack_size", [1, 5, 22, 100])
+    def test_round_trip(self, pack_size):
+        params = _make_params()
+        names = ["conv.weight", "fc.weight"]
+        packs, packing = pack_layers(params, names, pack_size)
+
+        assert all(name.startswith(he.HE_PACK_PREFIX) for name in packs)
+        assert list(packs.keys()) == packing["packs"]
+        assert len(packs) == -(-19 // pack_size)
+        assert all(np.size(v) <= pack_size for v in packs.values())
+
+        layers = unpack_layers(packs, packing)
+        assert sorted(layers.keys()) == sorted(names)
+        for name in names:
+            np.testing.assert_array_equal(layers[name], params[name].ravel())
+
+    def test_layout(self):
+        packs, packing = pack_layers(_make_params(), ["conv.bias", "fc.weight"], 4)
+        assert packing == {
+            "pack_size": 4,
+            "packs": [f"{he.HE_PACK_PREFIX}0", f"{he.HE_PACK_PREFIX}1", f"{he.HE_PACK_PREFIX}2"],
+            "layers": [["conv.bias", 0, 3], ["fc.weight", 3, 7]],
+        }
+        np.testing.assert_array_equal(packs[f"{he.HE_PACK_PREFIX}0"], [0, 1, 2, 0])
+        np.testing.assert_array_equal(packs[f"{he.HE_PACK_PREFIX}2"], [5, 6])
+
+    def test_no_layers(self):
+        packs, packing = pack_layers(_make_params(), [], 4)
+        assert packs == {}
+        assert unpack_layers(packs, packing) == {}
+
+    def test_invalid_pack_size(self):
+        with pytest.raises(ValueError):
+            pack_layers(_make_params(), ["conv.bias"], 0)
+
+    def test_pack_global_weights(self):
+        params = _make_params()
+        _, packing = pack_layers(params, ["conv.weight", "conv.bias"], 8)
+
+        weights = _make_params()
+        assert pack_global_weights(weights, {}, packing) == 2
+        assert sorted(weights.keys()) == sorted(["fc.weight"] + packing["packs"])
+        layers = unpack_layers(weights, packing)
+        np.testing.assert_array_equal(layers["conv.weight"], params["conv.weight"].ravel())
+        np.testing.assert_array_equal(layers["conv.bias"], params["conv.bias"])
+
+        # a global model that holds the packs already is left as it is
+        assert pack_global_weights(weights, {he.HE_PACKING: packing}, packing) == 0
+
+    def test_pack_global_weights_mismatch(self):
+        _, packing = pack_layers(_make_params(), ["conv.weight", "conv.bias"], 8)
+
+        weights = _make_params()
+        del weights["conv.bias"]
+        with pytest.raises(ValueError, match="not in the global model"):
+            pack_global_weights(weights, {}, packing)
+
+        weights = _make_params()
+        weights["conv.bias"] = np.zeros(4, dtype=np.float32)
+        with pytest.raises(ValueError, match="does not match"):
+            pack_global_weights(weights, {}, packing)
+
+        weights = _make_params()
+        pack_global_weights(weights, {}, packing)
+        _, other_packing = pack_layers(_make_params(), ["conv.weight", "conv.bias"], 4)
+        other_packing["packs"] = packing["packs"]
+        with pytest.raises(ValueError, match="differs"):
+            pack_global_weights(weights, {he.HE_PACKING: packing}, other_packing)
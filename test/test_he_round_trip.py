@@ -0,0 +1,133 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+ts = pytest.importorskip("tenseal")
+
+import nvflare.app_common.homomorphic_encryption.he_constant as he  # noqa: E402
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable  # noqa: E402
+from nvflare.apis.fl_constant import ReservedKey  # noqa: E402
+from nvflare.apis.fl_context import FLContext  # noqa: E402
+from nvflare.app_common.abstract.model import ModelLearnable, ModelLearnableKey  # noqa: E402
+from nvflare.app_common.app_constant import AppConstants  # noqa: E402
+from nvflare.app_common.homomorphic_encryption.he_intime_accumulate_model_aggregator import (  # noqa: E402
+    HEInTimeAccumulateWeightedAggregator,
+)
+from nvflare.app_common.homomorphic_encryption.he_model_decryptor import HEModelDecryptor  # noqa: E402
+from nvflare.app_common.homomorphic_encryption.he_model_encryptor import HEModelEncryptor  # noqa: E402
+from nvflare.app_common.homomorphic_encryption.he_model_shareable_generator import (  # noqa: E402
+    HEModelShareableGenerator,
+)
+
+# CKKS with a scale of 2**40 is accurate to about 1e-6 for values of this size
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(scope="module")
+def context():
+    # same parameters as the HEBuilder of the provisioning tool, with a smaller poly modulus for speed
+    context = ts.context(
+        ts.SCHEME_TYPE.CKKS,
+        poly_modulus_degree=8192,
+        coeff_mod_bit_sizes=[60, 40, 40],
+        encryption_type=ts.ENCRYPTION_TYPE.SYMMETRIC,
+    )
+    context.generate_relin_keys()
+    context.global_scale = 2**40
+    return context
+
+
+def _make_weights(seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "conv.weight": rng.standard_normal((4, 3)).astype(np.float32),
+        "conv.bias": rng.standard_normal(4).astype(np.float32),
+        "fc.weight": rng.standard_normal(50).astype(np.float32),
+    }
+
+
+def _make_result(diff, client_name, n_iter, current_round):
+    dxo = DXO(
+        data_kind=DataKind.WEIGHT_DIFF,
+        data={k: v.copy() for k, v in diff.items()},
+        meta={MetaKey.NUM_STEPS_CURRENT_ROUND: n_iter},
+    )
+    result = dxo.to_shareable()
+    result.set_peer_props({ReservedKey.IDENTITY_NAME: client_name})
+    result.set_header(AppConstants.CONTRIBUTION_ROUND, current_round)
+    return result
+
+
+def _run_round(context, global_model, current_round, diffs, n_iters, pack_size, encrypt_layers):
+    fl_ctx = FLContext()
+    fl_ctx.set_prop(AppConstants.CURRENT_ROUND, current_round)
+    fl_ctx.set_prop(AppConstants.START_ROUND, 0)
+    fl_ctx.set_prop(AppConstants.GLOBAL_MODEL, global_model)
+
+    encryptor = HEModelEncryptor(encrypt_layers=encrypt_layers, pack_size=pack_size)
+    aggregator = HEInTimeAccumulateWeightedAggregator()
+    generator = HEModelShareableGenerator()
+    for component in (encryptor, aggregator, generator):
+        component.tenseal_context = context
+    aggregator.accumulator.set_context(context)
+
+    for i, (diff, n_iter) in enumerate(zip(diffs, n_iters)):
+        result = encryptor.process(_make_result(diff, f"site-{i}", n_iter, current_round), fl_ctx)
+        assert aggregator.accept(result, fl_ctx)
+    return generator.shareable_to_learnable(aggregator.aggregate(fl_ctx), fl_ctx)
+
+
+def _decrypt(context, global_model):
+    decryptor = HEModelDecryptor()
+    decryptor.tenseal_context = context
+    dxo = DXO(
+        data_kind=DataKind.WEIGHTS,
+        data=dict(global_model[ModelLearnableKey.WEIGHTS]),
+        meta=global_model[ModelLearnableKey.META],
+    )
+    return from_shareable(decryptor.process(dxo.to_shareable(), FLContext())).data
+
+
+@pytest.mark.parametrize("pack_size", [0, 16, 4096])
+@pytest.mark.parametrize("encrypt_layers", [None, ["conv.weight", "fc.weight"]])
+def test_round_trip(context, pack_size, encrypt_layers):
+    weights = _make_weights(0)
+    global_model = ModelLearnable()
+    global_model[ModelLearnableKey.WEIGHTS] = {k: v.copy() for k, v in weights.items()}
+    global_model[ModelLearnableKey.META] = {}
+
+    expected = {k: v.astype(np.float64) for k, v in weights.items()}
+    n_iters = [1, 3]
+    for current_round in range(2):
+        diffs = [_make_weights(10 * current_round + i) for i in range(len(n_iters))]
+        global_model = _run_round(context, global_model, current_round, diffs, n_iters, pack_size, encrypt_layers)
+        for k in expected:
+            expected[k] += sum(n * d[k] for n, d in zip(n_iters, diffs)) / sum(n_iters)
+
+    encrypted = global_model[ModelLearnableKey.META][MetaKey.PROCESSED_KEYS]
+    packing = global_model[ModelLearnableKey.META].get(he.HE_PACKING)
+    if pack_size:
+        # the global model holds the packs of the encrypted layers
+        assert packing["pack_size"] == pack_size
+        assert set(packing["packs"]) <= set(global_model[ModelLearnableKey.WEIGHTS].keys())
+        assert all(encrypted[name] for name in packing["packs"])
+    else:
+        assert packing is None
+
+    decrypted = _decrypt(context, global_model)
+    assert sorted(decrypted.keys()) == sorted(weights.keys())
+    for k, v in expected.items():
+        np.testing.assert_allclose(np.ravel(decrypted[k]), v.ravel(), atol=TOLERANCE)
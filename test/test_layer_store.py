@@ -0,0 +1,98 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+from nvflare.fuel.utils.layer_store import LayerStore, is_layer_store
+
+
+def _make_layers():
+    return {
+        "conv.weight": np.random.random((8, 3, 3, 3)).astype(np.float32),
+        "conv.bias": np.random.random(8),
+        "bn.num_batches_tracked": np.array(7, dtype=np.int64),
+        "empty": np.zeros((0, 4)),
+        "strided": np.random.random((6, 6))[:, ::2],
+    }
+
+
+class TestLayerStore:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "model")
+        assert not is_layer_store(path)
+        layers = _make_layers()
+        store = LayerStore(path)
+        assert store.save(layers, props={"meta_props": {"a": 1}}) == len(layers)
+        assert is_layer_store(path)
+
+        # a new store instance reads the index from disk
+        store = LayerStore(path)
+        assert store.get_layer_names() == list(layers)
+        loaded = store.load()
+        for k, v in layers.items():
+            assert loaded[k].dtype == v.dtype
+            np.testing.assert_array_equal(loaded[k], v)
+        assert store.load_props() == {"meta_props": {"a": 1}}
+
+    def test_mmap(self, tmp_path):
+        store = LayerStore(str(tmp_path))
+        store.save(_make_layers())
+        loaded = store.load(names=["conv.weight"])
+        assert list(loaded) == ["conv.weight"]
+        assert isinstance(loaded["conv.weight"], np.memmap)
+        assert not loaded["conv.weight"].flags.writeable
+
+        loaded = store.load(names=["conv.weight"], mmap=False)
+        assert not isinstance(loaded["conv.weight"], np.memmap)
+
+        with pytest.raises(KeyError):
+            store.load(names=["missing"])
+
+    def test_incremental(self, tmp_path):
+        store = LayerStore(str(tmp_path))
+        layers = _make_layers()
+        store.save(layers)
+        mapped = store.load(names=["conv.bias"])["conv.bias"].copy()
+
+        assert store.save(layers) == 0
+
+        layers["conv.bias"] = layers["conv.bias"] + 1
+        assert store.save(layers) == 1
+        np.testing.assert_array_equal(LayerStore(str(tmp_path)).load()["conv.bias"], layers["conv.bias"])
+        np.testing.assert_array_equal(mapped + 1, layers["conv.bias"])
+
+        # layers that are gone are removed
+        del layers["conv.weight"]
+        assert store.save(layers) == 0
+        assert "conv.weight" not in store.get_layer_names()
+        num_files = len([f for f in os.listdir(str(tmp_path)) if f.endswith(".npy")])
+        assert num_files == len(layers)
+        assert not [f for f in os.listdir(str(tmp_path)) if f.endswith(".tmp")]
+
+    def test_not_array(self, tmp_path):
+        store = LayerStore(str(tmp_path))
+        with pytest.raises(TypeError):
+            store.save({"a": [1, 2, 3]})
+        with pytest.raises(TypeError):
+            store.save({"a": np.array([{}, []], dtype=object)})
+
+    def test_path_is_file(self, tmp_path):
+        path = tmp_path / "FL_global_model.pt"
+        path.write_bytes(b"torch checkpoint")
+        with pytest.raises(ValueError, match="file of this name exists"):
+            LayerStore(str(path)).save(_make_layers())
+        assert path.read_bytes() == b"torch checkpoint"
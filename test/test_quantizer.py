@@ -0,0 +1,73 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.fl_context import FLContext
+from nvflare.app_common.filters import Dequantizer, Quantizer
+
+# quantization type, max error relative to the max abs value of a layer
+TEST_CASES = [("float16", 1e-3), ("bfloat16", 4e-3), ("blockwise8", 1e-2)]
+
+
+def _make_weights():
+    return {
+        "conv": np.random.randn(16, 3, 3, 3).astype(np.float32),
+        "fc": np.random.randn(1000),
+        "zeros": np.zeros(5, dtype=np.float32),
+        "steps": np.array([7, 8], dtype=np.int64),
+    }
+
+
+class TestQuantizer:
+    @pytest.mark.parametrize("quantization_type,tolerance", TEST_CASES)
+    def test_round_trip(self, quantization_type, tolerance):
+        weights = _make_weights()
+        s = DXO(data_kind=DataKind.WEIGHT_DIFF, data={k: v.copy() for k, v in weights.items()}).to_shareable()
+        fl_ctx = FLContext()
+
+        s = Quantizer(quantization_type=quantization_type, block_size=64).process(s, fl_ctx)
+        dxo = from_shareable(s)
+        assert dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) == "quantize_" + quantization_type
+        assert set(dxo.get_meta_prop(MetaKey.PROCESSED_KEYS)) == {"conv", "fc", "zeros"}
+        assert dxo.data["conv"].nbytes < weights["conv"].nbytes
+        np.testing.assert_array_equal(dxo.data["steps"], weights["steps"])
+
+        # already processed data is not quantized again
+        s = Quantizer(quantization_type=quantization_type).process(s, fl_ctx)
+
+        dxo = from_shareable(Dequantizer().process(s, fl_ctx))
+        assert dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+        assert dxo.get_meta_prop(MetaKey.PROCESSED_KEYS) is None
+        for k, v in weights.items():
+            assert dxo.data[k].dtype == v.dtype
+            assert dxo.data[k].shape == v.shape
+            np.testing.assert_allclose(dxo.data[k], v, rtol=0, atol=tolerance * max(np.abs(v).max(), 1e-12))
+
+    def test_pass_through(self):
+        fl_ctx = FLContext()
+        s = DXO(data_kind=DataKind.METRICS, data={"acc": np.array([0.5])}).to_shareable()
+        assert from_shareable(Quantizer().process(s, fl_ctx)).get_meta_prop(MetaKey.PROCESSED_ALGORITHM) is None
+
+        # data that is not quantized is not changed
+        s = DXO(data_kind=DataKind.WEIGHTS, data={"a": np.ones(3)}).to_shareable()
+        np.testing.assert_array_equal(from_shareable(Dequantizer().process(s, fl_ctx)).data["a"], np.ones(3))
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Quantizer(quantization_type="int4")
+        with pytest.raises(ValueError):
+            Quantizer(quantization_type="blockwise8", block_size=0)
@@ -0,0 +1,150 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.fl_constant import FLContextKey, ReservedKey, ReturnCode
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+from nvflare.apis.signal import Signal
+from nvflare.app_common.aggregators.intime_accumulate_model_aggregator import InTimeAccumulateWeightedAggregator
+from nvflare.app_common.app_constant import AppConstants
+from nvflare.app_common.workflows.relay_controller import RelayController
+from nvflare.private.defs import SpecialTaskName, TaskConstant
+from nvflare.private.fed.client.upstream_client import UpstreamClient
+
+
+def _make_result(client_name, data, n_iter, round_num=0):
+    s = Shareable()
+    s.set_peer_props({ReservedKey.IDENTITY_NAME: client_name})
+    s.add_cookie(AppConstants.CONTRIBUTION_ROUND, round_num)
+    s.set_header(AppConstants.CONTRIBUTION_ROUND, round_num)
+    dxo = DXO(DataKind.WEIGHT_DIFF, data=data, meta={MetaKey.NUM_STEPS_CURRENT_ROUND: n_iter})
+    return dxo.update_shareable(s)
+
+
+def _aggregate(aggregator, results):
+    fl_ctx = FLContext()
+    fl_ctx.set_prop(AppConstants.CURRENT_ROUND, 0)
+    for result in results:
+        assert aggregator.accept(result, fl_ctx)
+    return aggregator.aggregate(fl_ctx)
+
+
+class _FederatedClient(object):
+    client_name = "relay-1"
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.results = []
+        self.token = None
+
+    def register(self):
+        self.token = "token"
+
+    def fetch_task(self, fl_ctx):
+        task = self.tasks.pop(0)
+        if task is None:
+            return False, None, None
+        return True, task[0], task[1]
+
+    def extract_shareable(self, remote_tasks, fl_ctx):
+        return remote_tasks
+
+    def push_results(self, result, fl_ctx):
+        self.results.append((fl_ctx.get_prop(FLContextKey.TASK_NAME), result))
+        return ["ok"]
+
+
+class TestRelayController:
+    @pytest.mark.parametrize("use_flat_buffer", [False, True])
+    def test_tree_aggregation(self, use_flat_buffer):
+        clients = [
+            (f"client_{i}", {"var1": np.random.random((3, 4)), "var2": np.random.random(5)}, i + 1) for i in range(6)
+        ]
+        flat = _aggregate(
+            InTimeAccumulateWeightedAggregator(use_flat_buffer=use_flat_buffer),
+            [_make_result(*c) for c in clients],
+        )
+
+        partials = []
+        for i, group in enumerate([clients[:2], clients[2:]]):
+            relay_aggregator = InTimeAccumulateWeightedAggregator(use_flat_buffer=use_flat_buffer)
+            partial = from_shareable(_aggregate(relay_aggregator, [_make_result(*c) for c in group]))
+            assert partial.get_meta_prop(MetaKey.NUM_STEPS_CURRENT_ROUND) == sum(c[2] for c in group)
+            partials.append(
+                _make_result(f"relay_{i}", partial.data, partial.get_meta_prop(MetaKey.NUM_STEPS_CURRENT_ROUND))
+            )
+        tree = _aggregate(InTimeAccumulateWeightedAggregator(use_flat_buffer=use_flat_buffer), partials)
+
+        for k in ["var1", "var2"]:
+            np.testing.assert_allclose(from_shareable(tree).data[k], from_shareable(flat).data[k])
+
+    def test_control_flow(self):
+        task_data = DXO(DataKind.WEIGHTS, data={"var1": np.zeros(4)}).to_shareable()
+        task_data.set_header(AppConstants.CURRENT_ROUND, 0)
+        task_data.add_cookie(AppConstants.CONTRIBUTION_ROUND, 0)
+        try_again = Shareable()
+        try_again[TaskConstant.WAIT_TIME] = 0
+        upstream = _FederatedClient(
+            [
+                None,
+                (SpecialTaskName.TRY_AGAIN, try_again),
+                ("train", task_data),
+                ("validate", Shareable()),
+                (SpecialTaskName.END_RUN, None),
+            ]
+        )
+
+        controller = RelayController()
+        controller.aggregator = InTimeAccumulateWeightedAggregator()
+        controller.upstream = UpstreamClient("localhost:8002", "upstream", "relay-1", retry_interval=0)
+        controller.upstream.client = upstream
+
+        def broadcast_and_wait(task, min_responses, wait_time_after_min_received, fl_ctx, abort_signal):
+            # the downstream server adds its own cookies to the task data
+            task.data.add_cookie(AppConstants.CONTRIBUTION_ROUND, "downstream")
+            for i in range(2):
+                result = _make_result(f"client_{i}", {"var1": np.full(4, i + 1.0)}, 1)
+                controller._accept_train_result(f"client_{i}", result, fl_ctx)
+
+        controller.broadcast_and_wait = broadcast_and_wait
+        controller.control_flow(Signal(), FLContext())
+
+        assert not upstream.tasks
+        assert [name for name, _ in upstream.results] == ["train", "validate"]
+        train_result = upstream.results[0][1]
+        assert train_result.get_cookie(AppConstants.CONTRIBUTION_ROUND) == 0
+        dxo = from_shareable(train_result)
+        np.testing.assert_allclose(dxo.data["var1"], np.full(4, 1.5))
+        assert dxo.get_meta_prop(MetaKey.NUM_STEPS_CURRENT_ROUND) == 2
+        assert upstream.results[1][1].get_return_code() == ReturnCode.TASK_UNKNOWN
+
+    def test_start_controller(self):
+        aggregator = InTimeAccumulateWeightedAggregator()
+        upstream = UpstreamClient("localhost:8002", "upstream", "relay-1")
+        components = {"aggregator": aggregator, "upstream_client": upstream}
+
+        class _Engine(object):
+            def get_component(self, component_id):
+                return components.get(component_id)
+
+        fl_ctx = FLContext()
+        fl_ctx.set_prop(ReservedKey.ENGINE, _Engine(), private=True)
+        controller = RelayController()
+        controller.start_controller(fl_ctx)
+        assert controller.aggregator is aggregator
+        assert controller.upstream is upstream
@@ -0,0 +1,124 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import threading
+from multiprocessing import Pipe
+
+import numpy as np
+
+from nvflare.apis.dxo import DXO, DataKind, from_shareable
+from nvflare.apis.fl_context import FLContext
+from nvflare.apis.shareable import Shareable
+from nvflare.apis.signal import Signal
+from nvflare.app_common.executors.multi_process_executor import MultiProcessExecutor
+from nvflare.fuel.common.multi_process_executor_constants import CommunicateData, CommunicationMetaData
+from nvflare.fuel.utils.shm_transport import get_shared, put_shared, release_shared
+from nvflare.private.fed.app.client.sub_worker_process import execute
+
+
+def _sum_shared(descriptor, queue):
+    shareable, shm = get_shared(descriptor)
+    data = from_shareable(shareable).data
+    queue.put((float(data["a"].sum()), data["a"].flags.writeable))
+    del shareable, data
+    release_shared(shm)
+
+
+class _RunManager(object):
+    def new_context(self):
+        return FLContext()
+
+
+class _RankExecutor(object):
+    def execute(self, task_name, shareable, fl_ctx, abort_signal):
+        result = Shareable()
+        result["task_name"] = task_name
+        result["keys"] = sorted(shareable.keys())
+        return result
+
+
+class _Executor(MultiProcessExecutor):
+    def get_multi_process_command(self) -> str:
+        return ""
+
+
+class TestShmTransport:
+    def test_round_trip(self):
+        weights = {"a": np.random.random((100, 10)), "b": np.arange(7, dtype=np.int32), "c": np.float32(1.5)}
+        s = DXO(DataKind.WEIGHTS, data=weights, meta={"m": 1}).to_shareable()
+        descriptor, shm = put_shared(s)
+        assert len(descriptor["table"]) == 2
+        # the descriptor only carries the small parts
+        assert len(descriptor["header"]) < 1000
+
+        result, shm2 = get_shared(descriptor)
+        release_shared(shm, unlink=True)
+        dxo = from_shareable(result)
+        for k, v in weights.items():
+            np.testing.assert_array_equal(dxo.data[k], v)
+        assert not dxo.data["a"].flags.writeable
+        assert dxo.meta == {"m": 1}
+
+        # the views are still in use
+        assert not release_shared(shm2)
+        del result, dxo
+        assert release_shared(shm2)
+
+    def test_no_buffers(self):
+        descriptor, shm = put_shared({"a": [1, 2]})
+        assert shm is None
+        assert get_shared(descriptor) == ({"a": [1, 2]}, None)
+
+    def test_other_process(self):
+        a = np.random.random(100000)
+        descriptor, shm = put_shared(DXO(DataKind.WEIGHTS, data={"a": a}).to_shareable())
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        p = ctx.Process(target=_sum_shared, args=(descriptor, queue))
+        p.start()
+        total, writeable = queue.get(timeout=30)
+        p.join(30)
+        release_shared(shm, unlink=True)
+        assert total == float(a.sum())
+        assert not writeable
+
+    def test_executor(self):
+        executor = _Executor(num_of_processes=2, components=[], use_shared_memory=True)
+        threads = []
+        for rank in range(2):
+            parent_conn, child_conn = Pipe()
+            executor.conn_clients.append({CommunicationMetaData.EXE_CONN: parent_conn})
+            t = threading.Thread(target=execute, args=(_RunManager(), rank, child_conn, _RankExecutor()))
+            t.start()
+            threads.append(t)
+
+        try:
+            # the rank processes only ack the task data they mapped from a segment
+            tasks = [
+                ("submit_model", Shareable()),
+                ("train", DXO(DataKind.WEIGHTS, data={"a": np.zeros(10)}).to_shareable()),
+                ("validate", DXO(DataKind.WEIGHTS, data={"a": [1, 2]}).to_shareable()),
+            ]
+            for task_name, task_data in tasks:
+                result = executor._execute_multi_process(task_name, task_data, FLContext(), Signal())
+                assert result["task_name"] == task_name
+                assert result["keys"] == sorted(task_data.keys())
+            for conn_client in executor.conn_clients:
+                assert not conn_client[CommunicationMetaData.EXE_CONN].poll(0.1)
+        finally:
+            for conn_client in executor.conn_clients:
+                conn_client[CommunicationMetaData.EXE_CONN].send({CommunicationMetaData.COMMAND: CommunicateData.CLOSE})
+            for t in threads:
+                t.join(10)
@@ -0,0 +1,147 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import threading
+import time
+
+import pytest
+
+from nvflare.apis.client import Client
+from nvflare.apis.fl_constant import FLContextKey
+from nvflare.apis.fl_context import FLContext, FLContextManager
+from nvflare.apis.responder import TaskNotifier
+from nvflare.apis.shareable import ReservedHeaderKey, Shareable
+from nvflare.private.defs import SpecialTaskName, TaskConstant
+from nvflare.private.fed.protos.federated_pb2 import ClientState
+from nvflare.private.fed.server.fed_server import FederatedServer
+from nvflare.private.fed.utils.numproto import bytes_to_proto, proto_to_bytes
+
+PROJECT_NAME = "test"
+RUN_NUM = 1
+
+
+class _Context(object):
+    def abort(self, code, details):
+        raise RuntimeError("{}: {}".format(code, details))
+
+
+class _RunManager(object):
+    def __init__(self, engine):
+        self.fl_ctx_mgr = FLContextManager(
+            engine=engine, identity_name=PROJECT_NAME, run_num=RUN_NUM, public_stickers={}, private_stickers={}
+        )
+
+    def new_context(self) -> FLContext:
+        return self.fl_ctx_mgr.new_context()
+
+
+class _ServerRunner(object):
+    def __init__(self):
+        self.task_notifier = TaskNotifier()
+        self.task_data = None
+
+    def get_task_notifier(self):
+        return self.task_notifier
+
+    def schedule_task(self):
+        self.task_data = Shareable()
+        self.task_notifier.notify()
+
+    def process_task_request(self, client, fl_ctx):
+        if self.task_data is None:
+            task = Shareable()
+            task[TaskConstant.WAIT_TIME] = 5
+            return SpecialTaskName.TRY_AGAIN, "", task
+        return "train", "task_id", self.task_data
+
+
+@pytest.fixture
+def server():
+    server = FederatedServer(project_name=PROJECT_NAME, min_num_clients=1, max_num_clients=1)
+    server.engine.run_manager = _RunManager(server.engine)
+    server.server_runner = _ServerRunner()
+    server.client_manager.clients = {"token": Client("site-1", "token")}
+    server.max_task_waiters = 1
+    return server
+
+
+def _make_request(wait_time, split_headers=True):
+    fl_ctx = FLContext()
+    fl_ctx.set_run_number(RUN_NUM)
+    request = ClientState(token="token")
+    request.meta.project.name = PROJECT_NAME
+    request.context["fl_context"].CopyFrom(bytes_to_proto(pickle.dumps(fl_ctx)))
+    if wait_time:
+        request.meta_data[TaskConstant.TASK_WAIT_TIME] = wait_time
+    if split_headers:
+        request.meta_data[TaskConstant.SPLIT_HEADERS] = True
+    return request
+
+
+def _get_wait_time(data):
+    return Shareable.from_bytes(data)[TaskConstant.WAIT_TIME]
+
+
+class TestTaskNotifier:
+    def test_wait(self):
+        notifier = TaskNotifier()
+        seq = notifier.get_seq()
+        assert not notifier.wait(seq, 0.01)
+        notifier.notify()
+        # the change is not missed, although it happened before waiting
+        assert notifier.wait(seq, 0.01)
+
+    def test_task_available(self, server):
+        threading.Timer(0.2, server.server_runner.schedule_task).start()
+        start = time.time()
+        task, _ = server._get_task(_make_request(10), _Context())
+        assert task.task_name == "train"
+        assert time.time() - start < 5
+
+    def test_try_again_after_wait(self, server):
+        task, data = server._get_task(_make_request(0.1), _Context())
+        assert task.task_name == SpecialTaskName.TRY_AGAIN
+        assert _get_wait_time(data) == 0
+
+    def test_polling(self, server):
+        start = time.time()
+        task, data = server._get_task(_make_request(0), _Context())
+        assert task.task_name == SpecialTaskName.TRY_AGAIN
+        assert _get_wait_time(data) == 5
+        assert time.time() - start < 1
+
+    def test_too_many_waiters(self, server):
+        server.max_task_waiters = 0
+        task, data = server._get_task(_make_request(10), _Context())
+        assert task.task_name == SpecialTaskName.TRY_AGAIN
+        assert _get_wait_time(data) == 5
+
+    def test_split_headers(self, server):
+        server.server_runner.schedule_task()
+        task, data = server._get_task(_make_request(0), _Context())
+        headers = pickle.loads(proto_to_bytes(task.data.params["headers"]))
+        assert headers[FLContextKey.TASK_ID] == "task_id"
+        assert Shareable.from_bytes(data).get_header(FLContextKey.TASK_ID) is None
+
+    def test_headers_in_data_for_old_clients(self, server):
+        # clients that do not advertise split headers get them in the task data, as before
+        server.server_runner.schedule_task()
+        task, data = server._get_task(_make_request(0, split_headers=False), _Context())
+        assert "headers" not in task.data.params
+        shareable = Shareable.from_bytes(data)
+        assert shareable.get_header(FLContextKey.TASK_ID) == "task_id"
+        assert shareable.get_cookie(FLContextKey.TASK_ID) == "task_id"
+        # the task data of the workflow is not changed
+        assert not server.server_runner.task_data[ReservedHeaderKey.HEADERS]
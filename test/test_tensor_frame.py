@@ -0,0 +1,92 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_bytes, from_shareable
+from nvflare.apis.shareable import Shareable
+from nvflare.fuel.utils.tensor_frame import BUFFER_ALIGNMENT, decode_frame, encode_frame, is_frame
+
+TEST_CASES = [
+    {"a": np.arange(10, dtype=np.float32)},
+    {"a": np.ones((3, 4), dtype=np.float64), "b": np.zeros(7, dtype=np.int8)},
+    {"a": np.random.rand(5, 3).astype(np.float32), "b": np.array(3.0), "c": np.empty(0, dtype=np.float32)},
+    {"a": np.arange(12, dtype=np.float32).reshape(3, 4).T},
+    {"a": 1.0, "b": "text"},
+]
+
+
+def _make_shareable(weights):
+    dxo = DXO(data_kind=DataKind.WEIGHTS, data=weights, meta={MetaKey.NUM_STEPS_CURRENT_ROUND: 5})
+    s = dxo.to_shareable()
+    s.add_cookie("task_id", "1234")
+    return s
+
+
+class TestTensorFrame:
+    @pytest.mark.parametrize("weights", TEST_CASES)
+    def test_shareable_round_trip(self, weights):
+        s = _make_shareable(weights)
+        data = s.to_bytes()
+        assert is_frame(data)
+
+        result = Shareable.from_bytes(data)
+        assert isinstance(result, Shareable)
+        assert result.get_cookie("task_id") == "1234"
+        dxo = from_shareable(result)
+        assert dxo.data_kind == DataKind.WEIGHTS
+        assert dxo.get_meta_prop(MetaKey.NUM_STEPS_CURRENT_ROUND) == 5
+        assert dxo.data.keys() == weights.keys()
+        for k, v in weights.items():
+            np.testing.assert_array_equal(dxo.data[k], v)
+
+    @pytest.mark.parametrize("weights", TEST_CASES)
+    def test_dxo_round_trip(self, weights):
+        dxo = DXO(data_kind=DataKind.WEIGHT_DIFF, data=weights)
+        result = from_bytes(dxo.to_bytes())
+        assert result.data_kind == DataKind.WEIGHT_DIFF
+        for k, v in weights.items():
+            np.testing.assert_array_equal(result.data[k], v)
+
+    def test_zero_copy_on_writable_buffer(self):
+        weights = {"a": np.arange(100, dtype=np.float32), "b": np.arange(33, dtype=np.float64)}
+        frame = bytearray(encode_frame(weights))
+        result = decode_frame(frame)
+        for k, v in result.items():
+            assert not v.flags.owndata
+            assert v.flags.writeable
+            offset = v.__array_interface__["data"][0] - np.frombuffer(frame, dtype=np.uint8).ctypes.data
+            assert offset % BUFFER_ALIGNMENT == 0
+
+        result["a"][0] = 42.0
+        assert decode_frame(frame)["a"][0] == 42.0
+
+    def test_read_only_frame(self):
+        frame = encode_frame({"a": np.arange(4, dtype=np.float32)})
+        assert not decode_frame(frame, writable=False)["a"].flags.writeable
+        result = decode_frame(frame)
+        result["a"] += 1
+        np.testing.assert_array_equal(result["a"], np.arange(1, 5, dtype=np.float32))
+
+    def test_legacy_pickle(self):
+        s = _make_shareable({"a": np.arange(4, dtype=np.float32)})
+        result = Shareable.from_bytes(pickle.dumps(s))
+        np.testing.assert_array_equal(from_shareable(result).data["a"], np.arange(4, dtype=np.float32))
+
+    def test_invalid_frame(self):
+        with pytest.raises(ValueError, match="data is not a tensor frame"):
+            decode_frame(pickle.dumps({"a": 1}) + bytes(32))
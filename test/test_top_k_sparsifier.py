@@ -0,0 +1,103 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from nvflare.apis.dxo import DXO, DataKind, MetaKey, from_shareable
+from nvflare.apis.fl_constant import ReservedKey
+from nvflare.apis.fl_context import FLContext
+from nvflare.app_common.aggregators import InTimeAccumulateWeightedAggregator, SparseInTimeAccumulateWeightedAggregator
+from nvflare.app_common.app_constant import AppConstants
+from nvflare.app_common.filters import TopKSparsifier
+from nvflare.app_common.filters.top_k_sparsifier import densify
+
+
+def _make_result(client_name, data, n_iter):
+    s = DXO(DataKind.WEIGHT_DIFF, data=data, meta={MetaKey.NUM_STEPS_CURRENT_ROUND: n_iter}).to_shareable()
+    s.set_peer_props({ReservedKey.IDENTITY_NAME: client_name})
+    s.set_header(AppConstants.CONTRIBUTION_ROUND, 0)
+    return s
+
+
+def _aggregate(aggregator, results):
+    fl_ctx = FLContext()
+    fl_ctx.set_prop(AppConstants.CURRENT_ROUND, 0)
+    for result in results:
+        assert aggregator.accept(result, fl_ctx)
+    return from_shareable(aggregator.aggregate(fl_ctx)).data
+
+
+class TestTopKSparsifier:
+    def test_sparsify(self):
+        diff = {"conv": np.random.randn(20, 50).astype(np.float32), "bias": np.random.randn(20)}
+        s = _make_result("site-1", {k: v.copy() for k, v in diff.items()}, 2)
+        dxo = from_shareable(TopKSparsifier(density=0.1, min_size=100).process(s, FLContext()))
+
+        assert dxo.get_meta_prop(MetaKey.PROCESSED_ALGORITHM) == "top_k_sparsification"
+        assert dxo.get_meta_prop(MetaKey.NUM_STEPS_CURRENT_ROUND) == 2
+        records = dxo.get_meta_prop(MetaKey.PROCESSED_KEYS)
+        assert list(records) == ["conv"]
+        assert dxo.data["conv"].size == 100
+        # the kept entries are the largest ones
+        dense = densify(dxo.data["conv"], records["conv"])
+        kept = np.abs(diff["conv"])[dense != 0]
+        assert kept.min() >= np.abs(diff["conv"])[dense == 0].max()
+        np.testing.assert_array_equal(dense[dense != 0], diff["conv"][dense != 0])
+        np.testing.assert_array_equal(dxo.data["bias"], diff["bias"])
+
+    def test_error_feedback(self):
+        diff = np.random.randn(1000)
+        sparsifier = TopKSparsifier(density=0.1, min_size=1)
+        sent = np.zeros(1000)
+        for _ in range(10):
+            s = _make_result("site-1", {"a": diff.copy()}, 1)
+            dxo = from_shareable(sparsifier.process(s, FLContext()))
+            sent += densify(dxo.data["a"], dxo.get_meta_prop(MetaKey.PROCESSED_KEYS)["a"])
+        # what was sent plus what is left is what was trained
+        np.testing.assert_allclose(sent + sparsifier.residuals["a"], diff * 10)
+
+        sparsifier = TopKSparsifier(density=0.1, min_size=1, error_feedback=False)
+        sparsifier.process(_make_result("site-1", {"a": diff.copy()}, 1), FLContext())
+        assert not sparsifier.residuals
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            TopKSparsifier(density=0.0)
+
+    def test_sparse_aggregation(self):
+        clients = [
+            ("site-{}".format(i), {"w": np.random.randn(40, 30), "b": np.random.randn(5)}, i + 1) for i in range(4)
+        ]
+        sparse_results, dense_results = [], []
+        for name, data, n_iter in clients:
+            s = TopKSparsifier(density=0.05, min_size=100).process(
+                _make_result(name, {k: v.copy() for k, v in data.items()}, n_iter), FLContext()
+            )
+            dxo = from_shareable(s)
+            records = dxo.get_meta_prop(MetaKey.PROCESSED_KEYS)
+            dense = {k: densify(v, records[k]) if k in records else v for k, v in dxo.data.items()}
+            sparse_results.append(s)
+            dense_results.append(_make_result(name, dense, n_iter))
+
+        expected = _aggregate(InTimeAccumulateWeightedAggregator(), dense_results)
+        result = _aggregate(SparseInTimeAccumulateWeightedAggregator(), sparse_results)
+        for k in ["w", "b"]:
+            assert result[k].shape == expected[k].shape
+            np.testing.assert_allclose(result[k], expected[k])
+
+        # the dense aggregator cannot accept sparse data
+        fl_ctx = FLContext()
+        fl_ctx.set_prop(AppConstants.CURRENT_ROUND, 0)
+        assert not InTimeAccumulateWeightedAggregator().accept(sparse_results[0], fl_ctx)
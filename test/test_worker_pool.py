@@ -0,0 +1,57 @@
+# Copyright (c) 2021-2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sys
+
+from nvflare.private.fed.client.worker_pool import WarmWorkerPool
+
+# a worker that writes the run it is handed to a file, and exits if stdin is closed
+WORKER = """
+import sys
+line = sys.stdin.readline()
+if line.strip():
+    with open(sys.argv[1], "w") as f:
+        f.write(line)
+"""
+
+
+class TestWarmWorkerPool:
+    def test_hand_off(self, tmp_path):
+        out = tmp_path / "run.json"
+        pool = WarmWorkerPool([sys.executable, "-c", WORKER, str(out)], size=1)
+        pool.fill()
+        first = pool.idle[0]
+
+        process = pool.hand_off({"token": "abc", "run_number": 3})
+        assert process is first
+        assert process.wait(30) == 0
+        assert json.loads(out.read_text()) == {"token": "abc", "run_number": 3}
+
+        # a worker takes one run only
+        assert not pool.idle
+        assert pool.hand_off({"run_number": 4}) is None
+        pool.fill()
+        assert len(pool.idle) == 1 and pool.idle[0] is not first
+
+        idle = pool.idle[0]
+        pool.shutdown()
+        assert idle.wait(30) == 0
+        assert not pool.idle
+
+    def test_dead_worker(self, tmp_path):
+        pool = WarmWorkerPool([sys.executable, "-c", "pass"], size=1)
+        pool.fill()
+        pool.idle[0].wait(30)
+        assert pool.hand_off({"run_number": 1}) is None